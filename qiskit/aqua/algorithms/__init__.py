@@ -19,8 +19,8 @@ from .quantum_algorithm import QuantumAlgorithm
 from .adaptive import VQE, QAOA, QSVMVariational
 from .classical import ExactEigensolver, ExactLSsolver, SVM_Classical
 from .many_sample import EOH, QSVMKernel
-from .single_sample import Grover, IQPE, QPE, AmplitudeEstimation, Simon, \
-    DeutschJozsa, BernsteinVazirani, HHL, Shor
+from .single_sample import Grover, IQPE, QPE, AmplitudeEstimation, MaximumLikelihoodAmplitudeEstimation, \
+    Simon, DeutschJozsa, BernsteinVazirani, HHL, Shor
 
 
 __all__ = [
@@ -37,6 +37,7 @@ __all__ = [
     'IQPE',
     'QPE',
     'AmplitudeEstimation',
+    'MaximumLikelihoodAmplitudeEstimation',
     'Simon',
     'DeutschJozsa',
     'BernsteinVazirani',
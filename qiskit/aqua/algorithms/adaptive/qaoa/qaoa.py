@@ -45,7 +45,7 @@ class QAOA(VQE):
                     'type': 'string',
                     'default': 'matrix',
                     'oneOf': [
-                        {'enum': ['matrix', 'paulis', 'grouped_paulis']}
+                        {'enum': ['matrix', 'paulis', 'grouped_paulis', 'commuting_paulis']}
                     ]
                 },
                 'p': {
@@ -184,9 +184,14 @@ class QSVMVariational(VQAlgorithm):
         """
         qr = QuantumRegister(self._num_qubits, name='q')
         cr = ClassicalRegister(self._num_qubits, name='c')
+        return self._combine_circuits(self._feature_map.construct_circuit(x, qr),
+                                      self._var_form.construct_circuit(theta, qr), qr, cr, measurement)
+
+    @staticmethod
+    def _combine_circuits(feature_circuit, var_circuit, qr, cr, measurement):
         qc = QuantumCircuit(qr, cr)
-        qc += self._feature_map.construct_circuit(x, qr)
-        qc += self._var_form.construct_circuit(theta, qr)
+        qc += feature_circuit
+        qc += var_circuit
 
         if measurement:
             qc.barrier(qr)
@@ -228,12 +233,15 @@ class QSVMVariational(VQAlgorithm):
         num_theta_sets = len(theta) // self._var_form.num_parameters
         theta_sets = np.split(theta, num_theta_sets)
 
+        # the feature map circuits are built once for all the parameter sets
+        qr = QuantumRegister(self._num_qubits, name='q')
+        cr = ClassicalRegister(self._num_qubits, name='c')
+        feature_circuits = self._feature_map.construct_circuits(data, qr)
         for theta in theta_sets:
-            for datum in data:
-                if self._quantum_instance.is_statevector:
-                    circuit = self.construct_circuit(datum, theta, measurement=False)
-                else:
-                    circuit = self.construct_circuit(datum, theta, measurement=True)
+            var_circuit = self._var_form.construct_circuit(theta, qr)
+            for feature_circuit in feature_circuits:
+                circuit = self._combine_circuits(feature_circuit, var_circuit, qr, cr,
+                                                 not self._quantum_instance.is_statevector)
 
                 circuits[circuit_id] = circuit
                 circuit_id += 1
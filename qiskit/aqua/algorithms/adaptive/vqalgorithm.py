@@ -24,12 +24,16 @@ interface requirements.
 
 """
 
+import functools
+import inspect
 import time
 import logging
 import numpy as np
 from abc import abstractmethod
 
 from qiskit.aqua.algorithms import QuantumAlgorithm
+from qiskit.aqua.components.optimizers import MultiStartOptimizer
+from qiskit.aqua.components.optimizers.multi_start import EvaluationRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +53,8 @@ class VQAlgorithm(QuantumAlgorithm):
         self._optimizer = optimizer
         self._cost_fn = cost_fn
         self._initial_point = initial_point
+        # the multi-start driver, and its process pool, is reused by the next optimizations
+        self._multi_start = None
 
     @abstractmethod
     def get_optimal_cost(self):
@@ -62,9 +68,23 @@ class VQAlgorithm(QuantumAlgorithm):
     def get_optimal_vector(self):
         raise NotImplementedError()
 
-    def find_minimum(self, initial_point=None, var_form=None, cost_fn=None, optimizer=None, gradient_fn=None):
+    def find_minimum(self, initial_point=None, var_form=None, cost_fn=None, optimizer=None, gradient_fn=None,
+                     num_starts=1, max_processes=None):
         """Optimize to find the minimum cost value.
 
+        Args:
+            initial_point (numpy.ndarray): the initial point, by default the one of the algorithm
+            var_form (VariationalForm): the variational form, by default the one of the algorithm
+            cost_fn (callable): the cost function, by default the one of the algorithm
+            optimizer (Optimizer): the optimizer, by default the one of the algorithm
+            gradient_fn (callable): the gradient of the cost function, if supported by the optimizer
+            num_starts (int): number of start points, run in parallel by MultiStartOptimizer when
+                              greater than 1; the other start points are drawn from the parameter bounds.
+                              A cost or gradient function taking a `callback` keyword argument is given
+                              an EvaluationRecorder of the `_callback` of the algorithm, so that its calls
+                              in the pool workers are replayed here, counted in `_eval_count`.
+            max_processes (int): maximum number of processes for the starts
+
         Returns:
             Optimized variational parameters, and corresponding minimum cost value.
 
@@ -106,6 +126,17 @@ class VQAlgorithm(QuantumAlgorithm):
         if not optimizer.is_gradient_supported: # ignore the passed gradient function
             gradient_fn = None
 
+        if num_starts > 1:
+            optimizer = self._get_multi_start(optimizer, num_starts, max_processes)
+        callback = getattr(self, '_callback', None)
+        if callback is not None:
+            # the functions run in the pool workers of an optimizer call the recorder, which replays
+            # their calls here, in place of the callback
+            recorder = EvaluationRecorder(
+                callback, lambda eval_count, *data: self._replay_evaluation(callback, *data))
+            cost_fn = self._with_callback(cost_fn, recorder)
+            gradient_fn = self._with_callback(gradient_fn, recorder)
+
         logger.info('Starting optimizer.\nbounds={}\ninitial point={}'.format(bounds, initial_point))
         opt_params, opt_val, num_optimizer_evals = optimizer.optimize(var_form.num_parameters,
                                                                       cost_fn,
@@ -121,6 +152,28 @@ class VQAlgorithm(QuantumAlgorithm):
 
         return ret
 
+    def _get_multi_start(self, optimizer, num_starts, max_processes):
+        multi_start = self._multi_start
+        if multi_start is None or multi_start.optimizer is not optimizer or \
+                multi_start.num_starts != num_starts or multi_start.max_processes != max_processes:
+            if multi_start is not None:
+                multi_start.close()
+            self._multi_start = multi_start = MultiStartOptimizer(optimizer, num_starts=num_starts,
+                                                                  max_processes=max_processes)
+        return multi_start
+
+    @staticmethod
+    def _with_callback(fn, recorder):
+        if fn is None or 'callback' not in inspect.signature(fn).parameters:
+            return fn
+        return functools.partial(fn, callback=recorder)
+
+    def _replay_evaluation(self, callback, *data):
+        # an evaluation of the cost function in a pool worker, numbered in the sequence of this process
+        self._eval_count = getattr(self, '_eval_count', 0) + 1
+        if callback is not None:
+            callback(self._eval_count, *data)
+
     # Helper function to get probability vectors for a set of params
     def get_prob_vector_for_params(self, construct_circuit_fn, params_s,
                                    quantum_instance, construct_circuit_args=None):
@@ -27,6 +27,7 @@ from qiskit import ClassicalRegister, QuantumCircuit
 
 from qiskit.aqua.algorithms.adaptive.vqalgorithm import VQAlgorithm
 from qiskit.aqua import AquaError, Pluggable, PluggableType, get_pluggable_class
+from qiskit.aqua.components.optimizers import Optimizer
 from qiskit.aqua.utils.backend_utils import is_aer_statevector_backend
 from qiskit.aqua.utils import find_regs_by_name
 
@@ -52,7 +53,7 @@ class VQE(VQAlgorithm):
                     'type': 'string',
                     'default': 'matrix',
                     'oneOf': [
-                        {'enum': ['matrix', 'paulis', 'grouped_paulis']}
+                        {'enum': ['matrix', 'paulis', 'grouped_paulis', 'commuting_paulis']}
                     ]
                 },
                 'initial_point': {
@@ -65,6 +66,10 @@ class VQE(VQAlgorithm):
                 'max_evals_grouped': {
                     'type': 'integer',
                     'default': 1
+                },
+                'param_shift_gradient': {
+                    'type': 'boolean',
+                    'default': False
                 }
             },
             'additionalProperties': False
@@ -85,7 +90,8 @@ class VQE(VQAlgorithm):
     }
 
     def __init__(self, operator, var_form, optimizer, operator_mode='matrix',
-                 initial_point=None, max_evals_grouped=1, aux_operators=None, callback=None):
+                 initial_point=None, max_evals_grouped=1, aux_operators=None, callback=None,
+                 param_shift_gradient=False):
         """Constructor.
 
         Args:
@@ -100,6 +106,11 @@ class VQE(VQAlgorithm):
                                  Internally, four arguments are provided as follows
                                  the index of evaluation, parameters of variational form,
                                  evaluated mean, evaluated standard devation.
+            param_shift_gradient (bool): pass the parameter-shift gradient of the energy to the optimizer,
+                                         in place of its own finite differences, when the optimizer
+                                         supports gradients and the variational form supports the
+                                         parameter-shift rule. All the shifted points of a gradient are
+                                         evaluated in a single execution, whatever max_evals_grouped.
         """
         self.validate(locals())
         super().__init__(var_form=var_form,
@@ -113,6 +124,8 @@ class VQE(VQAlgorithm):
         self._operator = operator
         self._operator_mode = operator_mode
         self._eval_count = 0
+        self._max_evals_grouped = max_evals_grouped
+        self._param_shift_gradient = param_shift_gradient
         if aux_operators is None:
             self._aux_operators = []
         else:
@@ -140,6 +153,7 @@ class VQE(VQAlgorithm):
         operator_mode = vqe_params.get('operator_mode')
         initial_point = vqe_params.get('initial_point')
         max_evals_grouped = vqe_params.get('max_evals_grouped')
+        param_shift_gradient = vqe_params.get('param_shift_gradient')
 
         # Set up variational form, we need to add computed num qubits
         # Pass all parameters so that Variational Form can create its dependents
@@ -155,7 +169,7 @@ class VQE(VQAlgorithm):
 
         return cls(operator, var_form, optimizer, operator_mode=operator_mode,
                    initial_point=initial_point, max_evals_grouped=max_evals_grouped,
-                   aux_operators=algo_input.aux_ops)
+                   aux_operators=algo_input.aux_ops, param_shift_gradient=param_shift_gradient)
 
     @property
     def setting(self):
@@ -278,11 +292,16 @@ class VQE(VQAlgorithm):
 
         self._quantum_instance.circuit_summary = True
 
+        gradient_fn = None
+        if self._param_shift_gradient and getattr(self.var_form, 'is_parameter_shift_supported', False):
+            gradient_fn = self._gradient_evaluation
+
         self._eval_count = 0
         self._ret = self.find_minimum(initial_point=self.initial_point,
                                       var_form=self.var_form,
                                       cost_fn=self._energy_evaluation,
-                                      optimizer=self.optimizer)
+                                      optimizer=self.optimizer,
+                                      gradient_fn=gradient_fn)
 
         if self._ret['num_optimizer_evals'] is not None and self._eval_count >= self._ret['num_optimizer_evals']:
             self._eval_count = self._ret['num_optimizer_evals']
@@ -298,12 +317,13 @@ class VQE(VQAlgorithm):
         return self._ret
 
     # This is the objective function to be passed to the optimizer that is uses for evaluation
-    def _energy_evaluation(self, parameters):
+    def _energy_evaluation(self, parameters, callback=None):
         """
         Evaluate energy at given parameters for the variational form.
 
         Args:
             parameters (numpy.ndarray): parameters for variational form.
+            callback (callable): called in place of the callback of the algorithm, if given
 
         Returns:
             float or list of float: energy of the hamiltonian of each parameter.
@@ -329,18 +349,35 @@ class VQE(VQAlgorithm):
             extra_args = {}
         result = self._quantum_instance.execute(to_be_simulated_circuits, **extra_args)
 
+        callback = callback if callback is not None else self._callback
         for idx in range(len(parameter_sets)):
             mean, std = self._operator.evaluate_with_result(
                 self._operator_mode, circuits[idx], self._quantum_instance.backend, result, self._use_simulator_operator_mode)
             mean_energy.append(np.real(mean))
             std_energy.append(np.real(std))
             self._eval_count += 1
-            if self._callback is not None:
-                self._callback(self._eval_count, parameter_sets[idx], np.real(mean), np.real(std))
+            if callback is not None:
+                callback(self._eval_count, parameter_sets[idx], np.real(mean), np.real(std))
             logger.info('Energy evaluation {} returned {}'.format(self._eval_count, np.real(mean)))
 
         return mean_energy if len(mean_energy) > 1 else mean_energy[0]
 
+    def _gradient_evaluation(self, parameters, callback=None):
+        """
+        Evaluate the gradient of the energy with the parameter-shift rule, all the 2P shifted
+        points in a single execution.
+
+        Args:
+            parameters (numpy.ndarray): parameters for variational form.
+            callback (callable): called in place of the callback of the algorithm, if given
+
+        Returns:
+            numpy.ndarray: the gradient, exact up to the sampling noise of the energies.
+        """
+        return Optimizer.gradient_param_shift(parameters,
+                                              functools.partial(self._energy_evaluation, callback=callback),
+                                              max_evals_grouped=None)
+
     def get_optimal_cost(self):
         if 'opt_params' not in self._ret:
             raise AquaError("Cannot return optimal cost before running the algorithm to find optimal params.")
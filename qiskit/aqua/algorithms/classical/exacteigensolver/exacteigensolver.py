@@ -20,15 +20,23 @@ import logging
 
 import numpy as np
 from scipy import sparse as scisparse
+from scipy.sparse.linalg import LinearOperator
 
 from qiskit.aqua.algorithms import QuantumAlgorithm
-from qiskit.aqua import AquaError, Pluggable
+from qiskit.aqua import AquaError, Pluggable, aqua_globals
+from qiskit.aqua.utils.packed_paulis import PackedPaulis, pauli_linear_operator
 
 logger = logging.getLogger(__name__)
 
 
 class ExactEigensolver(QuantumAlgorithm):
-    """The Exact Eigensolver algorithm."""
+    """The Exact Eigensolver algorithm.
+
+    In the matrix-free mode, which is opt-in, the operator is never converted to a matrix: its paulis are
+    applied to the vectors of Lanczos (or LOBPCG, with warm-start vectors) by `pauli_matvec`, in O(2^n)
+    memory, and a diagonal operator is solved by a partial sort of its diagonal. A non-Hermitian operator
+    is solved by the Arnoldi iteration instead, as in the matrix mode.
+    """
 
     CONFIGURATION = {
         'name': 'ExactEigensolver',
@@ -43,6 +51,14 @@ class ExactEigensolver(QuantumAlgorithm):
                     'type': 'integer',
                     'default': 1,
                     'minimum': 1
+                },
+                'matrix_free': {
+                    'type': 'boolean',
+                    'default': False
+                },
+                'sigma': {
+                    'type': ['number', 'null'],
+                    'default': None
                 }
             },
             'additionalProperties': False
@@ -50,13 +66,21 @@ class ExactEigensolver(QuantumAlgorithm):
         'problems': ['energy', 'excited_states', 'ising']
     }
 
-    def __init__(self, operator, k=1, aux_operators=None):
+    def __init__(self, operator, k=1, aux_operators=None, matrix_free=False, sigma=None, initial_vectors=None):
         """Constructor.
 
         Args:
             operator: Operator instance
             k: How many eigenvalues are to be computed
             aux_operators: Auxiliary operators to be evaluated at each eigenvalue
+            matrix_free (bool): apply the paulis of the operator instead of converting it to a matrix
+            sigma (float): shift-invert mode, the k eigenvalues closest to sigma are computed instead
+                           of the k lowest ones
+            initial_vectors (numpy.ndarray): warm-start vectors, one per row, e.g. the eigenvectors of
+                                             a previous run on a nearby operator
+
+        Raises:
+            AquaError: if the matrix-free mode is requested for an operator without paulis
         """
         self.validate(locals())
         super().__init__()
@@ -66,9 +90,20 @@ class ExactEigensolver(QuantumAlgorithm):
         else:
             self._aux_operators = [aux_operators] if not isinstance(aux_operators, list) else aux_operators
         self._k = k
-        self._operator.to_matrix()
-        if self._k > self._operator.matrix.shape[0]:
-            self._k = self._operator.matrix.shape[0]
+        if matrix_free:
+            if not self._operator._has_paulis():
+                raise AquaError('The matrix-free mode needs the paulis representation of the operator.')
+            logger.info('Solving the operator on {} qubits matrix-free.'.format(self._operator.num_qubits))
+        self._matrix_free = matrix_free
+        self._sigma = sigma
+        self._initial_vectors = None if initial_vectors is None else np.atleast_2d(initial_vectors)
+        if self._matrix_free:
+            dim = 2 ** self._operator.num_qubits
+        else:
+            self._operator.to_matrix()
+            dim = self._operator.matrix.shape[0]
+        if self._k > dim:
+            self._k = dim
             logger.debug("WARNING: Asked for {} eigenvalues but max possible is {}.".format(k, self._k))
         self._ret = {}
 
@@ -84,23 +119,121 @@ class ExactEigensolver(QuantumAlgorithm):
             raise AquaError("EnergyInput instance is required.")
         ee_params = params.get(Pluggable.SECTION_KEY_ALGORITHM)
         k = ee_params.get('k')
-        return cls(algo_input.qubit_op, k, algo_input.aux_ops)
+        matrix_free = ee_params.get('matrix_free')
+        sigma = ee_params.get('sigma')
+        return cls(algo_input.qubit_op, k, algo_input.aux_ops, matrix_free=matrix_free, sigma=sigma)
+
+    def _solve_diagonal(self, dia_matrix):
+        # a diagonal operator, e.g. an Ising Hamiltonian: its k lowest entries and their basis states
+        dia_matrix = np.asarray(dia_matrix)
+        if self._sigma is not None:
+            keys = np.abs(dia_matrix.real - self._sigma)
+        else:
+            keys = dia_matrix.real
+        temp = np.argpartition(keys, self._k - 1)[:self._k] if self._k < len(dia_matrix) else np.arange(len(dia_matrix))
+        temp = temp[np.lexsort((temp, keys[temp]))]
+        eigval = dia_matrix[temp]
+        eigvec = np.zeros((len(dia_matrix), self._k))
+        eigvec[temp, np.arange(self._k)] = 1.0
+        return eigval, eigvec
+
+    def _shift_invert_operator(self, linear_operator):
+        # (A - sigma)^-1 by MINRES, on the real symmetric form of the complex Hermitian operator
+        dim = linear_operator.shape[0]
+
+        def real_matvec(vector):
+            result = linear_operator.matvec(vector[:dim] + 1j * vector[dim:])
+            return np.concatenate((result.real, result.imag))
+
+        real_operator = LinearOperator((2 * dim, 2 * dim), matvec=real_matvec, dtype=np.float64)
+
+        def matvec(vector):
+            vector = np.asarray(vector).reshape(-1)
+            solution, info = scisparse.linalg.minres(real_operator, np.concatenate((vector.real, vector.imag)),
+                                                     shift=self._sigma, tol=1e-12)
+            if info > 0:
+                logger.debug('MINRES did not converge in {} iterations for the shift-invert mode.'.format(info))
+            return solution[:dim] + 1j * solution[dim:]
+
+        return LinearOperator((dim, dim), matvec=matvec, dtype=np.complex128)
+
+    def _is_hermitian(self, threshold=1e-12):
+        if self._matrix_free:
+            # a sum of distinct paulis is Hermitian if and only if its coefficients are real
+            packed_paulis = self._operator._get_packed_paulis()
+            packed_paulis = PackedPaulis(packed_paulis.coeffs.copy(), packed_paulis.z.copy(),
+                                         packed_paulis.x.copy(), packed_paulis.num_qubits)
+            packed_paulis.simplify()
+            return not np.any(np.abs(packed_paulis.coeffs.imag) > threshold)
+        matrix = self._operator.matrix
+        return abs(matrix - matrix.conj().T).max() <= threshold
+
+    def _solve_iteratively(self, linear_operator):
+        dim = linear_operator.shape[0]
+        hermitian = self._is_hermitian()
+        if not hermitian:
+            logger.debug('The operator is not Hermitian, using the Arnoldi iteration.')
+        if self._k >= dim - 1:
+            logger.debug("Scipy doesn't support to get all eigenvalues, using numpy instead.")
+            if isinstance(linear_operator, LinearOperator):
+                matrix = linear_operator.matmat(np.eye(dim, dtype=np.complex128))
+            else:
+                matrix = linear_operator.toarray()
+            eigval, eigvec = np.linalg.eigh(matrix) if hermitian else np.linalg.eig(matrix)
+            if self._sigma is not None:
+                idx = np.argsort(np.abs(eigval - self._sigma), kind='mergesort')[:self._k]
+            else:
+                idx = np.argsort(eigval.real, kind='mergesort')[:self._k]
+            return eigval[idx], eigvec[:, idx]
+
+        v0 = None
+        if self._initial_vectors is not None:
+            if self._initial_vectors.shape[1] != dim:
+                raise AquaError('The initial vectors have dimension {} instead of {}.'.format(
+                    self._initial_vectors.shape[1], dim))
+            v0 = self._initial_vectors[0]
+        if not hermitian:
+            # Lanczos, MINRES and LOBPCG need a Hermitian operator
+            if self._sigma is not None:
+                return scisparse.linalg.eigs(linear_operator, k=self._k, sigma=self._sigma, which='LM', v0=v0)
+            return scisparse.linalg.eigs(linear_operator, k=self._k, which='SR', v0=v0)
+        if self._sigma is not None:
+            op_inv = None
+            if isinstance(linear_operator, LinearOperator):
+                op_inv = self._shift_invert_operator(linear_operator)
+            return scisparse.linalg.eigsh(linear_operator, k=self._k, sigma=self._sigma, which='LM', v0=v0,
+                                          OPinv=op_inv)
+        if v0 is None:
+            return scisparse.linalg.eigsh(linear_operator, k=self._k, which='SA')
+
+        # warm start: LOBPCG refines the whole block of initial vectors, completed with random vectors
+        block = self._initial_vectors[:self._k].T.astype(np.complex128)
+        if block.shape[1] < self._k:
+            random_vectors = aqua_globals.random.randn(dim, self._k - block.shape[1])
+            block = np.hstack((block, random_vectors))
+        eigval, eigvec = scisparse.linalg.lobpcg(linear_operator, block, largest=False, tol=1e-9, maxiter=1000)
+        return eigval, eigvec
 
     def _solve(self):
-        if self._operator.matrix.ndim == 2:
-            if self._k >= self._operator.matrix.shape[0] - 1:
+        if self._matrix_free:
+            diagonal_ising = self._operator._get_diagonal_ising()
+            if diagonal_ising is not None:
+                eigval, eigvec = self._solve_diagonal(diagonal_ising.diagonal())
+            else:
+                linear_operator = pauli_linear_operator(self._operator._get_packed_paulis())
+                eigval, eigvec = self._solve_iteratively(linear_operator)
+        elif self._operator.matrix.ndim == 2:
+            if self._sigma is not None or self._initial_vectors is not None:
+                eigval, eigvec = self._solve_iteratively(self._operator.matrix)
+            elif self._k >= self._operator.matrix.shape[0] - 1:
                 logger.debug("Scipy doesn't support to get all eigenvalues, using numpy instead.")
                 eigval, eigvec = np.linalg.eig(self._operator.matrix.toarray())
             else:
                 eigval, eigvec = scisparse.linalg.eigs(self._operator.matrix, k=self._k, which='SR')
         else:
-            eigval = np.sort(self._operator.matrix.data)[:self._k]
-            temp = np.argsort(self._operator.matrix.data)[:self._k]
-            eigvec = np.zeros((self._operator.matrix.shape[0], self._k))
-            for i, idx in enumerate(temp):
-                eigvec[idx, i] = 1.0
+            eigval, eigvec = self._solve_diagonal(self._operator.matrix)
         if self._k > 1:
-            idx = eigval.argsort()
+            idx = eigval.argsort() if self._sigma is None else np.argsort(np.abs(eigval - self._sigma))
             eigval = eigval[idx]
             eigvec = eigvec[:, idx]
         self._ret['eigvals'] = eigval
@@ -128,10 +261,14 @@ class ExactEigensolver(QuantumAlgorithm):
     def _eval_aux_operators(self, wavefn, threshold=1e-12):
         values = []
         for operator in self._aux_operators:
-            operator.to_matrix()
+            if not self._matrix_free or not operator._has_paulis():
+                operator.to_matrix()
             value = 0.0
             if not operator.is_empty():
-                value, _ = operator.eval('matrix', wavefn, None)
+                if self._matrix_free and operator.matrix is None:
+                    value = operator._eval_directly(wavefn)
+                else:
+                    value, _ = operator.eval('matrix', wavefn, None)
                 value = value.real if abs(value.real) > threshold else 0.0
             values.append((value, 0))
         return np.asarray(values)
@@ -15,15 +15,106 @@
 # limitations under the License.
 # =============================================================================
 
+import hashlib
+
+import numpy as np
+from sklearn.metrics.pairwise import rbf_kernel
 from sklearn.svm import SVC
 
 from qiskit.aqua.components.multiclass_extensions import Estimator
 
 
+class _RBF_Kernel:
+    """
+    The RBF kernel of the training points, shared by the estimators of a multiclass extension.
+
+    The kernel matrix of the training points is computed once, and every estimator fits on the
+    block of the points it is trained with. The kernel block between the last data points seen
+    and the training points is kept, so that the estimators evaluated on the same data points
+    one after the other compute it only once.
+    """
+
+    def __init__(self, gamma=None):
+        """
+        Constructor.
+
+        Args:
+            gamma (float): the gamma of the kernel, 1 / D if None, where D is the feature dimension
+        """
+        self.gamma = gamma
+        self._points = None
+        self._matrix = None
+        self._index = {}
+        self._block_key = None
+        self._block = None
+
+    def fit(self, x):
+        """
+        Compute the kernel matrix of the training points.
+
+        Args:
+            x (numpy.ndarray): NxD array, the training points
+        """
+        self._points = np.ascontiguousarray(x, dtype=float)
+        self._matrix = rbf_kernel(self._points, self._points, self.gamma)
+        self._index = {row.tobytes(): i for i, row in enumerate(self._points)}
+        self._block_key = None
+        self._block = None
+
+    def indices(self, x):
+        """
+        Find the points among the training points.
+
+        Args:
+            x (numpy.ndarray): NxD array
+
+        Returns:
+            numpy.ndarray: the index of each point among the training points, or None if a point is not one of them
+        """
+        if self._points is None:
+            return None
+        try:
+            return np.fromiter((self._index[row.tobytes()] for row in np.ascontiguousarray(x, dtype=float)),
+                               dtype=int, count=len(x))
+        except KeyError:
+            return None
+
+    def training_block(self, indices):
+        """Return the kernel matrix of the training points at `indices`."""
+        return self._matrix[np.ix_(indices, indices)]
+
+    def block(self, x, indices):
+        """
+        Compute the kernel matrix between data points and the training points at `indices`.
+
+        Args:
+            x (numpy.ndarray): NxD array, the data points
+            indices (numpy.ndarray): the indices of the training points
+
+        Returns:
+            numpy.ndarray: NxM array, where M is the number of indices
+        """
+        x = np.ascontiguousarray(x, dtype=float)
+        key = (x.shape, hashlib.sha1(x.tobytes()).hexdigest())
+        if key != self._block_key:
+            self._block = rbf_kernel(x, self._points, self.gamma)
+            self._block_key = key
+        return self._block[:, indices]
+
+
 class _RBF_SVC_Estimator(Estimator):
     """The estimator that uses the RBF Kernel."""
 
-    def __init__(self):
+    def __init__(self, kernel=None):
+        """
+        Constructor.
+
+        Args:
+            kernel (_RBF_Kernel): the kernel shared with the other estimators, or None to compute
+                                  the kernel of this estimator alone
+        """
+        self._kernel = kernel
+        self._indices = None
         self._estimator = SVC(kernel='rbf', gamma='auto')
 
     def fit(self, x, y):
@@ -33,7 +124,14 @@ class _RBF_SVC_Estimator(Estimator):
             x (numpy.ndarray): input points
             y (numpy.ndarray): input labels
         """
-        self._estimator.fit(x, y)
+        self._indices = self._kernel.indices(x) if self._kernel is not None else None
+        if self._indices is not None:
+            self._estimator = SVC(kernel='precomputed')
+            self._estimator.fit(self._kernel.training_block(self._indices), y)
+        else:
+            gamma = self._kernel.gamma if self._kernel is not None and self._kernel.gamma is not None else 'auto'
+            self._estimator = SVC(kernel='rbf', gamma=gamma)
+            self._estimator.fit(x, y)
 
     def decision_function(self, x):
         """
@@ -41,4 +139,6 @@ class _RBF_SVC_Estimator(Estimator):
         Args:
             x (numpy.ndarray): input points
         """
+        if self._indices is not None:
+            return self._estimator.decision_function(self._kernel.block(x, self._indices))
         return self._estimator.decision_function(x)
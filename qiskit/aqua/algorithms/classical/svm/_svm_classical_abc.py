@@ -25,6 +25,9 @@ class _SVM_Classical_ABC(ABC):
     abstract base class for the binary classifier and the multiclass classifier
     """
 
+    # number of data points whose kernel block against the training points or the support vectors is held at once
+    BATCH_SIZE = 1000
+
     def __init__(self, training_dataset, test_dataset=None, datapoints=None, gamma=None):
         if training_dataset is None:
             raise ValueError('training dataset is missing! please provide it')
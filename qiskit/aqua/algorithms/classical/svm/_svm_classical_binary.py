@@ -38,68 +38,75 @@ class _SVM_Classical_Binary(_SVM_Classical_ABC):
         """
         train the svm
         Args:
-            data (dict): dictionary which maps each class to the points in the class
-            class_labels (list): list of classes. For example: ['A', 'B']
+            data (numpy.ndarray): NxD array, where N is the number of data,
+                                  D is the feature dimension.
+            labels (numpy.ndarray): Nx1 array, where N is the number of data
         """
         labels = labels.astype(np.float)
         labels = labels * 2. - 1.
         kernel_matrix = self.construct_kernel_matrix(data, data, self.gamma)
         self._ret['kernel_matrix_training'] = kernel_matrix
         [alpha, b, support] = optimize_svm(kernel_matrix, labels)
-        alphas = np.array([])
-        svms = np.array([])
-        yin = np.array([])
-        for alphindex in range(len(support)):
-            if support[alphindex]:
-                alphas = np.vstack([alphas, alpha[alphindex]]) if alphas.size else alpha[alphindex]
-                svms = np.vstack([svms, data[alphindex]]) if svms.size else data[alphindex]
-                yin = np.vstack([yin, labels[alphindex]]
-                                ) if yin.size else labels[alphindex]
 
+        # the weights and the labels of the support vectors are Sx1 columns
         self._ret['svm'] = {}
-        self._ret['svm']['alphas'] = alphas
+        self._ret['svm']['alphas'] = alpha[support].reshape(-1, 1)
         self._ret['svm']['bias'] = b
-        self._ret['svm']['support_vectors'] = svms
-        self._ret['svm']['yin'] = yin
+        self._ret['svm']['support_vectors'] = data[support]
+        self._ret['svm']['yin'] = labels[support].reshape(-1, 1)
 
-    def test(self, data, labels):
+    def get_predicted_confidence(self, data, return_kernel_matrix=False):
         """
-        test the svm
+        Get the decision function of the svm.
+
+        The kernel blocks between BATCH_SIZE data points and the support vectors are computed
+        and multiplied by the weights of the support vectors one after the other.
+
         Args:
-            data (dict): dictionary which maps each class to the points in the class
-            labels (list): list of classes. For example: ['A', 'B']
+            data (numpy.ndarray): NxD array, where N is the number of data,
+                                  D is the feature dimension.
+            return_kernel_matrix (bool): return the kernel matrix as well
+        Returns:
+            numpy.ndarray: Nx1 array, predicted confidence
+            numpy.ndarray (optional): the kernel matrix, NxS, where S is
+                                      the number of support vectors.
         """
-        alphas = self._ret['svm']['alphas']
         bias = self._ret['svm']['bias']
         svms = self._ret['svm']['support_vectors']
-        yin = self._ret['svm']['yin']
+        weights = (self._ret['svm']['yin'] * self._ret['svm']['alphas']).ravel()
+
+        confidence = np.empty(len(data))
+        kernel_matrix = np.empty((len(data), len(svms))) if return_kernel_matrix else None
+        for idx in range(0, len(data), self.BATCH_SIZE):
+            rows = slice(idx, idx + self.BATCH_SIZE)
+            kernel_block = self.construct_kernel_matrix(data[rows], svms, self.gamma)
+            confidence[rows] = kernel_block.dot(weights)
+            if return_kernel_matrix:
+                kernel_matrix[rows] = kernel_block
+        confidence += bias
+
+        if return_kernel_matrix:
+            return confidence, kernel_matrix
+        else:
+            return confidence
 
-        kernel_matrix = self.construct_kernel_matrix(data, svms, self.gamma)
-        self._ret['kernel_matrix_testing'] = kernel_matrix
+    def test(self, data, labels):
+        """
+        test the svm
 
-        success_ratio = 0
-        l = 0
-        total_num_points = len(data)
-        lsign = np.zeros(total_num_points)
-        for tin in range(total_num_points):
-            ltot = 0
-            for sin in range(len(svms)):
-                l = yin[sin] * alphas[sin] * kernel_matrix[tin][sin]
-                ltot += l
-            lsign[tin] = (np.sign(ltot + bias) + 1.) / 2.
-
-            logger.debug("\n=============================================")
-            logger.debug('classifying {}.'.format(data[tin]))
-            logger.debug('Label should be {}.'.format(self.label_to_class[np.int(labels[tin])]))
-            logger.debug('Predicted label is {}.'.format(self.label_to_class[np.int(lsign[tin])]))
-            if np.int(labels[tin]) == np.int(lsign[tin]):
-                logger.debug('CORRECT')
-            else:
-                logger.debug('INCORRECT')
-            if lsign[tin] == labels[tin]:
-                success_ratio += 1
-        final_success_ratio = success_ratio / total_num_points
+        Args:
+            data (numpy.ndarray): NxD array, where N is the number of data,
+                                  D is the feature dimension.
+            labels (numpy.ndarray): Nx1 array, where N is the number of data
+
+        Returns:
+            float: accuracy
+        """
+        predicted_confidence, kernel_matrix = self.get_predicted_confidence(data, return_kernel_matrix=True)
+        lsign = (np.sign(predicted_confidence) + 1.) / 2.
+        final_success_ratio = np.sum(lsign == labels) / len(data)
         logger.debug('Classification success is {} %% \n'.format(100 * final_success_ratio))
+        self._ret['kernel_matrix_testing'] = kernel_matrix
         self._ret['test_success_ratio'] = final_success_ratio
         self._ret['testing_accuracy'] = final_success_ratio
 
@@ -108,24 +115,15 @@ class _SVM_Classical_Binary(_SVM_Classical_ABC):
     def predict(self, data):
         """
         predict using the svm
+
         Args:
             data (numpy.ndarray): the points
+        Returns:
+            numpy.ndarray: predicted labels, Nx1 array
         """
-        alphas = self._ret['svm']['alphas']
-        bias = self._ret['svm']['bias']
-        svms = self._ret['svm']['support_vectors']
-        yin = self._ret['svm']['yin']
-        kernel_matrix = self.construct_kernel_matrix(data, svms, self.gamma)
+        predicted_confidence, kernel_matrix = self.get_predicted_confidence(data, return_kernel_matrix=True)
         self._ret['kernel_matrix_prediction'] = kernel_matrix
-
-        total_num_points = len(data)
-        lsign = np.zeros(total_num_points)
-        for tin in range(total_num_points):
-            ltot = 0
-            for sin in range(len(svms)):
-                l = yin[sin] * alphas[sin] * kernel_matrix[tin][sin]
-                ltot += l
-            lsign[tin] = np.int((np.sign(ltot + bias) + 1.) / 2.)
+        lsign = ((np.sign(predicted_confidence) + 1.) / 2.).astype(int)
         self._ret['predicted_labels'] = lsign
         return lsign
 
@@ -17,7 +17,10 @@
 
 import logging
 
+import numpy as np
+
 from qiskit.aqua.algorithms.classical.svm import _SVM_Classical_ABC
+from qiskit.aqua.algorithms.classical.svm._rbf_svc_estimator import _RBF_Kernel, _RBF_SVC_Estimator
 from qiskit.aqua.utils import map_label_to_class_name
 
 logger = logging.getLogger(__name__)
@@ -28,23 +31,38 @@ class _SVM_Classical_Multiclass(_SVM_Classical_ABC):
     the multiclass classifier
     the classifier is built by wrapping the estimator
     (for binary classification) with the multiclass extensions
+
+    The RBF estimators share the kernel matrix of the training points, and the data points are
+    classified in blocks of BATCH_SIZE points whose kernel block is computed once for all the estimators.
     """
 
     def __init__(self, training_dataset, test_dataset, datapoints, gamma, multiclass_classifier):
         super().__init__(training_dataset, test_dataset, datapoints, gamma)
         self.multiclass_classifier = multiclass_classifier
+        self._kernel = _RBF_Kernel(gamma)
+        estimator_cls = getattr(multiclass_classifier, 'estimator_cls', None)
+        if isinstance(estimator_cls, type) and issubclass(estimator_cls, _RBF_SVC_Estimator):
+            self.multiclass_classifier.params.append(self._kernel)
 
     def train(self, data, labels):
+        self._kernel.fit(data)
         self.multiclass_classifier.train(data, labels)
 
+    def _predict_in_blocks(self, data):
+        return np.concatenate([self.multiclass_classifier.predict(data[idx:idx + self.BATCH_SIZE])
+                               for idx in range(0, len(data), self.BATCH_SIZE)])
+
     def test(self, data, labels):
-        accuracy = self.multiclass_classifier.test(data, labels)
+        predicted_labels = self._predict_in_blocks(data)
+        diff = np.sum(predicted_labels != labels)
+        logger.debug("%d out of %d are wrong" % (diff, len(labels)))
+        accuracy = 1. - (diff * 1.0 / len(labels))
         self._ret['testing_accuracy'] = accuracy
         self._ret['test_success_ratio'] = accuracy
         return accuracy
 
     def predict(self, data):
-        predicted_labels = self.multiclass_classifier.predict(data)
+        predicted_labels = self._predict_in_blocks(data)
         self._ret['predicted_labels'] = predicted_labels
         return predicted_labels
 
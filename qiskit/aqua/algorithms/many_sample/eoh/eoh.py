@@ -53,6 +53,7 @@ class EOH(QuantumAlgorithm):
                         {'enum': [
                             'paulis',
                             'grouped_paulis',
+                            'commuting_paulis',
                             'matrix'
                         ]}
                     ]
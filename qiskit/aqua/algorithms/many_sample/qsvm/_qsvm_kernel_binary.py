@@ -39,12 +39,16 @@ class _QSVM_Kernel_Binary(_QSVM_Kernel_ABC):
                       "class directly.", DeprecationWarning)
         return self._qalgo.construct_kernel_matrix(x1_vec, x2_vec, self._qalgo.quantum_instance)
 
-    def get_predicted_confidence(self, data, return_kernel_matrix=False):
+    def get_predicted_confidence(self, data, return_kernel_matrix=False, kernel_matrix=None):
         """Get predicted confidence.
 
         Args:
             data (numpy.ndarray): NxD array, where N is the number of data,
                                   D is the feature dimension.
+            return_kernel_matrix (bool): return the kernel matrix as well
+            kernel_matrix (numpy.ndarray): the precomputed kernel matrix between data and
+                                           the support vectors, possibly a numpy.memmap;
+                                           it is constructed if None.
         Returns:
             numpy.ndarray: Nx1 array, predicted confidence
             numpy.ndarray (optional): the kernel matrix, NxN1, where N1 is
@@ -54,16 +58,23 @@ class _QSVM_Kernel_Binary(_QSVM_Kernel_ABC):
         bias = self._ret['svm']['bias']
         svms = self._ret['svm']['support_vectors']
         yin = self._ret['svm']['yin']
-        kernel_matrix = self._qalgo.construct_kernel_matrix(data, svms)
+        if kernel_matrix is None:
+            kernel_matrix = self._qalgo.construct_kernel_matrix(data, svms)
 
-        confidence = np.sum(yin * alphas * kernel_matrix, axis=1) + bias
+        # stream the rows, so that a memory-mapped kernel matrix is never loaded at once
+        weights = yin * alphas
+        confidence = np.empty(kernel_matrix.shape[0])
+        for idx in range(0, kernel_matrix.shape[0], self._qalgo.BATCH_SIZE):
+            rows = slice(idx, idx + self._qalgo.BATCH_SIZE)
+            confidence[rows] = np.asarray(kernel_matrix[rows]).dot(weights)
+        confidence += bias
 
         if return_kernel_matrix:
             return confidence, kernel_matrix
         else:
             return confidence
 
-    def train(self, data, labels):
+    def train(self, data, labels, kernel_matrix=None):
         """
         Train the svm.
 
@@ -71,9 +82,12 @@ class _QSVM_Kernel_Binary(_QSVM_Kernel_ABC):
             data (numpy.ndarray): NxD array, where N is the number of data,
                                   D is the feature dimension.
             labels (numpy.ndarray): Nx1 array, where N is the number of data
+            kernel_matrix (numpy.ndarray): the precomputed NxN kernel matrix of data,
+                                           possibly a numpy.memmap; it is constructed if None.
         """
         scaling = 1.0 if self._qalgo.quantum_instance.is_statevector else None
-        kernel_matrix = self._qalgo.construct_kernel_matrix(data)
+        if kernel_matrix is None:
+            kernel_matrix = self._qalgo.construct_kernel_matrix(data)
         labels = labels * 2 - 1  # map label from 0 --> -1 and 1 --> 1
         labels = labels.astype(np.float)
         [alpha, b, support] = optimize_svm(kernel_matrix, labels, scaling=scaling)
@@ -15,7 +15,10 @@
 # limitations under the License.
 # =============================================================================
 
+import hashlib
+import json
 import logging
+import os
 import sys
 
 import numpy as np
@@ -153,26 +156,46 @@ class QSVMKernel(QuantumAlgorithm):
             raise ValueError("x1 and x2 must be the same dimension.")
 
         q = QuantumRegister(num_qubits, 'q')
-        c = ClassicalRegister(num_qubits, 'c')
+        return QSVMKernel._combine_circuits(feature_map.construct_circuit(x1, q),
+                                            feature_map.construct_circuit(x2, q, inverse=True), q, measurement)
+
+    @staticmethod
+    def _combine_circuits(circuit1, circuit2_inverse, q, measurement):
+        c = ClassicalRegister(q.size, 'c')
         qc = QuantumCircuit(q, c)
         # write input state from sample distribution
-        qc += feature_map.construct_circuit(x1, q)
-        qc += feature_map.construct_circuit(x2, q, inverse=True)
+        qc += circuit1
+        qc += circuit2_inverse
         if measurement:
             qc.barrier(q)
             qc.measure(q, c)
         return qc
 
+    def _compute_feature_states(self, x_vec):
+        """
+        Simulate the feature map state of each data point once.
+
+        Args:
+            x_vec (numpy.ndarray): data points, 2-D array, NxD
+
+        Returns:
+            numpy.ndarray: the statevectors, 2-D complex array, Nx2^num_qubits
+        """
+        q = QuantumRegister(self.num_qubits, 'q')
+        states = np.empty((x_vec.shape[0], 2 ** self.num_qubits), dtype=complex)
+        for idx in range(0, x_vec.shape[0], QSVMKernel.BATCH_SIZE):
+            batch = x_vec[idx:idx + QSVMKernel.BATCH_SIZE]
+            circuits = self.feature_map.construct_circuits(batch, q)
+            results = self.quantum_instance.execute(circuits)
+            for k in range(len(circuits)):
+                states[idx + k] = results.get_statevector(k)
+        return states
+
     @staticmethod
-    def _compute_overlap(idx, results, is_statevector_sim, measurement_basis):
-        if is_statevector_sim:
-            temp = results.get_statevector(idx)[0]
-            #  |<0|Psi^daggar(y) x Psi(x)|0>|^2,
-            kernel_value = np.dot(temp.T.conj(), temp).real
-        else:
-            result = results.get_counts(idx)
-            kernel_value = result.get(measurement_basis, 0) / sum(result.values())
-        return kernel_value
+    def _compute_overlap(idx, results, measurement_basis):
+        # the statevector backends compute the overlaps from the feature map states instead
+        result = results.get_counts(idx)
+        return result.get(measurement_basis, 0) / sum(result.values())
 
     def construct_circuit(self, x1, x2, measurement=False):
         """
@@ -188,22 +211,122 @@ class QSVMKernel(QuantumAlgorithm):
         return QSVMKernel._construct_circuit((x1, x2), self.num_qubits,
                                              self.feature_map, measurement)
 
-    def construct_kernel_matrix(self, x1_vec, x2_vec=None, quantum_instance=None):
+    def _compute_kernel_tile(self, x1_vec, x2_vec, rows, cols, is_symmetric):
+        """
+        Compute a tile of the kernel matrix with one circuit per pair of data points.
+
+        For a symmetric kernel, only the pairs above the diagonal are computed.
+        """
+        measurement_basis = '0' * self.num_qubits
+        tile = np.ones((rows.stop - rows.start, cols.stop - cols.start))
+        to_be_computed_index = []
+        for i in range(rows.start, rows.stop):
+            for j in range(max(cols.start, i + 1) if is_symmetric else cols.start, cols.stop):
+                x1 = x1_vec[i]
+                x2 = x2_vec[j]
+                if not np.all(x1 == x2):
+                    to_be_computed_index.append((i - rows.start, j - cols.start))
+        if len(to_be_computed_index) == 0:
+            return tile
+
+        # the feature map circuits of the rows and the inverted ones of the columns are built once per tile
+        q = QuantumRegister(self.num_qubits, 'q')
+        circuits1 = self.feature_map.construct_circuits(x1_vec[rows], q)
+        circuits2_inverse = self.feature_map.construct_circuits(x2_vec[cols], q, inverse=True)
+        circuits = [QSVMKernel._combine_circuits(circuits1[i], circuits2_inverse[j], q, True)
+                    for i, j in to_be_computed_index]
+
+        results = self.quantum_instance.execute(circuits)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calculating overlap:")
+            TextProgressBar(sys.stderr)
+        matrix_elements = parallel_map(QSVMKernel._compute_overlap, range(len(circuits)),
+                                       task_args=(results, measurement_basis),
+                                       num_processes=aqua_globals.num_processes)
+
+        for idx in range(len(to_be_computed_index)):
+            i, j = to_be_computed_index[idx]
+            tile[i, j] = matrix_elements[idx]
+        return tile
+
+    @staticmethod
+    def _compute_state_overlap_tile(states1, states2_h, rows, cols, is_diagonal):
+        """
+        Compute a tile of the kernel matrix from the feature map states, |<Psi(x2)|Psi(x1)>|^2.
+
+        The diagonal of a tile on the diagonal of a symmetric kernel is set to 1.
+        """
+        tile = np.abs(states1[rows].dot(states2_h[:, cols])) ** 2
+        if is_diagonal:
+            np.fill_diagonal(tile, 1.0)
+        return tile
+
+    @staticmethod
+    def _open_kernel_file(kernel_file, x1_vec, x2_vec, is_symmetric, tile_size):
+        """
+        Open the memory-mapped kernel matrix and its tile progress, resuming a previous run if possible.
+
+        The progress of the tiles is stored next to `kernel_file` in a `.tiles.npy` file, and the
+        fingerprint of the data and of the tiling in a `.tiles.json` file.
+
+        Returns:
+            numpy.memmap: the kernel matrix, N1xN2
+            numpy.memmap: the completed tiles, a boolean flag per tile
+        """
+        base = kernel_file[:-4] if kernel_file.endswith('.npy') else kernel_file
+        tiles_file = base + '.tiles.npy'
+        meta_file = base + '.tiles.json'
+        shape = (x1_vec.shape[0], x2_vec.shape[0])
+        tiles_shape = (int(np.ceil(shape[0] / tile_size)), int(np.ceil(shape[1] / tile_size)))
+        digest = hashlib.sha1(np.ascontiguousarray(x1_vec, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(x2_vec, dtype=float).tobytes())
+        meta = {'shape': list(shape), 'tile_size': tile_size, 'symmetric': is_symmetric,
+                'data': digest.hexdigest()}
+
+        if os.path.exists(kernel_file) and os.path.exists(tiles_file) and os.path.exists(meta_file):
+            with open(meta_file) as f:
+                previous_meta = json.load(f)
+            if previous_meta == meta:
+                mat = np.lib.format.open_memmap(kernel_file, mode='r+')
+                done = np.lib.format.open_memmap(tiles_file, mode='r+')
+                logger.info("Resuming kernel matrix {}: {} of {} tiles done.".format(
+                    kernel_file, int(np.count_nonzero(done)), done.size))
+                return mat, done
+            logger.warning("Kernel matrix {} was computed for other data, recomputing it.".format(kernel_file))
+
+        mat = np.lib.format.open_memmap(kernel_file, mode='w+', dtype=float, shape=shape)
+        mat[:] = 1.0
+        mat.flush()
+        done = np.lib.format.open_memmap(tiles_file, mode='w+', dtype=bool, shape=tiles_shape)
+        done.flush()
+        with open(meta_file, 'w') as f:
+            json.dump(meta, f)
+        return mat, done
+
+    def construct_kernel_matrix(self, x1_vec, x2_vec=None, quantum_instance=None, kernel_file=None):
         """
         Construct kernel matrix, if x2_vec is None, self-innerproduct is conducted.
 
+        The kernel matrix is built tile by tile. On statevector backends, the feature map state
+        of each data point is simulated once and every tile is computed from the overlaps of the
+        states. Otherwise each tile is computed with one circuit per pair of data points.
+
+        If `kernel_file` is given, the tiles are written into a memory-mapped `.npy` file as they
+        complete, and a later call with the same data resumes from the completed tiles.
+
         Args:
             x1_vec (numpy.ndarray): data points, 2-D array, N1xD, where N1 is the number of data,
                                     D is the feature dimension
             x2_vec (numpy.ndarray): data points, 2-D array, N2xD, where N2 is the number of data,
                                     D is the feature dimension
             quantum_instance (QuantumInstance): quantum backend with all setting
+            kernel_file (str): path of the `.npy` file in which the kernel matrix is stored
         Returns:
-            numpy.ndarray: 2-D matrix, N1xN2
+            numpy.ndarray: 2-D matrix, N1xN2, a numpy.memmap if kernel_file is given
         """
         self._quantum_instance = self._quantum_instance \
             if quantum_instance is None else quantum_instance
-        from .qsvm_kernel import QSVMKernel
 
         if x2_vec is None:
             is_symmetric = True
@@ -212,53 +335,50 @@ class QSVMKernel(QuantumAlgorithm):
             is_symmetric = False
 
         is_statevector_sim = self.quantum_instance.is_statevector
-        measurement = not is_statevector_sim
-        measurement_basis = '0' * self.num_qubits
-        mat = np.ones((x1_vec.shape[0], x2_vec.shape[0]))
+        if is_statevector_sim:
+            tile_size = QSVMKernel.BATCH_SIZE
+        else:
+            # each tile is executed as one batch of at most BATCH_SIZE circuits
+            tile_size = max(1, int(np.sqrt(QSVMKernel.BATCH_SIZE)))
 
-        # get all indices
-        if is_symmetric:
-            mus, nus = np.triu_indices(x1_vec.shape[0], k=1)  # remove diagonal term
+        if kernel_file is None:
+            mat = np.ones((x1_vec.shape[0], x2_vec.shape[0]))
+            done = np.zeros((int(np.ceil(x1_vec.shape[0] / tile_size)),
+                             int(np.ceil(x2_vec.shape[0] / tile_size))), dtype=bool)
         else:
-            mus, nus = np.indices((x1_vec.shape[0], x2_vec.shape[0]))
-            mus = np.asarray(mus.flat)
-            nus = np.asarray(nus.flat)
-
-        for idx in range(0, len(mus), QSVMKernel.BATCH_SIZE):
-            to_be_computed_list = []
-            to_be_computed_index = []
-            for sub_idx in range(idx, min(idx + QSVMKernel.BATCH_SIZE, len(mus))):
-                i = mus[sub_idx]
-                j = nus[sub_idx]
-                x1 = x1_vec[i]
-                x2 = x2_vec[j]
-                if not np.all(x1 == x2):
-                    to_be_computed_list.append((x1, x2))
-                    to_be_computed_index.append((i, j))
-
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug("Building circuits:")
-                TextProgressBar(sys.stderr)
-            circuits = parallel_map(QSVMKernel._construct_circuit,
-                                    to_be_computed_list,
-                                    task_args=(self.num_qubits, self.feature_map,
-                                               measurement),
-                                    num_processes=aqua_globals.num_processes)
+            mat, done = QSVMKernel._open_kernel_file(kernel_file, x1_vec, x2_vec, is_symmetric, tile_size)
 
-            results = self.quantum_instance.execute(circuits)
+        if is_symmetric:
+            # the tiles below the diagonal are mirrored from the tiles above it
+            done[np.tril_indices(done.shape[0], k=-1, m=done.shape[1])] = True
+        if np.all(done):
+            return mat
 
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug("Calculating overlap:")
-                TextProgressBar(sys.stderr)
-            matrix_elements = parallel_map(QSVMKernel._compute_overlap, range(len(circuits)),
-                                           task_args=(results, is_statevector_sim, measurement_basis),
-                                           num_processes=aqua_globals.num_processes)
-
-            for idx in range(len(to_be_computed_index)):
-                i, j = to_be_computed_index[idx]
-                mat[i, j] = matrix_elements[idx]
-                if is_symmetric:
-                    mat[j, i] = mat[i, j]
+        if is_statevector_sim:
+            states1 = self._compute_feature_states(x1_vec)
+            states2_h = (states1 if is_symmetric else self._compute_feature_states(x2_vec)).conj().T
+
+        for tile_row, tile_col in zip(*np.nonzero(~done)):
+            rows = slice(tile_row * tile_size, min((tile_row + 1) * tile_size, x1_vec.shape[0]))
+            cols = slice(tile_col * tile_size, min((tile_col + 1) * tile_size, x2_vec.shape[0]))
+            if is_statevector_sim:
+                tile = QSVMKernel._compute_state_overlap_tile(states1, states2_h, rows, cols,
+                                                              is_symmetric and tile_row == tile_col)
+            else:
+                tile = self._compute_kernel_tile(x1_vec, x2_vec, rows, cols, is_symmetric)
+                if is_symmetric and tile_row == tile_col:
+                    upper = np.triu(tile, k=1)
+                    tile = upper + upper.T + np.eye(tile.shape[0])
+            mat[rows, cols] = tile
+            if is_symmetric and tile_row != tile_col:
+                mat[cols, rows] = tile.T
+            if kernel_file is not None:
+                # flush the tile before marking it done, so that a resumed run never skips a lost tile
+                mat.flush()
+                done[tile_row, tile_col] = True
+                done.flush()
+            else:
+                done[tile_row, tile_col] = True
 
         return mat
 
@@ -19,6 +19,7 @@ from .grover.grover import Grover
 from .iterative_qpe.iqpe import IQPE
 from .qpe.qpe import QPE
 from .amplitude_estimation.ae import AmplitudeEstimation
+from .amplitude_estimation.mlae import MaximumLikelihoodAmplitudeEstimation
 from .simon.simon import Simon
 from .deutsch_josza.dj import DeutschJozsa
 from .bernstein_vazirani.bv import BernsteinVazirani
@@ -31,6 +32,7 @@ __all__ = [
     'IQPE',
     'QPE',
     'AmplitudeEstimation',
+    'MaximumLikelihoodAmplitudeEstimation',
     'Simon',
     'DeutschJozsa',
     'BernsteinVazirani',
@@ -19,11 +19,11 @@ The Amplitude Estimation Algorithm.
 """
 
 import logging
-from collections import OrderedDict
 import numpy as np
 
-from qiskit import ClassicalRegister
-from qiskit.aqua import AquaError
+from qiskit import ClassicalRegister, QuantumRegister, QuantumCircuit
+from qiskit.providers import BaseBackend
+from qiskit.aqua import AquaError, QuantumInstance
 from qiskit.aqua import Pluggable, PluggableType, get_pluggable_class
 from qiskit.aqua.algorithms import QuantumAlgorithm
 from qiskit.aqua.circuits import PhaseEstimationCircuit
@@ -153,22 +153,81 @@ class AmplitudeEstimation(QuantumAlgorithm):
         self._circuit = pec.construct_circuit()
         return self._circuit
 
-    def _evaluate_statevector_results(self, probabilities):
-        # map measured results to estimates
-        y_probabilities = OrderedDict()
-        for i, probability in enumerate(probabilities):
-            b = "{0:b}".format(i).rjust(self._num_qubits, '0')[::-1]
-            y = int(b[:self._m], 2)
-            y_probabilities[y] = y_probabilities.get(y, 0) + probability
+    def _add_measurements(self, qc, num_eval_qubits):
+        cr = ClassicalRegister(num_eval_qubits)
+        qc.add_register(cr)
+        qc.measure([q for q in qc.qregs if q.name == 'a'][0], cr)
+        return qc
+
+    @staticmethod
+    def _reversed_bits(num_bits):
+        values = np.arange(2 ** num_bits)
+        reversed_values = np.zeros_like(values)
+        for i in range(num_bits):
+            reversed_values |= ((values >> i) & 1) << (num_bits - 1 - i)
+        return reversed_values
+
+    @staticmethod
+    def _y_probabilities(measurements, probabilities, num_eval_qubits):
+        # the inverse qft is applied without swaps, so y reads the evaluation qubit 0 as its most significant bit
+        y = AmplitudeEstimation._reversed_bits(num_eval_qubits)[measurements]
+        return np.bincount(y, weights=probabilities, minlength=2 ** num_eval_qubits)
+
+    def _evaluate_statevector_results(self, probabilities, num_eval_qubits=None):
+        num_eval_qubits = self._m if num_eval_qubits is None else num_eval_qubits
+        # the evaluation qubits are the least significant ones, the other qubits are summed out
+        eval_probabilities = np.asarray(probabilities).reshape(-1, 2 ** num_eval_qubits).sum(axis=0)
+        return self._y_probabilities(np.arange(2 ** num_eval_qubits), eval_probabilities, num_eval_qubits)
+
+    def _evaluate_count_results(self, counts, num_eval_qubits=None):
+        num_eval_qubits = self._m if num_eval_qubits is None else num_eval_qubits
+        # the evaluation register is the last classical register, i.e. the leftmost bits
+        measurements = np.array([int(state.replace(' ', '')[:num_eval_qubits], 2) for state in counts])
+        shots = np.array(list(counts.values()), dtype=float)
+        return self._y_probabilities(measurements, shots / np.sum(shots), num_eval_qubits)
+
+    @staticmethod
+    def _ideal_y_probabilities(a, num_eval_qubits):
+        # the eigenphases +/- theta of Q each contribute half of the output distribution of phase estimation
+        num_values = 2 ** num_eval_qubits
+        theta = np.arcsin(np.sqrt(np.clip(a, 0, 1))) / np.pi
+        y_probabilities = np.zeros(num_values)
+        for phase in [theta, -theta]:
+            delta = np.arange(num_values) / num_values - phase
+            denominator = num_values * np.sin(np.pi * delta)
+            exact = np.abs(denominator) < 1e-12
+            denominator[exact] = 1
+            y_probabilities += np.where(exact, 1, (np.sin(num_values * np.pi * delta) / denominator) ** 2) / 2
+        return y_probabilities
+
+    def _evaluate_y_probabilities(self, y_probabilities):
+        num_values = len(y_probabilities)
+        # y and M - y give the same estimate a = sin^2(pi * y / M)
+        folded_y = np.minimum(np.arange(num_values), num_values - np.arange(num_values))
+        a_probabilities = np.bincount(folded_y, weights=y_probabilities, minlength=num_values // 2 + 1)
+        a_values = np.power(np.sin(np.arange(num_values // 2 + 1) * np.pi / num_values), 2)
+
+        ret = {}
+        a_mask = a_probabilities > 1e-6
+        y_mask = y_probabilities > 1e-6
+        ret['a_items'] = list(zip(a_values[a_mask].tolist(), a_probabilities[a_mask].tolist()))
+        ret['y_items'] = list(zip(np.flatnonzero(y_mask).tolist(), y_probabilities[y_mask].tolist()))
 
-        a_probabilities = OrderedDict()
-        for y, probability in y_probabilities.items():
-            if y >= int(self._M / 2):
-                y = self._M - y
-            a = np.power(np.sin(y * np.pi / 2 ** self._m), 2)
-            a_probabilities[a] = a_probabilities.get(a, 0) + probability
+        # map estimated values to original range and extract probabilities
+        ret['mapped_values'] = [self.a_factory.value_to_estimation(a_item[0]) for a_item in ret['a_items']]
+        ret['values'] = [a_item[0] for a_item in ret['a_items']]
+        ret['y_values'] = [y_item[0] for y_item in ret['y_items']]
+        ret['probabilities'] = [a_item[1] for a_item in ret['a_items']]
+        ret['mapped_items'] = list(zip(ret['mapped_values'], ret['probabilities']))
 
-        return a_probabilities, y_probabilities
+        # determine most likely estimator
+        ret['estimation'] = None
+        ret['max_probability'] = 0
+        if len(ret['probabilities']) > 0:
+            i_max = int(np.argmax(ret['probabilities']))
+            ret['estimation'] = ret['mapped_values'][i_max]
+            ret['max_probability'] = ret['probabilities'][i_max]
+        return ret
 
     def _run(self):
 
@@ -185,50 +244,83 @@ class AmplitudeEstimation(QuantumAlgorithm):
             state_probabilities = np.real(state_vector.conj() * state_vector)[0]
 
             # evaluate results
-            a_probabilities, y_probabilities = self._evaluate_statevector_results(state_probabilities)
+            y_probabilities = self._evaluate_statevector_results(state_probabilities)
         else:
             # run circuit on QASM simulator
-            qc = self._circuit
-            cr = ClassicalRegister(self._m)
-            qc.add_register(cr)
-            qc.measure([q for q in qc.qregs if q.name == 'a'][0], cr)
+            self._add_measurements(self._circuit, self._m)
             ret = self._quantum_instance.execute(self._circuit)
 
             # get counts
             self._ret['counts'] = ret.get_counts()
 
-            # construct probabilities
-            y_probabilities = {}
-            a_probabilities = {}
-            shots = sum(ret.get_counts().values())
-            for state, counts in ret.get_counts().items():
-                y = int(state.replace(' ', '')[:self._m][::-1], 2)
-                p = counts / shots
-                y_probabilities[y] = p
-                a = np.power(np.sin(y * np.pi / 2 ** self._m), 2)
-                a_probabilities[a] = a_probabilities.get(a, 0.0) + p
-
-        # construct a_items and y_items
-        a_items = [(a, p) for (a, p) in a_probabilities.items() if p > 1e-6]
-        y_items = [(y, p) for (y, p) in y_probabilities.items() if p > 1e-6]
-        a_items = sorted(a_items)
-        y_items = sorted(y_items)
-        self._ret['a_items'] = a_items
-        self._ret['y_items'] = y_items
+            # evaluate results
+            y_probabilities = self._evaluate_count_results(self._ret['counts'])
 
-        # map estimated values to original range and extract probabilities
-        self._ret['mapped_values'] = [self.a_factory.value_to_estimation(a_item[0]) for a_item in self._ret['a_items']]
-        self._ret['values'] = [a_item[0] for a_item in self._ret['a_items']]
-        self._ret['y_values'] = [y_item[0] for y_item in y_items]
-        self._ret['probabilities'] = [a_item[1] for a_item in self._ret['a_items']]
-        self._ret['mapped_items'] = [(self._ret['mapped_values'][i], self._ret['probabilities'][i]) for i in range(len(self._ret['mapped_values']))]
+        self._ret.update(self._evaluate_y_probabilities(y_probabilities))
+        return self._ret
 
-        # determine most likely estimator
-        self._ret['estimation'] = None
-        self._ret['max_probability'] = 0
-        for val, prob in self._ret['mapped_items']:
-            if prob > self._ret['max_probability']:
-                self._ret['max_probability'] = prob
-                self._ret['estimation'] = val
+    def run_batch(self, num_eval_qubits, quantum_instance=None, **kwargs):
+        """
+        Run the amplitude estimation for several numbers of evaluation qubits at once.
 
-        return self._ret
+        On a statevector simulator, with the standard IQFT and the Q operator built by QFactory,
+        the outcome distribution of the phase estimation only depends on the amplitude a of the
+        objective qubit, so a single simulation of the A operator serves all the numbers of evaluation
+        qubits. Otherwise, the circuits of all the numbers of evaluation qubits are executed together;
+        the numbers of evaluation qubits other than this instance's use the standard IQFT.
+
+        Args:
+            num_eval_qubits (list[int]): the numbers of evaluation qubits
+            quantum_instance (QuantumInstance or BaseBackend): the experimental setting
+            kwargs: the configuration of the quantum instance when a backend is given
+
+        Returns:
+            list[dict]: the results for every number of evaluation qubits, in the format of `run`
+
+        Raises:
+            AquaError: if a number of evaluation qubits is smaller than 1
+        """
+        if quantum_instance is not None:
+            if isinstance(quantum_instance, BaseBackend):
+                quantum_instance = QuantumInstance(quantum_instance)
+                quantum_instance.set_config(**kwargs)
+            self._quantum_instance = quantum_instance
+        if self._quantum_instance is None:
+            raise AquaError("Quantum device or backend is needed since you are running quantum algorithm.")
+        if any(m < 1 for m in num_eval_qubits):
+            raise AquaError('The number of evaluation qubits must be at least 1.')
+
+        iqfts = [self._iqft if m == self._m else Standard(m) for m in num_eval_qubits]
+        ideal = isinstance(self.q_factory, QFactory) and all(type(iqft) is Standard for iqft in iqfts)
+        if self._quantum_instance.is_statevector and ideal:
+            a = self._simulate_amplitude()
+            y_probabilities = [self._ideal_y_probabilities(a, m) for m in num_eval_qubits]
+        else:
+            circuits = [PhaseEstimationCircuit(iqft=iqft, num_ancillae=m, state_in_circuit_factory=self.a_factory,
+                                               unitary_circuit_factory=self.q_factory).construct_circuit()
+                        for m, iqft in zip(num_eval_qubits, iqfts)]
+            if self._quantum_instance.is_statevector:
+                ret = self._quantum_instance.execute(circuits)
+                y_probabilities = [self._evaluate_statevector_results(np.abs(ret.get_statevector(qc)) ** 2, m)
+                                   for qc, m in zip(circuits, num_eval_qubits)]
+            else:
+                for qc, m in zip(circuits, num_eval_qubits):
+                    self._add_measurements(qc, m)
+                ret = self._quantum_instance.execute(circuits)
+                y_probabilities = [self._evaluate_count_results(ret.get_counts(qc), m)
+                                   for qc, m in zip(circuits, num_eval_qubits)]
+        return [self._evaluate_y_probabilities(p) for p in y_probabilities]
+
+    def _simulate_amplitude(self):
+        # probability of measuring the objective qubit in |1> after the A operator
+        q = QuantumRegister(self.a_factory.num_target_qubits, name='q')
+        qc = QuantumCircuit(q)
+        q_aux = None
+        if self.a_factory.required_ancillas() > 0:
+            q_aux = QuantumRegister(self.a_factory.required_ancillas(), name='aux')
+            qc.add_register(q_aux)
+        self.a_factory.build(qc, q, q_aux)
+        ret = self._quantum_instance.execute(qc)
+        probabilities = np.abs(ret.get_statevector(qc)) ** 2
+        i_objective = self.q_factory.i_objective
+        return np.sum(probabilities.reshape(-1, 2, 2 ** i_objective)[:, 1, :])
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+"""
+The Maximum Likelihood Amplitude Estimation Algorithm.
+"""
+
+import logging
+import numpy as np
+from scipy.optimize import minimize_scalar
+from scipy.stats import chi2, norm
+
+from qiskit import ClassicalRegister, QuantumRegister, QuantumCircuit
+from qiskit.aqua import AquaError
+from qiskit.aqua import Pluggable, PluggableType, get_pluggable_class
+from qiskit.aqua.algorithms import QuantumAlgorithm
+from .q_factory import QFactory
+
+logger = logging.getLogger(__name__)
+
+
+class MaximumLikelihoodAmplitudeEstimation(QuantumAlgorithm):
+    """
+    The Maximum Likelihood Amplitude Estimation algorithm.
+
+    Instead of a phase estimation, the circuits Q^k A|0> are run for a schedule of powers k and the
+    objective qubit is measured. With a = sin^2(theta), the objective qubit is measured in |1> with
+    probability sin^2((2k + 1) theta), and the amplitude is estimated by maximizing the likelihood of
+    the measured outcomes over theta. No evaluation qubits and no inverse QFT are needed.
+    """
+
+    CONFIGURATION = {
+        'name': 'MaximumLikelihoodAmplitudeEstimation',
+        'description': 'Maximum Likelihood Amplitude Estimation Algorithm',
+        'input_schema': {
+            '$schema': 'http://json-schema.org/schema#',
+            'id': 'MaximumLikelihoodAmplitudeEstimation_schema',
+            'type': 'object',
+            'properties': {
+                'num_oracle_circuits': {
+                    'type': ['integer', 'null'],
+                    'default': 5,
+                    'minimum': 1
+                },
+                'evaluation_schedule': {
+                    'type': ['array', 'null'],
+                    'items': {
+                        'type': 'integer',
+                        'minimum': 0
+                    },
+                    'default': None
+                },
+                'alpha': {
+                    'type': 'number',
+                    'default': 0.05,
+                    'minimum': 0,
+                    'maximum': 1
+                }
+            },
+            'additionalProperties': False
+        },
+        'problems': ['uncertainty'],
+        'depends': [
+            {
+                'pluggable_type': 'uncertainty_problem',
+                'default': {
+                    'name': 'EuropeanCallDelta'
+                }
+            },
+        ],
+    }
+
+    def __init__(self, num_oracle_circuits=5, a_factory=None, i_objective=None, q_factory=None,
+                 evaluation_schedule=None, alpha=0.05):
+        """
+        Constructor.
+
+        Args:
+            num_oracle_circuits (int): the number of circuits applying Q, with the powers 1, 2, 4, ...,
+                                       2^(num_oracle_circuits - 1), in addition to the circuit without Q;
+                                       ignored, and may be None, if evaluation_schedule is given
+            a_factory (CircuitFactory): the CircuitFactory subclass object representing the problem unitary
+            i_objective (int): index of the objective qubit, defaults to the last target qubit of A
+            q_factory (CircuitFactory): the CircuitFactory subclass object representing an amplitude
+                                        estimation sample (based on a_factory)
+            evaluation_schedule (list[int]): the powers of Q, overriding the exponential schedule
+                                             of num_oracle_circuits
+            alpha (float): the confidence level of the intervals is 1 - alpha
+
+        Raises:
+            AquaError: if a_factory is missing, if neither num_oracle_circuits nor evaluation_schedule
+                       is given, or if the evaluation schedule contains a negative power
+        """
+        self.validate(locals())
+        super().__init__()
+
+        if a_factory is None:
+            raise AquaError('The A operator factory is required.')
+        if num_oracle_circuits is None and evaluation_schedule is None:
+            raise AquaError('Either num_oracle_circuits or evaluation_schedule is required.')
+
+        # get/construct A/Q operator
+        self.a_factory = a_factory
+        if i_objective is None:
+            i_objective = self.a_factory.num_target_qubits - 1
+        self.i_objective = i_objective
+        if q_factory is None:
+            self.q_factory = QFactory(a_factory, i_objective)
+        else:
+            self.q_factory = q_factory
+
+        if evaluation_schedule is None:
+            evaluation_schedule = [0] + [2 ** j for j in range(num_oracle_circuits)]
+        evaluation_schedule = [int(k) for k in evaluation_schedule]
+        if len(evaluation_schedule) == 0 or min(evaluation_schedule) < 0:
+            raise AquaError('The powers of Q must be non-negative.')
+        self._evaluation_schedule = evaluation_schedule
+        self._alpha = alpha
+
+        self._circuits = None
+        self._good_counts = None
+        self._shots = None
+        self._ret = {}
+
+    @classmethod
+    def init_params(cls, params, algo_input):
+        """
+        Initialize via parameters dictionary and algorithm input instance
+        Args:
+            params: parameters dictionary
+            algo_input: Input instance
+        """
+        if algo_input is not None:
+            raise AquaError("Input instance not supported.")
+
+        ae_params = params.get(Pluggable.SECTION_KEY_ALGORITHM)
+        num_oracle_circuits = ae_params.get('num_oracle_circuits')
+        evaluation_schedule = ae_params.get('evaluation_schedule')
+        alpha = ae_params.get('alpha')
+
+        # Set up uncertainty problem. The params can include an uncertainty model
+        # type dependent on the uncertainty problem and is this its responsibility
+        # to create for itself from the complete params set that is passed to it.
+        uncertainty_problem_params = params.get(Pluggable.SECTION_KEY_UNCERTAINTY_PROBLEM)
+        uncertainty_problem = get_pluggable_class(
+            PluggableType.UNCERTAINTY_PROBLEM,
+            uncertainty_problem_params['name']).init_params(params)
+
+        return cls(num_oracle_circuits, uncertainty_problem, evaluation_schedule=evaluation_schedule, alpha=alpha)
+
+    @property
+    def evaluation_schedule(self):
+        """Return the powers of Q, one circuit per power."""
+        return self._evaluation_schedule
+
+    def construct_circuits(self, measurement=False):
+        """
+        Construct the circuits Q^k A|0> of the evaluation schedule.
+
+        Args:
+            measurement (bool): whether to measure the objective qubit
+
+        Returns:
+            list[QuantumCircuit]: one circuit per power of Q
+        """
+        num_ancillas = max(self.a_factory.required_ancillas(), self.q_factory.required_ancillas())
+        circuits = []
+        for power in self._evaluation_schedule:
+            q = QuantumRegister(self.a_factory.num_target_qubits, name='q')
+            qc = QuantumCircuit(q)
+            q_aux = None
+            if num_ancillas > 0:
+                q_aux = QuantumRegister(num_ancillas, name='aux')
+                qc.add_register(q_aux)
+            self.a_factory.build(qc, q, q_aux)
+            self.q_factory.build_power(qc, q, power, q_aux)
+            if measurement:
+                cr = ClassicalRegister(1)
+                qc.add_register(cr)
+                qc.measure(q[self.i_objective], cr[0])
+            circuits.append(qc)
+        self._circuits = circuits
+        return circuits
+
+    def _log_likelihood(self, theta):
+        # theta may be an array of angles, the result has one log-likelihood per angle
+        theta = np.asarray(theta, dtype=float)
+        angles = np.outer(theta, 2 * np.asarray(self._evaluation_schedule) + 1)
+        eps = 1e-15
+        p_good = np.clip(np.sin(angles) ** 2, eps, 1 - eps)
+        return np.sum(self._good_counts * np.log(p_good) +
+                      (self._shots - self._good_counts) * np.log(1 - p_good), axis=1)
+
+    def _grid(self):
+        # the likelihood oscillates with the period pi / (2 k_max + 1), which the grid resolves
+        num_points = 100 * (2 * max(self._evaluation_schedule) + 1) + 1
+        return np.linspace(0, np.pi / 2, num_points)
+
+    def _maximize_likelihood(self):
+        grid = self._grid()
+        i_max = int(np.argmax(self._log_likelihood(grid)))
+        step = grid[1] - grid[0]
+        bounds = (max(grid[i_max] - step, 0), min(grid[i_max] + step, np.pi / 2))
+        res = minimize_scalar(lambda theta: -self._log_likelihood([theta])[0], bounds=bounds, method='bounded',
+                              options={'xatol': 1e-10})
+        if res.success and -res.fun >= self._log_likelihood([grid[i_max]])[0]:
+            return float(res.x)
+        return float(grid[i_max])
+
+    def _fisher_information(self, theta):
+        # each shot of the circuit with k applications of Q contributes 4 (2k + 1)^2 for theta
+        fisher_theta = 4 * np.sum(self._shots * (2 * np.asarray(self._evaluation_schedule) + 1) ** 2)
+        # change of variable to a = sin^2(theta)
+        return fisher_theta / max(np.sin(2 * theta) ** 2, 1e-15)
+
+    def confidence_interval(self, alpha=None, kind='fisher'):
+        """
+        Compute the confidence interval of the amplitude of the last run.
+
+        Args:
+            alpha (float): the confidence level is 1 - alpha, defaults to the alpha of the constructor
+            kind (str): 'fisher' for the normal approximation with the Fisher information, or
+                        'likelihood_ratio' for the likelihood ratio interval
+
+        Returns:
+            list[float]: the lower and upper bounds of the amplitude a
+
+        Raises:
+            AquaError: if the algorithm has not been run or the kind is unknown
+        """
+        if self._good_counts is None:
+            raise AquaError('Run the algorithm before computing a confidence interval.')
+        alpha = self._alpha if alpha is None else alpha
+        theta = self._ret['theta']
+        a = np.sin(theta) ** 2
+        if kind == 'fisher':
+            half_width = norm.ppf(1 - alpha / 2) / np.sqrt(self._fisher_information(theta))
+            return [max(a - half_width, 0.0), min(a + half_width, 1.0)]
+        elif kind == 'likelihood_ratio':
+            grid = np.union1d(self._grid(), [theta])
+            log_likelihood = self._log_likelihood(grid)
+            accepted = grid[2 * (self._log_likelihood([theta])[0] - log_likelihood) <= chi2.ppf(1 - alpha, df=1)]
+            return [float(np.sin(np.min(accepted)) ** 2), float(np.sin(np.max(accepted)) ** 2)]
+        raise AquaError('Unknown confidence interval kind: {}'.format(kind))
+
+    def _run(self):
+        if self._quantum_instance.is_statevector:
+            circuits = self.construct_circuits(measurement=False)
+            ret = self._quantum_instance.execute(circuits)
+
+            # probability of the objective qubit being |1>, weighted as a single exact shot
+            good_probabilities = []
+            for qc in circuits:
+                probabilities = np.abs(ret.get_statevector(qc)) ** 2
+                good_probabilities.append(np.sum(probabilities.reshape(-1, 2, 2 ** self.i_objective)[:, 1, :]))
+            self._good_counts = np.array(good_probabilities)
+            self._shots = 1
+        else:
+            circuits = self.construct_circuits(measurement=True)
+            ret = self._quantum_instance.execute(circuits)
+
+            good_counts = []
+            for qc in circuits:
+                counts = ret.get_counts(qc)
+                good_counts.append(counts.get('1', 0))
+                self._shots = sum(counts.values())
+            self._good_counts = np.array(good_counts, dtype=float)
+
+        theta = self._maximize_likelihood()
+        a = np.sin(theta) ** 2
+        self._ret['theta'] = theta
+        self._ret['value'] = a
+        self._ret['estimation'] = self.a_factory.value_to_estimation(a)
+        self._ret['evaluation_schedule'] = self._evaluation_schedule
+        self._ret['good_counts'] = self._good_counts.tolist()
+        self._ret['shots'] = self._shots
+        if self._quantum_instance.is_statevector:
+            # the probabilities are exact, there is no sampling error
+            self._ret['confidence_interval'] = [a, a]
+        else:
+            self._ret['confidence_interval'] = self.confidence_interval()
+        self._ret['mapped_confidence_interval'] = sorted(
+            self.a_factory.value_to_estimation(bound) for bound in self._ret['confidence_interval'])
+        return self._ret
@@ -60,6 +60,17 @@ class QFactory(CircuitFactory):
         self.s_0_reflection_factory.build(qc, q, q_ancillas)
         self.a_factory.build(qc, q, q_ancillas)
 
+    @property
+    def has_closed_form_power(self):
+        # the powers of Q are in closed form if the problem declares them so
+        return getattr(self.a_factory, 'has_closed_form_q_power', False)
+
+    def build_power(self, qc, q, power, q_ancillas=None):
+        if self.has_closed_form_power:
+            self.a_factory.build_q_power(qc, q, self.i_objective, power, q_ancillas)
+        else:
+            super().build_power(qc, q, power, q_ancillas)
+
     def build_controlled(self, qc, q, q_control, q_ancillas=None, use_basis_gates=True):
         # A operators do not need to be controlled, since they cancel out in the not-controlled case
         self.s_psi_0_reflection_factory.build_controlled(qc, q, q_control, q_ancillas, use_basis_gates)
@@ -69,6 +69,8 @@ class StateVectorCircuit:
             temp = QuantumCircuit(*circuit.qregs)
             temp.initialize(self._state_vector, [register[i] for i in range(self._num_qubits)])
             temp = convert_to_basis_gates(temp)
+            # remove the reset gates terra's unroller added
+            temp.data = [g for g in temp.data if not g[0].name == 'reset']
             circuit += temp
             return circuit
 
@@ -87,5 +89,7 @@ class StateVectorCircuit:
             temp = QuantumCircuit(register)
             temp.initialize(self._state_vector, [register[i] for i in range(self._num_qubits)])
             temp = convert_to_basis_gates(temp)
+            # remove the reset gates terra's unroller added
+            temp.data = [g for g in temp.data if not g[0].name == 'reset']
             circuit += temp
             return circuit
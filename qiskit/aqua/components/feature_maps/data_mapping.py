@@ -29,11 +29,13 @@ def self_product(x):
     Define a function map from R^n to R.
 
     Args:
-        x (np.ndarray): data
+        x (np.ndarray): data, or 2-D data with one data point per row
 
     Returns:
-        double: the mapped value
+        double: the mapped value, or a 1-D array with the mapped value of each row
     """
+    if np.ndim(x) == 2:
+        return x[:, 0] if x.shape[1] == 1 else np.prod(np.pi - x, axis=1)
     coeff = x[0] if len(x) == 1 else \
         functools.reduce(lambda m, n: m * n, np.pi - x)
     return coeff
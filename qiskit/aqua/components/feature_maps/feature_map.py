@@ -60,6 +60,20 @@ class FeatureMap(Pluggable):
         """
         raise NotImplementedError()
 
+    def construct_circuits(self, x_vec, qr=None, inverse=False):
+        """Construct the circuits of many data points.
+
+        Args:
+            x_vec (numpy.ndarray[float]): 2-D array, one data point per row
+            qr (QauntumRegister): the QuantumRegister object for the circuits, if None,
+                                  generate new registers with name q.
+            inverse (bool): whether or not inverse the circuits
+
+        Returns:
+            list[QuantumCircuit]: a quantum circuit per data point.
+        """
+        return [self.construct_circuit(x, qr, inverse) for x in x_vec]
+
     @staticmethod
     def get_entangler_map(map_type, num_qubits):
         return get_entangler_map(map_type, num_qubits)
@@ -19,8 +19,6 @@ This module contains the definition of a base class for
 feature map. Several types of commonly used approaches.
 """
 
-from collections import OrderedDict
-import copy
 import itertools
 import logging
 
@@ -28,10 +26,10 @@ import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister
 from qiskit.quantum_info import Pauli
 from qiskit.qasm import pi
-from sympy.core.numbers import NaN, Float
 
-from qiskit.aqua import Operator
 from qiskit.aqua.components.feature_maps import FeatureMap, self_product
+from qiskit.aqua.utils.evolution_slice import EvolutionSlice
+from qiskit.aqua.utils.packed_paulis import PackedPaulis
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +38,10 @@ class PauliExpansion(FeatureMap):
     """
     Mapping data with the second order expansion followed by entangling gates.
     Refer to https://arxiv.org/pdf/1804.11326.pdf for details.
+
+    The gates of the map only depend on the Pauli strings, so their skeleton is compiled once by the
+    constructor. The rotation angles of a whole data matrix are computed in one vectorized call, and
+    the circuits, or their parameter vectors, are built from the skeleton without any deep copy.
     """
 
     CONFIGURATION = {
@@ -106,9 +108,10 @@ class PauliExpansion(FeatureMap):
         self._pauli_strings = self._build_subset_paulis_string(paulis)
         self._data_map_func = data_map_func
 
-        self._magic_num = np.nan
-        self._param_pos = OrderedDict()
-        self._circuit_template = self._build_circuit_template()
+        # the Paulis of a layer are evolved in the order of the list, the slice evolves the last one first
+        self._evolution_slice = EvolutionSlice(PackedPaulis.from_list(
+            [[1.0, Pauli.from_label(pauli)] for pauli in reversed(self._pauli_strings)]))
+        self._supports = [np.where(np.asarray(list(pauli[::-1])) != 'I')[0] for pauli in self._pauli_strings]
 
     def _build_subset_paulis_string(self, paulis):
         # fill out the paulis to the number of qubits
@@ -140,37 +143,89 @@ class PauliExpansion(FeatureMap):
         logger.info("Pauli terms include: {}".format(final_paulis))
         return final_paulis
 
-    def _build_circuit_template(self):
-        x = np.asarray([self._magic_num] * self._num_qubits)
-        qr = QuantumRegister(self._num_qubits, name='q')
-        qc = self.construct_circuit(x, qr)
-
-        for index in range(len(qc.data)):
-            gate_param = qc.data[index][0].params
-            param_sub_pos = []
-            for x in range(len(gate_param)):
-                if isinstance(gate_param[x], NaN):
-                    param_sub_pos.append(x)
-            if param_sub_pos != []:
-                self._param_pos[index] = param_sub_pos
-        return qc
+    def _check_data(self, x_vec):
+        if not isinstance(x_vec, np.ndarray):
+            raise TypeError("x must be numpy array.")
+        if x_vec.ndim != 2:
+            raise ValueError("x_vec must be 2-D array.")
+        if x_vec.shape[1] != self._num_qubits:
+            raise ValueError("number of qubits and data dimension must be the same.")
+
+    def compute_angles(self, x_vec):
+        """
+        Compute the rotation angles of many data points at once.
+
+        Args:
+            x_vec (numpy.ndarray): 2-D array, one data point per row
 
-    def _extract_data_for_rotation(self, pauli, x):
-        where_non_i = np.where(np.asarray(list(pauli[::-1])) != 'I')[0]
-        return x[where_non_i]
-
-    def _construct_circuit_with_template(self, x):
-        coeffs = [self._data_map_func(self._extract_data_for_rotation(pauli, x))
-                  for pauli in self._pauli_strings] * self._depth
-        qc = copy.deepcopy(self._circuit_template)
-        data_idx = 0
-        for key, value in self._param_pos.items():
-            new_param = coeffs[data_idx]
-            for pos in value:
-                qc.data[key].params[pos] = Float(2. * new_param)  # rotation angle is 2x
-            data_idx += 1
+        Returns:
+            numpy.ndarray: 2-D array, the rotation angle of every Pauli string of a layer per data point
+        """
+        if isinstance(x_vec, np.ndarray) and x_vec.size == 0:
+            # e.g. an empty batch of data points, which gives no circuits
+            return np.empty((0, len(self._pauli_strings)))
+        self._check_data(x_vec)
+        angles = np.empty((x_vec.shape[0], len(self._pauli_strings)))
+        for i, support in enumerate(self._supports):
+            if self._data_map_func is self_product:
+                angles[:, i] = self_product(x_vec[:, support])
+            else:
+                angles[:, i] = [self._data_map_func(x[support]) for x in x_vec]
+        return 2. * angles  # rotation angle is 2x
+
+    def _build(self, qc, qr, angles, inverse):
+        # the slice of the skeleton indexes the Paulis in the reversed order
+        angles = angles[::-1]
+        for _ in range(self._depth):
+            if not inverse:
+                for i in range(self._num_qubits):
+                    qc.u2(0, pi, qr[i])
+            self._evolution_slice.build(qc, qr, angles, inverse=inverse)
+            if inverse:
+                for i in range(self._num_qubits):
+                    qc.u2(0, pi, qr[i])
         return qc
 
+    def construct_circuits(self, x_vec, qr=None, inverse=False):
+        """
+        Construct the second order expansion of many data points, with all the angles computed at once.
+
+        Args:
+            x_vec (numpy.ndarray): 2-D array, one data point per row
+            qr (QauntumRegister): the QuantumRegister object for the circuits, if None,
+                                  generate new registers with name q.
+            inverse (bool): whether or not inverse the circuits
+
+        Returns:
+            list[QuantumCircuit]: a quantum circuit per data point.
+        """
+        circuits = []
+        for angles in self.compute_angles(x_vec):
+            qc = QuantumCircuit(qr if qr is not None else QuantumRegister(self._num_qubits, name='q'))
+            circuits.append(self._build(qc, qc.qregs[0], angles, inverse))
+        return circuits
+
+    def construct_parameters(self, x_vec, inverse=False):
+        """
+        Compute the parameter vectors of the circuits of many data points at once.
+
+        The parameters of all the gates of the circuit are listed in circuit order, as in
+        `circuit_signature`, so that the compiled template of the circuit structure, e.g. in a
+        `CircuitCache`, can be reused for every data point without building the circuits.
+
+        Args:
+            x_vec (numpy.ndarray): 2-D array, one data point per row
+            inverse (bool): the parameters of the inverted circuits
+
+        Returns:
+            numpy.ndarray: 2-D array, one parameter vector per data point
+        """
+        angles = self.compute_angles(x_vec)[:, ::-1]
+        hadamards = np.tile([0.0, pi], (angles.shape[0], self._num_qubits))
+        layer = self._evolution_slice.parameters(angles, inverse=inverse)
+        layer = np.hstack((layer, hadamards) if inverse else (hadamards, layer))
+        return np.tile(layer, (1, self._depth))
+
     def construct_circuit(self, x, qr=None, inverse=False):
         """
         Construct the second order expansion based on given data.
@@ -188,22 +243,4 @@ class PauliExpansion(FeatureMap):
             raise TypeError("x must be numpy array.")
         if x.ndim != 1:
             raise ValueError("x must be 1-D array.")
-        if x.shape[0] != self._num_qubits:
-            raise ValueError("number of qubits and data dimension must be the same.")
-
-        if qr is None:
-            qc = self._construct_circuit_with_template(x)
-        else:
-            qc = QuantumCircuit(qr)
-            for _ in range(self._depth):
-                for i in range(self._num_qubits):
-                    qc.u2(0, pi, qr[i])
-                for pauli in self._pauli_strings:
-                    coeff = self._data_map_func(self._extract_data_for_rotation(pauli, x))
-                    p = Pauli.from_label(pauli)
-                    qc += Operator.construct_evolution_circuit([[coeff, p]], 1, 1, qr)
-
-        if inverse:
-            qc = qc.inverse()
-
-        return qc
+        return self.construct_circuits(x.reshape(1, -1), qr, inverse)[0]
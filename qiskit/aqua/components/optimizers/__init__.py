@@ -20,6 +20,7 @@ from .adam_amsgrad import ADAM
 from .cg import CG
 from .cobyla import COBYLA
 from .l_bfgs_b import L_BFGS_B
+from .multi_start import MultiStartOptimizer
 from .nelder_mead import NELDER_MEAD
 from .p_bfgs import P_BFGS
 from .powell import POWELL
@@ -33,6 +34,7 @@ __all__ = ['Optimizer',
            'CG',
            'COBYLA',
            'L_BFGS_B',
+           'MultiStartOptimizer',
            'NELDER_MEAD',
            'P_BFGS',
            'POWELL',
@@ -199,7 +199,8 @@ class ADAM(Optimizer):
         if initial_point is None:
             initial_point = aqua_globals.random.rand(num_vars)
         if gradient_function is None:
-            gradient_function = Optimizer.wrap_function(Optimizer.gradient_num_diff, (objective_function, self._eps))
+            gradient_function = Optimizer.wrap_function(Optimizer.gradient_num_diff, (objective_function, self._eps,
+                                                                                          self._max_evals_grouped))
 
         point, value, nfev = self.minimize(objective_function, initial_point, gradient_function)
         return point, value, nfev
@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+""" Multi-start driver running any optimizer from several start points in a process pool.
+
+The pool is created from a forkserver (or spawn) context, never by forking the current process, which
+may already run threads, and is kept for the lifetime of the driver. The problem, i.e. the optimizer,
+the objective and the gradient functions, is pickled once per optimization and sent with the start
+points. A problem which can not be pickled, e.g. an objective closing over an unpicklable backend, is
+inherited instead by the workers of a pool forked for this optimization only. The remaining starts are
+cancelled through an event checked by the objective function in the workers, so that the pool
+survives the cancellation. The workers are daemonic and can not start processes of their own, so the
+parallel maps of qiskit and the BasicAer jobs run serially in them.
+
+The calls an `EvaluationRecorder` given to the objective receives in a worker are sent back with the
+result of the start and replayed in the current process.
+"""
+
+from concurrent import futures
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import weakref
+
+import numpy as np
+
+from qiskit.aqua import aqua_globals, AquaError, Pluggable, PluggableType, get_pluggable_class
+from qiskit.aqua.components.optimizers import Optimizer
+
+logger = logging.getLogger(__name__)
+
+# the cancellation event of the pool and the problem inherited by a forked pool, set in each worker
+# by the pool initializer
+_WORKER_CANCEL = None
+_WORKER_PROBLEM = None
+
+# the calls recorded in a worker during the current start, as (recorder key, arguments)
+_WORKER_RECORDS = []
+
+# the recorders created in this process, by key, which replay the calls recorded in the workers
+_RECORDERS = weakref.WeakValueDictionary()
+_RECORDER_KEYS = itertools.count()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _init_worker(cancel, problem=None):
+    global _WORKER_CANCEL, _WORKER_PROBLEM
+    _WORKER_CANCEL = cancel
+    _WORKER_PROBLEM = problem
+    _run_serially()
+
+
+def _run_serially():
+    # a daemonic worker can not start processes: the parallel maps of qiskit run in the worker, which
+    # they do when QISKIT_IN_PARALLEL is set, and the BasicAer jobs in a thread, as on the platforms
+    # without fork; a forked worker must not use the executor of its parent in any case
+    import qiskit.tools.parallel  # sets QISKIT_IN_PARALLEL to FALSE when first imported
+    os.environ['QISKIT_IN_PARALLEL'] = 'TRUE'
+    from qiskit.providers.basicaer.basicaerjob import BasicAerJob
+    if not isinstance(BasicAerJob._executor, futures.ThreadPoolExecutor):
+        BasicAerJob._executor = futures.ThreadPoolExecutor(max_workers=1)
+
+
+def _run_start(args):
+    problem, num_vars, variable_bounds, start_point = args
+    if problem is None:
+        problem = _WORKER_PROBLEM
+    elif isinstance(problem, bytes):
+        problem = pickle.loads(problem)
+    optimizer, objective_function, gradient_function = problem
+    cancel = _WORKER_CANCEL
+
+    def cancellable(function):
+        if function is None or cancel is None:
+            return function
+
+        def wrapper(x):
+            if cancel.is_set():
+                raise _Cancelled()
+            return function(x)
+        return wrapper
+
+    del _WORKER_RECORDS[:]
+    try:
+        result = optimizer.optimize(num_vars, cancellable(objective_function),
+                                    gradient_function=cancellable(gradient_function),
+                                    variable_bounds=variable_bounds, initial_point=start_point)
+    except _Cancelled:
+        result = None
+    records = list(_WORKER_RECORDS)
+    del _WORKER_RECORDS[:]
+    return result, records
+
+
+def _replay_records(records):
+    for key, args in records:
+        recorder = _RECORDERS.get(key)
+        if recorder is not None:
+            recorder.replay(args)
+
+
+def _shutdown_pool(pool, cancel):
+    # the running starts stop at their next evaluation, and the workers exit cleanly
+    cancel.set()
+    pool.close()
+    pool.join()
+
+
+class EvaluationRecorder:
+    """Relays the calls an objective function makes to a callback from the pool workers.
+
+    The recorder is given to the objective function in place of the callback. In the process which
+    created it, it calls `callback` directly. A copy of it in a worker, unpickled with the problem or
+    inherited by a forked worker, records the calls instead; they are sent back with the result of
+    the start and replayed with `replay_callback` in the current process, e.g. to number the
+    evaluations of all the starts in a single sequence.
+    """
+
+    def __init__(self, callback=None, replay_callback=None):
+        """
+        Constructor.
+
+        Args:
+            callback (callable): called with the arguments of each call made in the current process
+            replay_callback (callable): called with the arguments of each call made in a worker,
+                                        by default `callback`
+        """
+        self._callback = callback
+        self._replay_callback = replay_callback if replay_callback is not None else callback
+        self._pid = os.getpid()
+        self._key = (self._pid, next(_RECORDER_KEYS))
+        _RECORDERS[self._key] = self
+
+    def __getstate__(self):
+        # the callbacks stay in the current process, a worker only records
+        return {'_callback': None, '_replay_callback': None, '_pid': self._pid, '_key': self._key}
+
+    def __call__(self, *args):
+        if os.getpid() == self._pid:
+            if self._callback is not None:
+                self._callback(*args)
+        else:
+            _WORKER_RECORDS.append((self._key, args))
+
+    def replay(self, args):
+        """
+        Replay a call recorded in a worker.
+
+        Args:
+            args (tuple): the arguments of the call
+        """
+        if self._replay_callback is not None:
+            self._replay_callback(*args)
+
+
+class MultiStartOptimizer(Optimizer):
+    """Runs an optimizer from several start points and keeps the best result.
+
+    The first start is the supplied initial point, if any, and the other ones are drawn uniformly
+    from the variable bounds, using +/- 2*pi for the missing bounds. The support levels of the
+    gradient, bounds and initial point are those of the wrapped optimizer.
+    """
+
+    CONFIGURATION = {
+        'name': 'MULTI_START',
+        'description': 'Multi-start Optimizer',
+        'input_schema': {
+            '$schema': 'http://json-schema.org/schema#',
+            'id': 'multi_start_schema',
+            'type': 'object',
+            'properties': {
+                'optimizer': {
+                    'type': 'object',
+                    'default': {
+                        'name': 'L_BFGS_B'
+                    }
+                },
+                'num_starts': {
+                    'type': ['integer', 'null'],
+                    'minimum': 1,
+                    'default': None
+                },
+                'max_processes': {
+                    'type': ['integer', 'null'],
+                    'minimum': 1,
+                    'default': None
+                },
+                'seed': {
+                    'type': ['integer', 'null'],
+                    'default': None
+                },
+                'target_value': {
+                    'type': ['number', 'null'],
+                    'default': None
+                }
+            },
+            'additionalProperties': False
+        },
+        'support_level': {
+            'gradient': Optimizer.SupportLevel.supported,
+            'bounds': Optimizer.SupportLevel.supported,
+            'initial_point': Optimizer.SupportLevel.supported
+        },
+        'options': [],
+        'optimizer': ['global', 'parallel']
+    }
+
+    BOUNDS_THRESHOLD = 2 * np.pi
+
+    def __init__(self, optimizer, num_starts=None, max_processes=None, seed=None, target_value=None):
+        """
+        Constructor.
+
+        Args:
+            optimizer (Optimizer): the optimizer run from each start point
+            num_starts (int): the number of start points, by default one per process
+            max_processes (int): maximum number of processes of the pool, by default
+                                 aqua_globals.num_processes
+            seed (int): seed of the random start points, by default aqua_globals.random is used
+            target_value (float): the remaining starts are cancelled as soon as one start
+                                  converges to an objective value below this tolerance
+        """
+        self.validate({k: v for k, v in locals().items() if k != 'optimizer'})
+        self._optimizer = optimizer
+        super().__init__()
+        self._configuration['support_level'] = self.get_support_level()
+        self._max_processes = max_processes
+        self._num_starts = num_starts if num_starts is not None else self.num_processes
+        self._seed = seed
+        self._target_value = target_value
+        self._pool = None
+        self._pool_cancel = None
+        self._pool_finalizer = None
+
+    @classmethod
+    def init_params(cls, params):
+        """
+        Initialize with a params dictionary, the wrapped optimizer being configured by the
+        dictionary of its `optimizer` parameter.
+
+        Args:
+            params (dict): configuration dict
+
+        Returns:
+            MultiStartOptimizer: the multi-start optimizer
+        """
+        opt_params = params.get(Pluggable.SECTION_KEY_OPTIMIZER)
+        logger.debug('init_params: {}'.format(opt_params))
+        args = {k: v for k, v in opt_params.items() if k != 'name'}
+        local_params = args.pop('optimizer', None)
+        if local_params is None:
+            local_params = cls.CONFIGURATION['input_schema']['properties']['optimizer']['default']
+        if 'name' not in local_params:
+            raise AquaError('The optimizer of {} has no name.'.format(cls.CONFIGURATION['name']))
+        optimizer = get_pluggable_class(PluggableType.OPTIMIZER, local_params['name']).init_params(
+            {Pluggable.SECTION_KEY_OPTIMIZER: local_params})
+        return cls(optimizer, **args)
+
+    def __getstate__(self):
+        # the pool stays in the process which created it
+        state = self.__dict__.copy()
+        state.update({'_pool': None, '_pool_cancel': None, '_pool_finalizer': None})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def get_support_level(self):
+        """Return the support levels of the wrapped optimizer."""
+        return {'gradient': self._optimizer.gradient_support_level,
+                'bounds': self._optimizer.bounds_support_level,
+                'initial_point': self._optimizer.initial_point_support_level}
+
+    def set_max_evals_grouped(self, limit):
+        """Set the max number of evaluations grouped by the wrapped optimizer in each start."""
+        super().set_max_evals_grouped(limit)
+        self._optimizer.set_max_evals_grouped(limit)
+
+    @property
+    def optimizer(self):
+        """Return the wrapped optimizer."""
+        return self._optimizer
+
+    @property
+    def num_starts(self):
+        """Return the number of start points."""
+        return self._num_starts
+
+    @property
+    def max_processes(self):
+        """Return the maximum number of processes of the pool, None for aqua_globals.num_processes."""
+        return self._max_processes
+
+    @property
+    def num_processes(self):
+        """Return the number of processes used for the starts."""
+        num_processes = aqua_globals.num_processes
+        if self._max_processes is not None:
+            num_processes = min(num_processes, self._max_processes)
+        return max(num_processes, 1)
+
+    def start_points(self, num_vars, variable_bounds=None, initial_point=None):
+        """
+        Draw the start points.
+
+        Args:
+            num_vars (int): number of parameters to be optimized
+            variable_bounds (list[(float, float)]): list of variable bounds, None means unbounded
+            initial_point (numpy.ndarray): the first start point, drawn at random if None
+
+        Returns:
+            list[numpy.ndarray]: the `num_starts` start points
+        """
+        if variable_bounds is None:
+            variable_bounds = [(None, None)] * num_vars
+        low = [(l if l is not None else -self.BOUNDS_THRESHOLD) for (l, u) in variable_bounds]
+        high = [(u if u is not None else self.BOUNDS_THRESHOLD) for (l, u) in variable_bounds]
+        random = aqua_globals.random if self._seed is None else np.random.RandomState(self._seed)
+        points = [] if initial_point is None else [np.asarray(initial_point)]
+        while len(points) < self._num_starts:
+            points.append(random.uniform(low, high))
+        return points
+
+    def optimize(self, num_vars, objective_function, gradient_function=None, variable_bounds=None, initial_point=None):
+        """
+        Run the wrapped optimizer from every start point.
+
+        Args:
+            num_vars (int): number of parameters to be optimized
+            objective_function (callable): handle to a function that computes the objective function
+            gradient_function (callable): handle to a function that computes the gradient of the
+                                          objective function, or None if not available
+            variable_bounds (list[(float, float)]): list of variable bounds, None means unbounded
+            initial_point (numpy.ndarray[float]): the first start point
+
+        Returns:
+            point, value, nfev of the best start, with nfev summed over the completed starts
+        """
+        super().optimize(num_vars, objective_function, gradient_function, variable_bounds, initial_point)
+        if not self._optimizer.is_initial_point_supported or self._num_starts <= 1:
+            if self._num_starts > 1:
+                logger.warning('{} ignores the initial point, running a single start'.format(
+                    self._optimizer.__class__.__name__))
+            return self._optimizer.optimize(num_vars, objective_function, gradient_function=gradient_function,
+                                            variable_bounds=variable_bounds, initial_point=initial_point)
+
+        points = self.start_points(num_vars, variable_bounds, initial_point)
+        num_processes = min(self.num_processes, len(points))
+        problem = (self._optimizer, objective_function, gradient_function)
+        forked = False
+        if num_processes > 1:
+            try:
+                problem = pickle.dumps(problem, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:  # pylint: disable=broad-except
+                if 'fork' in multiprocessing.get_all_start_methods():
+                    logger.debug('Forking the workers of the starts, the problem can not be sent to '
+                                 'the pool: {}'.format(repr(e)))
+                    forked = True
+                else:
+                    logger.warning('Running the starts in the current process, the problem can not be sent '
+                                   'to the pool and processes can not be forked: {}'.format(repr(e)))
+                    num_processes = 1
+        if forked:
+            context = multiprocessing.get_context('fork')
+            cancel = context.Event()
+            pool = context.Pool(num_processes, initializer=_init_worker, initargs=(cancel, problem))
+            tasks = [(None, num_vars, variable_bounds, point) for point in points]
+            results = pool.imap_unordered(_run_start, tasks)
+        else:
+            tasks = [(problem, num_vars, variable_bounds, point) for point in points]
+            if num_processes > 1:
+                results = self._pool_results(tasks)
+                pool, cancel = self._pool, self._pool_cancel
+            else:
+                results = map(_run_start, tasks)
+
+        best = None
+        nfev = None
+        num_done = 0
+        cancelled = False
+        try:
+            for result, records in results:
+                _replay_records(records)
+                if result is None:
+                    # cancelled in a worker
+                    continue
+                num_done += 1
+                sol, opt, start_nfev = result
+                if start_nfev is not None:
+                    nfev = start_nfev if nfev is None else nfev + start_nfev
+                if best is None or opt < best[1]:
+                    best = (sol, opt)
+                if not cancelled and self._target_value is not None and opt < self._target_value:
+                    logger.debug('Cancelling {} starts after reaching {}'.format(len(tasks) - num_done, opt))
+                    if num_processes == 1:
+                        break
+                    # the workers stop at their next evaluation, their evaluations are still replayed
+                    cancelled = True
+                    cancel.set()
+        except BaseException:
+            # e.g. an error of the objective function, the other starts still running are dropped
+            if num_processes > 1 and not forked:
+                self.close()
+            raise
+        finally:
+            if forked:
+                _shutdown_pool(pool, cancel)
+        logger.debug('Completed {} of {} starts, best value {}'.format(num_done, len(tasks), best[1]))
+        return best[0], best[1], nfev
+
+    def _pool_results(self, tasks):
+        if self._pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._pool_cancel = context.Event()
+            self._pool = context.Pool(self.num_processes, initializer=_init_worker,
+                                      initargs=(self._pool_cancel,))
+            self._pool_finalizer = weakref.finalize(self, _shutdown_pool, self._pool, self._pool_cancel)
+        self._pool_cancel.clear()
+        return self._pool.imap_unordered(_run_start, tasks)
+
+    def close(self):
+        """Shut down the process pool; a new one is created by the next optimization if needed."""
+        if self._pool_finalizer is not None:
+            self._pool_finalizer()
+        self._pool = None
+        self._pool_cancel = None
+        self._pool_finalizer = None
@@ -17,6 +17,7 @@
 
 import logging
 
+import numpy as np
 from scipy.optimize import minimize
 
 from qiskit.aqua.components.optimizers import Optimizer
@@ -99,8 +100,28 @@ class NELDER_MEAD(Optimizer):
                 self._options[k] = v
         self._tol = tol
 
+    @staticmethod
+    def _initial_simplex(initial_point):
+        """The initial simplex scipy builds around the initial point."""
+        x0 = np.asarray(initial_point, dtype=float).flatten()
+        simplex = np.tile(x0, (len(x0) + 1, 1))
+        for k in range(len(x0)):
+            if simplex[k + 1, k] != 0:
+                simplex[k + 1, k] = (1 + 0.05) * simplex[k + 1, k]
+            else:
+                simplex[k + 1, k] = 0.00025
+        return simplex
+
     def optimize(self, num_vars, objective_function, gradient_function=None, variable_bounds=None, initial_point=None):
         super().optimize(num_vars, objective_function, gradient_function, variable_bounds, initial_point)
 
-        res = minimize(objective_function, initial_point, tol=self._tol, method="Nelder-Mead", options=self._options)
+        options = self._options
+        if self._max_evals_grouped > 1 and options.get('initial_simplex') is None:
+            # the vertices of the initial simplex are independent, evaluate them in groups
+            initial_simplex = NELDER_MEAD._initial_simplex(initial_point)
+            objective_function = Optimizer.prefetch_points(objective_function, list(initial_simplex),
+                                                           self._max_evals_grouped)
+            options = dict(options, initial_simplex=initial_simplex)
+
+        res = minimize(objective_function, initial_point, tol=self._tol, method="Nelder-Mead", options=options)
         return res.x, res.fun, res.nfev
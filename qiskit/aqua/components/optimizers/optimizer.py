@@ -68,9 +68,10 @@ class Optimizer(Pluggable):
             self._configuration['support_level'] = self.DEFAULT_CONFIGURATION['support_level']
         if 'options' not in self._configuration:
             self._configuration['options'] = self.DEFAULT_CONFIGURATION['options']
-        self._gradient_support_level = self._configuration['support_level']['gradient']
-        self._bounds_support_level = self._configuration['support_level']['bounds']
-        self._initial_point_support_level = self._configuration['support_level']['initial_point']
+        support_level = self.get_support_level()
+        self._gradient_support_level = support_level['gradient']
+        self._bounds_support_level = support_level['bounds']
+        self._initial_point_support_level = support_level['initial_point']
         self._options = {}
         self._max_evals_grouped = 1
 
@@ -93,6 +94,10 @@ class Optimizer(Pluggable):
         optimizer = cls(**args)
         return optimizer
 
+    def get_support_level(self):
+        """Return the support levels of the gradient, bounds and initial point, by name."""
+        return self._configuration['support_level']
+
     def set_options(self, **kwargs):
         """
         Sets or updates values in the options dictionary.
@@ -109,52 +114,104 @@ class Optimizer(Pluggable):
             self._options[name] = value
         logger.debug('options: {}'.format(self._options))
 
+    @staticmethod
+    def evaluate_points(f, points, max_evals_grouped=1):
+        """
+        Evaluate the objective function at independent points, shipping up to max_evals_grouped
+        points per call of the function, concatenated, so that they can be run as one job.
+
+        Args:
+            f (func): the objective function, which accepts concatenated points when
+                      max_evals_grouped > 1 and then returns one value per point.
+            points (list[ndarray]): the points to evaluate
+            max_evals_grouped (int): max number of points per call, None for all of them.
+        Returns:
+            ndarray: the values of the function at the points, in order
+
+        """
+        max_evals_grouped = len(points) if max_evals_grouped is None else max(1, max_evals_grouped)
+        values = []
+        for idx in range(0, len(points), max_evals_grouped):
+            chunk = points[idx:idx + max_evals_grouped]
+            if len(chunk) == 1:
+                values.append(f(chunk[0]))
+            else:
+                values.extend(np.ravel(f(np.concatenate(chunk))))  # eval the points in a chunk (order preserved)
+        return np.asarray(values, dtype=float)
+
+    @staticmethod
+    def prefetch_points(f, points, max_evals_grouped=1):
+        """
+        Evaluate points, which an optimizer is known to request next one at a time, in groups ahead.
+
+        Args:
+            f (func): the objective function
+            points (list[ndarray]): the points to evaluate ahead
+            max_evals_grouped (int): max number of points per call
+        Returns:
+            func: the objective function, answering the prefetched points from memory, once each
+
+        """
+        values = Optimizer.evaluate_points(f, points, max_evals_grouped)
+        prefetched = {np.asarray(x, dtype=float).tobytes(): value for x, value in zip(points, values)}
+
+        def prefetched_function(x):
+            value = prefetched.pop(np.asarray(x, dtype=float).tobytes(), None)
+            return f(x) if value is None else value
+        return prefetched_function
+
     @staticmethod
     def gradient_num_diff(x_center, f, epsilon, max_evals_grouped=1):
         """
         We compute the gradient with the numeric differentiation in the parallel way, around the point x_center.
+        The center point and the P shifted points are evaluated in groups of max_evals_grouped.
         Args:
             x_center (ndarray): point around which we compute the gradient
             f (func): the function of which the gradient is to be computed.
             epsilon (float): the epsilon used in the numeric differentiation.
+            max_evals_grouped (int): max number of points evaluated per call of f
         Returns:
             grad: the gradient computed
 
         """
-        forig = f(*((x_center,)))
-        grad = []
+        todos = [x_center]
         ei = np.zeros((len(x_center),), float)
-        todos = []
         for k in range(len(x_center)):
             ei[k] = 1.0
             d = epsilon * ei
             todos.append(x_center + d)
             ei[k] = 0.0
 
-        counter = 0
-        chunk = []
-        chunks = []
-        length = len(todos)
-        for i in range(length): # split all points to chunks, where each chunk has batch_size points
-            x = todos[i]
-            chunk.append(x)
-            counter+=1
-            if counter == max_evals_grouped or i == length-1: # the last one does not have to reach batch_size
-                chunks.append(chunk)
-                chunk = []
-                counter = 0
-
-        for chunk in chunks: # eval the chunks in order
-            parallel_parameters = np.concatenate(chunk)
-            todos_results = f(parallel_parameters) # eval the points in a chunk (order preserved)
-            if isinstance(todos_results,float):
-                grad.append((todos_results - forig) / epsilon)
-            else:
-                for todor in todos_results:
-                    grad.append((todor - forig) / epsilon)
+        values = Optimizer.evaluate_points(f, todos, max_evals_grouped)
+        return (values[1:] - values[0]) / epsilon
 
-        return np.array(grad)
+    @staticmethod
+    def gradient_param_shift(x_center, f, shift=np.pi / 2, max_evals_grouped=None):
+        """
+        We compute the gradient with the parameter-shift rule, around the point x_center.
+        It is exact for parameters which enter the circuit once, as the angle of a rotation
+        exp(-i theta P / 2) generated by a Pauli P, as in the RY and RYRZ variational forms.
+        All the 2P shifted points are evaluated in groups of max_evals_grouped, by default
+        in a single call of f, i.e. a single execution on the backend.
+        Args:
+            x_center (ndarray): point around which we compute the gradient
+            f (func): the function of which the gradient is to be computed.
+            shift (float): the shift of the parameters
+            max_evals_grouped (int): max number of points evaluated per call of f, None for all of them.
+        Returns:
+            grad: the gradient computed
+
+        """
+        todos = []
+        ei = np.zeros((len(x_center),), float)
+        for k in range(len(x_center)):
+            ei[k] = shift
+            todos.append(x_center + ei)
+            todos.append(x_center - ei)
+            ei[k] = 0.0
 
+        values = Optimizer.evaluate_points(f, todos, max_evals_grouped)
+        return (values[0::2] - values[1::2]) / (2 * np.sin(shift))
 
     @staticmethod
     def wrap_function(function, args):
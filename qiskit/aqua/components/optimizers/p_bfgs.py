@@ -16,13 +16,11 @@
 # =============================================================================
 
 import multiprocessing
-import platform
 import logging
 
-import numpy as np
-from scipy import optimize as sciopt
-
 from qiskit.aqua.components.optimizers import Optimizer
+from .l_bfgs_b import L_BFGS_B
+from .multi_start import MultiStartOptimizer
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +28,10 @@ logger = logging.getLogger(__name__)
 class P_BFGS(Optimizer):
     """Limited-memory BFGS algorithm. Parallel instantiations.
 
+    Runs L_BFGS_B from the initial point and from random points in bounds, one per process,
+    using MultiStartOptimizer, and keeps the best result. An objective function which can not be
+    pickled, e.g. one holding a backend, is inherited by processes forked for the optimization.
+
     Uses scipy.optimize.fmin_l_bfgs_b
     https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.fmin_l_bfgs_b.html
     """
@@ -101,51 +103,22 @@ class P_BFGS(Optimizer):
             if k in self._configuration['options']:
                 self._options[k] = v
         self._max_processes = max_processes
+        # the pool of the starts is kept for the lifetime of the optimizer
+        self._multi_start = None
 
     def optimize(self, num_vars, objective_function, gradient_function=None, variable_bounds=None, initial_point=None):
+        super().optimize(num_vars, objective_function, gradient_function, variable_bounds, initial_point)
+
         num_procs = multiprocessing.cpu_count() - 1
         num_procs = num_procs if self._max_processes is None else min(num_procs, self._max_processes)
         num_procs = num_procs if num_procs >= 0 else 0
 
-        if platform.system() == "Windows":
-            num_procs = 0
-            logger.warning("Using only current process. Multiple core use not supported in Windows")
-
-        queue = multiprocessing.Queue()
-        threshold = 2*np.pi  # bounds for additional initial points in case bounds has any None values
-        low = [(l if l is not None else -threshold) for (l, u) in variable_bounds]
-        high = [(u if u is not None else threshold) for (l, u) in variable_bounds]
-
-        def optimize_runner(_queue, _i_pt):  # Multi-process sampling
-            _sol, _opt, _nfev = self._optimize(num_vars, objective_function, gradient_function, variable_bounds, _i_pt)
-            _queue.put((_sol, _opt, _nfev))
-
-        # Start off as many other processes running the optimize (can be 0)
-        processes = []
-        for i in range(num_procs):
-            i_pt = np.random.uniform(low, high)  # Another random point in bounds
-            p = multiprocessing.Process(target=optimize_runner, args=(queue, i_pt))
-            processes.append(p)
-            p.start()
-
-        # While the one _optimize in this process below runs the other processes will be running to. This one runs
-        # with the supplied initial point. The process ones have their own random one
-        sol, opt, nfev = self._optimize(num_vars, objective_function, gradient_function, variable_bounds, initial_point)
-
-        for p in processes:
-            # For each other process we wait now for it to finish and see if it has a better result than above
-            p.join()
-            p_sol, p_opt, p_nfev = queue.get()
-            if p_opt < opt:
-                sol, opt = p_sol, p_opt
-            nfev += p_nfev
-
-        return sol, opt, nfev
-
-    def _optimize(self, num_vars, objective_function, gradient_function=None, variable_bounds=None, initial_point=None):
-        super().optimize(num_vars, objective_function, gradient_function, variable_bounds, initial_point)
-
-        approx_grad = True if gradient_function is None else False
-        sol, opt, info = sciopt.fmin_l_bfgs_b(objective_function, initial_point, bounds=variable_bounds,
-                                              fprime=gradient_function, approx_grad=approx_grad, **self._options)
-        return sol, opt, info['funcalls']
+        # The supplied initial point plus one random point in bounds for each other process
+        if self._multi_start is None or self._multi_start.num_starts != num_procs + 1:
+            if self._multi_start is not None:
+                self._multi_start.close()
+            self._multi_start = MultiStartOptimizer(L_BFGS_B(**self._options), num_starts=num_procs + 1,
+                                                    max_processes=num_procs + 1)
+        self._multi_start.set_max_evals_grouped(self._max_evals_grouped)
+        return self._multi_start.optimize(num_vars, objective_function, gradient_function, variable_bounds,
+                                          initial_point)
@@ -227,18 +227,26 @@ class SPSA(Optimizer):
         initial_c = self._parameters[1]
         delta_obj = 0
         logger.debug("Calibration...")
-        for i in range(stat):
-            if i % 5 == 0:
-                logger.debug('calibration step # {} of {}'.format(str(i), str(stat)))
-            delta = 2 * np.random.randint(2, size=np.shape(initial_theta)[0]) - 1
-            theta_plus = initial_theta + initial_c * delta
-            theta_minus = initial_theta - initial_c * delta
-            if self._max_evals_grouped > 1:
-                obj_plus, obj_minus = obj_fun(np.concatenate((theta_plus, theta_minus)))
-            else:
+        if self._max_evals_grouped > 1:
+            # the random directions are independent, evaluate all of them in groups
+            todos = []
+            for i in range(stat):
+                delta = 2 * np.random.randint(2, size=np.shape(initial_theta)[0]) - 1
+                todos.append(initial_theta + initial_c * delta)
+                todos.append(initial_theta - initial_c * delta)
+            values = Optimizer.evaluate_points(obj_fun, todos, self._max_evals_grouped)
+            for i in range(stat):
+                delta_obj += np.absolute(values[2 * i] - values[2 * i + 1]) / stat
+        else:
+            for i in range(stat):
+                if i % 5 == 0:
+                    logger.debug('calibration step # {} of {}'.format(str(i), str(stat)))
+                delta = 2 * np.random.randint(2, size=np.shape(initial_theta)[0]) - 1
+                theta_plus = initial_theta + initial_c * delta
+                theta_minus = initial_theta - initial_c * delta
                 obj_plus = obj_fun(theta_plus)
                 obj_minus = obj_fun(theta_minus)
-            delta_obj += np.absolute(obj_plus - obj_minus) / stat
+                delta_obj += np.absolute(obj_plus - obj_minus) / stat
 
         self._parameters[0] = target_update * 2 / delta_obj \
             * self._parameters[1] * (self._parameters[4] + 1)
@@ -54,3 +54,26 @@ class UncertaintyProblem(CircuitFactory, Pluggable, ABC):
 
     def value_to_estimation(self, value):
         return value
+
+    @property
+    def has_closed_form_q_power(self):
+        """ Whether the powers of the amplitude estimation operator Q of this problem can be built
+            in closed form by `build_q_power` """
+        return False
+
+    def build_q_power(self, qc, q, i_objective, power, q_ancillas=None):
+        """ Adds the power of the amplitude estimation operator Q of this problem, in closed form.
+            The circuit must implement Q^power exactly, including its global phase, since it is controlled
+            in the phase estimation.
+
+        Args:
+            qc : quantum circuit
+            q : list of qubits (has to be same length as self._num_qubits)
+            i_objective : index of the objective qubit
+            power : the power of Q
+            q_ancillas : list of ancilla qubits (or None if none needed)
+
+        Raises:
+            NotImplementedError: if the problem has no closed-form powers of Q
+        """
+        raise NotImplementedError('{} has no closed-form powers of Q.'.format(self.__class__.__name__))
@@ -113,6 +113,11 @@ class RY(VariationalForm):
         self._num_parameters += len(self._entangled_qubits) * depth
         self._bounds = [(-np.pi, np.pi)] * self._num_parameters
 
+    @property
+    def is_parameter_shift_supported(self):
+        """Every parameter is the angle of a single Y rotation."""
+        return True
+
     def construct_circuit(self, parameters, q=None):
         """
         Construct the variational form, given its parameters.
@@ -105,6 +105,15 @@ class VariationalForm(Pluggable):
     def preferred_init_points(self):
         return None
 
+    @property
+    def is_parameter_shift_supported(self):
+        """Whether the parameter-shift rule gives the exact gradient of an expectation value.
+
+        Returns:
+            True if every parameter enters the circuit once, as the angle of a rotation generated by a Pauli.
+        """
+        return False
+
     @staticmethod
     def get_entangler_map(map_type, num_qubits):
         return get_entangler_map(map_type, num_qubits)
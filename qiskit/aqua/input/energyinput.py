@@ -67,10 +67,11 @@ class EnergyInput(AlgorithmInput):
     def validate(self, args_dict):
         params = {}
         for key, value in args_dict.items():
+            # the binary form is enough for the schema and avoids a dict per pauli
             if key == EnergyInput.PROP_KEY_QUBITOP:
-                value = value.save_to_dict() if value is not None else {}
+                value = value.save_to_dict(binary=True) if value is not None else {}
             elif key == EnergyInput.PROP_KEY_AUXOPS:
-                value = [value[i].save_to_dict() for i in range(len(value))] if value is not None else None
+                value = [value[i].save_to_dict(binary=True) for i in range(len(value))] if value is not None else None
 
             params[key] = value
 
@@ -82,10 +83,20 @@ class EnergyInput(AlgorithmInput):
     def has_aux_ops(self):
         return len(self._aux_ops) > 0
 
-    def to_params(self):
+    def to_params(self, binary=False):
+        """
+        Save the input to a dictionary of parameters.
+
+        Args:
+            binary (bool): save the operators in the base64-encoded binary format of `Operator.save_to_dict`
+
+        Returns:
+            dict: the parameters, which `from_params` loads in either format
+        """
         params = {}
-        params[EnergyInput.PROP_KEY_QUBITOP] = self._qubit_op.save_to_dict()
-        params[EnergyInput.PROP_KEY_AUXOPS] = [self._aux_ops[i].save_to_dict() for i in range(len(self._aux_ops))]
+        params[EnergyInput.PROP_KEY_QUBITOP] = self._qubit_op.save_to_dict(binary=binary)
+        params[EnergyInput.PROP_KEY_AUXOPS] = [self._aux_ops[i].save_to_dict(binary=binary)
+                                               for i in range(len(self._aux_ops))]
         return params
 
     @classmethod
@@ -94,6 +105,7 @@ class EnergyInput(AlgorithmInput):
             raise AquaError("Qubit operator is required.")
         qparams = params[EnergyInput.PROP_KEY_QUBITOP]
         qubit_op = Operator.load_from_dict(qparams)
+        aux_ops = None
         if EnergyInput.PROP_KEY_AUXOPS in params:
             auxparams = params[EnergyInput.PROP_KEY_AUXOPS]
             aux_ops = [Operator.load_from_dict(auxparams[i]) for i in range(len(auxparams))]
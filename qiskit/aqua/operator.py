@@ -15,26 +15,28 @@
 # limitations under the License.
 # =============================================================================
 
+import base64
 import copy
-import itertools
-from functools import reduce
 import logging
 import json
 from operator import iadd as op_iadd, isub as op_isub
-import sys
 
 import numpy as np
 from scipy import sparse as scisparse
-from scipy import linalg as scila
+from scipy.sparse.linalg import expm_multiply
 from qiskit import ClassicalRegister, QuantumCircuit
 from qiskit.quantum_info import Pauli
-from qiskit.qasm import pi
 from qiskit.compiler.run_config import RunConfig
-from qiskit.tools import parallel_map
-from qiskit.tools.events import TextProgressBar
 
-from qiskit.aqua import AquaError, aqua_globals
+from qiskit.aqua import AquaError
 from qiskit.aqua.utils import PauliGraph, compile_and_run_circuits, find_regs_by_name
+from qiskit.aqua.utils.packed_paulis import (PackedPaulis, pack_bits, counts_to_outcomes, parity_signs,
+                                             expectations_and_covariance, pauli_expectations,
+                                             apply_pauli_exponentials, is_packed_paulis_file,
+                                             pauli_linear_operator, pauli_trace)
+from qiskit.aqua.utils.diagonal_ising import DiagonalIsing
+from qiskit.aqua.utils.commuting_paulis import get_commuting_sets
+from qiskit.aqua.utils.evolution_slice import get_evolution_slice
 from qiskit.aqua.utils.backend_utils import is_statevector_backend
 
 logger = logging.getLogger(__name__)
@@ -48,6 +50,11 @@ class Operator(object):
     Note:
         For grouped paulis representation, all operations will always convert it to paulis and then convert it back.
         (It might be a performance issue.)
+
+        The paulis representation is stored packed (a coefficient vector plus bit-packed Z and X matrices),
+        so that addition, multiplication, simplification, chopping and scaling run vectorized. The
+        list of [coeff, Pauli] pairs is only built when `paulis` is accessed; from then on the list is the
+        authoritative copy until the next packed operation.
     """
 
     def __init__(self, paulis=None, grouped_paulis=None, matrix=None, coloring="largest-degree"):
@@ -56,8 +63,14 @@ class Operator(object):
             paulis ([[float, Pauli]]): each list contains a coefficient (real number) and a corresponding Pauli class object.
             grouped_paulis ([[[float, Pauli]]]): each list of list contains a grouped paulis.
             matrix (numpy.ndarray or scipy.sparse.csr_matrix) : a 2-D sparse matrix represents operator (using CSR format internally)
-            coloring (bool): method to group paulis.
-        """
+            coloring (str): method to group paulis, one of 'largest-degree', 'dsatur', 'independent-set' and
+                            'sorted-insertion', or None for the original grouping.
+        """
+        self._pauli_list = None
+        self._packed_paulis = None
+        # the packed form of the list view, and the quadratic form of the paulis, kept until the paulis change
+        self._packed_pauli_list = None
+        self._diagonal_ising = None
         self._paulis = paulis
         self._coloring = coloring
         self._grouped_paulis = grouped_paulis
@@ -71,6 +84,7 @@ class Operator(object):
         # use for fast lookup whether or not the paulis is existed.
         self._simplify_paulis()
         self._summarize_circuits = False
+        self._commuting_sets = None
 
     def _extend_or_combine(self, rhs, mode, operation=op_iadd):
         """
@@ -92,21 +106,14 @@ class Operator(object):
         elif mode == 'non-inplace':
             lhs = copy.deepcopy(self)
 
-        if lhs._paulis is not None and rhs._paulis is not None:
-            for pauli in rhs._paulis:
-                pauli_label = pauli[1].to_label()
-                idx = lhs._paulis_table.get(pauli_label, None)
-                if idx is not None:
-                    lhs._paulis[idx][0] = operation(lhs._paulis[idx][0], pauli[0])
-                else:
-                    lhs._paulis_table[pauli_label] = len(lhs._paulis)
-                    pauli[0] = operation(0.0, pauli[0])
-                    lhs._paulis.append(pauli)
+        if lhs._has_paulis() and rhs._has_paulis():
+            lhs._get_packed_paulis(inplace=True).add(rhs._get_packed_paulis(), subtract=operation is op_isub)
         elif lhs._grouped_paulis is not None and rhs._grouped_paulis is not None:
-            lhs._grouped_paulis_to_paulis()
-            rhs._grouped_paulis_to_paulis()
-            lhs = operation(lhs, rhs)
-            lhs._paulis_to_grouped_paulis()
+            # the terms of rhs are inserted into the existing groups of lhs, without regrouping
+            sign = -1.0 if operation is op_isub else 1.0
+            rhs_paulis = [[sign * coeff, pauli] for group in rhs._grouped_paulis for coeff, pauli in group[1:]]
+            lhs._grouped_paulis = PauliGraph.add_to_grouped_paulis(lhs._grouped_paulis, rhs_paulis)
+            lhs._matrix = None
         elif lhs._matrix is not None and rhs._matrix is not None:
             lhs._matrix = operation(lhs._matrix, rhs._matrix)
         else:
@@ -172,9 +179,9 @@ class Operator(object):
         curr_repr = ""
         length = ""
         group = None
-        if self._paulis is not None:
+        if self._has_paulis():
             curr_repr = 'paulis'
-            length = len(self._paulis)
+            length = len(self._get_packed_paulis() if self._pauli_list is None else self._pauli_list)
         elif self._grouped_paulis is not None:
             curr_repr = 'grouped_paulis'
             group = len(self._grouped_paulis)
@@ -212,12 +219,8 @@ class Operator(object):
                 new_coeff = temp_real + 1j * temp_imag
                 return new_coeff
 
-        if self._paulis is not None:
-            for i in range(len(self._paulis)):
-                self._paulis[i][0] = chop_real_imag(self._paulis[i][0], threshold)
-            paulis = [x for x in self._paulis if x[0] != 0.0]
-            self._paulis = paulis
-            self._paulis_table = {pauli[1].to_label(): i for i, pauli in enumerate(self._paulis)}
+        if self._has_paulis():
+            self._get_packed_paulis(inplace=True).chop(threshold)
             if self._dia_matrix is not None:
                 self._to_dia_matrix('paulis')
 
@@ -248,20 +251,8 @@ class Operator(object):
 
         Usually used in construction.
         """
-        if self._paulis is not None:
-            new_paulis = []
-            new_paulis_table = {}
-            for curr_paulis in self._paulis:
-                pauli_label = curr_paulis[1].to_label()
-                new_idx = new_paulis_table.get(pauli_label, None)
-                if new_idx is not None:
-                    new_paulis[new_idx][0] += curr_paulis[0]
-                else:
-                    new_paulis_table[pauli_label] = len(new_paulis)
-                    new_paulis.append(curr_paulis)
-
-            self._paulis = new_paulis
-            self._paulis_table = new_paulis_table
+        if self._has_paulis():
+            self._get_packed_paulis(inplace=True).simplify()
 
         elif self._grouped_paulis is not None:
             self._grouped_paulis_to_paulis()
@@ -278,15 +269,10 @@ class Operator(object):
         Raises:
             TypeError, if two Operators do not have the same representations.
         """
-        if self._paulis is not None and rhs._paulis is not None:
+        if self._has_paulis() and rhs._has_paulis():
             ret_pauli = Operator(paulis=[])
-            for existed_pauli in self._paulis:
-                for pauli in rhs._paulis:
-                    basis, sign = Pauli.sgn_prod(existed_pauli[1], pauli[1])
-                    coeff = existed_pauli[0] * pauli[0] * sign
-                    if abs(coeff) > 1e-15:
-                        pauli_term = [coeff, basis]
-                        ret_pauli += Operator(paulis=[pauli_term])
+            ret_pauli._packed_paulis = self._get_packed_paulis().multiply(rhs._get_packed_paulis(), threshold=1e-15)
+            ret_pauli._pauli_list = None
             return ret_pauli
 
         elif self._grouped_paulis is not None and rhs._grouped_paulis is not None:
@@ -304,6 +290,108 @@ class Operator(object):
             raise TypeError("the representations of two Operators should be the same. ({}, {})".format(
                 self.representations, rhs.representations))
 
+    @property
+    def _paulis(self):
+        """
+        The list view of the paulis representation, materialized from the packed storage on first access.
+        Materializing hands the ownership of the terms to the list, so in-place edits of the list are kept.
+        """
+        if self._pauli_list is None and self._packed_paulis is not None:
+            self._pauli_list = self._packed_paulis.to_list()
+            self._packed_pauli_list = (self._pauli_list_key(), self._packed_paulis)
+            self._packed_paulis = None
+        return self._pauli_list
+
+    @_paulis.setter
+    def _paulis(self, paulis):
+        self._pauli_list = paulis
+        self._packed_paulis = None
+        self._packed_pauli_list = None
+
+    def _pauli_list_key(self):
+        # the coefficient and the identity of every term; the Pauli objects are kept alive by the key
+        return [(coeff, pauli) for coeff, pauli in self._pauli_list]
+
+    def _is_pauli_list_key(self, key):
+        return len(key) == len(self._pauli_list) and \
+            all(coeff == key_coeff and pauli is key_pauli
+                for (coeff, pauli), (key_coeff, key_pauli) in zip(self._pauli_list, key))
+
+    def _has_paulis(self):
+        """Whether the paulis representation is available, without materializing the list."""
+        return self._pauli_list is not None or self._packed_paulis is not None
+
+    def _get_packed_paulis(self, inplace=False):
+        """
+        Get the packed paulis representation.
+
+        Args:
+            inplace (bool): the caller is going to modify the packed terms; the list view, if any,
+                            is dropped and the packed storage becomes the authoritative copy.
+
+        Returns:
+            PackedPaulis: the packed paulis, or None if the paulis representation is not available.
+        """
+        if self._packed_paulis is not None:
+            return self._packed_paulis
+        if self._pauli_list is None:
+            return None
+        # the list view is only packed again when its terms changed
+        if self._packed_pauli_list is not None and self._is_pauli_list_key(self._packed_pauli_list[0]):
+            packed_paulis = self._packed_pauli_list[1]
+        else:
+            packed_paulis = PackedPaulis.from_list(self._pauli_list)
+            self._packed_pauli_list = (self._pauli_list_key(), packed_paulis)
+        if inplace:
+            self._packed_paulis = packed_paulis
+            self._pauli_list = None
+            self._packed_pauli_list = None
+        return packed_paulis
+
+    def _get_commuting_sets(self):
+        """
+        Get the commuting sets of the paulis, with their diagonalization circuits, for the
+        commuting_paulis mode. The sets are kept until the paulis change.
+
+        Returns:
+            list[CommutingSet]: the commuting sets
+        """
+        packed_paulis = self._get_packed_paulis()
+        key = (packed_paulis.num_qubits, packed_paulis.z.tobytes(), packed_paulis.x.tobytes())
+        if self._commuting_sets is None or self._commuting_sets[0] != key:
+            self._commuting_sets = (key, get_commuting_sets(packed_paulis))
+        return self._commuting_sets[1]
+
+    def _get_diagonal_ising(self):
+        """
+        Get the diagonal engine of the paulis representation. The engine is kept until the paulis change.
+
+        Returns:
+            DiagonalIsing: the quadratic form of the paulis, or None if the paulis representation is not
+                           available, is empty or has X or Y factors.
+        """
+        packed_paulis = self._get_packed_paulis()
+        if packed_paulis is None or len(packed_paulis) == 0 or not packed_paulis.is_diagonal():
+            return None
+        key = (packed_paulis.num_qubits, packed_paulis.z.tobytes(), packed_paulis.coeffs.tobytes())
+        if self._diagonal_ising is None or self._diagonal_ising[0] != key:
+            self._diagonal_ising = (key, DiagonalIsing.from_packed_paulis(packed_paulis))
+        return self._diagonal_ising[1]
+
+    @staticmethod
+    def from_diagonal_ising(diagonal_ising, threshold=0.0):
+        """
+        Build the operator of a diagonal quadratic form in one step, without creating a Pauli object per term.
+
+        Args:
+            diagonal_ising (DiagonalIsing): the diagonal operator
+            threshold (float): the terms whose coefficient is not larger than threshold in magnitude are left out
+
+        Returns:
+            Operator: the Z and I paulis of the quadratic form
+        """
+        return Operator._from_packed_paulis(diagonal_ising.to_packed_paulis(threshold))
+
     @property
     def coloring(self):
         """Getter of method of grouping paulis"""
@@ -344,19 +432,9 @@ class Operator(object):
                 dia_matrix = None
             self._dia_matrix = dia_matrix
 
-        elif mode == 'paulis' and self._paulis is not None:
-            if self._paulis == []:
-                self._dia_matrix = None
-            else:
-                valid_dia_matrix_flag = True
-                dia_matrix = 0.0
-                for idx in range(len(self._paulis)):
-                    coeff, pauli = self._paulis[idx][0], self._paulis[idx][1]
-                    if not (np.all(np.logical_not(pauli.x))):
-                        valid_dia_matrix_flag = False
-                        break
-                    dia_matrix += coeff * pauli.to_spmatrix().diagonal()
-                self._dia_matrix = dia_matrix.copy() if valid_dia_matrix_flag else None
+        elif mode == 'paulis' and self._has_paulis():
+            diagonal_ising = self._get_diagonal_ising()
+            self._dia_matrix = diagonal_ising.diagonal() if diagonal_ising is not None else None
 
         elif mode == 'grouped_paulis' and self._grouped_paulis is not None:
             self._grouped_paulis_to_paulis()
@@ -395,7 +473,7 @@ class Operator(object):
             list: available representations ([str])
         """
         ret = []
-        if self._paulis is not None:
+        if self._has_paulis():
             ret.append("paulis")
         if self._grouped_paulis is not None:
             ret.append("grouped_paulis")
@@ -412,9 +490,11 @@ class Operator(object):
             int: number of qubits
 
         """
-        if self._paulis is not None:
-            if self._paulis != []:
-                return len(self._paulis[0][1])
+        if self._packed_paulis is not None:
+            return self._packed_paulis.num_qubits if len(self._packed_paulis) > 0 else 0
+        elif self._pauli_list is not None:
+            if self._pauli_list != []:
+                return len(self._pauli_list[0][1])
             else:
                 return 0
         elif self._grouped_paulis is not None and self._grouped_paulis != []:
@@ -423,31 +503,52 @@ class Operator(object):
             return int(np.log2(self._matrix.shape[0]))
 
     @staticmethod
-    def load_from_file(file_name, before_04=False):
+    def load_from_file(file_name, before_04=False, mmap=True):
         """
         Load paulis in a file to construct an Operator.
 
         Args:
-            file_name (str): path to the file, which contains a list of Paulis and coefficients.
+            file_name (str): path to the file, which contains a list of Paulis and coefficients,
+                             either in JSON or in the binary format of `save_to_file`.
             before_04 (bool): support the format < 0.4.
+            mmap (bool): memory-map the arrays of an uncompressed binary file instead of reading them.
 
         Returns:
             Operator class: the loaded operator.
         """
+        if is_packed_paulis_file(file_name):
+            return Operator._from_packed_paulis(PackedPaulis.load(file_name, mmap=mmap))
         with open(file_name, 'r') as file:
             return Operator.load_from_dict(json.load(file), before_04=before_04)
 
-    def save_to_file(self, file_name):
+    def save_to_file(self, file_name, binary=False, compress=False):
         """
         Save operator to a file in pauli representation.
 
+        The binary format holds the packed Z and X bits and the coefficients of the paulis after a
+        small header; it is loaded without parsing, and the Pauli objects are only built if the
+        paulis of the loaded operator are accessed.
+
         Args:
             file_name (str): path to the file
+            binary (bool): save in the binary format instead of JSON
+            compress (bool): compress the binary format with zlib; compressed files can not be memory-mapped
 
         """
+        if binary:
+            self._check_representation("paulis")
+            self._get_packed_paulis().save(file_name, compress=compress)
+            return
         with open(file_name, 'w') as f:
             json.dump(self.save_to_dict(), f)
 
+    @staticmethod
+    def _from_packed_paulis(packed_paulis):
+        operator = Operator(paulis=[])
+        operator._packed_paulis = packed_paulis
+        operator._pauli_list = None
+        return operator
+
     @staticmethod
     def load_from_dict(dictionary, before_04=False):
         """
@@ -463,6 +564,8 @@ class Operator(object):
                     ... \
                 ] \
             } \
+        or, as saved by `save_to_dict` with binary=True, the base64-encoded binary format: \
+           {'packed_paulis': 'QVFQUAEA...'}
 
         Args:
             dictionary (dict): dictionary, which contains a list of Paulis and coefficients.
@@ -471,10 +574,14 @@ class Operator(object):
         Returns:
             Operator: the loaded operator.
         """
+        if 'packed_paulis' in dictionary:
+            return Operator._from_packed_paulis(PackedPaulis.from_bytes(base64.b64decode(dictionary['packed_paulis'])))
+
         if 'paulis' not in dictionary:
             raise AquaError('Dictionary missing "paulis" key')
 
-        paulis = []
+        labels = []
+        coeffs = []
         for op in dictionary['paulis']:
             if 'label' not in op:
                 raise AquaError('Dictionary missing "label" key')
@@ -491,19 +598,29 @@ class Operator(object):
             if 'imag' in pauli_coeff:
                 coeff = complex(pauli_coeff['real'], pauli_coeff['imag'])
 
-            pauli_label = pauli_label[::-1] if before_04 else pauli_label
-            paulis.append([coeff, Pauli.from_label(pauli_label)])
+            labels.append(pauli_label[::-1] if before_04 else pauli_label)
+            coeffs.append(coeff)
 
-        return Operator(paulis=paulis)
+        # the labels are packed at once, the Pauli objects are only built if the paulis are accessed
+        operator = Operator._from_packed_paulis(PackedPaulis.from_labels(labels, coeffs))
+        operator._simplify_paulis()
+        return operator
 
-    def save_to_dict(self):
+    def save_to_dict(self, binary=False):
         """
         Save operator to a dict in pauli representation.
 
+        Args:
+            binary (bool): save the paulis in the base64-encoded binary format of `save_to_file`,
+                           under the 'packed_paulis' key, instead of one dict per pauli.
+
         Returns:
             dict: a dictionary contains an operator with pauli representation.
         """
         self._check_representation("paulis")
+        if binary:
+            return {"packed_paulis": base64.b64encode(self._get_packed_paulis().to_bytes()).decode('ascii')}
+
         ret_dict = {"paulis": []}
         for pauli in self._paulis:
             op = {"label": pauli[1].to_label()}
@@ -561,8 +678,13 @@ class Operator(object):
         """
         Construct the circuits for evaluation.
 
+        In the commuting_paulis mode, the paulis are partitioned into sets of commuting paulis, and each set
+        is measured by a single circuit, which maps the paulis of the set to Z-type paulis with a Clifford
+        circuit before the measurement.
+
         Args:
-            operator_mode (str): representation of operator, including paulis, grouped_paulis and matrix
+            operator_mode (str): representation of operator, including paulis, grouped_paulis, commuting_paulis
+                                 and matrix
             input_circuit (QuantumCircuit): the quantum circuit.
             backend (BaseBackend): backend selection for quantum machine.
             use_simulator_operator_mode (bool): if aer_provider is used, we can do faster
@@ -575,25 +697,9 @@ class Operator(object):
             if operator_mode == 'matrix':
                 circuits = [input_circuit]
             else:
+                # the paulis are applied to the simulated statevector directly, see `evaluate_with_result`
                 self._check_representation("paulis")
-                if use_simulator_operator_mode:
-                    circuits = [input_circuit]
-                else:
-                    n_qubits = self.num_qubits
-                    q = find_regs_by_name(input_circuit, 'q')
-                    circuits = [input_circuit]
-                    for idx, pauli in enumerate(self._paulis):
-                        circuit = QuantumCircuit() + input_circuit
-                        if np.all(np.logical_not(pauli[1].z)) and np.all(np.logical_not(pauli[1].x)):  # all I
-                            continue
-                        for qubit_idx in range(n_qubits):
-                            if not pauli[1].z[qubit_idx] and pauli[1].x[qubit_idx]:
-                                circuit.u3(np.pi, 0.0, np.pi, q[qubit_idx])  # x
-                            elif pauli[1].z[qubit_idx] and not pauli[1].x[qubit_idx]:
-                                circuit.u1(np.pi, q[qubit_idx])  # z
-                            elif pauli[1].z[qubit_idx] and pauli[1].x[qubit_idx]:
-                                circuit.u3(np.pi, np.pi/2, np.pi/2, q[qubit_idx])  # y
-                        circuits.append(circuit)
+                circuits = [input_circuit]
         else:
             if operator_mode == 'matrix':
                 raise AquaError("matrix mode can not be used with non-statevector simulator.")
@@ -610,6 +716,15 @@ class Operator(object):
             if operator_mode == "paulis":
                 self._check_representation("paulis")
 
+                if self._get_diagonal_ising() is not None:
+                    # all the Z and I paulis are measured at once in the computational basis
+                    circuit = QuantumCircuit() + base_circuit
+                    q = find_regs_by_name(circuit, 'q')
+                    c = find_regs_by_name(circuit, 'c', qreg=False)
+                    circuit.barrier(q)
+                    circuit.measure(q, c)
+                    return [circuit]
+
                 for idx, pauli in enumerate(self._paulis):
                     circuit = QuantumCircuit() + base_circuit
                     q = find_regs_by_name(circuit, 'q')
@@ -626,6 +741,17 @@ class Operator(object):
                     circuit.barrier(q)
                     circuit.measure(q, c)
                     circuits.append(circuit)
+            elif operator_mode == "commuting_paulis":
+                self._check_representation("paulis")
+
+                for commuting_set in self._get_commuting_sets():
+                    circuit = QuantumCircuit() + base_circuit
+                    q = find_regs_by_name(circuit, 'q')
+                    c = find_regs_by_name(circuit, 'c', qreg=False)
+                    commuting_set.build(circuit, q)
+                    circuit.barrier(q)
+                    circuit.measure(q, c)
+                    circuits.append(circuit)
             else:
                 self._check_representation("grouped_paulis")
 
@@ -652,7 +778,8 @@ class Operator(object):
         Use the executed result with operator to get the evaluated value.
 
         Args:
-            operator_mode (str): representation of operator, including paulis, grouped_paulis and matrix
+            operator_mode (str): representation of operator, including paulis, grouped_paulis, commuting_paulis
+                                 and matrix
             circuits (list of qiskit.QuantumCircuit): the quantum circuits.
             backend (str): backend selection for quantum machine.
             result (qiskit.Result): the result from the backend.
@@ -680,77 +807,86 @@ class Operator(object):
                     avg = temp[0] + 1j * temp[1]
                 else:
                     quantum_state = np.asarray(result.get_statevector(circuits[0]))
-                    circuit_idx = 1
-                    for idx, pauli in enumerate(self._paulis):
-                        if np.all(np.logical_not(pauli[1].z)) and np.all(np.logical_not(pauli[1].x)):
-                            avg += pauli[0]
-                        else:
-                            quantum_state_i = np.asarray(result.get_statevector(circuits[circuit_idx]))
-                            avg += pauli[0] * (np.vdot(quantum_state, quantum_state_i))
-                            circuit_idx += 1
+                    avg = self._eval_paulis_on_statevector(quantum_state)
         else:
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug("Computing the expectation from measurement results:")
-                TextProgressBar(sys.stderr)
             num_shots = sum(list(result.get_counts(circuits[0]).values()))
+            num_qubits = self.num_qubits
             if operator_mode == "paulis":
                 self._check_representation("paulis")
-                results = parallel_map(Operator._routine_paulis_with_shots,
-                                       [(pauli, result.get_counts(circuits[idx]))
-                                        for idx, pauli in enumerate(self._paulis)],
-                                       num_processes=aqua_globals.num_processes)
-                for result in results:
-                    avg += result[0]
-                    variance += result[1]
+                diagonal_ising = self._get_diagonal_ising()
+                if diagonal_ising is not None:
+                    avg, variance = diagonal_ising.evaluate_counts(result.get_counts(circuits[0]))
+                    return avg, np.sqrt(variance / num_shots)
+                packed_paulis = self._get_packed_paulis()
+                masks = packed_paulis.z | packed_paulis.x
+                for idx, coeff in enumerate(packed_paulis.coeffs):
+                    outcomes, weights = counts_to_outcomes(result.get_counts(circuits[idx]), num_qubits)
+                    pauli_avg, pauli_cov = expectations_and_covariance(outcomes, weights, masks[idx:idx + 1])
+                    avg += coeff * pauli_avg[0]
+                    variance += (coeff ** 2) * pauli_cov[0, 0]
+            elif operator_mode == "commuting_paulis":
+                self._check_representation("paulis")
+                coeffs = self._get_packed_paulis().coeffs
+                for set_idx, commuting_set in enumerate(self._get_commuting_sets()):
+                    set_avg, set_variance = commuting_set.evaluate_counts(result.get_counts(circuits[set_idx]),
+                                                                          coeffs[commuting_set.indices])
+                    avg += set_avg
+                    variance += set_variance
             else:
                 self._check_representation("grouped_paulis")
-                results = parallel_map(Operator._routine_grouped_paulis_with_shots,
-                                       [(tpb_set, result.get_counts(circuits[tpb_idx]))
-                                        for tpb_idx, tpb_set in enumerate(self._grouped_paulis)],
-                                       num_processes=aqua_globals.num_processes)
-                for result in results:
-                    avg += result[0]
-                    variance += result[1]
+                for tpb_idx, tpb_set in enumerate(self._grouped_paulis):
+                    tpb_avg, tpb_variance = Operator._evaluate_tpb_set_with_counts(
+                        tpb_set, result.get_counts(circuits[tpb_idx]), num_qubits)
+                    avg += tpb_avg
+                    variance += tpb_variance
 
             std_dev = np.sqrt(variance / num_shots)
 
         return avg, std_dev
 
     @staticmethod
-    def _routine_grouped_paulis_with_shots(args):
-        tpb_set, measured_results = args
-        avg_paulis = []
-        avg = 0.0
-        variance = 0.0
-        for pauli_idx, pauli in enumerate(tpb_set):
-            if pauli_idx == 0:
-                continue
-            observable = Operator._measure_pauli_z(measured_results, pauli[1])
-            avg_paulis.append(observable)
-            avg += pauli[0] * observable
-
-        # Compute the covariance matrix elements of tpb_set
-        # and add up to the total standard deviation
-        # tpb_set = grouped_paulis, tensor product basis set
-        for pauli_1_idx, pauli_1 in enumerate(tpb_set):
-            for pauli_2_idx, pauli_2 in enumerate(tpb_set):
-                if pauli_1_idx == 0 or pauli_2_idx == 0:
-                    continue
-                variance += pauli_1[0] * pauli_2[0] * \
-                    Operator._covariance(measured_results, pauli_1[1], pauli_2[1],
-                                         avg_paulis[pauli_1_idx-1], avg_paulis[pauli_2_idx-1])
-        return avg, variance
+    def _evaluate_tpb_set_with_counts(tpb_set, measured_results, num_qubits):
+        """
+        Compute the contribution of a tensor product basis set to the mean and the variance.
+        The counts are decoded once and all the Paulis of the set are evaluated by parity popcounts,
+        the covariance matrix of the set coming from a single matrix product.
 
-    @staticmethod
-    def _routine_paulis_with_shots(args):
-        pauli, measured_results = args
-        curr_result = Operator._measure_pauli_z(measured_results, pauli[1])
-        avg = pauli[0] * curr_result
-        variance = (pauli[0] ** 2) * Operator._covariance(measured_results, pauli[1], pauli[1],
-                                                          curr_result, curr_result)
-        return avg, variance
+        Args:
+            tpb_set (list): a grouped_paulis entry, the header followed by the [coeff, Pauli] of the set.
+            measured_results (dict): the counts of the circuit measuring the set.
+            num_qubits (int): number of qubits of the operator.
+
+        Returns:
+            complex: the weighted sum of the expectation values of the set
+            complex: the variance of the weighted sum
+        """
+        if len(tpb_set) < 2:
+            return 0.0, 0.0
+        packed_paulis = PackedPaulis.from_list(tpb_set[1:])
+        outcomes, weights = counts_to_outcomes(measured_results, num_qubits)
+        tpb_avg, tpb_cov = expectations_and_covariance(outcomes, weights, packed_paulis.z | packed_paulis.x)
+        coeffs = packed_paulis.coeffs
+        return coeffs.dot(tpb_avg), coeffs.dot(tpb_cov).dot(coeffs)
+
+    def _eval_paulis_on_statevector(self, quantum_state):
+        """
+        Compute sum_i c_i <psi|P_i|psi> by applying every Pauli to the statevector with bit-flip and phase
+        index arithmetic; no matrix and no extra circuit is built.
+
+        Args:
+            quantum_state (numpy.ndarray): the statevector
+
+        Returns:
+            complex: the expectation value
+        """
+        packed_paulis = self._get_packed_paulis()
+        if len(packed_paulis) == 0:
+            return 0.0
+        return packed_paulis.coeffs.dot(pauli_expectations(packed_paulis, quantum_state))
 
     def _eval_directly(self, quantum_state):
+        if self._matrix is None and self._has_paulis():
+            return self._eval_paulis_on_statevector(quantum_state)
         self._check_representation("matrix")
         if self._dia_matrix is None:
             self._to_dia_matrix(mode='matrix')
@@ -771,7 +907,8 @@ class Operator(object):
            to obtain the mean and standard deviation of measured results.
 
         Args:
-            operator_mode (str): representation of operator, including paulis, grouped_paulis and matrix
+            operator_mode (str): representation of operator, including paulis, grouped_paulis, commuting_paulis
+                                 and matrix
             input_circuit (QuantumCircuit or numpy.ndarray): the quantum circuit.
             backend (BaseBackend): backend selection for quantum machine.
             backend_config (dict): configuration for backend
@@ -799,19 +936,12 @@ class Operator(object):
         else:
             if is_statevector_backend(backend):
                 run_config.shots = 1
-                has_shared_circuits = True
-
-                if operator_mode == 'matrix':
-                    has_shared_circuits = False
-            else:
-                has_shared_circuits = False
 
             circuits = self.construct_evaluation_circuit(operator_mode, input_circuit, backend)
             result = compile_and_run_circuits(circuits, backend=backend, backend_config=backend_config,
                                               compile_config=compile_config, run_config=run_config,
                                               qjob_config=qjob_config, noise_config=noise_config,
-                                              show_circuit_summary=self._summarize_circuits,
-                                              has_shared_circuits=has_shared_circuits)
+                                              show_circuit_summary=self._summarize_circuits)
             avg, std_dev = self.evaluate_with_result(operator_mode, circuits, backend, result)
 
         return avg, std_dev
@@ -898,22 +1028,15 @@ class Operator(object):
             Conversion from Paulis to matrix: H = sum_i alpha_i * Pauli_i
             Conversion from matrix to Paulis: alpha_i = coeff * Trace(H.Pauli_i) (dot product of trace)
                 where coeff = 2^(- # of qubits), # of qubit = log2(dim of matrix)
+            The traces of all the paulis sharing an X part are computed at once with a Walsh-Hadamard
+            transform, in O(n 4^n) operations instead of a sparse product per basis pauli.
         """
         if self._matrix.nnz == 0:
             return
 
-        num_qubits = self.num_qubits
-        coeff = 2 ** (-num_qubits)
-
-        paulis = []
-        # generate all possible paulis basis
-        for basis in itertools.product('IXYZ', repeat=num_qubits):
-            pauli_i = Pauli.from_label(''.join(basis))
-            trace_value = np.sum(self._matrix.dot(pauli_i.to_spmatrix()).diagonal())
-            alpha_i = trace_value * coeff
-            if alpha_i != 0.0:
-                paulis.append([alpha_i, pauli_i])
-        self._paulis = paulis
+        packed_paulis = PackedPaulis.from_matrix(self._matrix)
+        self._paulis = None
+        self._packed_paulis = packed_paulis
         self._matrix = None
         self._grouped_paulis = None
 
@@ -987,16 +1110,22 @@ class Operator(object):
     def _paulis_to_matrix(self):
         """
         Convert paulis to matrix, and save it in internal property directly.
-        If all paulis are Z or I (identity), convert to dia_matrix.
+        If all paulis are Z or I (identity), convert to dia_matrix, computed directly by `DiagonalIsing`.
+        Otherwise, the CSR arrays of all the terms are built at once by `PackedPaulis.to_spmatrix`.
         """
-        if self._paulis == []:
+        diagonal_ising = self._get_diagonal_ising()
+        if diagonal_ising is not None:
+            dia_matrix = diagonal_ising.diagonal()
+            self._matrix = scisparse.diags(dia_matrix, format='csr')
+            self._matrix.eliminate_zeros()
+            self._dia_matrix = dia_matrix
+            self._paulis = None
+            self._grouped_paulis = None
             return
-        p = self._paulis[0]
-        hamiltonian = p[0] * p[1].to_spmatrix()
-        for idx in range(1, len(self._paulis)):
-            p = self._paulis[idx]
-            hamiltonian += p[0] * p[1].to_spmatrix()
-        self._matrix = hamiltonian
+        packed_paulis = self._get_packed_paulis()
+        if packed_paulis is None or len(packed_paulis) == 0:
+            return
+        self._matrix = packed_paulis.to_spmatrix()
         self._to_dia_matrix(mode='matrix')
         self._paulis = None
         self._grouped_paulis = None
@@ -1008,17 +1137,8 @@ class Operator(object):
         """
         if self._grouped_paulis == []:
             return
-        p = self._grouped_paulis[0][1]
-        hamiltonian = p[0] * p[1].to_spmatrix()
-        for idx in range(2, len(self._grouped_paulis[0])):
-            p = self._grouped_paulis[0][idx]
-            hamiltonian += p[0] * p[1].to_spmatrix()
-        for group_idx in range(1, len(self._grouped_paulis)):
-            group = self._grouped_paulis[group_idx]
-            for idx in range(1, len(group)):
-                p = group[idx]
-                hamiltonian += p[0] * p[1].to_spmatrix()
-        self._matrix = hamiltonian
+        paulis = [p for group in self._grouped_paulis for p in group[1:]]
+        self._matrix = PackedPaulis.from_list(paulis).to_spmatrix()
         self._to_dia_matrix(mode='matrix')
         self._paulis = None
         self._grouped_paulis = None
@@ -1035,15 +1155,9 @@ class Operator(object):
         Returns:
             float: Expected value of paulis given data
         """
-        observable = 0.0
-        num_shots = sum(data.values())
-        p_z_or_x = np.logical_or(pauli.z, pauli.x)
-        for key, value in data.items():
-            bitstr = np.asarray(list(key))[::-1].astype(np.bool)
-            sign = -1.0 if np.logical_xor.reduce(np.logical_and(bitstr, p_z_or_x)) else 1.0
-            observable += sign * value
-        observable /= num_shots
-        return observable
+        outcomes, weights = counts_to_outcomes(data, len(pauli.z))
+        masks = pack_bits(np.logical_or(pauli.z, pauli.x)[None, :])
+        return weights.dot(parity_signs(outcomes, masks)[:, 0]) / np.sum(weights)
 
     @staticmethod
     def _covariance(data, pauli_1, pauli_2, avg_1, avg_2):
@@ -1062,21 +1176,15 @@ class Operator(object):
         Returns:
             float: the element of the covariance matrix between two Paulis
         """
-        cov = 0.0
         num_shots = sum(data.values())
 
         if num_shots == 1:
-            return cov
-
-        p1_z_or_x = np.logical_or(pauli_1.z, pauli_1.x)
-        p2_z_or_x = np.logical_or(pauli_2.z, pauli_2.x)
-        for key, value in data.items():
-            bitstr = np.asarray(list(key))[::-1].astype(np.bool)
-            sign_1 = -1.0 if np.logical_xor.reduce(np.logical_and(bitstr, p1_z_or_x)) else 1.0
-            sign_2 = -1.0 if np.logical_xor.reduce(np.logical_and(bitstr, p2_z_or_x)) else 1.0
-            cov += (sign_1 - avg_1) * (sign_2 - avg_2) * value
-        cov /= (num_shots - 1)
-        return cov
+            return 0.0
+
+        outcomes, weights = counts_to_outcomes(data, len(pauli_1.z))
+        masks = pack_bits(np.stack([np.logical_or(pauli_1.z, pauli_1.x), np.logical_or(pauli_2.z, pauli_2.x)]))
+        signs = parity_signs(outcomes, masks)
+        return weights.dot((signs[:, 0] - avg_1) * (signs[:, 1] - avg_2)) / (num_shots - 1)
 
     def two_qubit_reduced_operator(self, m, threshold=10**-13):
         """
@@ -1148,10 +1256,14 @@ class Operator(object):
     @staticmethod
     def construct_evolution_circuit(slice_pauli_list, evo_time, num_time_slices, state_registers,
                                     ancillary_registers=None, ctl_idx=0, unitary_power=None, use_basis_gates=True,
-                                    shallow_slicing=False):
+                                    shallow_slicing=False, reorder_paulis=False):
         """
         Construct the evolution circuit according to the supplied specification.
 
+        The gates of a slice only depend on the Pauli labels, so they are computed once per slice
+        Pauli list and reused, rescaling the rotation angles, for every evolution time, power and
+        control qubit. The basis changes and CNOTs shared by consecutive Paulis cancel out.
+
         Args:
             slice_pauli_list (list): The list of pauli terms corresponding to a single time slice to be evolved
             evo_time (int): The evolution time
@@ -1163,6 +1275,8 @@ class Operator(object):
             unitary_power (int): The power to which the unitary operator is to be raised
             use_basis_gates (bool): boolean flag for indicating only using basis gates when building circuit.
             shallow_slicing (bool): boolean flag for indicating using shallow qc.data reference repetition for slicing
+            reorder_paulis (bool): boolean flag for sorting the paulis of the slice by label, which maximizes
+                the cancelled gates but changes the Trotter error of the slice
 
         Returns:
             QuantumCircuit: The Qiskit QuantumCircuit corresponding to specified evolution.
@@ -1170,157 +1284,35 @@ class Operator(object):
         if state_registers is None:
             raise ValueError('Quantum state registers are required.')
 
-        qc_slice = QuantumCircuit(state_registers)
+        qc = QuantumCircuit(state_registers)
         if ancillary_registers is not None:
-            qc_slice.add_register(ancillary_registers)
-
-        # for each pauli [IXYZ]+, record the list of qubit pairs needing CX's
-        cnot_qubit_pairs = [None] * len(slice_pauli_list)
-        # for each pauli [IXYZ]+, record the highest index of the nontrivial pauli gate (X,Y, or Z)
-        top_XYZ_pauli_indices = [-1] * len(slice_pauli_list)
-
-        for pauli_idx, pauli in enumerate(reversed(slice_pauli_list)):
-            n_qubits = pauli[1].numberofqubits
-            # changes bases if necessary
-            nontrivial_pauli_indices = []
-            for qubit_idx in range(n_qubits):
-                # pauli I
-                if not pauli[1].z[qubit_idx] and not pauli[1].x[qubit_idx]:
-                    continue
-
-                if cnot_qubit_pairs[pauli_idx] is None:
-                    nontrivial_pauli_indices.append(qubit_idx)
-
-                if pauli[1].x[qubit_idx]:
-                    # pauli X
-                    if not pauli[1].z[qubit_idx]:
-                        if use_basis_gates:
-                            qc_slice.u2(0.0, pi, state_registers[qubit_idx])
-                        else:
-                            qc_slice.h(state_registers[qubit_idx])
-                    # pauli Y
-                    elif pauli[1].z[qubit_idx]:
-                        if use_basis_gates:
-                            qc_slice.u3(pi / 2, -pi / 2, pi / 2, state_registers[qubit_idx])
-                        else:
-                            qc_slice.rx(pi / 2, state_registers[qubit_idx])
-                # pauli Z
-                elif pauli[1].z[qubit_idx] and not pauli[1].x[qubit_idx]:
-                    pass
-                else:
-                    raise ValueError('Unrecognized pauli: {}'.format(pauli[1]))
-
-            if len(nontrivial_pauli_indices) > 0:
-                top_XYZ_pauli_indices[pauli_idx] = nontrivial_pauli_indices[-1]
-
-            # insert lhs cnot gates
-            if cnot_qubit_pairs[pauli_idx] is None:
-                cnot_qubit_pairs[pauli_idx] = list(zip(
-                    sorted(nontrivial_pauli_indices)[:-1],
-                    sorted(nontrivial_pauli_indices)[1:]
-                ))
-
-            for pair in cnot_qubit_pairs[pauli_idx]:
-                qc_slice.cx(state_registers[pair[0]], state_registers[pair[1]])
-
-            # insert Rz gate
-            if top_XYZ_pauli_indices[pauli_idx] >= 0:
-                if ancillary_registers is None:
-                    lam = (2.0 * pauli[0] * evo_time / num_time_slices).real
-                    if use_basis_gates:
-                        qc_slice.u1(lam, state_registers[top_XYZ_pauli_indices[pauli_idx]])
-                    else:
-                        qc_slice.rz(lam, state_registers[top_XYZ_pauli_indices[pauli_idx]])
-                else:
-                    unitary_power = (2 ** ctl_idx) if unitary_power is None else unitary_power
-                    lam = (2.0 * pauli[0] * evo_time / num_time_slices * unitary_power).real
-
-                    if use_basis_gates:
-                        qc_slice.u1(lam / 2, state_registers[top_XYZ_pauli_indices[pauli_idx]])
-                        qc_slice.cx(ancillary_registers[ctl_idx], state_registers[top_XYZ_pauli_indices[pauli_idx]])
-                        qc_slice.u1(-lam / 2, state_registers[top_XYZ_pauli_indices[pauli_idx]])
-                        qc_slice.cx(ancillary_registers[ctl_idx], state_registers[top_XYZ_pauli_indices[pauli_idx]])
-                    else:
-                        qc_slice.crz(lam, ancillary_registers[ctl_idx],
-                                     state_registers[top_XYZ_pauli_indices[pauli_idx]])
-
-            # insert rhs cnot gates
-            for pair in reversed(cnot_qubit_pairs[pauli_idx]):
-                qc_slice.cx(state_registers[pair[0]], state_registers[pair[1]])
-
-            # revert bases if necessary
-            for qubit_idx in range(n_qubits):
-                if pauli[1].x[qubit_idx]:
-                    # pauli X
-                    if not pauli[1].z[qubit_idx]:
-                        if use_basis_gates:
-                            qc_slice.u2(0.0, pi, state_registers[qubit_idx])
-                        else:
-                            qc_slice.h(state_registers[qubit_idx])
-                    # pauli Y
-                    elif pauli[1].z[qubit_idx]:
-                        if use_basis_gates:
-                            qc_slice.u3(-pi / 2, -pi / 2, pi / 2, state_registers[qubit_idx])
-                        else:
-                            qc_slice.rx(-pi / 2, state_registers[qubit_idx])
+            qc.add_register(ancillary_registers)
+
+        evolution_slice, coeffs = get_evolution_slice(slice_pauli_list, reorder=reorder_paulis)
+        if ancillary_registers is None:
+            angles = np.real(2.0 * coeffs * evo_time / num_time_slices)
+        else:
+            unitary_power = (2 ** ctl_idx) if unitary_power is None else unitary_power
+            angles = np.real(2.0 * coeffs * evo_time / num_time_slices * unitary_power)
 
         # repeat the slice
         if shallow_slicing:
             logger.info('Under shallow slicing mode, the qc.data reference is repeated shallowly. '
                         'Thus, changing gates of one slice of the output circuit might affect other slices.')
-            qc_slice.data *= num_time_slices
-            qc = qc_slice
+            evolution_slice.build(qc, state_registers, angles, ancillary_registers, ctl_idx, use_basis_gates)
+            qc.data *= num_time_slices
         else:
-            qc = QuantumCircuit()
+            # every slice gets its own gates, appended directly instead of copying a slice circuit
             for _ in range(num_time_slices):
-                qc += qc_slice
+                evolution_slice.build(qc, state_registers, angles, ancillary_registers, ctl_idx, use_basis_gates)
         return qc
 
-    @staticmethod
-    def _suzuki_expansion_slice_matrix(pauli_list, lam, expansion_order):
-        """
-        Compute the matrix for a single slice of the suzuki expansion following the paper
-        https://arxiv.org/pdf/quant-ph/0508139.pdf
-
-        Args:
-            pauli_list (list): The operator's complete list of pauli terms for the suzuki expansion
-            lam (complex): The parameter lambda as defined in said paper
-            expansion_order (int): The order for the suzuki expansion
-
-        Returns:
-            numpy array: The matrix representation corresponding to the specified suzuki expansion
-        """
-        if expansion_order == 1:
-            left = reduce(
-                lambda x, y: x @ y,
-                [scila.expm(lam / 2 * c * p.to_spmatrix().tocsc()) for c, p in pauli_list]
-            )
-            right = reduce(
-                lambda x, y: x @ y,
-                [scila.expm(lam / 2 * c * p.to_spmatrix().tocsc()) for c, p in reversed(pauli_list)]
-            )
-            return left @ right
-        else:
-            pk = (4 - 4 ** (1 / (2 * expansion_order - 1))) ** -1
-            side_base = Operator._suzuki_expansion_slice_matrix(
-                pauli_list,
-                lam * pk,
-                expansion_order - 1
-            )
-            side = side_base @ side_base
-            middle = Operator._suzuki_expansion_slice_matrix(
-                pauli_list,
-                lam * (1 - 4 * pk),
-                expansion_order - 1
-            )
-            return side @ middle @ side
-
     @staticmethod
     def _suzuki_expansion_slice_pauli_list(pauli_list, lam_coef, expansion_order):
         """
-        Similar to _suzuki_expansion_slice_matrix, with the difference that this method
-        computes the list of pauli terms for a single slice of the suzuki expansion,
-        which can then be fed to construct_evolution_circuit to build the QuantumCircuit.
+        Compute the list of pauli terms for a single slice of the suzuki expansion following the paper
+        https://arxiv.org/pdf/quant-ph/0508139.pdf, which can then be fed to construct_evolution_circuit
+        to build the QuantumCircuit, or applied to a statevector in matrix mode.
         """
         if expansion_order == 1:
             half = [[lam_coef / 2 * c, p] for c, p in pauli_list]
@@ -1377,37 +1369,37 @@ class Operator(object):
         if not (expansion_mode == 'trotter' or expansion_mode == 'suzuki'):
             raise NotImplementedError('Expansion mode {} not supported.'.format(expansion_mode))
 
+        if evo_mode == 'matrix' and num_time_slices == 0:
+            # krylov action of the exponential on the vector, the exponential itself is never formed
+            if self._has_paulis() or self._grouped_paulis is not None:
+                # the paulis are applied matrix-free, in O(2^n) memory, and the representation is kept
+                packed_paulis = self._get_packed_paulis() if self._has_paulis() else \
+                    PackedPaulis.from_list(self.get_flat_pauli_list())
+                return expm_multiply(-1.j * evo_time * pauli_linear_operator(packed_paulis), state_in,
+                                     traceA=-1.j * evo_time * pauli_trace(packed_paulis))
+            self._check_representation("matrix")
+            return expm_multiply(-1.j * evo_time * self._matrix.tocsc(), state_in)
+
         pauli_list = self.get_flat_pauli_list()
 
         if evo_mode == 'matrix':
-            self._check_representation("matrix")
-
-            if num_time_slices == 0:
-                return scila.expm(-1.j * evo_time * self._matrix.tocsc()) @ state_in
+            if len(pauli_list) == 1 or expansion_mode == 'trotter':
+                slice_pauli_list = [[-1.j * evo_time / num_time_slices * c, p] for c, p in pauli_list]
+            # suzuki expansion
+            elif expansion_mode == 'suzuki':
+                slice_pauli_list = Operator._suzuki_expansion_slice_pauli_list(
+                    pauli_list,
+                    -1.j * evo_time / num_time_slices,
+                    expansion_order
+                )
             else:
-                if len(pauli_list) == 1:
-                    approx_matrix_slice = scila.expm(
-                        -1.j * evo_time / num_time_slices * pauli_list[0][0] * pauli_list[0][1].to_spmatrix().tocsc()
-                    )
-                else:
-                    if expansion_mode == 'trotter':
-                        approx_matrix_slice = reduce(
-                            lambda x, y: x @ y,
-                            [
-                                scila.expm(-1.j * evo_time / num_time_slices * c * p.to_spmatrix().tocsc())
-                                for c, p in pauli_list
-                            ]
-                        )
-                    # suzuki expansion
-                    elif expansion_mode == 'suzuki':
-                        approx_matrix_slice = Operator._suzuki_expansion_slice_matrix(
-                            pauli_list,
-                            -1.j * evo_time / num_time_slices,
-                            expansion_order
-                        )
-                    else:
-                        raise ValueError('Unrecognized expansion mode {}.'.format(expansion_mode))
-                return reduce(lambda x, y: x @ y, [approx_matrix_slice] * num_time_slices) @ state_in
+                raise ValueError('Unrecognized expansion mode {}.'.format(expansion_mode))
+            # each exp(-i t c P) is applied to the vector, mixing it with its pauli-permuted copy
+            packed_slice = PackedPaulis.from_list(slice_pauli_list)
+            state_out = np.asarray(state_in)
+            for _ in range(num_time_slices):
+                state_out = apply_pauli_exponentials(packed_slice, state_out)
+            return state_out
 
         elif evo_mode == 'circuit':
             if num_time_slices == 0:
@@ -1441,7 +1433,7 @@ class Operator(object):
             bool: is empty?
         """
         if self._matrix is None and self._dia_matrix is None \
-                and (self._paulis == [] or self._paulis is None) \
+                and (not self._has_paulis() or self.num_qubits == 0) \
                 and (self._grouped_paulis == [] or self._grouped_paulis is None):
 
             return True
@@ -1460,7 +1452,7 @@ class Operator(object):
             ValueError: if the `targeted_representation` is not recognized.
         """
         if targeted_representation == 'paulis':
-            if self._paulis is None:
+            if not self._has_paulis():
                 if self._matrix is not None:
                     self._matrix_to_paulis()
                 elif self._grouped_paulis is not None:
@@ -1471,7 +1463,7 @@ class Operator(object):
 
         elif targeted_representation == 'grouped_paulis':
             if self._grouped_paulis is None:
-                if self._paulis is not None:
+                if self._has_paulis():
                     self._paulis_to_grouped_paulis()
                 elif self._matrix is not None:
                     self._matrix_to_grouped_paulis()
@@ -1481,7 +1473,7 @@ class Operator(object):
 
         elif targeted_representation == 'matrix':
             if self._matrix is None:
-                if self._paulis is not None:
+                if self._has_paulis():
                     self._paulis_to_matrix()
                 elif self._grouped_paulis is not None:
                     self._grouped_paulis_to_matrix()
@@ -1726,10 +1718,8 @@ class Operator(object):
         The difference from `_simplify_paulis` method is that, this method will not remove duplicated
         paulis.
         """
-        if self._paulis is not None:
-            new_paulis = [pauli for pauli in self._paulis if pauli[0] != 0]
-            self._paulis = new_paulis
-            self._paulis_table = {pauli[1].to_label(): i for i, pauli in enumerate(self._paulis)}
+        if self._has_paulis():
+            self._get_packed_paulis(inplace=True).eliminate_zeros()
 
         elif self._grouped_paulis is not None:
             self._grouped_paulis_to_paulis()
@@ -1746,12 +1736,11 @@ class Operator(object):
         Args:
             scaling_factor (float): the sacling factor
         """
-        if self._paulis is not None:
-            for idx in range(len(self._paulis)):
-                self._paulis[idx] = [self._paulis[idx][0] * scaling_factor, self._paulis[idx][1]]
+        if self._has_paulis():
+            self._get_packed_paulis(inplace=True).scale(scaling_factor)
         elif self._grouped_paulis is not None:
             self._grouped_paulis_to_paulis()
-            self._scale_paulis(scaling_factor)
+            self.scaling_coeff(scaling_factor)
             self._paulis_to_grouped_paulis()
         elif self._matrix is not None:
             self._matrix *= scaling_factor
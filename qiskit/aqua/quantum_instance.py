@@ -20,7 +20,7 @@ import logging
 from qiskit import __version__ as terra_version
 from qiskit.compiler.run_config import RunConfig
 from qiskit.mapper import Layout
-from .utils import compile_and_run_circuits, CircuitCache
+from .utils import compile_and_run_circuits, CircuitCache, TranspileCache
 from .utils.backend_utils import (is_aer_provider,
                                   is_ibmq_provider,
                                   is_statevector_backend,
@@ -49,7 +49,8 @@ class QuantumInstance:
                  basis_gates=None, coupling_map=None,
                  initial_layout=None, pass_manager=None, seed_mapper=None,
                  backend_options=None, noise_model=None, timeout=None, wait=5,
-                 circuit_caching=True, cache_file=None, skip_qobj_deepcopy=True, skip_qobj_validation=True):
+                 circuit_caching=True, cache_file=None, skip_qobj_deepcopy=True, skip_qobj_validation=True,
+                 transpile_cache_dir=None, transpile_cache_size=4096):
         """Constructor.
 
         Args:
@@ -71,6 +72,9 @@ class QuantumInstance:
             cache_file(str, optional): filename into which to store the cache as a pickle file
             skip_qobj_deepcopy (bool, optional): Reuses the same qobj object over and over to avoid deepcopying
             skip_qobj_validation (bool, optional): Bypass Qobj validation to decrease submission time
+            transpile_cache_dir (str, optional): directory of a persistent cache of transpiled circuits,
+                                                 shared across runs
+            transpile_cache_size (int, optional): maximum number of transpiled circuits kept in the cache
         """
         self._backend = backend
         # setup run config
@@ -134,6 +138,8 @@ class QuantumInstance:
         self._circuit_summary = False
         self._circuit_cache = CircuitCache(skip_qobj_deepcopy=skip_qobj_deepcopy, cache_file=cache_file) if circuit_caching else None
         self._skip_qobj_validation = skip_qobj_validation
+        self._transpile_cache = TranspileCache(transpile_cache_dir, max_entries=transpile_cache_size) \
+            if transpile_cache_dir is not None else None
 
         logger.info(self)
 
@@ -169,7 +175,8 @@ class QuantumInstance:
                                           show_circuit_summary=self._circuit_summary,
                                           has_shared_circuits=self._shared_circuits,
                                           circuit_cache=self._circuit_cache,
-                                          skip_qobj_validation=self._skip_qobj_validation, **kwargs)
+                                          skip_qobj_validation=self._skip_qobj_validation,
+                                          transpile_cache=self._transpile_cache, **kwargs)
         if self._circuit_summary:
             self._circuit_summary = False
 
@@ -283,6 +290,10 @@ class QuantumInstance:
     def has_circuit_caching(self):
         return self._circuit_cache is not None
 
+    @property
+    def transpile_cache(self):
+        return self._transpile_cache
+
     @property
     def skip_qobj_validation(self):
         return self._skip_qobj_validation
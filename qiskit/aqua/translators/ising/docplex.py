@@ -55,15 +55,15 @@ print('tsp objective:', result['energy'] + offset)
 """
 
 import logging
-from collections import OrderedDict
 from math import fsum
 
 import numpy as np
 from docplex.mp.constants import ComparisonType
 from docplex.mp.model import Model
-from qiskit.quantum_info import Pauli
+from scipy import sparse as scisparse
 
 from qiskit.aqua import Operator, AquaError
+from qiskit.aqua.utils.diagonal_ising import DiagonalIsing, most_likely_bitstring
 
 logger = logging.getLogger(__name__)
 
@@ -107,42 +107,28 @@ def get_qubitops(mdl, auto_penalty=True, default_penalty=1e5):
 
     # initialize Hamiltonian.
     num_nodes = len(qd)
-    pauli_list = []
+    linear = np.zeros(num_nodes)
+    rows, cols, values = [], [], []
     shift = 0
-    zero = np.zeros(num_nodes, dtype=np.bool)
 
     # convert linear parts of the object function into Hamiltonian.
-    l_itr = mdl.get_objective_expr().iter_terms()
-    for j in l_itr:
-        zp = np.zeros(num_nodes, dtype=np.bool)
-        index = qd[j[0]]
-        weight = j[1] * sign / 2
-        zp[index] = True
-
-        pauli_list.append([-weight, Pauli(zp, zero)])
-        shift += weight
+    terms = list(mdl.get_objective_expr().iter_terms())
+    indices = np.array([qd[term[0]] for term in terms], dtype=int)
+    weights = np.array([term[1] for term in terms], dtype=float) * sign / 2
+    linear -= np.bincount(indices, weights, minlength=num_nodes)
+    shift += np.sum(weights)
 
     # convert quadratic parts of the object function into Hamiltonian.
-    q_itr = mdl.get_objective_expr().iter_quads()
-    for i in q_itr:
-        index1 = qd[i[0][0]]
-        index2 = qd[i[0][1]]
-        weight = i[1] * sign / 4
-
-        zp = np.zeros(num_nodes, dtype=np.bool)
-        zp[index1] = True
-        zp[index2] = True
-        pauli_list.append([weight, Pauli(zp, zero)])
-
-        zp = np.zeros(num_nodes, dtype=np.bool)
-        zp[index1] = True
-        pauli_list.append([-weight, Pauli(zp, zero)])
-
-        zp = np.zeros(num_nodes, dtype=np.bool)
-        zp[index2] = True
-        pauli_list.append([-weight, Pauli(zp, zero)])
-
-        shift += weight
+    quads = list(mdl.get_objective_expr().iter_quads())
+    indices1 = np.array([qd[quad[0][0]] for quad in quads], dtype=int)
+    indices2 = np.array([qd[quad[0][1]] for quad in quads], dtype=int)
+    weights = np.array([quad[1] for quad in quads], dtype=float) * sign / 4
+    rows.append(indices1)
+    cols.append(indices2)
+    values.append(weights)
+    linear -= np.bincount(indices1, weights, minlength=num_nodes)
+    linear -= np.bincount(indices2, weights, minlength=num_nodes)
+    shift += np.sum(weights)
 
     # convert constraints into penalty terms.
     for constraint in mdl.iter_constraints():
@@ -152,45 +138,28 @@ def get_qubitops(mdl, auto_penalty=True, default_penalty=1e5):
         shift += penalty * constant ** 2
 
         # linear parts of penalty*(Constant-func)**2: penalty*(-2*Constant*func)
-        for l in constraint.left_expr.iter_terms():
-            zp = np.zeros(num_nodes, dtype=np.bool)
-            index = qd[l[0]]
-            weight = l[1]
-            zp[index] = True
-
-            pauli_list.append([penalty * constant * weight, Pauli(zp, zero)])
-            shift += -penalty * constant * weight
-
-        # quadratic parts of penalty*(Constant-func)**2: penalty*(func**2)
-        for l in constraint.left_expr.iter_terms():
-            for l2 in constraint.left_expr.iter_terms():
-                index1 = qd[l[0]]
-                index2 = qd[l2[0]]
-                weight1 = l[1]
-                weight2 = l2[1]
-                penalty_weight1_weight2 = penalty * weight1 * weight2 / 4
-
-                if index1 == index2:
-                    shift += penalty_weight1_weight2
-                else:
-                    zp = np.zeros(num_nodes, dtype=np.bool)
-                    zp[index1] = True
-                    zp[index2] = True
-                    pauli_list.append([penalty_weight1_weight2, Pauli(zp, zero)])
-
-                zp = np.zeros(num_nodes, dtype=np.bool)
-                zp[index1] = True
-                pauli_list.append([-penalty_weight1_weight2, Pauli(zp, zero)])
-
-                zp = np.zeros(num_nodes, dtype=np.bool)
-                zp[index2] = True
-                pauli_list.append([-penalty_weight1_weight2, Pauli(zp, zero)])
-
-                shift += penalty_weight1_weight2
-
-    # Remove paulis whose coefficients are zeros.
-    qubitOp = Operator(paulis=pauli_list)
-    qubitOp.zeros_coeff_elimination()
+        terms = list(constraint.left_expr.iter_terms())
+        indices = np.array([qd[term[0]] for term in terms], dtype=int)
+        weights = np.array([term[1] for term in terms], dtype=float)
+        linear += np.bincount(indices, penalty * constant * weights, minlength=num_nodes)
+        shift += -penalty * constant * np.sum(weights)
+
+        # quadratic parts of penalty*(Constant-func)**2: penalty*(func**2), over all the ordered pairs of terms
+        penalty_weight1_weight2 = penalty * np.outer(weights, weights) / 4
+        indices1, indices2 = np.meshgrid(indices, indices, indexing='ij')
+        rows.append(indices1.ravel())
+        cols.append(indices2.ravel())
+        values.append(penalty_weight1_weight2.ravel())
+        linear -= 2 * np.bincount(indices, np.sum(penalty_weight1_weight2, axis=1), minlength=num_nodes)
+        shift += np.sum(penalty_weight1_weight2)
+
+    # ZiZj and ZjZi are merged, ZiZi is the identity, and the paulis whose coefficients are zeros are left out.
+    quadratic = scisparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                                     shape=(num_nodes, num_nodes))
+    diagonal_ising = DiagonalIsing.from_quadratic_form(num_nodes, linear=linear, quadratic=quadratic)
+    shift += diagonal_ising.offset
+    qubitOp = Operator.from_diagonal_ising(DiagonalIsing(num_nodes, 0.0, diagonal_ising.linear,
+                                                         diagonal_ising.quadratic))
 
     return qubitOp, shift
 
@@ -267,16 +236,4 @@ def sample_most_likely(state_vector):
     Returns:
         numpy.ndarray: binary string as numpy.ndarray of ints.
     """
-    if isinstance(state_vector, dict) or isinstance(state_vector, OrderedDict):
-        # get the binary string with the largest count
-        binary_string = sorted(state_vector.items(), key=lambda kv: kv[1])[-1][0]
-        x = np.asarray([int(y) for y in reversed(list(binary_string))])
-        return x
-    else:
-        n = int(np.log2(state_vector.shape[0]))
-        k = np.argmax(np.abs(state_vector))
-        x = np.zeros(n)
-        for i in range(n):
-            x[i] = k % 2
-            k >>= 1
-        return x
+    return most_likely_bitstring(state_vector)
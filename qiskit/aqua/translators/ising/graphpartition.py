@@ -20,13 +20,13 @@
 
 
 import logging
-from collections import OrderedDict
 
 import numpy as np
 import numpy.random as rand
+from scipy import sparse as scisparse
 
-from qiskit.quantum_info import Pauli
 from qiskit.aqua import Operator
+from qiskit.aqua.utils.diagonal_ising import DiagonalIsing, most_likely_bitstring
 
 logger = logging.getLogger(__name__)
 
@@ -89,30 +89,17 @@ def get_graphpartition_qubitops(weight_matrix):
     H_A is for achieving goal 2 and H_B is for achieving goal 1.
     """
     num_nodes = len(weight_matrix)
-    pauli_list = []
-    shift = 0
-
-    for i in range(num_nodes):
-        for j in range(i):
-            if weight_matrix[i, j] != 0:
-                xp = np.zeros(num_nodes, dtype=np.bool)
-                zp = np.zeros(num_nodes, dtype=np.bool)
-                zp[i] = True
-                zp[j] = True
-                pauli_list.append([-0.5, Pauli(zp, xp)])
-                shift += 0.5
-
-    for i in range(num_nodes):
-        for j in range(num_nodes):
-            if i != j:
-                xp = np.zeros(num_nodes, dtype=np.bool)
-                zp = np.zeros(num_nodes, dtype=np.bool)
-                zp[i] = True
-                zp[j] = True
-                pauli_list.append([1, Pauli(zp, xp)])
-            else:
-                shift += 1
-    return Operator(paulis=pauli_list), shift
+    weight_matrix = np.asarray(weight_matrix)
+    rows, cols = np.tril_indices(num_nodes, -1)
+    edges = weight_matrix[rows, cols] != 0
+    shift = 0.5 * np.count_nonzero(edges) + num_nodes
+
+    # -1/2 ZiZj per edge, and ZiZj + ZjZi for every pair of nodes
+    quadratic = scisparse.coo_matrix((np.concatenate((np.full(np.count_nonzero(edges), -0.5),
+                                                      np.full(len(rows), 2.0))),
+                                      (np.concatenate((rows[edges], rows)), np.concatenate((cols[edges], cols)))),
+                                     shape=(num_nodes, num_nodes))
+    return Operator.from_diagonal_ising(DiagonalIsing.from_quadratic_form(num_nodes, quadratic=quadratic)), shift
 
 
 def parse_gset_format(filename):
@@ -180,19 +167,7 @@ def sample_most_likely(state_vector):
     Returns:
         numpy.ndarray: binary string as numpy.ndarray of ints.
     """
-    if isinstance(state_vector, dict) or isinstance(state_vector, OrderedDict):
-        # get the binary string with the largest count
-        binary_string = sorted(state_vector.items(), key=lambda kv: kv[1])[-1][0]
-        x = np.asarray([int(y) for y in reversed(list(binary_string))])
-        return x
-    else:
-        n = int(np.log2(state_vector.shape[0]))
-        k = np.argmax(np.abs(state_vector))
-        x = np.zeros(n)
-        for i in range(n):
-            x[i] = k % 2
-            k >>= 1
-        return x
+    return most_likely_bitstring(state_vector)
 
 
 def get_gset_result(x):
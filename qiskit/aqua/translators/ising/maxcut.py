@@ -22,13 +22,13 @@
 # Note that the weights are symmetric, i.e., w[j, i] = x always holds.
 
 import logging
-from collections import OrderedDict
 
 import numpy as np
 import numpy.random as rand
 
 from qiskit.quantum_info import Pauli
 from qiskit.aqua import Operator
+from qiskit.aqua.utils.diagonal_ising import most_likely_bitstring
 
 logger = logging.getLogger(__name__)
 
@@ -163,19 +163,7 @@ def sample_most_likely(state_vector):
     Returns:
         numpy.ndarray: binary string as numpy.ndarray of ints.
     """
-    if isinstance(state_vector, dict) or isinstance(state_vector, OrderedDict):
-        # get the binary string with the largest count
-        binary_string = sorted(state_vector.items(), key=lambda kv: kv[1])[-1][0]
-        x = np.asarray([int(y) for y in reversed(list(binary_string))])
-        return x
-    else:
-        n = int(np.log2(state_vector.shape[0]))
-        k = np.argmax(np.abs(state_vector))
-        x = np.zeros(n)
-        for i in range(n):
-            x[i] = k % 2
-            k >>= 1
-        return x
+    return most_likely_bitstring(state_vector)
 
 
 def get_gset_result(x):
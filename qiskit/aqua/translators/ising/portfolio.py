@@ -17,12 +17,11 @@
 
 # Convert portfolio optimization instances into Pauli list
 
-from collections import OrderedDict
 
 import numpy as np
-from qiskit.quantum_info import Pauli
 
 from qiskit.aqua import Operator
+from qiskit.aqua.utils.diagonal_ising import DiagonalIsing, most_likely_bitstring
 
 from sklearn.datasets import make_spd_matrix
 
@@ -63,28 +62,13 @@ def get_portfolio_qubitops(mu, sigma, q, budget, penalty):
     mu_z = mu/2 + budget*penalty*e - n*penalty/2*e - q/2*np.dot(sigma, e)
     sigma_z = penalty/4*E + q/4*sigma
 
-    # construct operator
-    pauli_list = []
-    for i in range(n):
-        i_ = i
-        # i_ = n-i-1
-        if np.abs(mu_z[i_]) > 1e-6:
-            xp = np.zeros(n, dtype=np.bool)
-            zp = np.zeros(n, dtype=np.bool)
-            zp[i_] = True
-            pauli_list.append([mu_z[i_], Pauli(zp, xp)])
-        for j in range(i):
-            j_ = j
-            # j_ = n-j-1
-            if np.abs(sigma_z[i_, j_]) > 1e-6:
-                xp = np.zeros(n, dtype=np.bool)
-                zp = np.zeros(n, dtype=np.bool)
-                zp[i_] = True
-                zp[j_] = True
-                pauli_list.append([2*sigma_z[i_, j_], Pauli(zp, xp)])
-        offset += sigma_z[i_, i_]
-
-    return Operator(paulis=pauli_list), offset
+    # construct operator, leaving out the coefficients below 1e-6
+    offset += np.trace(sigma_z)
+    quadratic = 2 * np.tril(np.asarray(sigma_z), -1)
+    quadratic[np.abs(quadratic) <= 2e-6] = 0
+    diagonal_ising = DiagonalIsing.from_quadratic_form(n, linear=np.asarray(mu_z).ravel(), quadratic=quadratic)
+
+    return Operator.from_diagonal_ising(diagonal_ising, threshold=1e-6), offset
 
 
 def portfolio_value(x, mu, sigma, q, budget, penalty):
@@ -108,16 +92,4 @@ def sample_most_likely(state_vector):
     Returns:
         numpy.ndarray: binary string as numpy.ndarray of ints.
     """
-    if isinstance(state_vector, dict) or isinstance(state_vector, OrderedDict):
-        # get the binary string with the largest count
-        binary_string = sorted(state_vector.items(), key=lambda kv: kv[1])[-1][0]
-        x = np.asarray([int(y) for y in reversed(list(binary_string))])
-        return x
-    else:
-        n = int(np.log2(state_vector.shape[0]))
-        k = np.argmax(np.abs(state_vector))
-        x = np.zeros(n, dtype=int)
-        for i in range(n):
-            x[i] = k % 2
-            k >>= 1
-        return x
+    return most_likely_bitstring(state_vector)
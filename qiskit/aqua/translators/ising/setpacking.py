@@ -16,12 +16,12 @@
 # =============================================================================
 
 import logging
-from collections import OrderedDict
 
 import numpy as np
 
 from qiskit.quantum_info import Pauli
 from qiskit.aqua import Operator
+from qiskit.aqua.utils.diagonal_ising import most_likely_bitstring
 
 logger = logging.getLogger(__name__)
 
@@ -127,22 +127,7 @@ def sample_most_likely(n, state_vector):
     Returns:
         numpy.ndarray: binary string as numpy.ndarray of ints.
     """
-    if isinstance(state_vector, dict) or isinstance(state_vector, OrderedDict):
-        temp_vec = np.zeros(2**n)
-        total = 0
-        for i in range(2**n):
-            state = np.binary_repr(i, n)
-            count = state_vector.get(state, 0)
-            temp_vec[i] = count
-            total += count
-        state_vector = temp_vec / float(total)
-
-    k = np.argmax(np.abs(state_vector))
-    x = np.zeros(n)
-    for i in range(n):
-        x[i] = k % 2
-        k >>= 1
-    return x
+    return most_likely_bitstring(state_vector, n)
 
 
 def get_solution(x):
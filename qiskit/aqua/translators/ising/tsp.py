@@ -25,13 +25,14 @@ Note that the weights are symmetric, i.e., w[j, i] = x always holds.
 """
 
 import logging
-from collections import OrderedDict, namedtuple
+from collections import namedtuple
 
 import numpy as np
 import numpy.random as rand
-from qiskit.quantum_info import Pauli
+from scipy import sparse as scisparse
 
 from qiskit.aqua import Operator
+from qiskit.aqua.utils.diagonal_ising import DiagonalIsing, most_likely_bitstring
 
 logger = logging.getLogger(__name__)
 
@@ -140,74 +141,40 @@ def get_tsp_qubitops(ins, penalty=1e5):
     """
     num_nodes = ins.dim
     num_qubits = num_nodes ** 2
-    zero = np.zeros(num_qubits, dtype=np.bool)
-    pauli_list = []
-    shift = 0
-    for i in range(num_nodes):
-        for j in range(num_nodes):
-            if i == j:
-                continue
-            for p in range(num_nodes):
-                q = (p + 1) % num_nodes
-                shift += ins.w[i, j] / 4
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + p] = True
-                pauli_list.append([-ins.w[i, j] / 4, Pauli(zp, zero)])
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[j * num_nodes + q] = True
-                pauli_list.append([-ins.w[i, j] / 4, Pauli(zp, zero)])
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + p] = True
-                zp[j * num_nodes + q] = True
-                pauli_list.append([ins.w[i, j] / 4, Pauli(zp, zero)])
-
-    for i in range(num_nodes):
-        for p in range(num_nodes):
-            zp = np.zeros(num_qubits, dtype=np.bool)
-            zp[i * num_nodes + p] = True
-            pauli_list.append([penalty, Pauli(zp, zero)])
-            shift += -penalty
-
-    for p in range(num_nodes):
-        for i in range(num_nodes):
-            for j in range(i):
-                shift += penalty / 2
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + p] = True
-                pauli_list.append([-penalty / 2, Pauli(zp, zero)])
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[j * num_nodes + p] = True
-                pauli_list.append([-penalty / 2, Pauli(zp, zero)])
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + p] = True
-                zp[j * num_nodes + p] = True
-                pauli_list.append([penalty / 2, Pauli(zp, zero)])
-
-    for i in range(num_nodes):
-        for p in range(num_nodes):
-            for q in range(p):
-                shift += penalty / 2
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + p] = True
-                pauli_list.append([-penalty / 2, Pauli(zp, zero)])
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + q] = True
-                pauli_list.append([-penalty / 2, Pauli(zp, zero)])
-
-                zp = np.zeros(num_qubits, dtype=np.bool)
-                zp[i * num_nodes + p] = True
-                zp[i * num_nodes + q] = True
-                pauli_list.append([penalty / 2, Pauli(zp, zero)])
+    nodes = np.arange(num_nodes)
+    linear = np.zeros(num_qubits)
+    rows, cols, values = [], [], []
+
+    # distance terms w_ij x_{i,p} x_{j,p+1}, for i != j
+    i, j, p = [a.ravel() for a in np.meshgrid(nodes, nodes, nodes, indexing='ij')]
+    i, j, p = i[i != j], j[i != j], p[i != j]
+    weights = ins.w[i, j] / 4
+    shift = np.sum(weights)
+    linear -= np.bincount(i * num_nodes + p, weights, minlength=num_qubits)
+    linear -= np.bincount(j * num_nodes + (p + 1) % num_nodes, weights, minlength=num_qubits)
+    rows.append(i * num_nodes + p)
+    cols.append(j * num_nodes + (p + 1) % num_nodes)
+    values.append(weights)
+
+    linear += penalty
+    shift += -penalty * num_qubits
+
+    # penalty on two nodes at the same position p, and on one node at two positions p and q
+    a, b = np.tril_indices(num_nodes, -1)
+    for qubits_a, qubits_b in [(a * num_nodes + nodes[:, None], b * num_nodes + nodes[:, None]),
+                               (nodes[:, None] * num_nodes + a, nodes[:, None] * num_nodes + b)]:
+        qubits_a, qubits_b = qubits_a.ravel(), qubits_b.ravel()
+        shift += penalty / 2 * len(qubits_a)
+        linear -= penalty / 2 * np.bincount(qubits_a, minlength=num_qubits)
+        linear -= penalty / 2 * np.bincount(qubits_b, minlength=num_qubits)
+        rows.append(qubits_a)
+        cols.append(qubits_b)
+        values.append(np.full(len(qubits_a), penalty / 2))
     shift += 2 * penalty * num_nodes
-    return Operator(paulis=pauli_list), shift
+
+    quadratic = scisparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                                     shape=(num_qubits, num_qubits))
+    return Operator.from_diagonal_ising(DiagonalIsing.from_quadratic_form(num_qubits, 0.0, linear, quadratic)), shift
 
 
 def tsp_value(z, w):
@@ -278,16 +245,4 @@ def sample_most_likely(state_vector):
     Returns:
         numpy.ndarray: binary string as numpy.ndarray of ints.
     """
-    if isinstance(state_vector, dict) or isinstance(state_vector, OrderedDict):
-        # get the binary string with the largest count
-        binary_string = sorted(state_vector.items(), key=lambda kv: kv[1])[-1][0]
-        x = np.asarray([int(y) for y in reversed(list(binary_string))])
-        return x
-    else:
-        n = int(np.log2(state_vector.shape[0]))
-        k = np.argmax(np.abs(state_vector))
-        x = np.zeros(n)
-        for i in range(n):
-            x[i] = k % 2
-            k >>= 1
-        return x
+    return most_likely_bitstring(state_vector)
@@ -32,6 +32,7 @@ from .qpsolver import optimize_svm
 from .circuit_factory import CircuitFactory
 from .run_circuits import compile_and_run_circuits, find_regs_by_name
 from .circuit_cache import CircuitCache
+from .transpile_cache import TranspileCache
 from .backend_utils import has_ibmq, has_aer
 
 
@@ -60,6 +61,7 @@ __all__ = [
     'compile_and_run_circuits',
     'find_regs_by_name',
     'CircuitCache',
+    'TranspileCache',
     'has_ibmq',
     'has_aer',
 ]
@@ -16,30 +16,36 @@
 # =============================================================================
 
 """ A utility for caching and reparameterizing circuits, rather than compiling from scratch
-with each iteration. Note that if the circuit is transpiled aggressively such that rotation parameters
-cannot be easily mapped from the uncompiled to compiled circuit, caching will fail gracefully to
-standard compilation. This will be noted by multiple cache misses in the DEBUG log. It is generally safer to
-skip the transpiler (aqua_dict['backend']['skip_transpiler'] = True) when using caching.
+with each iteration.
+
+Circuits are cached as compiled templates keyed by their structure, i.e. the sequence of
+instructions, the qubits and clbits they act on and the number of parameters of each of them,
+but not the parameter values. When a structure is seen for the first time, two probe copies of the
+circuit, whose parameters are replaced by distinct tag values, are compiled together. Every
+parameter of the compiled instructions is then traced back to the parameter of the uncompiled
+circuit it was derived from (possibly negated, halved or doubled by the unroller), or recognized as
+a constant of the compilation. Later circuits with the same structure skip transpilation and
+assembly entirely: their parameter vector is mapped onto the compiled parameter slots in one
+vectorized step and written into preallocated qobj experiments. If the transpiler merges or
+rewrites parameters in a way that cannot be traced, caching fails gracefully to standard
+compilation. This will be noted by cache misses in the DEBUG log.
 
 Caching is controlled via the aqua_dict['problem']['circuit_caching'] parameter. Setting skip_qobj_deepcopy = True
-reuses the same qobj object over and over to avoid deepcopying. It is controlled via the aqua_dict['problem'][
+reuses the same qobj experiments over and over to avoid deepcopying. It is controlled via the aqua_dict['problem'][
 'skip_qobj_deepcopy'] parameter.
 
 You may also specify a filename into which to store the cache as a pickle file, for circuits which
 are expensive to compile even the first time. The filename is set in aqua_dict['problem']['circuit_cache_file'].
 If a filename is present, the system will attempt to load from the file.
 
-In the event of an error, the system will fail gracefully, compile from scratch, and cache the new
-compiled qobj and mapping in the file location in pickled form. It will fail over 5 times before deciding
-that caching should be disabled."""
+In the event of an error, the system will fail gracefully and compile from scratch. It will fail over
+`allowed_misses` times before deciding that caching should be disabled."""
 
 import numpy as np
 import copy
 import pickle
 import logging
 
-from qiskit import QuantumRegister
-from qiskit.circuit import CompositeGate
 from qiskit.compiler.run_config import RunConfig
 from qiskit.qobj import Qobj, QasmQobjConfig
 
@@ -47,6 +53,145 @@ from qiskit.aqua.aqua_error import AquaError
 
 logger = logging.getLogger(__name__)
 
+# factors the unroller may apply to a parameter when expanding a gate into basis gates,
+# e.g. crz(t) -> u1(t/2) cx u1(-t/2) cx
+_SLOT_SCALES = (1., -1., 0.5, -0.5, 2., -2.)
+_SLOT_ATOL = 1e-9
+
+
+def _is_parameter_source(instruction):
+    params = getattr(instruction, 'params', None)
+    return params is not None and len(params) > 0 and instruction.name != 'snapshot'
+
+
+def circuit_signature(circuit):
+    """
+    Compute the structure of a circuit and extract its parameter vector.
+
+    Args:
+        circuit (QuantumCircuit): the uncompiled circuit
+
+    Returns:
+        tuple: the hashable structure of the circuit, which excludes the parameter values
+        numpy.ndarray: the parameter values of the circuit, in instruction order
+
+    Raises:
+        TypeError: if a parameter can not be represented as a real number
+    """
+    structure = [tuple((reg.name, reg.size) for reg in circuit.qregs),
+                 tuple((reg.name, reg.size) for reg in circuit.cregs)]
+    values = []
+    for instruction, qargs, cargs in circuit.data:
+        if _is_parameter_source(instruction):
+            values.extend(instruction.params)
+            num_params = len(instruction.params)
+        else:
+            num_params = 0
+        structure.append((instruction.name,
+                          tuple((reg.name, idx) for reg, idx in qargs),
+                          tuple((reg.name, idx) for reg, idx in cargs),
+                          num_params))
+    return tuple(structure), np.asarray(values, dtype=float)
+
+
+def _parameterized_instructions(experiment):
+    for instruction_index, instruction in enumerate(experiment.instructions):
+        if _is_parameter_source(instruction):
+            yield instruction_index, instruction
+
+
+def _trace_parameter_slots(experiment_a, experiment_b, tags_a, tags_b):
+    """
+    Trace the parameters of the instructions of a compiled experiment back to
+    the parameter vector of the uncompiled circuit.
+
+    Args:
+        experiment_a (QasmQobjExperiment): the compiled experiment of the probe tagged with `tags_a`
+        experiment_b (QasmQobjExperiment): the compiled experiment of the probe tagged with `tags_b`
+        tags_a (numpy.ndarray): the parameter values of the first probe
+        tags_b (numpy.ndarray): the parameter values of the second probe
+
+    Returns:
+        dict: instruction index -> tuple of (source index, scale, constant) per parameter,
+              where the source index is -1 for parameters which are constant.
+
+    Raises:
+        AquaError: if the probes compile to different structures or a parameter can not be traced
+    """
+    instructions_a = experiment_a.instructions
+    instructions_b = experiment_b.instructions
+    if len(instructions_a) != len(instructions_b):
+        raise AquaError("Probe circuits compiled to {} and {} instructions".format(len(instructions_a),
+                                                                                    len(instructions_b)))
+    mapping = {}
+    for instruction_index, instruction_a in _parameterized_instructions(experiment_a):
+        instruction_b = instructions_b[instruction_index]
+        if instruction_a.name != instruction_b.name or \
+                getattr(instruction_a, 'qubits', None) != getattr(instruction_b, 'qubits', None) or \
+                len(instruction_a.params) != len(getattr(instruction_b, 'params', [])):
+            raise AquaError("Probe circuits compiled to different instructions at index {}: {} and {}".format(
+                instruction_index, instruction_a.name, instruction_b.name))
+        slots = []
+        for value_a, value_b in zip(np.asarray(instruction_a.params, dtype=float),
+                                    np.asarray(instruction_b.params, dtype=float)):
+            if abs(value_a - value_b) <= _SLOT_ATOL:
+                slots.append((-1, 0., float(value_a)))
+                continue
+            matches = [(int(source), scale) for scale in _SLOT_SCALES
+                       for source in np.flatnonzero((np.abs(scale * tags_a - value_a) <= _SLOT_ATOL) &
+                                                    (np.abs(scale * tags_b - value_b) <= _SLOT_ATOL))]
+            if len(matches) != 1:
+                raise AquaError("Parameter of compiled instruction {} ({}) can not be traced "
+                                "back to the circuit".format(instruction_index, instruction_a.name))
+            slots.append((matches[0][0], matches[0][1], 0.))
+        mapping[instruction_index] = tuple(slots)
+    return mapping
+
+
+class _CircuitTemplate:
+    """A compiled experiment with the parameter slots of its instructions."""
+
+    def __init__(self, experiment, mapping):
+        self.experiment = experiment
+        self.mapping = mapping
+        sources, scales, constants = [], [], []
+        self.slots = []
+        for instruction_index in sorted(mapping):
+            start = len(sources)
+            for source, scale, constant in mapping[instruction_index]:
+                sources.append(source)
+                scales.append(scale)
+                constants.append(constant)
+            self.slots.append((instruction_index, start, len(sources)))
+        self.sources = np.asarray(sources, dtype=int)
+        self.scales = np.asarray(scales, dtype=float)
+        self.constants = np.asarray(constants, dtype=float)
+        self.variables = np.flatnonzero(self.sources >= 0)
+        self._pool = {}
+
+    def compiled_parameters(self, values):
+        """
+        Map parameter vectors of the uncompiled circuit to the compiled parameter slots.
+
+        Args:
+            values (numpy.ndarray): one parameter vector per row
+
+        Returns:
+            numpy.ndarray: one row of compiled parameters per parameter vector
+        """
+        compiled = np.tile(self.constants, (values.shape[0], 1))
+        compiled[:, self.variables] = values[:, self.sources[self.variables]] * self.scales[self.variables]
+        return compiled
+
+    def experiment_for(self, key):
+        """Return the preallocated experiment and the slot instructions reserved for `key`."""
+        if key not in self._pool:
+            experiment = copy.deepcopy(self.experiment)
+            instructions = [(experiment.instructions[instruction_index], start, stop)
+                            for instruction_index, start, stop in self.slots]
+            self._pool[key] = (experiment, instructions)
+        return self._pool[key]
+
 
 class CircuitCache:
 
@@ -59,83 +204,90 @@ class CircuitCache:
         self.misses = 0
         self.qobjs = []
         self.mappings = []
-        self.cache_transpiled_circuits = False
-        self.try_reusing_qobjs = True
+        self.signatures = []
         self.allowed_misses = allowed_misses
+        self._templates = {}
+        self._untraceable = set()
         try:
             self.try_loading_cache_from_file()
         except(EOFError, FileNotFoundError) as e:
             logger.warning("Error loading cache from file {0}: {1}".format(self.cache_file, repr(e)))
 
-    def cache_circuit(self, qobj, circuits, chunk):
+    def _add_template(self, signature, qobj, mapping):
+        self.signatures.append(signature)
+        self.qobjs.append(qobj)
+        self.mappings.append(mapping)
+        self._templates[signature] = _CircuitTemplate(qobj.experiments[0], mapping)
+
+    def cache_circuit(self, circuits, compile_fn):
         """
-        A method for caching compiled qobjs by storing the compiled qobj
-        and constructing a mapping array from the uncompiled operations in the circuit
-        to the instructions in the qobj. Note that the "qobjs" list in the cache dict is a
-        list of the cached chunks, each element of which contains a single qobj with as
-        many experiments as is allowed by the execution backend. E.g. if the backend allows
-        300 experiments per job and the user wants to run 500 circuits,
-        len(circuit_cache['qobjs']) == 2,
-        len(circuit_cache['qobjs'][0].experiments) == 300, and
-        len(circuit_cache['qobjs'][1].experiments) == 200.
+        A method for caching compiled templates for the structures of `circuits` which are not cached yet.
+        Two probe copies of each new structure are compiled in a single call of `compile_fn`,
+        and the parameters of the compiled instructions are traced back to the circuit parameters.
+        The compiled experiment of each structure is stored in its own single-experiment qobj in
+        `qobjs`, with the parameter slots of its instructions stored in `mappings`.
 
         This feature is only applied if 'circuit_caching' is True in the 'problem' Aqua
         dictionary section.
 
         Args:
-            qobj (Qobj): A compiled qobj to be saved
             circuits (list): The original uncompiled QuantumCircuits
-            chunk (int): If a larger list of circuits was broken into chunks by run_algorithm for separate runs,
-            which chunk number `circuits` represents
+            compile_fn (callable): compiles a list of QuantumCircuits into a Qobj, with one experiment per circuit
+
+        Structures whose compiled parameters can not be traced back to the circuit parameters
+        are remembered and not compiled as probes again.
+
+        Raises:
+            TypeError: if a circuit parameter can not be represented as a real number
         """
+        rng = np.random.RandomState(50)
+        new_signatures = []
+        probes = []
+        tags = []
+        for circuit in circuits:
+            signature, values = circuit_signature(circuit)
+            if signature in self._templates or signature in self._untraceable or signature in new_signatures:
+                continue
+            # two sets of distinct generic angles, so that no parameter is optimized away
+            # and every compiled parameter can be traced back to its source
+            tags_a = rng.permutation(len(values)) * 0.37 / max(len(values), 1) + rng.uniform(1.1, 1.4)
+            tags_b = rng.permutation(len(values)) * 0.41 / max(len(values), 1) + rng.uniform(1.7, 2.0)
+            for probe_tags in (tags_a, tags_b):
+                probe = copy.deepcopy(circuit)
+                offset = 0
+                for instruction, _, _ in probe.data:
+                    if _is_parameter_source(instruction):
+                        num_params = len(instruction.params)
+                        instruction.params = probe_tags[offset:offset + num_params].tolist()
+                        offset += num_params
+                probes.append(probe)
+            new_signatures.append(signature)
+            tags.append((tags_a, tags_b))
 
-        self.qobjs.insert(chunk, copy.deepcopy(qobj))
+        if len(new_signatures) == 0:
+            return
 
-        self.mappings.insert(chunk, [{} for i in range(len(circuits))])
-        for circ_num, input_circuit in enumerate(circuits):
+        qobj = compile_fn(probes)
+        for i, signature in enumerate(new_signatures):
+            experiment_a = qobj.experiments[2 * i]
+            experiment_b = qobj.experiments[2 * i + 1]
+            try:
+                mapping = _trace_parameter_slots(experiment_a, experiment_b, *tags[i])
+            except AquaError as e:
+                logger.debug("Circuit template could not be cached: {}".format(e))
+                self._untraceable.add(signature)
+                continue
+            template_qobj = copy.copy(qobj)
+            template_qobj.experiments = [experiment_a]
+            self._add_template(signature, template_qobj, mapping)
+            logger.debug("Cached circuit template with {} parameterized instructions.".format(len(mapping)))
 
-            qreg_sizes = [reg.size for reg in input_circuit.qregs if isinstance(reg, QuantumRegister)]
-            qreg_indeces = {reg.name: sum(qreg_sizes[0:i]) for i, reg in enumerate(input_circuit.qregs)}
-            op_graph = {}
-
-            # Unroll circuit in case of composite gates
-            raw_gates = []
-            for gate in input_circuit.data:
-                if isinstance(gate, CompositeGate): raw_gates += gate.instruction_list()
-                else: raw_gates += [gate]
-
-            for i, (uncompiled_gate, regs, _) in enumerate(raw_gates):
-                if not hasattr(uncompiled_gate, 'params') or len(uncompiled_gate.params) < 1: continue
-                if uncompiled_gate.name == 'snapshot': continue
-                qubits = [qubit+qreg_indeces[reg.name] for reg, qubit in regs if isinstance(reg, QuantumRegister)]
-                gate_type = uncompiled_gate.name
-                type_and_qubits = gate_type + qubits.__str__()
-                op_graph[type_and_qubits] = \
-                    op_graph.get(type_and_qubits, []) + [i]
-            mapping = {}
-            for compiled_gate_index, compiled_gate in enumerate(qobj.experiments[circ_num].instructions):
-                if not hasattr(compiled_gate, 'params') or len(compiled_gate.params) < 1: continue
-                if compiled_gate.name == 'snapshot': continue
-                type_and_qubits = compiled_gate.name + compiled_gate.qubits.__str__()
-                if len(op_graph[type_and_qubits]) > 0:
-                    uncompiled_gate_index = op_graph[type_and_qubits].pop(0)
-                    (uncompiled_gate, regs, _) = raw_gates[uncompiled_gate_index]
-                    qubits = [qubit + qreg_indeces[reg.name] for reg, qubit in regs if isinstance(reg, QuantumRegister)]
-                    if (compiled_gate.name == uncompiled_gate.name) and (compiled_gate.qubits.__str__() ==
-                                                                         qubits.__str__()):
-                        mapping[compiled_gate_index] = uncompiled_gate_index
-                else: raise AquaError("Circuit shape does not match qobj, found extra {} instruction in qobj".format(
-                    type_and_qubits))
-            self.mappings[chunk][circ_num] = mapping
-            for type_and_qubits, ops in op_graph.items():
-                if len(ops) > 0:
-                    raise AquaError("Circuit shape does not match qobj, found extra {} in circuit".format(type_and_qubits))
         if self.cache_file is not None and len(self.cache_file) > 0:
             with open(self.cache_file, 'wb') as cache_handler:
                 qobj_dicts = [qob.to_dict() for qob in self.qobjs]
                 pickle.dump({'qobjs': qobj_dicts,
                              'mappings': self.mappings,
-                             'transpile': self.cache_transpiled_circuits},
+                             'signatures': self.signatures},
                             cache_handler,
                             protocol=pickle.HIGHEST_PROTOCOL)
                 logger.debug("Circuit cache saved to file: {}".format(self.cache_file))
@@ -148,55 +300,58 @@ class CircuitCache:
                 except (EOFError) as e:
                     logger.debug("No cache found in file: {}".format(self.cache_file))
                     return
-                self.qobjs = [Qobj.from_dict(qob) for qob in cache['qobjs']]
-                self.mappings = cache['mappings']
-                self.cache_transpiled_circuits = cache['transpile']
+                if 'signatures' not in cache:
+                    logger.debug("Ignoring cache in an outdated format in file: {}".format(self.cache_file))
+                    return
+                for signature, qobj_dict, mapping in zip(cache['signatures'], cache['qobjs'], cache['mappings']):
+                    self._add_template(signature, Qobj.from_dict(qobj_dict), mapping)
                 logger.debug("Circuit cache loaded from file: {}".format(self.cache_file))
 
-    # Note that this function overwrites the previous cached qobj for speed
+    # Note that this function overwrites the parameters of the previous qobj experiments for speed
     def load_qobj_from_cache(self, circuits, chunk, run_config=None):
-        self.try_loading_cache_from_file()
+        """
+        Build the qobj of `circuits` from the cached templates of their structures.
+
+        Args:
+            circuits (list): The uncompiled QuantumCircuits
+            chunk (int): If a larger list of circuits was broken into chunks for separate runs,
+                which chunk number `circuits` represents. Chunks use distinct preallocated experiments.
+            run_config (RunConfig, optional): configuration for running the circuits
 
-        if self.try_reusing_qobjs and self.qobjs is not None and len(self.qobjs) > 0 and len(self.qobjs) <= chunk:
-            self.mappings.insert(chunk, self.mappings[0])
-            self.qobjs.insert(chunk, copy.deepcopy(self.qobjs[0]))
+        Returns:
+            Qobj: the qobj ready for execution
 
+        Raises:
+            AquaError: if the structure of a circuit has no cached template
+        """
+        self.try_loading_cache_from_file()
+        if len(self.qobjs) == 0:
+            raise AquaError("Circuit cache is empty")
+
+        # group the circuits by template, so that their parameters are mapped in one step per template
+        occurrences = {}
         for circ_num, input_circuit in enumerate(circuits):
+            signature, values = circuit_signature(input_circuit)
+            template = self._templates.get(signature)
+            if template is None:
+                raise AquaError("No cached template matches the structure of circuit {}".format(input_circuit.name))
+            occurrences.setdefault(signature, []).append((circ_num, values))
+
+        experiments = [None] * len(circuits)
+        for signature, entries in occurrences.items():
+            template = self._templates[signature]
+            compiled = template.compiled_parameters(np.asarray([values for _, values in entries], dtype=float))
+            for k, (circ_num, _) in enumerate(entries):
+                experiment, instructions = template.experiment_for((chunk, k))
+                row = compiled[k].tolist()
+                for instruction, start, stop in instructions:
+                    instruction.params = row[start:stop]
+                experiment.header.name = circuits[circ_num].name
+                experiments[circ_num] = experiment
 
-            # If there are too few experiments in the cache, try reusing the first experiment.
-            # Only do this for the first chunk. Subsequent chunks should rely on these copies
-            # through the deepcopy above.
-            if self.try_reusing_qobjs and chunk == 0 and circ_num > 0 and len(self.qobjs[chunk].experiments) <= \
-                    circ_num:
-                self.qobjs[0].experiments.insert(circ_num, copy.deepcopy(self.qobjs[0].experiments[0]))
-                self.mappings[0].insert(circ_num, self.mappings[0][0])
-
-            # Unroll circuit in case of composite gates
-            raw_gates = []
-            for gate in input_circuit.data:
-                if isinstance(gate, CompositeGate): raw_gates += gate.instruction_list()
-                else: raw_gates += [gate]
-            self.qobjs[chunk].experiments[circ_num].header.name = input_circuit.name
-            for gate_num, compiled_gate in enumerate(self.qobjs[chunk].experiments[circ_num].instructions):
-                if not hasattr(compiled_gate, 'params') or len(compiled_gate.params) < 1: continue
-                if compiled_gate.name == 'snapshot': continue
-                cache_index = self.mappings[chunk][circ_num][gate_num]
-                (uncompiled_gate, regs, _) = raw_gates[cache_index]
-
-                # Need the 'getattr' wrapper because measure has no 'params' field and breaks this.
-                if not len(getattr(compiled_gate, 'params', [])) == len(getattr(uncompiled_gate, 'params', [])) or \
-                    not compiled_gate.name == uncompiled_gate.name:
-                    raise AquaError('Gate mismatch at gate {0} ({1}, {2} params) of circuit against gate {3} ({4}, '
-                                    '{5} params) of cached qobj'.format(cache_index,
-                                                                 uncompiled_gate.name,
-                                                                 len(uncompiled_gate.params),
-                                                                 gate_num,
-                                                                 compiled_gate.name,
-                                                                 len(compiled_gate.params)))
-                compiled_gate.params = np.array(uncompiled_gate.params, dtype=float).tolist()
-        exec_qobj = copy.copy(self.qobjs[chunk])
-        if self.skip_qobj_deepcopy: exec_qobj.experiments = self.qobjs[chunk].experiments[0:len(circuits)]
-        else: exec_qobj.experiments = copy.deepcopy(self.qobjs[chunk].experiments[0:len(circuits)])
+        exec_qobj = copy.copy(self.qobjs[0])
+        if self.skip_qobj_deepcopy: exec_qobj.experiments = experiments
+        else: exec_qobj.experiments = copy.deepcopy(experiments)
 
         if run_config is None:
             run_config = RunConfig(shots=1024, max_credits=10, memory=False)
@@ -208,4 +363,6 @@ class CircuitCache:
     def clear_cache(self):
         self.qobjs = []
         self.mappings = []
-        self.try_reusing_qobjs = True
+        self.signatures = []
+        self._templates = {}
+        self._untraceable = set()
@@ -17,10 +17,15 @@
 """
 Abstract CircuitFactory to build a circuit, along with inverse, controlled
 and power combinations of the circuit.
+
+The controlled sub-circuits are built once per target, control and ancilla qubits, basis setting and
+registers of the circuit, and cached by the factory, which is assumed not to change once built. Powers
+are assembled from the cached body by reference, so a controlled power costs a single unroll-and-control
+pass whatever the power.
 """
 
 from abc import ABC, abstractmethod
-from qiskit import QuantumCircuit
+from qiskit import QuantumCircuit, QuantumRegister
 from qiskit.aqua.utils.controlledcircuit import get_controlled_circuit
 
 
@@ -30,7 +35,7 @@ class CircuitFactory(ABC):
 
     def __init__(self, num_target_qubits):
         self._num_target_qubits = num_target_qubits
-        pass
+        self._controlled_circuits = {}
 
     @property
     def num_target_qubits(self):
@@ -75,6 +80,34 @@ class CircuitFactory(ABC):
         self.build(qc_, q, q_ancillas)
         qc.extend(qc_.inverse())
 
+    @property
+    def has_closed_form_power(self):
+        """ Whether `build_power` builds the powers in closed form, e.g. as a single rotation by a multiple
+            of an angle; a controlled power then controls the power circuit once instead of repeating
+            the controlled circuit """
+        return False
+
+    def _get_controlled_circuit(self, qc, key, construct):
+        # the controlled sub-circuits of a factory, by qubits, basis setting and registers of the circuit
+        controlled_circuits = getattr(self, '_controlled_circuits', None)
+        if controlled_circuits is None:
+            controlled_circuits = self._controlled_circuits = {}
+        key = tuple(tuple(item) if isinstance(item, (list, QuantumRegister)) else item for item in key)
+        key += (tuple(qc.qregs),)
+        controlled_circuit = controlled_circuits.get(key)
+        if controlled_circuit is None:
+            controlled_circuit = construct()
+            controlled_circuits[key] = controlled_circuit
+        return controlled_circuit
+
+    @staticmethod
+    def _extend_by_reference(qc, circuit, repetitions=1):
+        # the instructions of the cached circuit are shared, not copied
+        for qreg in circuit.qregs:
+            if not qc.has_register(qreg):
+                qc.add_register(qreg)
+        qc.data += circuit.data * repetitions
+
     def build_controlled(self, qc, q, q_control, q_ancillas=None, use_basis_gates=True):
         """ Adds corresponding controlled sub-circuit to given circuit
 
@@ -85,11 +118,14 @@ class CircuitFactory(ABC):
             q_ancillas : list of ancilla qubits (or None if none needed)
             use_basis_gates: use basis gates for expansion of controlled circuit
         """
-        uncontrolled_circuit = QuantumCircuit(*qc.qregs)
-        self.build(uncontrolled_circuit, q, q_ancillas)
+        def construct():
+            uncontrolled_circuit = QuantumCircuit(*qc.qregs)
+            self.build(uncontrolled_circuit, q, q_ancillas)
+            return get_controlled_circuit(uncontrolled_circuit, q_control, use_basis_gates=use_basis_gates)
 
-        controlled_circuit = get_controlled_circuit(uncontrolled_circuit, q_control, use_basis_gates=use_basis_gates)
-        qc.extend(controlled_circuit)
+        controlled_circuit = self._get_controlled_circuit(
+            qc, ('controlled', q, q_control, q_ancillas, use_basis_gates), construct)
+        self._extend_by_reference(qc, controlled_circuit)
 
     def build_controlled_inverse(self, qc, q, q_control, q_ancillas=None, use_basis_gates=True):
         """ Adds controlled inverse of corresponding sub-circuit to given circuit
@@ -101,14 +137,19 @@ class CircuitFactory(ABC):
             q_ancillas : list of ancilla qubits (or None if none needed)
             use_basis_gates: use basis gates for expansion of controlled circuit
         """
-        qc_ = QuantumCircuit(*qc.qregs)
+        def construct():
+            qc_ = QuantumCircuit(*qc.qregs)
+            self.build_controlled(qc_, q, q_control, q_ancillas, use_basis_gates)
+            return qc_.inverse()
 
-        self.build_controlled(qc_, q, q_control, q_ancillas, use_basis_gates)
-        qc.extend(qc_.inverse())
+        controlled_circuit = self._get_controlled_circuit(
+            qc, ('controlled_inverse', q, q_control, q_ancillas, use_basis_gates), construct)
+        self._extend_by_reference(qc, controlled_circuit)
 
     def build_power(self, qc, q, power, q_ancillas=None):
         """ Adds power of corresponding circuit.
-            May be overridden if a more efficient implementation is possible """
+            May be overridden if a more efficient implementation is possible,
+            see `has_closed_form_power` """
         for _ in range(power):
             self.build(qc, q, q_ancillas)
 
@@ -120,12 +161,43 @@ class CircuitFactory(ABC):
 
     def build_controlled_power(self, qc, q, q_control, power, q_ancillas=None, use_basis_gates=True):
         """ Adds controlled power of corresponding circuit.
+            The controlled circuit is built once and repeated by reference, or, if the factory
+            has closed-form powers, the power circuit is controlled once.
             May be overridden if a more efficient implementation is possible """
-        for _ in range(power):
-            self.build_controlled(qc, q, q_control, q_ancillas, use_basis_gates)
+        if power <= 0:
+            return
+        if self.has_closed_form_power:
+            def construct():
+                uncontrolled_circuit = QuantumCircuit(*qc.qregs)
+                self.build_power(uncontrolled_circuit, q, power, q_ancillas)
+                return get_controlled_circuit(uncontrolled_circuit, q_control, use_basis_gates=use_basis_gates)
+
+            controlled_circuit = self._get_controlled_circuit(
+                qc, ('controlled_power', power, q, q_control, q_ancillas, use_basis_gates), construct)
+            self._extend_by_reference(qc, controlled_circuit)
+            return
+
+        def construct():
+            qc_ = QuantumCircuit(*qc.qregs)
+            self.build_controlled(qc_, q, q_control, q_ancillas, use_basis_gates)
+            return qc_
+
+        controlled_circuit = self._get_controlled_circuit(
+            qc, ('controlled', q, q_control, q_ancillas, use_basis_gates), construct)
+        self._extend_by_reference(qc, controlled_circuit, power)
 
     def build_controlled_inverse_power(self, qc, q, q_control, power, q_ancillas=None, use_basis_gates=True):
         """ Adds controlled, inverse, power of corresponding circuit.
+            The controlled inverse circuit is built once and repeated by reference.
             May be overridden if a more efficient implementation is possible """
-        for _ in range(power):
-            self.build_controlled_inverse(qc, q, q_control, q_ancillas, use_basis_gates)
+        if power <= 0:
+            return
+
+        def construct():
+            qc_ = QuantumCircuit(*qc.qregs)
+            self.build_controlled_inverse(qc_, q, q_control, q_ancillas, use_basis_gates)
+            return qc_
+
+        controlled_circuit = self._get_controlled_circuit(
+            qc, ('controlled_inverse', q, q_control, q_ancillas, use_basis_gates), construct)
+        self._extend_by_reference(qc, controlled_circuit, power)
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+""" Measurement of sets of commuting Paulis with Clifford diagonalization circuits.
+
+Paulis which commute, but not qubit-wise, can not be measured in a tensor product basis; they still
+share an eigenbasis, which a Clifford circuit maps onto the computational basis. After the circuit,
+every Pauli of the set is a Z-type Pauli up to a sign, and its eigenvalue for a measured bitstring is
+the parity of the bits of its support. The circuit is found on the symplectic (X | Z) representation
+of the set: the X block is brought to reduced row echelon form over GF(2), the way `Operator.kernel_F2`
+does, then CNOTs clear the X bits out of the pivot columns, CZs and S gates clear the Z bits of the
+pivot rows and Hadamards turn the pivot X's into Z's.
+"""
+
+import logging
+
+import numpy as np
+from qiskit.qasm import pi
+
+from qiskit.aqua.aqua_error import AquaError
+from qiskit.aqua.utils.packed_paulis import (pack_bits, unpack_bits, popcount, counts_to_outcomes,
+                                             expectations_and_covariance)
+
+logger = logging.getLogger(__name__)
+
+_H = 'h'
+_S = 's'
+_S_DG = 'sdg'
+_CX = 'cx'
+
+
+def anticommutation(z_a, x_a, z_b, x_b):
+    """
+    Anticommutation of the Paulis of `a` with the Paulis of `b`, the parity of their symplectic product.
+
+    Args:
+        z_a (numpy.ndarray): packed Z words of `a`, one row per Pauli
+        x_a (numpy.ndarray): packed X words of `a`, one row per Pauli
+        z_b (numpy.ndarray): packed Z words of `b`, one row per Pauli
+        x_b (numpy.ndarray): packed X words of `b`, one row per Pauli
+
+    Returns:
+        numpy.ndarray: boolean matrix, True at (i, j) if a[i] and b[j] anticommute
+    """
+    product = (z_a[:, None] & x_b[None]) ^ (x_a[:, None] & z_b[None])
+    return (np.sum(popcount(product), axis=2) & 1).astype(bool)
+
+
+def group_commuting_paulis(packed_paulis):
+    """
+    Partition Paulis into sets of commuting Paulis by sorted insertion: the Paulis of the largest
+    weights first, each into the first set it commutes with.
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis
+
+    Returns:
+        list[numpy.ndarray]: the sorted indices of the Paulis of each set
+    """
+    num_paulis = len(packed_paulis)
+    z, x = packed_paulis.z, packed_paulis.x
+    group_of = np.full(num_paulis, -1, dtype=np.int64)
+    placed = []
+    num_groups = 0
+    for i in np.argsort(-np.abs(packed_paulis.coeffs), kind='stable'):
+        group = num_groups
+        if num_groups > 0:
+            others = np.asarray(placed)
+            blocked = np.zeros(num_groups, dtype=bool)
+            blocked[group_of[others[anticommutation(z[i:i + 1], x[i:i + 1], z[others], x[others])[0]]]] = True
+            free = np.flatnonzero(~blocked)
+            if len(free) > 0:
+                group = int(free[0])
+        if group == num_groups:
+            num_groups += 1
+        group_of[i] = group
+        placed.append(i)
+    return [np.flatnonzero(group_of == group) for group in range(num_groups)]
+
+
+class CommutingSet(object):
+    """A set of commuting Paulis and the Clifford circuit which diagonalizes all of them."""
+
+    def __init__(self, indices, z_bits, x_bits):
+        """
+        Constructor.
+
+        Args:
+            indices (numpy.ndarray): the indices of the Paulis of the set in the operator
+            z_bits (numpy.ndarray): boolean matrix (num_paulis, num_qubits) of the Z bits of the set
+            x_bits (numpy.ndarray): boolean matrix (num_paulis, num_qubits) of the X bits of the set
+        """
+        self._indices = np.asarray(indices)
+        self._num_qubits = z_bits.shape[1]
+        if self._is_tensor_product_basis(z_bits, x_bits):
+            self._gates = self._tensor_product_basis_gates(z_bits, x_bits)
+        else:
+            self._gates = self._diagonalizing_gates(z_bits.copy(), x_bits.copy())
+        z_diag, self._signs = self._conjugate(z_bits, x_bits)
+        self._masks = pack_bits(z_diag)
+
+    @property
+    def indices(self):
+        """Return the indices of the Paulis of the set in the operator."""
+        return self._indices
+
+    @property
+    def num_gates(self):
+        """Return the number of gates of the diagonalization circuit."""
+        return len(self._gates)
+
+    @property
+    def masks(self):
+        """Return the packed supports of the diagonalized Paulis, one row per Pauli."""
+        return self._masks
+
+    @property
+    def signs(self):
+        """Return the sign (+1 or -1) of each diagonalized Pauli."""
+        return self._signs
+
+    @staticmethod
+    def _is_tensor_product_basis(z_bits, x_bits):
+        # every qubit is acted on by a single non-identity Pauli, or by none
+        support = z_bits | x_bits
+        for bits in (z_bits, x_bits):
+            if np.any(np.any(support & bits, axis=0) & np.any(support & ~bits, axis=0)):
+                return False
+        return True
+
+    @staticmethod
+    def _tensor_product_basis_gates(z_bits, x_bits):
+        gates = []
+        for qubit in np.flatnonzero(np.any(x_bits, axis=0)).tolist():
+            if np.any(z_bits[:, qubit]):
+                gates.append((_S_DG, qubit))
+            gates.append((_H, qubit))
+        return gates
+
+    @staticmethod
+    def _diagonalizing_gates(z, x):
+        gates = []
+
+        def apply(gate):
+            # conjugation of the X | Z tableau, signs are tracked by `_conjugate`
+            gates.append(gate)
+            if gate[0] == _H:
+                q = gate[1]
+                z[:, q], x[:, q] = x[:, q].copy(), z[:, q].copy()
+            elif gate[0] == _S:
+                z[:, gate[1]] ^= x[:, gate[1]]
+            else:
+                control, target = gate[1], gate[2]
+                x[:, target] ^= x[:, control]
+                z[:, control] ^= z[:, target]
+
+        # reduced row echelon form of the X block; the row operations multiply Paulis of the set,
+        # which still commute and still generate all of the set
+        pivots = []
+        for col in range(z.shape[1]):
+            row = len(pivots)
+            if row == z.shape[0]:
+                break
+            candidates = np.flatnonzero(x[row:, col])
+            if len(candidates) == 0:
+                continue
+            swap = row + candidates[0]
+            x[[row, swap]] = x[[swap, row]]
+            z[[row, swap]] = z[[swap, row]]
+            others = np.flatnonzero(x[:, col])
+            others = others[others != row]
+            x[others] ^= x[row]
+            z[others] ^= z[row]
+            pivots.append(col)
+
+        # the pivot rows keep a single X, on their pivot column
+        for row, pivot in enumerate(pivots):
+            for qubit in np.flatnonzero(x[row]).tolist():
+                if qubit != pivot:
+                    apply((_CX, pivot, qubit))
+
+        # the Z bits of the pivot rows are symmetric on the pivot columns, since the rows commute,
+        # a CZ clears a pair of them, an S the one on the pivot itself and a Hadamard turns X into Z
+        for row, pivot in enumerate(pivots):
+            for qubit in np.flatnonzero(z[row]).tolist():
+                if qubit != pivot:
+                    apply((_H, qubit))
+                    apply((_CX, pivot, qubit))
+                    apply((_H, qubit))
+            if z[row, pivot]:
+                apply((_S, pivot))
+            apply((_H, pivot))
+        return CommutingSet._cancel_hadamards(gates)
+
+    @staticmethod
+    def _cancel_hadamards(gates):
+        # two Hadamards on a qubit with no gate on that qubit in between cancel out
+        last = {}
+        kept = [True] * len(gates)
+        for i, gate in enumerate(gates):
+            qubits = gate[1:]
+            if gate[0] == _H and last.get(gate[1]) is not None and gates[last[gate[1]]][0] == _H:
+                kept[last[gate[1]]] = False
+                kept[i] = False
+                last[gate[1]] = None
+                continue
+            for qubit in qubits:
+                last[qubit] = i
+        return [gate for gate, keep in zip(gates, kept) if keep]
+
+    def _conjugate(self, z_bits, x_bits):
+        """Conjugate the Paulis by the circuit, tracking the signs as in the Aaronson-Gottesman tableau."""
+        z = z_bits.copy()
+        x = x_bits.copy()
+        minus = np.zeros(len(z), dtype=bool)
+        for gate in self._gates:
+            if gate[0] == _H:
+                q = gate[1]
+                minus ^= x[:, q] & z[:, q]
+                z[:, q], x[:, q] = x[:, q].copy(), z[:, q].copy()
+            elif gate[0] == _S:
+                q = gate[1]
+                minus ^= x[:, q] & z[:, q]
+                z[:, q] ^= x[:, q]
+            elif gate[0] == _S_DG:
+                q = gate[1]
+                minus ^= x[:, q] & ~z[:, q]
+                z[:, q] ^= x[:, q]
+            else:
+                control, target = gate[1], gate[2]
+                minus ^= x[:, control] & z[:, target] & ~(x[:, target] ^ z[:, control])
+                x[:, target] ^= x[:, control]
+                z[:, control] ^= z[:, target]
+        if np.any(x):
+            raise AquaError("The Paulis of the set do not commute.")
+        return z, np.where(minus, -1.0, 1.0)
+
+    def build(self, qc, q):
+        """
+        Append the diagonalization circuit.
+
+        Args:
+            qc (QuantumCircuit): the circuit to append the gates to
+            q (QuantumRegister): the qubits of the operator
+        """
+        for gate in self._gates:
+            name = gate[0]
+            if name == _H:
+                qc.u2(0.0, pi, q[gate[1]])
+            elif name == _S:
+                qc.u1(pi / 2, q[gate[1]])
+            elif name == _S_DG:
+                qc.u1(-pi / 2, q[gate[1]])
+            else:
+                qc.cx(q[gate[1]], q[gate[2]])
+
+    def evaluate_counts(self, counts, coeffs):
+        """
+        Compute the contribution of the set to the mean and the variance from the measured counts.
+
+        Args:
+            counts (dict): the counts of the circuit measuring the set
+            coeffs (numpy.ndarray): the coefficients of the Paulis of the set
+
+        Returns:
+            complex: the weighted sum of the expectation values of the set
+            complex: the variance of the weighted sum
+        """
+        outcomes, weights = counts_to_outcomes(counts, self._num_qubits)
+        avg, cov = expectations_and_covariance(outcomes, weights, self._masks)
+        coeffs = coeffs * self._signs
+        return coeffs.dot(avg), coeffs.dot(cov).dot(coeffs)
+
+
+def get_commuting_sets(packed_paulis):
+    """
+    Group Paulis into commuting sets and build the diagonalization circuit of each set.
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis
+
+    Returns:
+        list[CommutingSet]: the sets
+    """
+    num_qubits = packed_paulis.num_qubits
+    z_bits = unpack_bits(packed_paulis.z, num_qubits)
+    x_bits = unpack_bits(packed_paulis.x, num_qubits)
+    commuting_sets = [CommutingSet(indices, z_bits[indices], x_bits[indices])
+                      for indices in group_commuting_paulis(packed_paulis)]
+    logger.debug('Grouped {} paulis into {} commuting sets.'.format(len(packed_paulis), len(commuting_sets)))
+    return commuting_sets
@@ -15,11 +15,50 @@
 # limitations under the License.
 # =============================================================================
 
+"""
+Construction of controlled circuits, gate by gate.
+
+Every instruction of the circuit is decomposed into the u1, u2, u3, cx and id basis gates, with
+the rules of the standard gates looked up in a table and the definitions of the other instructions
+expanded recursively, and every basis gate is replaced by its controlled gate sequence. The controlled
+sequences are memoized by gate name, parameters and basis setting and appended by reference, so
+circuits already in the basis gates are controlled without unrolling, and without any transpiler pass.
+"""
+
+from collections import OrderedDict
+
 import numpy as np
-from qiskit import QuantumCircuit, transpiler
-from qiskit.transpiler.passes import Unroller
-from qiskit.transpiler import PassManager
-from qiskit import BasicAer
+from qiskit import QuantumCircuit, QuantumRegister
+from qiskit.circuit import Gate, Instruction
+from qiskit.qasm import pi
+
+from qiskit.aqua.aqua_error import AquaError
+
+_BASIS_GATES = ['u1', 'u2', 'u3', 'cx', 'id']
+
+# the decompositions of the standard single-qubit gates into the basis gates, as in their definitions
+_DECOMPOSITIONS = {
+    'x': lambda: [('u3', (pi, 0, pi))],
+    'y': lambda: [('u3', (pi, pi / 2, pi / 2))],
+    'z': lambda: [('u1', (pi,))],
+    'h': lambda: [('u2', (0, pi))],
+    's': lambda: [('u1', (pi / 2,))],
+    'sdg': lambda: [('u1', (-pi / 2,))],
+    't': lambda: [('u1', (pi / 4,))],
+    'tdg': lambda: [('u1', (-pi / 4,))],
+    'rx': lambda theta: [('u3', (theta, -pi / 2, pi / 2))],
+    'ry': lambda theta: [('u3', (theta, 0, 0))],
+    'rz': lambda phi: [('u1', (phi,))],
+    'u0': lambda m: [('u3', (0, 0, 0))],
+}
+
+# instructions which are not controlled but kept as they are
+_UNCONTROLLED_INSTRUCTIONS = ['measure', 'barrier']
+
+_CONTROLLED_GATES_CACHE = OrderedDict()
+_CONTROLLED_GATES_CACHE_SIZE = 4096
+_CONTROLLED_INSTRUCTIONS_CACHE = OrderedDict()
+_CONTROLLED_INSTRUCTIONS_CACHE_SIZE = 4096
 
 
 def apply_cu1(circuit, lam, c, t, use_basis_gates=True):
@@ -70,6 +109,111 @@ def apply_ccx(circuit, a, b, c, use_basis_gates=True):
         circuit.ccx(a, b, c)
 
 
+def _get_cached(cache, cache_size, key, construct):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+        return value
+    value = construct()
+    cache[key] = value
+    if len(cache) > cache_size:
+        cache.popitem(last=False)
+    return value
+
+
+def _float_params(name, params):
+    try:
+        return tuple(float(param) for param in params)
+    except TypeError:
+        raise AquaError('Controlling gates parameterized by expressions is not supported: {}.'.format(name))
+
+
+def _unroll(instruction, qargs, cargs):
+    """
+    Decompose an instruction into the basis gates.
+
+    Yields:
+        tuple: the name and parameters of a basis gate, its qubits and clbits, and the instruction
+               itself for the instructions which are kept as they are
+    """
+    name = instruction.name
+    if name in _BASIS_GATES:
+        yield name, tuple(instruction.params), qargs, cargs, None
+    elif name in _DECOMPOSITIONS:
+        for basis_name, params in _DECOMPOSITIONS[name](*instruction.params):
+            yield basis_name, params, qargs, cargs, None
+    elif name in _UNCONTROLLED_INSTRUCTIONS:
+        yield name, (), qargs, cargs, instruction
+    else:
+        rule = instruction.definition
+        if not rule:
+            raise AquaError('Cannot control the instruction {}, which has no definition.'.format(name))
+        # the rule is defined on registers of its own, which are mapped to the qubits and clbits by index
+        for rule_instruction, rule_qargs, rule_cargs in rule:
+            yield from _unroll(rule_instruction,
+                               [qargs[qarg[1]] for qarg in rule_qargs],
+                               [cargs[carg[1]] for carg in rule_cargs])
+
+
+def _get_controlled_gates(name, params, use_basis_gates):
+    """
+    Get the controlled gate sequence of a basis gate, from the cache if it was controlled before.
+
+    Returns:
+        list[tuple]: the instructions of the sequence, with the positions of their qubits
+                     among the control qubit followed by the qubits of the gate
+    """
+    def construct():
+        q = QuantumRegister(3, 'q')
+        qc = QuantumCircuit(q)
+        if name == 'id':
+            apply_cu3(qc, 0, 0, 0, q[0], q[1], use_basis_gates=use_basis_gates)
+        elif name == 'u1':
+            apply_cu1(qc, *params, q[0], q[1], use_basis_gates=use_basis_gates)
+        elif name == 'u2':
+            apply_cu3(qc, np.pi / 2, *params, q[0], q[1], use_basis_gates=use_basis_gates)
+        elif name == 'u3':
+            apply_cu3(qc, *params, q[0], q[1], use_basis_gates=use_basis_gates)
+        else:
+            apply_ccx(qc, q[0], q[1], q[2], use_basis_gates=use_basis_gates)
+        return [(instruction, [qarg[1] for qarg in qargs]) for instruction, qargs, _ in qc.data]
+
+    return _get_cached(_CONTROLLED_GATES_CACHE, _CONTROLLED_GATES_CACHE_SIZE,
+                       (name, _float_params(name, params), use_basis_gates), construct)
+
+
+def _get_controlled_instruction(instruction, use_basis_gates):
+    """
+    Get the controlled sequence of an instruction, from the cache if a gate of the same type
+    and parameters was controlled before.
+
+    Returns:
+        list[tuple]: the instructions of the sequence, with the positions of their qubits among
+                     the control qubit followed by the qubits of the instruction, and the positions
+                     of their clbits among the clbits of the instruction
+    """
+    def construct():
+        controlled_instruction = []
+        qubits = list(range(1, instruction.num_qubits + 1))
+        clbits = list(range(instruction.num_clbits))
+        for name, params, op_qargs, op_cargs, op in _unroll(instruction, qubits, clbits):
+            if op is not None:
+                controlled_instruction.append((op, op_qargs, op_cargs))
+                continue
+            positions = [0] + op_qargs
+            for gate, gate_positions in _get_controlled_gates(name, params, use_basis_gates):
+                controlled_instruction.append((gate, [positions[i] for i in gate_positions], []))
+        return controlled_instruction
+
+    # the generic instructions, e.g. of composite circuits, are told apart by their definitions only
+    if type(instruction) in (Gate, Instruction):
+        return construct()
+    params = () if instruction.name in _UNCONTROLLED_INSTRUCTIONS else \
+        _float_params(instruction.name, instruction.params)
+    key = (type(instruction), instruction.name, params, instruction.num_qubits, use_basis_gates)
+    return _get_cached(_CONTROLLED_INSTRUCTIONS_CACHE, _CONTROLLED_INSTRUCTIONS_CACHE_SIZE, key, construct)
+
+
 def get_controlled_circuit(circuit, ctl_qubit, tgt_circuit=None, use_basis_gates=True):
     """
     Construct the controlled version of a given circuit.
@@ -82,6 +226,9 @@ def get_controlled_circuit(circuit, ctl_qubit, tgt_circuit=None, use_basis_gates
 
     Return:
         a QuantumCircuit object with the base circuit being controlled by ctl_qubit
+
+    Raises:
+        AquaError: if an instruction of the circuit can not be decomposed into the basis gates
     """
     if tgt_circuit is not None:
         qc = tgt_circuit
@@ -89,45 +236,19 @@ def get_controlled_circuit(circuit, ctl_qubit, tgt_circuit=None, use_basis_gates
         qc = QuantumCircuit()
 
     # get all the qubits and clbits
-    qregs = circuit.qregs
-    qubits = []
-    for qreg in qregs:
+    for qreg in circuit.qregs:
         if not qc.has_register(qreg):
             qc.add_register(qreg)
-        qubits.extend(qreg)
-    cregs = circuit.cregs
-    clbits = []
-    for creg in cregs:
+    for creg in circuit.cregs:
         if not qc.has_register(creg):
             qc.add_register(creg)
-        clbits.extend(creg)
-
-    # get all operations from compiled circuit
-    unroller = Unroller(basis=['u1', 'u2', 'u3', 'cx', 'id'])
-    pm = PassManager(passes=[unroller])
-    ops = transpiler.transpile(
-        circuit,
-        BasicAer.get_backend('qasm_simulator'),
-        pass_manager=pm
-    ).data
-
-    # process all basis gates to add control
     if not qc.has_register(ctl_qubit[0]):
-        qc.add(ctl_qubit[0])
-    for op in ops:
-        if op[0].name == 'id':
-            apply_cu3(qc, 0, 0, 0, ctl_qubit, op[1][0], use_basis_gates=use_basis_gates)
-        elif op[0].name == 'u1':
-            apply_cu1(qc, *op[0].params, ctl_qubit, op[1][0], use_basis_gates=use_basis_gates)
-        elif op[0].name == 'u2':
-            apply_cu3(qc, np.pi / 2, *op[0].params, ctl_qubit, op[1][0], use_basis_gates=use_basis_gates)
-        elif op[0].name == 'u3':
-            apply_cu3(qc, *op[0].params, ctl_qubit, op[1][0], use_basis_gates=use_basis_gates)
-        elif op[0].name == 'cx':
-            apply_ccx(qc, ctl_qubit, *op[1], use_basis_gates=use_basis_gates)
-        elif op[0].name == 'measure':
-            qc.measure(op[1], op[2])
-        else:
-            raise RuntimeError('Unexpected operation {}.'.format(op['name']))
+        qc.add_register(ctl_qubit[0])
+
+    # the controlled gate sequences are shared by reference between the circuits
+    for instruction, qargs, cargs in circuit.data:
+        qubits = [ctl_qubit] + qargs
+        for op, op_qubits, op_clbits in _get_controlled_instruction(instruction, use_basis_gates):
+            qc.data.append((op, [qubits[i] for i in op_qubits], [cargs[i] for i in op_clbits]))
 
     return qc
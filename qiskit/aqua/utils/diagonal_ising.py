@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+"""
+Direct evaluation of diagonal (Z and I only) operators, such as the Ising Hamiltonians of
+`qiskit.aqua.translators.ising`.
+
+With s_i = 1 - 2 b_i the eigenvalue of Z_i on the bit b_i, a diagonal operator is the function
+
+    E(b) = offset + sum_i h_i s_i + sum_{i<j} J_ij s_i s_j + sum_k c_k prod_{i in S_k} s_i
+
+of the basis state b. The linear and quadratic parts, which make up the translated Ising models,
+are kept as a vector and a sparse upper-triangular matrix; the rare terms on more than two qubits
+as packed supports whose parities are popcounts. Energies of bitstrings, counts and of the whole
+computational basis are then a few vectorized operations, without a matrix or a circuit per term.
+"""
+
+import numpy as np
+from scipy import sparse as scisparse
+
+from qiskit.aqua.aqua_error import AquaError
+from qiskit.aqua.utils.packed_paulis import (WORD_SIZE, PackedPaulis, num_words, pack_bits, unpack_bits, popcount,
+                                             counts_to_outcomes, parity_signs, _coeff_dtype)
+
+# number of basis states whose energies are computed at once by `iter_diagonal`
+DIAGONAL_CHUNK_SIZE = 1 << 16
+
+
+def most_likely_bitstring(state_vector, num_qubits=None):
+    """
+    The most likely basis state of a statevector or of measurement counts.
+
+    Args:
+        state_vector (numpy.ndarray or dict): the statevector, or counts of the form {'0101': 10}
+                                              where the right-most character is the outcome of qubit 0.
+        num_qubits (int): the number of qubits, by default the length of the bitstrings or log2 of
+                          the length of the statevector.
+
+    Returns:
+        numpy.ndarray: the bits of the basis state as ints, qubit 0 first.
+    """
+    if isinstance(state_vector, dict):
+        # the last of the keys with the largest count, as a stable sort of the counts would give
+        counts = np.fromiter(state_vector.values(), dtype=np.float64, count=len(state_vector))
+        best = len(counts) - 1 - np.argmax(counts[::-1])
+        binary_string = list(state_vector.keys())[best].replace(' ', '')
+        bits = np.frombuffer(binary_string.encode(), dtype=np.uint8)[::-1] - ord('0')
+        if num_qubits is not None:
+            bits = np.concatenate((bits, np.zeros(max(0, num_qubits - len(bits)), dtype=np.uint8)))[:num_qubits]
+        return bits.astype(int)
+    state_vector = np.asarray(state_vector)
+    if num_qubits is None:
+        num_qubits = int(np.log2(state_vector.shape[0]))
+    k = int(np.argmax(np.abs(state_vector)))
+    return (k >> np.arange(num_qubits)) & 1
+
+
+class DiagonalIsing(object):
+    """
+    A diagonal operator as a quadratic form over the Z eigenvalues of the qubits, plus packed
+    higher-order terms.
+    """
+
+    def __init__(self, num_qubits, offset=0.0, linear=None, quadratic=None, higher_coeffs=None, higher_masks=None):
+        """
+        Args:
+            num_qubits (int): number of qubits
+            offset (float): the coefficient of the identity
+            linear (numpy.ndarray): h_i, the coefficient of Z_i
+            quadratic (scipy.sparse.spmatrix): J_ij, the coefficient of Z_i Z_j, for i < j
+            higher_coeffs (numpy.ndarray): the coefficients of the terms on more than two qubits
+            higher_masks (numpy.ndarray): the packed supports of these terms, one row per term
+        """
+        self._num_qubits = num_qubits
+        self._offset = offset
+        self._linear = np.zeros(num_qubits) if linear is None else np.asarray(linear)
+        self._quadratic = scisparse.csr_matrix((num_qubits, num_qubits)) if quadratic is None \
+            else scisparse.csr_matrix(quadratic)
+        self._higher_coeffs = np.zeros(0) if higher_coeffs is None else np.asarray(higher_coeffs)
+        self._higher_masks = pack_bits(np.zeros((0, num_qubits), dtype=bool)) if higher_masks is None \
+            else np.asarray(higher_masks, dtype=np.uint64)
+
+    @classmethod
+    def from_packed_paulis(cls, packed_paulis):
+        """
+        Build the quadratic form of packed Paulis.
+
+        Args:
+            packed_paulis (PackedPaulis): Z and I only Paulis
+
+        Returns:
+            DiagonalIsing: the diagonal operator
+
+        Raises:
+            AquaError: if any Pauli has an X or Y factor
+        """
+        if not packed_paulis.is_diagonal():
+            raise AquaError('Only operators made of Z and I Paulis are diagonal.')
+        num_qubits = packed_paulis.num_qubits
+        coeffs = packed_paulis.coeffs
+        if np.iscomplexobj(coeffs) and np.all(coeffs.imag == 0):
+            coeffs = coeffs.real
+        dtype = _coeff_dtype(coeffs.dtype)
+        weights = np.sum(popcount(packed_paulis.z), axis=1)
+        bits = unpack_bits(packed_paulis.z, num_qubits)
+
+        offset = np.sum(coeffs[weights == 0])
+        terms, qubits = np.nonzero(bits[weights == 1])
+        linear = np.zeros(num_qubits, dtype=dtype)
+        np.add.at(linear, qubits, coeffs[weights == 1][terms])
+
+        pair_terms = np.where(weights == 2)[0]
+        terms, qubits = np.nonzero(bits[pair_terms])
+        qubits = qubits.reshape(-1, 2)
+        quadratic = scisparse.coo_matrix((coeffs[pair_terms], (qubits[:, 0], qubits[:, 1])),
+                                         shape=(num_qubits, num_qubits), dtype=dtype).tocsr()
+        quadratic.sum_duplicates()
+
+        higher = weights > 2
+        return cls(num_qubits, offset, linear, quadratic, coeffs[higher], packed_paulis.z[higher])
+
+    @classmethod
+    def from_quadratic_form(cls, num_qubits, offset=0.0, linear=None, quadratic=None):
+        """
+        Build a diagonal operator from unnormalized couplings, e.g. assembled from index arrays.
+
+        The couplings of `quadratic` may be repeated and on either side of the diagonal: the duplicates are
+        summed, J_ji is added to J_ij and the diagonal, Z_i Z_i = I, is added to the offset.
+
+        Args:
+            num_qubits (int): number of qubits
+            offset (float): the coefficient of the identity
+            linear (numpy.ndarray): the coefficient of Z_i
+            quadratic (numpy.ndarray or scipy.sparse.spmatrix): the coefficient of Z_i Z_j
+
+        Returns:
+            DiagonalIsing: the diagonal operator
+        """
+        if quadratic is None:
+            return cls(num_qubits, offset, linear)
+        quadratic = scisparse.coo_matrix(quadratic)
+        on_diagonal = quadratic.row == quadratic.col
+        offset = offset + np.sum(quadratic.data[on_diagonal])
+        rows = np.minimum(quadratic.row, quadratic.col)[~on_diagonal]
+        cols = np.maximum(quadratic.row, quadratic.col)[~on_diagonal]
+        couplings = scisparse.coo_matrix((quadratic.data[~on_diagonal], (rows, cols)),
+                                         shape=(num_qubits, num_qubits)).tocsr()
+        couplings.sum_duplicates()
+        return cls(num_qubits, offset, linear, couplings)
+
+    def to_packed_paulis(self, threshold=0.0):
+        """
+        The Z and I Paulis of the operator, built directly as packed bits.
+
+        Args:
+            threshold (float): the terms whose coefficient is not larger than threshold in magnitude are left out
+
+        Returns:
+            PackedPaulis: the Z terms, then the Z_i Z_j terms in row-major order, the higher-order terms
+                          and the identity
+        """
+        linear_qubits = np.flatnonzero(np.abs(self._linear) > threshold)
+        quadratic = self._quadratic.tocoo()
+        pairs = np.abs(quadratic.data) > threshold
+        rows, cols = quadratic.row[pairs].astype(np.int64), quadratic.col[pairs].astype(np.int64)
+        higher = np.abs(self._higher_coeffs) > threshold
+        offset = [self._offset] if abs(self._offset) > threshold else []
+        coeffs = np.concatenate((self._linear[linear_qubits], quadratic.data[pairs], self._higher_coeffs[higher],
+                                 offset))
+        z = np.zeros((len(coeffs), num_words(self._num_qubits)), dtype=np.uint64)
+
+        def set_bits(terms, qubits):
+            z[terms, qubits // WORD_SIZE] |= np.left_shift(np.uint64(1), (qubits % WORD_SIZE).astype(np.uint64))
+
+        set_bits(np.arange(len(linear_qubits)), linear_qubits)
+        pair_terms = len(linear_qubits) + np.arange(len(rows))
+        set_bits(pair_terms, rows)
+        set_bits(pair_terms, cols)
+        start = len(linear_qubits) + len(rows)
+        z[start:start + np.count_nonzero(higher)] = self._higher_masks[higher]
+        return PackedPaulis(coeffs.astype(_coeff_dtype(coeffs.dtype)), z, np.zeros_like(z), self._num_qubits)
+
+    @property
+    def num_qubits(self):
+        """Number of qubits."""
+        return self._num_qubits
+
+    @property
+    def offset(self):
+        """The coefficient of the identity."""
+        return self._offset
+
+    @property
+    def linear(self):
+        """The coefficients h_i of the Z_i terms."""
+        return self._linear
+
+    @property
+    def quadratic(self):
+        """The upper-triangular sparse matrix of the coefficients J_ij of the Z_i Z_j terms."""
+        return self._quadratic
+
+    def _energies(self, bits, outcomes):
+        spins = 1.0 - 2.0 * bits
+        energies = self._offset + spins.dot(self._linear)
+        if self._quadratic.nnz > 0:
+            energies = energies + np.sum(self._quadratic.T.dot(spins.T).T * spins, axis=1)
+        if len(self._higher_coeffs) > 0:
+            energies = energies + parity_signs(outcomes, self._higher_masks).dot(self._higher_coeffs)
+        return energies
+
+    def energies(self, bits):
+        """
+        Energies of basis states.
+
+        Args:
+            bits (numpy.ndarray): 0/1 matrix of shape (num_states, num_qubits), qubit 0 first
+
+        Returns:
+            numpy.ndarray: the energy of each basis state
+        """
+        bits = np.atleast_2d(np.asarray(bits, dtype=bool))
+        outcomes = pack_bits(bits) if len(self._higher_coeffs) > 0 else None
+        return self._energies(bits, outcomes)
+
+    def energies_of_outcomes(self, outcomes):
+        """
+        Energies of packed measurement outcomes, see `counts_to_outcomes`.
+
+        Args:
+            outcomes (numpy.ndarray): uint64 matrix of packed outcomes
+
+        Returns:
+            numpy.ndarray: the energy of each outcome
+        """
+        return self._energies(unpack_bits(outcomes, self._num_qubits), outcomes)
+
+    def evaluate_counts(self, counts):
+        """
+        Sample mean and variance of the energy of measurement counts in the computational basis.
+
+        Args:
+            counts (dict): counts of the form {'0101': 10}, the right-most character being qubit 0
+
+        Returns:
+            float: the mean energy
+            float: the sample variance of the energy of a single shot (0 for a single shot)
+        """
+        outcomes, weights = counts_to_outcomes(counts, self._num_qubits)
+        energies = self.energies_of_outcomes(outcomes)
+        num_shots = np.sum(weights)
+        avg = weights.dot(energies) / num_shots
+        if num_shots == 1:
+            return avg, 0.0
+        variance = weights.dot(np.abs(energies - avg) ** 2) / (num_shots - 1)
+        return avg, variance
+
+    def iter_diagonal(self, chunk_size=DIAGONAL_CHUNK_SIZE):
+        """
+        Energies of all the 2^n basis states, chunk by chunk.
+
+        Args:
+            chunk_size (int): number of basis states per chunk
+
+        Yields:
+            int, numpy.ndarray: the first basis state of the chunk and the energies of the chunk
+        """
+        shifts = np.arange(self._num_qubits, dtype=np.int64)
+        dim = 1 << self._num_qubits
+        for start in range(0, dim, chunk_size):
+            indices = np.arange(start, min(start + chunk_size, dim), dtype=np.int64)
+            bits = ((indices[:, None] >> shifts) & 1).astype(bool)
+            outcomes = indices.astype(np.uint64)[:, None] if len(self._higher_coeffs) > 0 else None
+            yield start, self._energies(bits, outcomes)
+
+    def diagonal(self, chunk_size=DIAGONAL_CHUNK_SIZE):
+        """
+        The diagonal of the operator, i.e. the energies of all the 2^n basis states.
+
+        Args:
+            chunk_size (int): number of basis states computed at once
+
+        Returns:
+            numpy.ndarray: the diagonal, indexed by basis state with qubit 0 as least significant bit
+        """
+        dtype = np.result_type(self._linear.dtype, self._quadratic.dtype, self._higher_coeffs.dtype, np.float64)
+        diagonal = np.empty(1 << self._num_qubits, dtype=dtype)
+        for start, energies in self.iter_diagonal(chunk_size):
+            diagonal[start:start + len(energies)] = energies
+        return diagonal
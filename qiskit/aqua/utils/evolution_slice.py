@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+""" Gate skeletons of the Trotter slices of Pauli evolutions.
+
+The gates of a slice depend on the Pauli labels only: every Pauli is rotated to the Z basis,
+its parity is accumulated with a CNOT ladder onto its highest nontrivial qubit, which carries the
+rotation, and the ladder and the basis changes are undone. The skeleton of a slice is computed once
+per list of labels and cached, and only the rotation angles are recomputed for every evolution time,
+unitary power and control qubit. When the skeleton is built, the basis changes and the CNOTs which
+undo the previous Pauli and redo the same for the next one cancel out.
+"""
+
+from collections import OrderedDict
+import logging
+
+import numpy as np
+from qiskit.qasm import pi
+
+from qiskit.aqua.utils.packed_paulis import PackedPaulis, unpack_bits
+
+logger = logging.getLogger(__name__)
+
+_SLICE_CACHE = OrderedDict()
+_SLICE_CACHE_SIZE = 64
+
+# gates of the skeleton, as tuples (name, qubits..., [term index])
+_H = 'h'
+_Y = 'y'
+_Y_DG = 'ydg'
+_CX = 'cx'
+_RZ = 'rz'
+_INVERSES = {_H: _H, _Y: _Y_DG, _Y_DG: _Y, _CX: _CX}
+
+
+class EvolutionSlice:
+    """The gate skeleton of a single Trotter slice, with one rotation per non-identity Pauli."""
+
+    def __init__(self, packed_paulis, reorder=False):
+        """
+        Constructor.
+
+        Args:
+            packed_paulis (PackedPaulis): the Paulis of the slice, in the order they are evolved
+            reorder (bool): sort the Paulis by label, so that consecutive Paulis share basis changes
+                            and CNOTs which then cancel out; this changes the Trotter error of the slice
+        """
+        num_qubits = packed_paulis.num_qubits
+        z = unpack_bits(packed_paulis.z, num_qubits)
+        x = unpack_bits(packed_paulis.x, num_qubits)
+
+        # the terms are evolved in the reversed order of the list
+        order = np.arange(len(packed_paulis))[::-1]
+        if reorder and len(order) > 0:
+            labels = z.astype(np.int8) + 2 * x.astype(np.int8)
+            order = np.lexsort(labels.T[::-1])
+        self._num_qubits = num_qubits
+        self._gates = self._cancel_inverses(self._build_gates(z, x, order))
+
+    @staticmethod
+    def _build_gates(z, x, order):
+        gates = []
+        for term in order:
+            support = np.flatnonzero(z[term] | x[term]).tolist()
+            if len(support) == 0:
+                continue
+            basis_changes = [(_H if not z[term, q] else _Y, q) for q in support if x[term, q]]
+            ladder = [(_CX, c, t) for c, t in zip(support[:-1], support[1:])]
+            gates.extend(basis_changes)
+            gates.extend(ladder)
+            gates.append((_RZ, support[-1], int(term)))
+            gates.extend(reversed(ladder))
+            gates.extend((_INVERSES[name], q) for name, q in basis_changes)
+        return gates
+
+    def _cancel_inverses(self, gates):
+        # a gate cancels the last gate on its qubits if that gate is its inverse on the same qubits
+        stacks = [[] for _ in range(self._num_qubits)]
+        kept = [True] * len(gates)
+        for i, gate in enumerate(gates):
+            qubits = gate[1:3] if gate[0] == _CX else gate[1:2]
+            last = [stacks[q][-1] if len(stacks[q]) > 0 else None for q in qubits]
+            j = last[0]
+            if j is not None and all(k == j for k in last) and gate[0] in _INVERSES \
+                    and gates[j][0] == _INVERSES[gate[0]] and gates[j][1:] == gate[1:]:
+                kept[j] = False
+                kept[i] = False
+                for q in qubits:
+                    stacks[q].pop()
+            else:
+                for q in qubits:
+                    stacks[q].append(i)
+        num_cancelled = kept.count(False)
+        if num_cancelled > 0:
+            logger.debug('Cancelled {} of {} gates of the evolution slice.'.format(num_cancelled, len(gates)))
+        return [gate for gate, keep in zip(gates, kept) if keep]
+
+    @property
+    def num_gates(self):
+        """Return the number of gates of the skeleton, counting a rotation as one gate."""
+        return len(self._gates)
+
+    def _ordered_gates(self, inverse):
+        # the inverse slice applies the inverse gates in the reversed order, with negated rotations
+        if not inverse:
+            return self._gates
+        return [(_INVERSES[gate[0]],) + gate[1:] if gate[0] in _INVERSES else gate for gate in reversed(self._gates)]
+
+    def build(self, qc, state_registers, angles, ancillary_registers=None, ctl_idx=0, use_basis_gates=True,
+              inverse=False):
+        """
+        Append the gates of the slice.
+
+        Args:
+            qc (QuantumCircuit): the circuit to append the gates to
+            state_registers (QuantumRegister): the qubits of the system
+            angles (numpy.ndarray): the rotation angle of every Pauli of the slice, in the order of the list
+            ancillary_registers (QuantumRegister): the optional control qubits
+            ctl_idx (int): the index of the control qubit in the ancillary_registers
+            use_basis_gates (bool): only use basis gates
+            inverse (bool): append the inverse of the slice
+        """
+        q = state_registers
+        sign = -1 if inverse else 1
+        for gate in self._ordered_gates(inverse):
+            name = gate[0]
+            if name == _CX:
+                qc.cx(q[gate[1]], q[gate[2]])
+            elif name == _H:
+                if use_basis_gates:
+                    qc.u2(0.0, pi, q[gate[1]])
+                else:
+                    qc.h(q[gate[1]])
+            elif name == _Y:
+                if use_basis_gates:
+                    qc.u3(pi / 2, -pi / 2, pi / 2, q[gate[1]])
+                else:
+                    qc.rx(pi / 2, q[gate[1]])
+            elif name == _Y_DG:
+                if use_basis_gates:
+                    qc.u3(-pi / 2, -pi / 2, pi / 2, q[gate[1]])
+                else:
+                    qc.rx(-pi / 2, q[gate[1]])
+            else:
+                lam = sign * angles[gate[2]]
+                if ancillary_registers is None:
+                    if use_basis_gates:
+                        qc.u1(lam, q[gate[1]])
+                    else:
+                        qc.rz(lam, q[gate[1]])
+                elif use_basis_gates:
+                    qc.u1(lam / 2, q[gate[1]])
+                    qc.cx(ancillary_registers[ctl_idx], q[gate[1]])
+                    qc.u1(-lam / 2, q[gate[1]])
+                    qc.cx(ancillary_registers[ctl_idx], q[gate[1]])
+                else:
+                    qc.crz(lam, ancillary_registers[ctl_idx], q[gate[1]])
+
+    def parameters(self, angles, inverse=False):
+        """
+        Compute the parameters of the gates appended by `build` with basis gates and without control,
+        for many sets of angles at once.
+
+        Args:
+            angles (numpy.ndarray): one row of rotation angles per set, see `build`
+            inverse (bool): the parameters of the inverse of the slice
+
+        Returns:
+            numpy.ndarray: one row per set of angles, with the parameters of the gates in circuit order
+        """
+        angles = np.atleast_2d(angles)
+        constants = []
+        positions = []
+        terms = []
+        for gate in self._ordered_gates(inverse):
+            name = gate[0]
+            if name == _H:
+                constants.extend([0.0, pi])
+            elif name == _Y:
+                constants.extend([pi / 2, -pi / 2, pi / 2])
+            elif name == _Y_DG:
+                constants.extend([-pi / 2, -pi / 2, pi / 2])
+            elif name == _RZ:
+                positions.append(len(constants))
+                terms.append(gate[2])
+                constants.append(0.0)
+        parameters = np.tile(np.asarray(constants, dtype=float), (angles.shape[0], 1))
+        parameters[:, positions] = (-1 if inverse else 1) * angles[:, terms]
+        return parameters
+
+
+def get_evolution_slice(slice_pauli_list, reorder=False):
+    """
+    Get the gate skeleton of a slice, from the cache if the same labels were evolved before.
+
+    Args:
+        slice_pauli_list (list): the [coeff, Pauli] terms of a single time slice
+        reorder (bool): sort the Paulis by label, see `EvolutionSlice`
+
+    Returns:
+        tuple(EvolutionSlice, numpy.ndarray): the skeleton and the coefficients of the terms
+    """
+    packed_paulis = PackedPaulis.from_list(slice_pauli_list)
+    key = (packed_paulis.num_qubits, packed_paulis.z.tobytes(), packed_paulis.x.tobytes(), reorder)
+    evolution_slice = _SLICE_CACHE.get(key)
+    if evolution_slice is None:
+        evolution_slice = EvolutionSlice(packed_paulis, reorder=reorder)
+        _SLICE_CACHE[key] = evolution_slice
+        if len(_SLICE_CACHE) > _SLICE_CACHE_SIZE:
+            _SLICE_CACHE.popitem(last=False)
+    else:
+        _SLICE_CACHE.move_to_end(key)
+    return evolution_slice, packed_paulis.coeffs
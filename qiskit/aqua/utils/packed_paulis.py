@@ -0,0 +1,933 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+"""
+Packed (symplectic) storage for lists of weighted Paulis.
+
+Each Pauli is kept as one row of a Z and one row of an X bit matrix, with the bits of
+qubit `k` stored at bit `k % 64` of the uint64 word `k // 64`. Next to the two bit matrices
+a single coefficient vector holds the weights, so merging, multiplying, chopping and
+scaling many Paulis are a handful of vectorized numpy calls instead of per-term Python work.
+
+The same arrays make up the binary format of a packed list: a 24-byte header (magic bytes, format
+version, flags, number of qubits, number of words per row and number of Paulis) followed by the
+coefficients and the Z and X words, little-endian. Uncompressed files can be memory-mapped.
+"""
+
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+from scipy import sparse as scisparse
+from scipy.sparse.linalg import LinearOperator
+from qiskit.quantum_info import Pauli
+
+from qiskit.aqua.aqua_error import AquaError
+
+WORD_SIZE = 64
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# number of rhs terms below which additions update a hash index instead of re-sorting everything
+_INCREMENTAL_ADD_LIMIT = 64
+
+# upper bound on the number of pairs produced at once when multiplying two packed lists
+_MULTIPLY_BLOCK_SIZE = 1 << 20
+
+# header of the binary format: magic, version, flags, padding, num_qubits, num_words, num_paulis
+_BINARY_HEADER = struct.Struct('<4sBB2xIIQ')
+_BINARY_MAGIC = b'AQPP'
+_BINARY_VERSION = 1
+_FLAG_COMPLEX = 1
+_FLAG_COMPRESSED = 2
+
+_LABEL_CHARS = np.frombuffer(b'IXYZ', dtype=np.uint8)
+
+
+def num_words(num_qubits):
+    """Number of uint64 words needed to hold `num_qubits` bits."""
+    return max(1, (num_qubits + WORD_SIZE - 1) // WORD_SIZE)
+
+
+def popcount(values):
+    """
+    Count the set bits of every element of a non-negative integer array.
+
+    Args:
+        values (numpy.ndarray): integer array, e.g. packed uint64 words or basis-state indices.
+
+    Returns:
+        numpy.ndarray: array of the same shape with the number of set bits of each element.
+    """
+    values = np.ascontiguousarray(values)
+    octets = values.view(np.uint8).reshape(values.shape + (values.dtype.itemsize,))
+    return np.sum(_POPCOUNT_TABLE[octets], axis=-1, dtype=np.int64)
+
+
+def pack_bits(bits):
+    """
+    Pack a boolean matrix of shape (num_rows, num_qubits) into uint64 words.
+
+    Args:
+        bits (numpy.ndarray): boolean matrix, one row per Pauli.
+
+    Returns:
+        numpy.ndarray: uint64 matrix of shape (num_rows, num_words(num_qubits)).
+    """
+    bits = np.asarray(bits, dtype=bool)
+    num_rows, num_qubits = bits.shape
+    words = np.zeros((num_rows, num_words(num_qubits)), dtype=np.uint64)
+    for word_idx in range(words.shape[1]):
+        chunk = bits[:, word_idx * WORD_SIZE:(word_idx + 1) * WORD_SIZE].astype(np.uint64)
+        shifts = np.arange(chunk.shape[1], dtype=np.uint64)
+        words[:, word_idx] = np.sum(chunk << shifts, axis=1, dtype=np.uint64)
+    return words
+
+
+def unpack_bits(words, num_qubits):
+    """
+    Inverse of `pack_bits`.
+
+    Args:
+        words (numpy.ndarray): uint64 matrix of shape (num_rows, num_words).
+        num_qubits (int): number of meaningful bits per row.
+
+    Returns:
+        numpy.ndarray: boolean matrix of shape (num_rows, num_qubits).
+    """
+    qubits = np.arange(num_qubits)
+    shifts = (qubits % WORD_SIZE).astype(np.uint64)
+    return ((words[:, qubits // WORD_SIZE] >> shifts) & np.uint64(1)).astype(bool)
+
+
+def row_keys(z, x):
+    """
+    Hashable/sortable key per Pauli row: the raw bytes of its Z and X words.
+
+    Args:
+        z (numpy.ndarray): packed Z words
+        x (numpy.ndarray): packed X words
+
+    Returns:
+        numpy.ndarray: 1-D array of numpy.void keys.
+    """
+    rows = np.ascontiguousarray(np.hstack((z, x)))
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+
+
+def _coeff_dtype(*dtypes):
+    dtype = np.result_type(*dtypes)
+    return np.complex128 if dtype.kind == 'c' else np.float64
+
+
+class PackedPaulis(object):
+    """
+    A list of weighted Paulis stored as a coefficient vector plus bit-packed Z and X matrices.
+
+    The arrays are over-allocated so that appending a few terms at a time is amortized O(1);
+    the `coeffs`, `z` and `x` properties return views on the used part of the buffers.
+    """
+
+    def __init__(self, coeffs, z, x, num_qubits):
+        """
+        Args:
+            coeffs (numpy.ndarray): weights, float64 or complex128, one per Pauli.
+            z (numpy.ndarray): uint64 matrix (num_paulis, num_words) of packed Z bits.
+            x (numpy.ndarray): uint64 matrix (num_paulis, num_words) of packed X bits.
+            num_qubits (int): number of qubits of every Pauli.
+        """
+        self._num_qubits = num_qubits
+        self._set_arrays(coeffs, z, x)
+
+    @classmethod
+    def from_list(cls, paulis):
+        """
+        Pack a list of [coeff, Pauli] pairs.
+
+        Args:
+            paulis (list): list of [coeff, Pauli]
+
+        Returns:
+            PackedPaulis: the packed list
+
+        Raises:
+            AquaError: if the Paulis do not all act on the same number of qubits.
+        """
+        if len(paulis) == 0:
+            return cls.empty(0)
+        coeffs = np.asarray([p[0] for p in paulis])
+        coeffs = coeffs.astype(np.complex128 if np.iscomplexobj(coeffs) else np.float64)
+        num_qubits = len(paulis[0][1].z)
+        if any(len(p[1].z) != num_qubits for p in paulis):
+            raise AquaError('All Paulis should act on the same number of qubits.')
+        z = pack_bits(np.asarray([p[1].z for p in paulis], dtype=bool).reshape(len(paulis), num_qubits))
+        x = pack_bits(np.asarray([p[1].x for p in paulis], dtype=bool).reshape(len(paulis), num_qubits))
+        return cls(coeffs, z, x, num_qubits)
+
+    @classmethod
+    def from_labels(cls, labels, coeffs):
+        """
+        Pack Pauli labels and their coefficients, without building Pauli objects.
+
+        Args:
+            labels (list[str]): the Pauli labels, qubit 0 being the right-most character
+            coeffs (list): the coefficients, one per label
+
+        Returns:
+            PackedPaulis: the packed list
+
+        Raises:
+            AquaError: if the labels are not all of the same length or contain other characters than I, X, Y and Z
+        """
+        coeffs = np.asarray(coeffs)
+        coeffs = coeffs.astype(np.complex128 if np.iscomplexobj(coeffs) else np.float64)
+        if len(labels) == 0:
+            return cls.empty(0, dtype=coeffs.dtype)
+        num_qubits = len(labels[0])
+        if any(len(label) != num_qubits for label in labels):
+            raise AquaError('All Paulis should act on the same number of qubits.')
+        try:
+            chars = np.frombuffer(''.join(labels).encode('ascii'), dtype=np.uint8)
+        except UnicodeEncodeError:
+            raise AquaError('Pauli labels can only contain I, X, Y and Z.')
+        if not np.all(np.isin(chars, _LABEL_CHARS)):
+            raise AquaError('Pauli labels can only contain I, X, Y and Z.')
+        chars = chars.reshape(len(labels), num_qubits)[:, ::-1]
+        is_y = chars == ord('Y')
+        z = pack_bits(is_y | (chars == ord('Z')))
+        x = pack_bits(is_y | (chars == ord('X')))
+        return cls(coeffs, z, x, num_qubits)
+
+    @classmethod
+    def empty(cls, num_qubits, dtype=np.float64):
+        """An empty list of `num_qubits`-qubit Paulis."""
+        width = num_words(num_qubits)
+        return cls(np.zeros(0, dtype=dtype), np.zeros((0, width), dtype=np.uint64),
+                   np.zeros((0, width), dtype=np.uint64), num_qubits)
+
+    def to_list(self):
+        """
+        Materialize the packed list as [[coeff, Pauli]] pairs.
+
+        Returns:
+            list: list of [coeff, Pauli], each Pauli owning its own bit arrays.
+        """
+        z_bits = unpack_bits(self.z, self._num_qubits)
+        x_bits = unpack_bits(self.x, self._num_qubits)
+        return [[coeff, Pauli(z_bits[idx], x_bits[idx])] for idx, coeff in enumerate(self.coeffs.tolist())]
+
+    def labels(self):
+        """Pauli labels (qubit 0 is the right-most character), without building Pauli objects."""
+        codes = unpack_bits(self.x, self._num_qubits) + 2 * unpack_bits(self.z, self._num_qubits).astype(np.int8)
+        chars = np.array(['I', 'X', 'Z', 'Y'])[codes[:, ::-1]]
+        return [''.join(row) for row in chars]
+
+    def to_bytes(self, compress=False):
+        """
+        Serialize the packed list in the binary format.
+
+        Args:
+            compress (bool): compress the arrays with zlib
+
+        Returns:
+            bytes: the header followed by the coefficients and the Z and X words
+        """
+        is_complex = self._coeffs.dtype.kind == 'c'
+        flags = (_FLAG_COMPLEX if is_complex else 0) | (_FLAG_COMPRESSED if compress else 0)
+        header = _BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, flags, self._num_qubits,
+                                     self._z.shape[1], self._size)
+        payload = b''.join([np.ascontiguousarray(self.coeffs, dtype='<c16' if is_complex else '<f8').tobytes(),
+                            np.ascontiguousarray(self.z, dtype='<u8').tobytes(),
+                            np.ascontiguousarray(self.x, dtype='<u8').tobytes()])
+        if compress:
+            payload = zlib.compress(payload)
+        return header + payload
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Deserialize a packed list from the binary format.
+
+        Args:
+            data (bytes): the serialized packed list
+
+        Returns:
+            PackedPaulis: the packed list
+
+        Raises:
+            AquaError: if the data is not in the binary format
+        """
+        header = _read_binary_header(data[:_BINARY_HEADER.size])
+        payload = data[_BINARY_HEADER.size:]
+        if header['compressed']:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as ex:
+                raise AquaError('Not a packed paulis binary: {}.'.format(ex))
+        if len(payload) != _binary_payload_size(header):
+            raise AquaError('Not a packed paulis binary: the arrays are truncated.')
+        # a single copy, which the arrays own and can modify
+        payload = bytearray(payload)
+        arrays = [np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(shape)
+                  for dtype, count, offset, shape in _binary_layout(header)]
+        return cls._from_binary_arrays(header, arrays)
+
+    def save(self, file_name, compress=False):
+        """
+        Save the packed list to a file in the binary format.
+
+        Args:
+            file_name (str): path to the file
+            compress (bool): compress the arrays with zlib; compressed files can not be memory-mapped
+        """
+        # the arrays may be memory-mapped from the same file: they are written to a new file, which then
+        # replaces the old one, so that the mapped file is never truncated
+        data = self.to_bytes(compress=compress)
+        fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_name)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_name, file_name)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    @classmethod
+    def load(cls, file_name, mmap=True):
+        """
+        Load a packed list from a file in the binary format.
+
+        Args:
+            file_name (str): path to the file
+            mmap (bool): memory-map the arrays of an uncompressed file instead of reading them; the
+                         mapping is copy-on-write, so modifying the list never modifies the file
+
+        Returns:
+            PackedPaulis: the packed list
+
+        Raises:
+            AquaError: if the file is not in the binary format
+        """
+        with open(file_name, 'rb') as file:
+            header = _read_binary_header(file.read(_BINARY_HEADER.size))
+            if header['compressed'] or not mmap or header['num_paulis'] == 0:
+                file.seek(0)
+                return cls.from_bytes(file.read())
+        if os.path.getsize(file_name) != _BINARY_HEADER.size + _binary_payload_size(header):
+            raise AquaError('Not a packed paulis binary: the arrays are truncated.')
+        arrays = [np.memmap(file_name, dtype=dtype, mode='c', offset=_BINARY_HEADER.size + offset, shape=shape)
+                  for dtype, count, offset, shape in _binary_layout(header)]
+        return cls._from_binary_arrays(header, arrays)
+
+    @classmethod
+    def _from_binary_arrays(cls, header, arrays):
+        coeffs, z, x = [array if array.dtype.isnative else array.astype(array.dtype.newbyteorder('='))
+                        for array in arrays]
+        return cls(coeffs, z, x, header['num_qubits'])
+
+    @classmethod
+    def from_matrix(cls, matrix, threshold=1e-14):
+        """
+        Decompose a 2^n x 2^n matrix into weighted Paulis, alpha_P = Tr(H P) / 2^n, in O(n 4^n) operations.
+
+        Since P|c> = i^(#Y) (-1)^popcount(c & z) |c ^ x>, Tr(H P) = i^(#Y) sum_c H[c, c ^ x] (-1)^popcount(c & z):
+        for every X part x occurring in the matrix, the coefficients of all its Z parts are the Walsh-Hadamard
+        transform of the diagonal H[c, c ^ x].
+
+        Args:
+            matrix (scipy.sparse.spmatrix or numpy.ndarray): the matrix, of dimension a power of two.
+            threshold (float): coefficients not larger in magnitude than threshold times the largest
+                matrix entry are dropped, which only removes rounding noise of the transform.
+
+        Returns:
+            PackedPaulis: the Paulis with nonzero (complex) coefficients, sorted by label as IXYZ
+                          with the highest qubit first.
+        """
+        matrix = scisparse.coo_matrix(matrix)
+        matrix.sum_duplicates()
+        dim = matrix.shape[0]
+        num_qubits = int(np.log2(dim))
+        if matrix.nnz == 0:
+            return cls.empty(num_qubits, dtype=np.complex128)
+        # the coefficients of each X part are thresholded as they are produced, so that only the kept
+        # ones are stored, not all the 4^n candidates
+        cutoff = threshold * np.max(np.abs(matrix.data))
+        x_of_entries = (matrix.row ^ matrix.col).astype(np.int64)
+        order = np.argsort(x_of_entries, kind='mergesort')
+        unique_x, starts = np.unique(x_of_entries[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        z_masks = np.arange(dim, dtype=np.int64)
+        coeffs, x_rows, z_rows = [], [], []
+        for x_mask, start, end in zip(unique_x, starts, ends):
+            entries = order[start:end]
+            diagonal = np.zeros(dim, dtype=np.complex128)
+            diagonal[matrix.row[entries]] = matrix.data[entries]
+            traces = walsh_hadamard(diagonal)
+            kept = np.flatnonzero(np.abs(traces) > cutoff * dim)
+            phases = np.array([1, 1j, -1, -1j])[popcount(z_masks[kept] & x_mask) % 4]
+            coeffs.append(traces[kept] * phases / dim)
+            x_rows.append(np.full(len(kept), x_mask, dtype=np.int64))
+            z_rows.append(z_masks[kept])
+        coeffs, x_masks, z_masks = np.concatenate(coeffs), np.concatenate(x_rows), np.concatenate(z_rows)
+
+        # the label order of IXYZ, i.e. I, X, Y, Z mapped to the base-4 digits 0, 1, 2, 3 of every qubit
+        keys = np.zeros(len(coeffs), dtype=np.int64)
+        for qubit_idx in range(num_qubits):
+            x_bits = (x_masks >> qubit_idx) & 1
+            z_bits = (z_masks >> qubit_idx) & 1
+            keys += (x_bits + 3 * z_bits - 2 * x_bits * z_bits) << (2 * qubit_idx)
+        order = np.argsort(keys, kind='mergesort')
+        return cls(coeffs[order], z_masks[order].astype(np.uint64)[:, None],
+                   x_masks[order].astype(np.uint64)[:, None], num_qubits)
+
+    def to_spmatrix(self):
+        """
+        Sum of the weighted Paulis as a CSR matrix, built for all the terms at once.
+
+        The Paulis sharing an X part x fill the same entries (c ^ x, c), whose values are a signed sum of their
+        weights over their Z parts, computed with a Walsh-Hadamard transform when many Paulis share x.
+
+        Returns:
+            scipy.sparse.csr_matrix: the complex 2^n x 2^n matrix.
+        """
+        dim = 2 ** self._num_qubits
+        if self._size == 0:
+            return scisparse.csr_matrix((dim, dim), dtype=np.complex128)
+        x_masks = self.x[:, 0].astype(np.int64)
+        z_masks = self.z[:, 0].astype(np.int64)
+        weights = self.coeffs * np.array([1, 1j, -1, -1j])[popcount(x_masks & z_masks) % 4]
+        order = np.argsort(x_masks, kind='mergesort')
+        unique_x, starts = np.unique(x_masks[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        columns = np.arange(dim, dtype=np.int64)
+        values = np.zeros((len(unique_x), dim), dtype=np.complex128)
+        for group, (start, end) in enumerate(zip(starts, ends)):
+            members = order[start:end]
+            if len(members) > self._num_qubits:
+                signed_weights = (np.bincount(z_masks[members], weights=weights[members].real, minlength=dim) +
+                                  1j * np.bincount(z_masks[members], weights=weights[members].imag, minlength=dim))
+                values[group] = walsh_hadamard(signed_weights)
+            else:
+                for member in members:
+                    values[group] += weights[member] * (1 - 2 * (popcount(columns & z_masks[member]) & 1))
+        # row r holds the entry (r, r ^ x) of every X part x, whose value is indexed by the column
+        indices = columns[:, None] ^ unique_x[None, :]
+        data = values[np.arange(len(unique_x))[None, :], indices]
+        matrix = scisparse.csr_matrix((data.reshape(-1), indices.reshape(-1),
+                                       np.arange(0, dim * len(unique_x) + 1, len(unique_x))), shape=(dim, dim))
+        matrix.sort_indices()
+        matrix.eliminate_zeros()
+        return matrix
+
+    def _set_arrays(self, coeffs, z, x):
+        self._coeffs = coeffs
+        self._z = z
+        self._x = x
+        self._size = len(coeffs)
+        self._index = None
+
+    def _reserve(self, extra):
+        capacity = len(self._coeffs)
+        if self._size + extra <= capacity:
+            return
+        capacity = max(2 * capacity, self._size + extra, 8)
+        coeffs = np.zeros(capacity, dtype=self._coeffs.dtype)
+        z = np.zeros((capacity, self._z.shape[1]), dtype=np.uint64)
+        x = np.zeros((capacity, self._x.shape[1]), dtype=np.uint64)
+        coeffs[:self._size] = self.coeffs
+        z[:self._size] = self.z
+        x[:self._size] = self.x
+        self._coeffs, self._z, self._x = coeffs, z, x
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = {key.tobytes(): idx for idx, key in enumerate(row_keys(self.z, self.x))}
+        return self._index
+
+    @property
+    def num_qubits(self):
+        """Number of qubits."""
+        return self._num_qubits
+
+    @property
+    def coeffs(self):
+        """Coefficient vector."""
+        return self._coeffs[:self._size]
+
+    @property
+    def z(self):
+        """Packed Z bits, one row per Pauli."""
+        return self._z[:self._size]
+
+    @property
+    def x(self):
+        """Packed X bits, one row per Pauli."""
+        return self._x[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def copy(self):
+        """Compact copy of the packed list."""
+        return PackedPaulis(self.coeffs.copy(), self.z.copy(), self.x.copy(), self._num_qubits)
+
+    def is_diagonal(self):
+        """True if every Pauli is made of I and Z only."""
+        return not np.any(self.x)
+
+    def simplify(self):
+        """
+        Merge identical Paulis, keeping the position of the first occurrence.
+        Paulis with zero coefficient are kept.
+        """
+        if self._size < 2:
+            return
+        _, first, inverse = np.unique(row_keys(self.z, self.x), return_index=True, return_inverse=True)
+        if len(first) == self._size:
+            return
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        coeffs = np.zeros(len(first), dtype=self._coeffs.dtype)
+        np.add.at(coeffs, rank[inverse.ravel()], self.coeffs)
+        rows = first[order]
+        self._set_arrays(coeffs, self.z[rows], self.x[rows])
+
+    def add(self, other, subtract=False):
+        """
+        In-place `self += other` (or `self -= other`), merging identical Paulis.
+
+        New Paulis of `other` are appended in order; coefficients of Paulis already present
+        are accumulated at their current position.
+
+        Args:
+            other (PackedPaulis): the terms to add
+            subtract (bool): subtract instead of add
+
+        Raises:
+            AquaError: if both lists are non-empty and act on a different number of qubits.
+        """
+        if len(other) == 0:
+            return
+        if self._size == 0 and self._num_qubits != other.num_qubits:
+            self._num_qubits = other.num_qubits
+            self._set_arrays(np.zeros(0, dtype=self._coeffs.dtype), other.z[:0].copy(), other.x[:0].copy())
+        if self._num_qubits != other.num_qubits:
+            raise AquaError('Can not combine Paulis on {} and {} qubits.'.format(self._num_qubits,
+                                                                               other.num_qubits))
+        dtype = _coeff_dtype(self._coeffs.dtype, other.coeffs.dtype)
+        if dtype != self._coeffs.dtype:
+            self._coeffs = self._coeffs.astype(dtype)
+        other_coeffs = -other.coeffs if subtract else other.coeffs
+
+        if len(other) > _INCREMENTAL_ADD_LIMIT:
+            coeffs = np.concatenate((self.coeffs, other_coeffs.astype(dtype)))
+            self._set_arrays(coeffs, np.vstack((self.z, other.z)), np.vstack((self.x, other.x)))
+            self.simplify()
+            return
+
+        index = self._get_index()
+        for key, coeff, z, x in zip(row_keys(other.z, other.x), other_coeffs, other.z, other.x):
+            key = key.tobytes()
+            idx = index.get(key, None)
+            if idx is not None:
+                self._coeffs[idx] += coeff
+            else:
+                self._reserve(1)
+                self._coeffs[self._size] = coeff
+                self._z[self._size] = z
+                self._x[self._size] = x
+                index[key] = self._size
+                self._size += 1
+
+    def multiply(self, other, threshold=1e-15):
+        """
+        Product of two packed lists, `self * other`, with the Pauli phases folded into the weights.
+
+        Terms are generated in the same order as a nested loop over `self` then `other`; products
+        whose coefficient magnitude does not exceed `threshold` are dropped and identical Paulis
+        merged.
+
+        Args:
+            other (PackedPaulis): right-hand side
+            threshold (float): magnitude below which product terms are discarded
+
+        Returns:
+            PackedPaulis: the product
+        """
+        if self._size == 0 or len(other) == 0:
+            return PackedPaulis.empty(max(self._num_qubits, other.num_qubits), dtype=np.complex128)
+        if self._num_qubits != other.num_qubits:
+            raise AquaError('Can not multiply Paulis on {} and {} qubits.'.format(self._num_qubits,
+                                                                                other.num_qubits))
+        phases = np.array([1, 1j, -1, -1j], dtype=np.complex128)
+        block = max(1, _MULTIPLY_BLOCK_SIZE // len(other))
+        o_x, o_z = other.x[None, :, :], other.z[None, :, :]
+        all_coeffs, all_z, all_x = [], [], []
+        for start in range(0, self._size, block):
+            s_x, s_z = self.x[start:start + block, None, :], self.z[start:start + block, None, :]
+            s_y, o_y = s_x & s_z, o_x & o_z
+            s_xo, s_zo = s_x & ~s_z, s_z & ~s_x
+            o_xo, o_zo = o_x & ~o_z, o_z & ~o_x
+            # i^k with +1 for ZX, XY, YZ and -1 for ZY, XZ, YX on every qubit
+            plus = (s_zo & o_xo) | (s_xo & o_y) | (s_y & o_zo)
+            minus = (s_zo & o_y) | (s_xo & o_zo) | (s_y & o_xo)
+            power = (popcount(plus).sum(axis=-1) - popcount(minus).sum(axis=-1)) % 4
+            coeffs = (self.coeffs[start:start + block, None] * other.coeffs[None, :]) * phases[power]
+            coeffs = coeffs.ravel()
+            keep = np.abs(coeffs) > threshold
+            width = self.z.shape[1]
+            all_coeffs.append(coeffs[keep])
+            all_z.append((s_z ^ o_z).reshape(-1, width)[keep])
+            all_x.append((s_x ^ o_x).reshape(-1, width)[keep])
+        ret = PackedPaulis(np.concatenate(all_coeffs), np.vstack(all_z), np.vstack(all_x), self._num_qubits)
+        ret.simplify()
+        return ret
+
+    def chop(self, threshold):
+        """
+        Zero the real and imaginary parts whose magnitude is below `threshold` and drop the
+        Paulis left with a zero coefficient. Coefficients become complex.
+        """
+        coeffs = self.coeffs.astype(np.complex128)
+        real = np.where(np.abs(coeffs.real) >= threshold, coeffs.real, 0.0)
+        imag = np.where(np.abs(coeffs.imag) >= threshold, coeffs.imag, 0.0)
+        coeffs = real + 1j * imag
+        keep = coeffs != 0.0
+        self._set_arrays(coeffs[keep], self.z[keep], self.x[keep])
+
+    def eliminate_zeros(self):
+        """Drop Paulis whose coefficient is exactly zero."""
+        keep = self.coeffs != 0
+        if not np.all(keep):
+            self._set_arrays(self.coeffs[keep], self.z[keep], self.x[keep])
+
+    def scale(self, scaling_factor):
+        """Multiply every coefficient by `scaling_factor`."""
+        self._coeffs = self._coeffs * scaling_factor
+
+
+def _read_binary_header(data):
+    if len(data) < _BINARY_HEADER.size:
+        raise AquaError('Not a packed paulis binary: the header is truncated.')
+    magic, version, flags, num_qubits, width, num_paulis = _BINARY_HEADER.unpack(data)
+    if magic != _BINARY_MAGIC:
+        raise AquaError('Not a packed paulis binary.')
+    if version > _BINARY_VERSION:
+        raise AquaError('Unsupported packed paulis binary version: {}.'.format(version))
+    if width != num_words(num_qubits):
+        raise AquaError('Inconsistent number of words in the packed paulis binary.')
+    return {'num_qubits': num_qubits, 'num_words': width, 'num_paulis': num_paulis,
+            'complex': bool(flags & _FLAG_COMPLEX), 'compressed': bool(flags & _FLAG_COMPRESSED)}
+
+
+def _binary_layout(header):
+    # the dtype, number of items, byte offset in the payload and shape of the coefficients, Z and X words
+    num_paulis, width = header['num_paulis'], header['num_words']
+    coeff_dtype = np.dtype('<c16' if header['complex'] else '<f8')
+    words_size = 8 * num_paulis * width
+    return [(coeff_dtype, num_paulis, 0, (num_paulis,)),
+            (np.dtype('<u8'), num_paulis * width, coeff_dtype.itemsize * num_paulis, (num_paulis, width)),
+            (np.dtype('<u8'), num_paulis * width, coeff_dtype.itemsize * num_paulis + words_size,
+             (num_paulis, width))]
+
+
+def _binary_payload_size(header):
+    coeff_size = 16 if header['complex'] else 8
+    return header['num_paulis'] * (coeff_size + 16 * header['num_words'])
+
+
+def is_packed_paulis_file(file_name):
+    """
+    Check whether a file is in the binary format of packed paulis, from its magic bytes.
+
+    Args:
+        file_name (str): path to the file
+
+    Returns:
+        bool: True if the file starts with the magic bytes of the binary format
+    """
+    with open(file_name, 'rb') as file:
+        return file.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC
+
+
+def counts_to_outcomes(counts, num_qubits):
+    """
+    Convert a counts dictionary into packed measurement outcomes and their weights.
+
+    Args:
+        counts (dict): measurement counts of the form {'0101': 10} ({str: int}), where the
+                       right-most character is the outcome of qubit 0.
+        num_qubits (int): number of measured qubits.
+
+    Returns:
+        numpy.ndarray: uint64 matrix (num_outcomes, num_words(num_qubits)) of packed outcomes
+        numpy.ndarray: float vector of the number of times each outcome was observed
+    """
+    keys = [key.replace(' ', '') for key in counts.keys()]
+    outcomes = np.zeros((len(keys), num_words(num_qubits)), dtype=np.uint64)
+    for word_idx in range(outcomes.shape[1]):
+        outcomes[:, word_idx] = [int(key[max(0, len(key) - (word_idx + 1) * WORD_SIZE):
+                                         max(0, len(key) - word_idx * WORD_SIZE)] or '0', 2) for key in keys]
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(keys))
+    return outcomes, weights
+
+
+def parity_signs(outcomes, masks):
+    """
+    Eigenvalue (+1 or -1) of every measured Pauli for every outcome, i.e. the parity of
+    the outcome bits selected by the Pauli's support.
+
+    Args:
+        outcomes (numpy.ndarray): packed outcomes, see `counts_to_outcomes`.
+        masks (numpy.ndarray): packed supports (Z | X) of the Paulis, one row per Pauli.
+
+    Returns:
+        numpy.ndarray: float matrix (num_outcomes, num_paulis) of +1/-1 values.
+    """
+    parity = np.zeros((outcomes.shape[0], masks.shape[0]), dtype=np.int64)
+    for word_idx in range(outcomes.shape[1]):
+        parity += popcount(outcomes[:, None, word_idx] & masks[None, :, word_idx])
+    return 1.0 - 2.0 * (parity & 1)
+
+
+def expectations_and_covariance(outcomes, weights, masks):
+    """
+    Sample means of a set of simultaneously measured Paulis and their sample covariance matrix.
+
+    Args:
+        outcomes (numpy.ndarray): packed outcomes, see `counts_to_outcomes`.
+        weights (numpy.ndarray): number of observations of each outcome.
+        masks (numpy.ndarray): packed supports (Z | X) of the Paulis, one row per Pauli.
+
+    Returns:
+        numpy.ndarray: the expectation value of each Pauli
+        numpy.ndarray: the covariance matrix of the Paulis (all zeros for a single shot)
+    """
+    signs = parity_signs(outcomes, masks)
+    num_shots = np.sum(weights)
+    avg = weights.dot(signs) / num_shots
+    if num_shots == 1:
+        return avg, np.zeros((masks.shape[0], masks.shape[0]))
+    centered = signs - avg
+    cov = (centered * weights[:, None]).T.dot(centered) / (num_shots - 1)
+    return avg, cov
+
+
+def walsh_hadamard(vector):
+    """
+    Unnormalized fast Walsh-Hadamard transform, `out[z] = sum_j vector[j] * (-1)^popcount(j & z)`,
+    in O(n 2^n) operations for a vector of length 2^n.
+
+    Args:
+        vector (numpy.ndarray): vector whose length is a power of two
+
+    Returns:
+        numpy.ndarray: the transformed vector
+    """
+    out = np.array(vector)
+    half = 1
+    while half < len(vector):
+        out = out.reshape(-1, 2, half)
+        out = np.concatenate((out[:, :1] + out[:, 1:], out[:, :1] - out[:, 1:]), axis=1)
+        half *= 2
+    return out.reshape(-1)
+
+
+def _signed_sum(vector, z_mask, num_qubits):
+    """sum_j vector[j] * (-1)^popcount(j & z_mask), folding one qubit at a time (O(2^n) in total)."""
+    out = vector
+    for qubit_idx in range(num_qubits - 1, -1, -1):
+        out = out.reshape(2, -1)
+        out = out[0] - out[1] if (z_mask >> qubit_idx) & 1 else out[0] + out[1]
+    return out[0]
+
+
+def pauli_expectations(packed_paulis, statevector):
+    """
+    Expectation value <psi|P|psi> of every Pauli on a statevector, without building matrices or circuits.
+
+    A Pauli acts on a basis state as P|j> = i^(#Y) (-1)^popcount(j & z) |j ^ x>, so all Paulis sharing an
+    X part share the bit-flipped copy of the statevector; their Z parts only flip signs, which are folded
+    qubit by qubit, or obtained with a single Walsh-Hadamard transform when the X part is shared by many Paulis.
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis, on at most 62 qubits.
+        statevector (numpy.ndarray): the state, qubit 0 being the least significant bit of the index.
+
+    Returns:
+        numpy.ndarray: complex expectation value of each Pauli (not weighted by the coefficients).
+
+    Raises:
+        AquaError: if the Paulis act on more qubits than the statevector holds.
+    """
+    state = np.asarray(statevector, dtype=np.complex128).reshape(-1)
+    num_state_qubits = int(np.log2(len(state)))
+    if packed_paulis.num_qubits > num_state_qubits:
+        raise AquaError('The statevector has {} qubits but the Paulis act on {} qubits.'.format(
+            num_state_qubits, packed_paulis.num_qubits))
+    x_masks = packed_paulis.x[:, 0].astype(np.int64)
+    z_masks = packed_paulis.z[:, 0].astype(np.int64)
+    phases = np.array([1, 1j, -1, -1j])[popcount(x_masks & z_masks) % 4]
+    # axis k of the tensor view holds qubit num_state_qubits - 1 - k
+    tensor = state.reshape([2] * num_state_qubits)
+    values = np.zeros(len(packed_paulis), dtype=np.complex128)
+    for x_mask in np.unique(x_masks):
+        members = np.where(x_masks == x_mask)[0]
+        flipped = tensor[tuple(slice(None, None, -1) if (int(x_mask) >> (num_state_qubits - 1 - axis)) & 1
+                               else slice(None) for axis in range(num_state_qubits))]
+        overlap = (np.conj(flipped) * tensor).reshape(-1)
+        if len(members) > num_state_qubits:
+            values[members] = walsh_hadamard(overlap)[z_masks[members]]
+        else:
+            for member in members:
+                values[member] = _signed_sum(overlap, int(z_masks[member]), num_state_qubits)
+    return values * phases
+
+
+def _tensor_z_signs(tensor, z_mask):
+    """(-1)^popcount(j & z) applied in place on the tensor view of a statevector, axis k holding qubit ndim - 1 - k."""
+    num_qubits = tensor.ndim
+    for axis in range(num_qubits):
+        if (z_mask >> (num_qubits - 1 - axis)) & 1:
+            tensor[(slice(None),) * axis + (1,)] *= -1
+    return tensor
+
+
+def _tensor_x_flip(tensor, x_mask):
+    """The bit-flipped view |j> -> |j ^ x> of the tensor view of a statevector."""
+    num_qubits = tensor.ndim
+    return tensor[tuple(slice(None, None, -1) if (x_mask >> (num_qubits - 1 - axis)) & 1 else slice(None)
+                        for axis in range(num_qubits))]
+
+
+def _tensor_pauli_action(tensor, x_mask, z_mask):
+    """P|psi> (without the i^(#Y) phase) on the tensor view of a statevector, in O(2^n) and without index arrays."""
+    return _tensor_x_flip(_tensor_z_signs(tensor.copy(), z_mask), x_mask)
+
+
+def apply_pauli_exponentials(packed_paulis, statevector):
+    """
+    Apply the product exp(c_1 P_1) exp(c_2 P_2) ... exp(c_K P_K) of the exponentials of the weighted Paulis
+    to a statevector, the last Pauli being applied first, without building any matrix.
+
+    Since P^2 = I, exp(c P) = cosh(c) I + sinh(c) P, so every exponential combines the statevector with its
+    bit-flipped and sign-flipped copy: for c = -i t, this is cos(t) |psi> - i sin(t) P|psi>. The memory is O(2^n).
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis, on at most 62 qubits, weighted by the exponents c_k.
+        statevector (numpy.ndarray): the state, qubit 0 being the least significant bit of the index.
+
+    Returns:
+        numpy.ndarray: the resulting statevector.
+
+    Raises:
+        AquaError: if the Paulis act on more qubits than the statevector holds.
+    """
+    state = np.array(statevector, dtype=np.complex128).reshape(-1)
+    num_state_qubits = int(np.log2(len(state)))
+    if packed_paulis.num_qubits > num_state_qubits:
+        raise AquaError('The statevector has {} qubits but the Paulis act on {} qubits.'.format(
+            num_state_qubits, packed_paulis.num_qubits))
+    if len(packed_paulis) == 0:
+        return state
+    x_masks = packed_paulis.x[:, 0].astype(np.int64)
+    z_masks = packed_paulis.z[:, 0].astype(np.int64)
+    phases = np.array([1, 1j, -1, -1j])[popcount(x_masks & z_masks) % 4]
+    exponents = np.asarray(packed_paulis.coeffs, dtype=np.complex128)
+    tensor = state.reshape([2] * num_state_qubits)
+    for k in range(len(packed_paulis) - 1, -1, -1):
+        if x_masks[k] == 0 and z_masks[k] == 0:
+            tensor = tensor * np.exp(exponents[k])
+            continue
+        pauli_tensor = _tensor_pauli_action(tensor, int(x_masks[k]), int(z_masks[k]))
+        tensor = np.cosh(exponents[k]) * tensor + (np.sinh(exponents[k]) * phases[k]) * pauli_tensor
+    return tensor.reshape(-1)
+
+
+def pauli_matvec(packed_paulis, vector):
+    """
+    Product sum_k c_k P_k |v> of the weighted Paulis with a vector, without building any matrix.
+
+    The Paulis sharing an X part x are summed before their common bit flip: their Z parts only weight the entries
+    of the vector by sign patterns, summed term by term, or obtained with a single Walsh-Hadamard transform
+    of the weights when many Paulis share x. The memory is O(2^n).
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis, on at most 62 qubits.
+        vector (numpy.ndarray): the vector, qubit 0 being the least significant bit of the index.
+
+    Returns:
+        numpy.ndarray: the complex product.
+    """
+    state = np.asarray(vector, dtype=np.complex128).reshape(-1)
+    num_qubits = int(np.log2(len(state)))
+    result = np.zeros(len(state), dtype=np.complex128)
+    if len(packed_paulis) == 0:
+        return result
+    x_masks = packed_paulis.x[:, 0].astype(np.int64)
+    z_masks = packed_paulis.z[:, 0].astype(np.int64)
+    weights = packed_paulis.coeffs * np.array([1, 1j, -1, -1j])[popcount(x_masks & z_masks) % 4]
+    tensor = state.reshape([2] * num_qubits)
+    order = np.argsort(x_masks, kind='mergesort')
+    unique_x, starts = np.unique(x_masks[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    for x_mask, start, end in zip(unique_x, starts, ends):
+        members = order[start:end]
+        if len(members) > num_qubits:
+            signed_weights = np.zeros(len(state), dtype=np.complex128)
+            np.add.at(signed_weights, z_masks[members], weights[members])
+            signed = (walsh_hadamard(signed_weights) * state).reshape(tensor.shape)
+        else:
+            signed = np.zeros(tensor.shape, dtype=np.complex128)
+            for member in members:
+                signed += _tensor_z_signs(weights[member] * tensor, int(z_masks[member]))
+        result += _tensor_x_flip(signed, int(x_mask)).reshape(-1)
+    return result
+
+
+def pauli_linear_operator(packed_paulis):
+    """
+    The weighted Paulis as a matrix-free scipy LinearOperator, e.g. for the iterative eigensolvers.
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis, on at most 62 qubits.
+
+    Returns:
+        scipy.sparse.linalg.LinearOperator: the 2^n x 2^n complex operator, applied by `pauli_matvec`;
+                                            its adjoint applies the conjugated coefficients.
+    """
+    dim = 2 ** packed_paulis.num_qubits
+    adjoint = PackedPaulis(packed_paulis.coeffs.conj(), packed_paulis.z, packed_paulis.x, packed_paulis.num_qubits)
+    return LinearOperator((dim, dim), matvec=lambda vector: pauli_matvec(packed_paulis, vector),
+                          rmatvec=lambda vector: pauli_matvec(adjoint, vector), dtype=np.complex128)
+
+
+def pauli_trace(packed_paulis):
+    """
+    Trace of the weighted Paulis: only the identity terms contribute, each with 2^n times its coefficient.
+
+    Args:
+        packed_paulis (PackedPaulis): the Paulis
+
+    Returns:
+        complex: the trace
+    """
+    identities = ~np.any(packed_paulis.z | packed_paulis.x, axis=1)
+    return np.sum(packed_paulis.coeffs[identities]) * 2.0 ** packed_paulis.num_qubits
@@ -16,20 +16,120 @@
 # =============================================================================
 """
 For coloring Pauli Graph for transforming paulis into grouped Paulis
+
+Two Paulis can be measured in the same tensor product basis (TPB) unless they act on a common qubit
+with different non-identity Paulis. The test is done on the bit-packed Z and X words of the Paulis,
+a block of rows at a time, so the full graph never has to be stored. A group of TPB-compatible Paulis
+is summarized by its basis, the union of the non-identity qubits of its members; a Pauli is compatible
+with every member of a group if and only if it is compatible with the basis, so all the colorings
+assign a Pauli to a group with a single vectorized test against the bases of all the groups.
 """
 
-import copy
+import logging
 
 import numpy as np
+from qiskit.quantum_info import Pauli
+
+from qiskit.aqua.utils.packed_paulis import PackedPaulis, row_keys, unpack_bits
+
+logger = logging.getLogger(__name__)
+
+# number of uint64 words compared at once when building the degrees or the edges
+_BLOCK_SIZE = 1 << 22
+
+COLORING_MODES = ['largest-degree', 'dsatur', 'independent-set', 'sorted-insertion']
+
+
+def _conflicts(z_a, x_a, z_b, x_b):
+    """
+    Qubit-wise non-commutation of the Paulis of `a` with the Paulis of `b`.
+
+    Args:
+        z_a (numpy.ndarray): packed Z words of `a`, one row per Pauli
+        x_a (numpy.ndarray): packed X words of `a`, one row per Pauli
+        z_b (numpy.ndarray): packed Z words of `b`, one row per Pauli
+        x_b (numpy.ndarray): packed X words of `b`, one row per Pauli
+
+    Returns:
+        numpy.ndarray: boolean matrix, True at (i, j) if a[i] and b[j] can not be measured in the same TPB
+    """
+    # two single-qubit Paulis are both non-identity and different if and only if they anticommute
+    return np.any((z_a[:, None] & x_b[None]) ^ (x_a[:, None] & z_b[None]), axis=2)
+
+
+class _GroupBases(object):
+    """The packed measurement bases of a growing list of groups."""
+
+    def __init__(self, num_words, capacity=8):
+        self._z = np.zeros((max(capacity, 1), num_words), dtype=np.uint64)
+        self._x = np.zeros((max(capacity, 1), num_words), dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def z(self):
+        return self._z[:self._size]
+
+    @property
+    def x(self):
+        return self._x[:self._size]
+
+    def append(self, z, x):
+        if self._size == len(self._z):
+            self._z = np.vstack((self._z, np.zeros_like(self._z)))
+            self._x = np.vstack((self._x, np.zeros_like(self._x)))
+        self._z[self._size] = z
+        self._x[self._size] = x
+        self._size += 1
+        return self._size - 1
+
+    def update(self, group, z, x):
+        self._z[group] |= z
+        self._x[group] |= x
+
+    def conflicts(self, z, x):
+        """Whether the Pauli with the packed words z and x conflicts with the basis of each group."""
+        return _conflicts(z[None], x[None], self.z, self.x)[0]
+
+    def first_compatible(self, z, x):
+        """The index of the first group the Pauli is compatible with, -1 if there is none."""
+        if self._size == 0:
+            return -1
+        compatible = np.flatnonzero(~self.conflicts(z, x))
+        return int(compatible[0]) if len(compatible) > 0 else -1
+
+    def insert(self, z, x):
+        """Add a Pauli to the first compatible group, or to a new group, and return the group index."""
+        group = self.first_compatible(z, x)
+        if group < 0:
+            return self.append(z, x)
+        self.update(group, z, x)
+        return group
+
+    def to_pauli(self, group, num_qubits):
+        return Pauli(unpack_bits(self._z[group:group + 1], num_qubits)[0],
+                     unpack_bits(self._x[group:group + 1], num_qubits)[0])
 
 
 class PauliGraph(object):
     """Pauli Graph."""
 
     def __init__(self, paulis, mode="largest-degree"):
+        """
+        Args:
+            paulis (list): list of [weight, Pauli object]
+            mode (str): the coloring heuristic, one of 'largest-degree', 'dsatur', 'independent-set'
+                        and 'sorted-insertion'; other values fall back to 'largest-degree'
+        """
         self.nodes, self.weights = self._create_nodes(paulis)  # must be pauli list
         self._nqbits = self._get_nqbits()
-        self.edges = self._create_edges()
+        packed_paulis = PackedPaulis.from_list(paulis)
+        self._z = packed_paulis.z
+        self._x = packed_paulis.x
+        self._degrees = None
+        self._edges = None
         self._grouped_paulis = self._coloring(mode)
 
     def _create_nodes(self, paulis):
@@ -52,67 +152,183 @@ class PauliGraph(object):
             assert nqbits == self.nodes[i].numberofqubits, "different number of qubits"
         return nqbits
 
-    def _create_edges(self):
+    def _blocks(self):
+        # rows of the conflict matrix compared at once, bounding the size of the temporaries
+        num_nodes = len(self.nodes)
+        block_size = max(1, _BLOCK_SIZE // max(1, num_nodes * self._z.shape[1]))
+        for start in range(0, num_nodes, block_size):
+            stop = min(start + block_size, num_nodes)
+            yield start, stop, _conflicts(self._z[start:stop], self._x[start:stop], self._z, self._x)
+
+    @property
+    def degrees(self):
+        """The number of Paulis each Pauli can not be measured with in the same TPB."""
+        if self._degrees is None:
+            self._degrees = np.zeros(len(self.nodes), dtype=np.int64)
+            for start, stop, conflicts in self._blocks():
+                self._degrees[start:stop] = np.sum(conflicts, axis=1)
+        return self._degrees
+
+    @property
+    def edges(self):
         """
-        Create edges (i,j) if i and j is not commutable under Paulis.
+        Dictionary of graph connectivity with node index as key and array of neighbors as values,
+        built on first access; (i, j) is an edge if i and j are not commutable under TPB.
+        """
+        if self._edges is None:
+            self._edges = {}
+            for start, stop, conflicts in self._blocks():
+                for i in range(start, stop):
+                    self._edges[i] = np.flatnonzero(conflicts[i - start])
+        return self._edges
 
-        Returns:
-            dictionary of graph connectivity with node index as key and list of neighbor as values
+    def _greedy_coloring(self, order):
+        """Color the nodes in the given order, each with the first group whose basis it is compatible with."""
+        bases = _GroupBases(self._z.shape[1])
+        color = np.empty(len(self.nodes), dtype=np.int64)
+        for i in order:
+            color[i] = bases.insert(self._z[i], self._x[i])
+        return color, bases
+
+    def _dsatur_coloring(self):
         """
-        conv = {
-            'I': 0,
-            'X': 1,
-            'Y': 2,
-            'Z': 3
-        }
-        a = np.array([[conv[e] for e in reversed(n.to_label())] for n in self.nodes], dtype=np.int8)
-        b = a[:, None]
-        c = (((a * b) * (a - b)) == 0).all(axis=2)  # i and j are commutable with TPB if c[i, j] is True
-        edges = {i: np.where(c[i] == False)[0] for i in range(len(self.nodes))}
-        return edges
+        DSATUR: color next the node conflicting with the most groups, breaking ties by degree.
+        A group only grows, so the saturation of a node is updated with the group that changed.
+        """
+        num_nodes = len(self.nodes)
+        degrees = self.degrees
+        bases = _GroupBases(self._z.shape[1])
+        color = np.full(num_nodes, -1, dtype=np.int64)
+        saturation = np.zeros(num_nodes, dtype=np.int64)
+        uncolored = np.ones(num_nodes, dtype=bool)
+        for _ in range(num_nodes):
+            priority = np.where(uncolored, saturation * (num_nodes + 1) + degrees, -1)
+            i = int(np.argmax(priority))
+            uncolored[i] = False
+            group = bases.first_compatible(self._z[i], self._x[i])
+            color[i] = group
+            candidates = np.flatnonzero(uncolored)
+            if group < 0:
+                group = bases.append(self._z[i], self._x[i])
+                color[i] = group
+                before = np.zeros(len(candidates), dtype=bool)
+            elif np.any((self._z[i] | self._x[i]) & ~(bases.z[group] | bases.x[group])):
+                before = _conflicts(self._z[candidates], self._x[candidates],
+                                    bases.z[group:group + 1], bases.x[group:group + 1])[:, 0]
+                bases.update(group, self._z[i], self._x[i])
+            else:
+                # the basis of the group does not change, neither do the saturations
+                continue
+            after = _conflicts(self._z[candidates], self._x[candidates],
+                               bases.z[group:group + 1], bases.x[group:group + 1])[:, 0]
+            saturation[candidates[after & ~before]] += 1
+        return color, bases
+
+    def _independent_set_coloring(self):
+        """
+        Build one maximal independent set after the other, each with the remaining nodes of the
+        lowest degrees first.
+        """
+        remaining = np.argsort(self.degrees, kind='stable')
+        bases = _GroupBases(self._z.shape[1])
+        color = np.empty(len(self.nodes), dtype=np.int64)
+        colored = np.zeros(len(self.nodes), dtype=bool)
+        while len(remaining) > 0:
+            group = bases.append(self._z[remaining[0]], self._x[remaining[0]])
+            members = []
+            candidates = remaining
+            while len(candidates) > 0:
+                i = candidates[0]
+                members.append(i)
+                bases.update(group, self._z[i], self._x[i])
+                candidates = candidates[1:]
+                conflicts = _conflicts(self._z[candidates], self._x[candidates],
+                                       bases.z[group:group + 1], bases.x[group:group + 1])[:, 0]
+                candidates = candidates[~conflicts]
+            color[members] = group
+            colored[members] = True
+            remaining = remaining[~colored[remaining]]
+        return color, bases
 
     def _coloring(self, mode="largest-degree"):
-        if mode == "largest-degree":
-            nodes = sorted(self.edges.keys(), key=lambda x: len(self.edges[x]), reverse=True)
-            # -1 means not colored; 0 ... len(self.nodes)-1 is valid colored
-            max_node = max(nodes)
-            color = np.array([-1] * (max_node + 1))
-            all_colors = np.arange(len(nodes))
-            for i in nodes:
-                neighbors = self.edges[i]
-                color_neighbors = color[neighbors]
-                color_neighbors = color_neighbors[color_neighbors >= 0]
-                mask = np.ones(len(nodes), dtype=bool)
-                mask[color_neighbors] = False
-                color[i] = np.min(all_colors[mask])
-            assert np.min(color[nodes]) >= 0, "Uncolored node exists!"
-
-            # post-processing to grouped_paulis
-            maxColor = np.max(color[nodes])  # the color used is 0, 1, 2, ..., maxColor
-            temp_gp = []  # list of indices of grouped paulis
-            for c in range(maxColor+1):  # maxColor is included
-                temp_gp.append([i for i, icolor in enumerate(color) if icolor == c])
-
-            # create _grouped_paulis as dictated in the operator.py
-            gp = []
-            for c in range(maxColor+1):  # maxColor is included
-                # add all paulis
-                gp.append([[self.weights[i], self.nodes[i]] for i in temp_gp[c]])
-
-            # create header (measurement basis)
-            for i, groupi in enumerate(gp):
-                header = [0.0, copy.deepcopy(groupi[0][1])]
-                for _, p in groupi:
-                    for k in range(self._nqbits):
-                        if p.z[k] or p.x[k]:
-                            header[1].update_z(p.z[k], k)
-                            header[1].update_x(p.x[k], k)
-                gp[i].insert(0, header)
-            return gp
+        if mode == "dsatur":
+            color, bases = self._dsatur_coloring()
+        elif mode == "independent-set":
+            color, bases = self._independent_set_coloring()
+        elif mode == "sorted-insertion":
+            # the Paulis of the largest weights first
+            order = np.argsort(-np.abs(np.asarray(self.weights)), kind='stable')
+            color, bases = self._greedy_coloring(order)
         else:
-            return self._coloring("largest-degree")  # this is the default implementation
+            if mode != "largest-degree":
+                logger.debug('Unknown coloring mode {}, using largest-degree.'.format(mode))
+            # this is the default implementation
+            color, bases = self._greedy_coloring(np.argsort(-self.degrees, kind='stable'))
+
+        # post-processing to grouped_paulis, as dictated in the operator.py
+        order = np.argsort(color, kind='stable')
+        boundaries = np.flatnonzero(np.diff(color[order])) + 1
+        gp = []
+        for c, members in enumerate(np.split(order, boundaries)):
+            # the header is the measurement basis of the group
+            gp.append([[0.0, bases.to_pauli(c, self._nqbits)]] +
+                      [[self.weights[i], self.nodes[i]] for i in members])
+        logger.debug('Grouped {} paulis into {} TPB groups with {} coloring.'.format(
+            len(self.nodes), len(gp), mode))
+        return gp
 
     @property
     def grouped_paulis(self):
         """Getter of grouped Pauli list."""
         return self._grouped_paulis
+
+    @staticmethod
+    def add_to_grouped_paulis(grouped_paulis, paulis):
+        """
+        Add paulis to grouped paulis in place, without regrouping the existing ones.
+
+        The coefficient of a pauli which is already in a group is added to it; any other pauli
+        joins the first group whose basis it is compatible with, or starts a new group.
+
+        Args:
+            grouped_paulis (list): the groups, each a header followed by [weight, Pauli object] terms
+            paulis (list): list of [weight, Pauli object] to add
+
+        Returns:
+            list: the updated grouped paulis
+        """
+        if len(paulis) == 0:
+            return grouped_paulis
+        packed_paulis = PackedPaulis.from_list(paulis)
+        num_qubits = packed_paulis.num_qubits
+        bases = _GroupBases(packed_paulis.z.shape[1], capacity=len(grouped_paulis) + len(paulis))
+        index = {}
+        if len(grouped_paulis) > 0:
+            headers = PackedPaulis.from_list([group[0] for group in grouped_paulis])
+            for group in range(len(grouped_paulis)):
+                bases.append(headers.z[group], headers.x[group])
+            terms = [(group, idx) for group in range(len(grouped_paulis))
+                     for idx in range(1, len(grouped_paulis[group]))]
+            if len(terms) > 0:
+                packed_terms = PackedPaulis.from_list([grouped_paulis[g][i] for g, i in terms])
+                index = {key.tobytes(): term for key, term in zip(row_keys(packed_terms.z, packed_terms.x), terms)}
+
+        updated = set()
+        z_bits = unpack_bits(packed_paulis.z, num_qubits)
+        x_bits = unpack_bits(packed_paulis.x, num_qubits)
+        for i, key in enumerate(row_keys(packed_paulis.z, packed_paulis.x)):
+            key = key.tobytes()
+            coeff = paulis[i][0]
+            if key in index:
+                group, idx = index[key]
+                grouped_paulis[group][idx][0] += coeff
+                continue
+            group = bases.insert(packed_paulis.z[i], packed_paulis.x[i])
+            if group == len(grouped_paulis):
+                grouped_paulis.append([None])
+            grouped_paulis[group].append([coeff, Pauli(z_bits[i], x_bits[i])])
+            index[key] = (group, len(grouped_paulis[group]) - 1)
+            updated.add(group)
+        for group in updated:
+            grouped_paulis[group][0] = [0.0, bases.to_pauli(group, num_qubits)]
+        return grouped_paulis
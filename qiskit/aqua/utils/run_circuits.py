@@ -21,6 +21,8 @@ import time
 import copy
 import os
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 
 import numpy as np
 from qiskit import transpiler
@@ -37,6 +39,8 @@ from qiskit.aqua.utils.backend_utils import (is_aer_provider,
                                              is_local_backend)
 
 MAX_CIRCUITS_PER_JOB = os.environ.get('QISKIT_AQUA_MAX_CIRCUITS_PER_JOB', None)
+MAX_PARALLEL_CHUNKS = int(os.environ.get('QISKIT_AQUA_MAX_PARALLEL_CHUNKS', 4))
+MAX_JOBS_IN_FLIGHT = int(os.environ.get('QISKIT_AQUA_MAX_JOBS_IN_FLIGHT', 4))
 
 logger = logging.getLogger(__name__)
 
@@ -156,8 +160,13 @@ def _maybe_add_aer_expectation_instruction(qobj, options):
     return qobj
 
 
-def _compile_wrapper(circuits, backend, backend_config, compile_config, run_config):
-    transpiled_circuits = transpiler.transpile(circuits, backend, **backend_config, **compile_config)
+def _compile_wrapper(circuits, backend, backend_config, compile_config, run_config, transpile_cache=None):
+    if transpile_cache is None:
+        transpiled_circuits = transpiler.transpile(circuits, backend, **backend_config, **compile_config)
+    else:
+        transpiled_circuits = transpile_cache.transpile(
+            circuits, lambda misses: transpiler.transpile(misses, backend, **backend_config, **compile_config),
+            backend.name(), backend_config, compile_config)
     qobj = assemble_circuits(transpiled_circuits, run_config=run_config)
     return qobj, transpiled_circuits
 
@@ -167,13 +176,19 @@ def compile_and_run_circuits(circuits, backend, backend_config=None,
                              qjob_config=None, backend_options=None,
                              noise_config=None, show_circuit_summary=False,
                              has_shared_circuits=False, circuit_cache=None,
-                             skip_qobj_validation=False, **kwargs):
+                             skip_qobj_validation=False, transpile_cache=None, **kwargs):
     """
     An execution wrapper with Qiskit-Terra, with job auto recover capability.
 
     The autorecovery feature is only applied for non-simulator backend.
     This wraper will try to get the result no matter how long it costs.
 
+    When the circuits are split into several chunks, up to `QISKIT_AQUA_MAX_PARALLEL_CHUNKS`
+    (default 4) chunks are transpiled concurrently, while the jobs are submitted in chunk order;
+    the results are always combined in circuit order. At most `QISKIT_AQUA_MAX_JOBS_IN_FLIGHT`
+    (default 4) jobs are submitted and not yet collected at any time, and chunks are only
+    transpiled that far ahead, so that the qobjs of a large batch are not all held at once.
+
     Args:
         circuits (QuantumCircuit or list[QuantumCircuit]): circuits to execute
         backend (BaseBackend): backend instance
@@ -187,6 +202,7 @@ def compile_and_run_circuits(circuits, backend, backend_config=None,
         has_shared_circuits (bool, optional): use the 0-th circuits as initial state for other circuits.
         circuit_cache (CircuitCache, optional): A CircuitCache to use when calling compile_and_run_circuits
         skip_qobj_validation (bool, optional): Bypass Qobj validation to decrease submission time
+        transpile_cache (TranspileCache, optional): A persistent cache consulted before transpiling circuits
 
     Returns:
         Result: Result object
@@ -224,83 +240,101 @@ def compile_and_run_circuits(circuits, backend, backend_config=None,
         else:
             max_circuits_per_job = backend.configuration().max_experiments
 
-    if circuit_cache is not None and circuit_cache.try_reusing_qobjs:
-        # Check if all circuits are the same length.
-        # If not, don't try to use the same qobj.experiment for all of them.
-        if len(set([len(circ.data) for circ in circuits])) > 1:
-            circuit_cache.try_reusing_qobjs = False
-        else:  # Try setting up the reusable qobj
-            # Compile and cache first circuit if cache is empty. The load method will try to reuse it
-            if circuit_cache.qobjs is None:
-                qobj, _ = _compile_wrapper([circuits[0]], backend, backend_config, compile_config, run_config)
-                if is_aer_provider(backend):
-                    qobj = _maybe_add_aer_expectation_instruction(qobj, kwargs)
-                circuit_cache.cache_circuit(qobj, [circuits[0]], 0)
+    if circuit_cache is not None and circuit_cache.misses < circuit_cache.allowed_misses:
+        # Compile the templates of the circuit structures which are not cached yet.
+        # Circuits with cached structures skip transpilation and assembly entirely.
+        try:
+            circuit_cache.cache_circuit(circuits,
+                                        lambda probes: _compile_wrapper(probes, backend, backend_config,
+                                                                        compile_config, run_config,
+                                                                        transpile_cache=transpile_cache)[0])
+        # template can not be built, fail gracefully; loading it below counts as a miss
+        except (TypeError, IndexError, AquaError, AttributeError, KeyError) as e:
+            logger.info('Circuit could not be cached for reason: ' + repr(e))
+            logger.info('Transpilation may be too aggressive. Try skipping transpiler.')
 
-    qobjs = []
-    jobs = []
-    job_ids = []
-    transpiled_circuits = []
     chunks = int(np.ceil(len(circuits) / max_circuits_per_job))
-    for i in range(chunks):
-        sub_circuits = circuits[i * max_circuits_per_job:(i + 1) * max_circuits_per_job]
+    sub_circuits_list = [circuits[i * max_circuits_per_job:(i + 1) * max_circuits_per_job] for i in range(chunks)]
+
+    # The chunks not served by the circuit cache are transpiled and assembled ahead in the pool,
+    # while the main thread submits each qobj, in chunk order, as soon as it is ready.
+    # The results are gathered in another pool, and a new job is only submitted once there are
+    # less than `window` jobs in flight; the results are combined in chunk order.
+    window = max(1, MAX_JOBS_IN_FLIGHT)
+    num_workers = max(1, min(chunks, MAX_PARALLEL_CHUNKS, window))
+    executor = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+    collector = ThreadPoolExecutor(max_workers=min(chunks, window)) if chunks > 1 else None
+
+    def prepare(i):
+        sub_circuits = sub_circuits_list[i]
         if circuit_cache is not None and circuit_cache.misses < circuit_cache.allowed_misses:
             try:
-                if circuit_cache.cache_transpiled_circuits:
-                    transpiled_sub_circuits = transpiler.transpile(sub_circuits, backend, **backend_config,
-                                                                   **compile_config)
-                    qobj = circuit_cache.load_qobj_from_cache(transpiled_sub_circuits, i, run_config=run_config)
-                else:
-                    qobj = circuit_cache.load_qobj_from_cache(sub_circuits, i, run_config=run_config)
-                if is_aer_provider(backend):
-                    qobj = _maybe_add_aer_expectation_instruction(qobj, kwargs)
+                return circuit_cache.load_qobj_from_cache(sub_circuits, i, run_config=run_config), []
             # cache miss, fail gracefully
             except (TypeError, IndexError, FileNotFoundError, EOFError, AquaError, AttributeError) as e:
-                circuit_cache.try_reusing_qobjs = False  # Reusing Qobj didn't work
                 if len(circuit_cache.qobjs) > 0:
                     logger.info('Circuit cache miss, recompiling. Cache miss reason: ' + repr(e))
                     circuit_cache.misses += 1
                 else:
                     logger.info('Circuit cache is empty, compiling from scratch.')
-                circuit_cache.clear_cache()
-                qobj, transpiled_sub_circuits = _compile_wrapper(sub_circuits, backend, backend_config, compile_config, run_config)
-                transpiled_circuits.extend(transpiled_sub_circuits)
-                if is_aer_provider(backend):
-                    qobj = _maybe_add_aer_expectation_instruction(qobj, kwargs)
-                try:
-                    circuit_cache.cache_circuit(qobj, sub_circuits, i)
-                except (TypeError, IndexError, AquaError, AttributeError, KeyError) as e:
-                    try:
-                        circuit_cache.cache_transpiled_circuits = True
-                        circuit_cache.cache_circuit(qobj, transpiled_sub_circuits, i)
-                    except (TypeError, IndexError, AquaError, AttributeError, KeyError) as e:
-                        logger.info('Circuit could not be cached for reason: ' + repr(e))
-                        logger.info('Transpilation may be too aggressive. Try skipping transpiler.')
+        if executor is None:
+            return _compile_wrapper(sub_circuits, backend, backend_config, compile_config, run_config,
+                                    transpile_cache)
+        return executor.submit(_compile_wrapper, sub_circuits, backend, backend_config,
+                               compile_config, run_config, transpile_cache)
 
-        else:
-            qobj, transpiled_sub_circuits = _compile_wrapper(sub_circuits, backend, backend_config, compile_config, run_config)
+    if with_autorecover:
+        logger.info("Backend status: {}".format(backend.status()))
+        logger.info("There are {} circuits and they are chunked into {} chunks, "
+                    "each with {} circutis (max.).".format(len(circuits), chunks,
+                                                           max_circuits_per_job))
+
+        def collect(idx):
+            return _result_with_autorecover(backend, jobs[idx], job_ids[idx], qobjs[idx], idx,
+                                            qjob_config=qjob_config, backend_options=backend_options,
+                                            noise_config=noise_config,
+                                            skip_qobj_validation=skip_qobj_validation)
+    else:
+        def collect(idx):
+            return jobs[idx].result(**qjob_config)
+
+    qobjs = []
+    jobs = []
+    job_ids = []
+    transpiled_circuits = []
+    results = []
+    in_flight = deque()
+    try:
+        prepared = deque()
+        for i in range(chunks):
+            # transpile ahead up to the chunks which can be in flight along with this one
+            while len(qobjs) + len(prepared) < min(chunks, i + window):
+                prepared.append(prepare(len(qobjs) + len(prepared)))
+            if len(in_flight) >= window:
+                results.append(in_flight.popleft().result())
+            item = prepared.popleft()
+            qobj, transpiled_sub_circuits = item.result() if isinstance(item, Future) else item
             transpiled_circuits.extend(transpiled_sub_circuits)
             if is_aer_provider(backend):
                 qobj = _maybe_add_aer_expectation_instruction(qobj, kwargs)
-
-        # assure get job ids
-        while True:
-            job = run_on_backend(backend, qobj, backend_options=backend_options, noise_config=noise_config,
-                                 skip_qobj_validation=skip_qobj_validation)
-            try:
-                job_id = job.job_id()
-                break
-            except JobError as e:
-                logger.warning("FAILURE: the {}-th chunk of circuits, can not get job id, "
-                               "Resubmit the qobj to get job id. "
-                               "Terra job error: {} ".format(i, e))
-            except Exception as e:
-                logger.warning("FAILURE: the {}-th chunk of circuits, can not get job id, "
-                               "Resubmit the qobj to get job id. "
-                               "Error: {} ".format(i, e))
-        job_ids.append(job_id)
-        jobs.append(job)
-        qobjs.append(qobj)
+            job, job_id = _submit_with_job_id(backend, qobj, i, backend_options=backend_options,
+                                              noise_config=noise_config,
+                                              skip_qobj_validation=skip_qobj_validation)
+            if with_autorecover:
+                logger.info("Submitted {}-th chunk of circuits, job id: {}".format(i, job_id))
+            job_ids.append(job_id)
+            jobs.append(job)
+            qobjs.append(qobj)
+            if collector is None:
+                results.append(collect(i))
+            else:
+                in_flight.append(collector.submit(collect, i))
+        while len(in_flight) > 0:
+            results.append(in_flight.popleft().result())
+    finally:
+        for pool in (executor, collector):
+            if pool is not None:
+                pool.shutdown(wait=False)
 
     if logger.isEnabledFor(logging.DEBUG) and show_circuit_summary:
         logger.debug("==== Before transpiler ====")
@@ -308,96 +342,100 @@ def compile_and_run_circuits(circuits, backend, backend_config=None,
         logger.debug("====  After transpiler ====")
         logger.debug(summarize_circuits(transpiled_circuits))
 
-    results = []
-    if with_autorecover:
-        logger.info("Backend status: {}".format(backend.status()))
-        logger.info("There are {} circuits and they are chunked into {} chunks, "
-                    "each with {} circutis (max.).".format(len(circuits), chunks,
-                                                           max_circuits_per_job))
-        logger.info("All job ids:\n{}".format(job_ids))
-        for idx in range(len(jobs)):
-            while True:
-                job = jobs[idx]
-                job_id = job_ids[idx]
-                logger.info("Running {}-th chunk circuits, job id: {}".format(idx, job_id))
-                # try to get result if possible
-                try:
-                    result = job.result(**qjob_config)
-                    if result.success:
-                        results.append(result)
-                        logger.info("COMPLETED the {}-th chunk of circuits, "
-                                    "job id: {}".format(idx, job_id))
-                        break
-                    else:
-                        logger.warning("FAILURE: the {}-th chunk of circuits, "
-                                       "job id: {}".format(idx, job_id))
-                except JobError as e:
-                    # if terra raise any error, which means something wrong, re-run it
-                    logger.warning("FAILURE: the {}-th chunk of circuits, job id: {} "
-                                   "Terra job error: {} ".format(idx, job_id, e))
-                except Exception as e:
-                    raise AquaError("FAILURE: the {}-th chunk of circuits, job id: {} "
-                                    "Unknown error: {} ".format(idx, job_id, e)) from e
-
-                # something wrong here, querying the status to check how to handle it.
-                # keep qeurying it until getting the status.
-                while True:
-                    try:
-                        job_status = job.status()
-                        break
-                    except JobError as e:
-                        logger.warning("FAILURE: job id: {}, "
-                                       "status: 'FAIL_TO_GET_STATUS' "
-                                       "Terra job error: {}".format(job_id, e))
-                        time.sleep(5)
-                    except Exception as e:
-                        raise AquaError("FAILURE: job id: {}, "
-                                        "status: 'FAIL_TO_GET_STATUS' "
-                                        "Unknown error: ({})".format(job_id, e)) from e
-
-                logger.info("Job status: {}".format(job_status))
-
-                # handle the failure job based on job status
-                if job_status == JobStatus.DONE:
-                    logger.info("Job ({}) is completed anyway, retrieve result "
-                                "from backend.".format(job_id))
-                    job = backend.retrieve_job(job_id)
-                elif job_status == JobStatus.RUNNING or job_status == JobStatus.QUEUED:
-                    logger.info("Job ({}) is {}, but encounter an exception, "
-                                "recover it from backend.".format(job_id, job_status))
-                    job = backend.retrieve_job(job_id)
-                else:
-                    logger.info("Fail to run Job ({}), resubmit it.".format(job_id))
-                    qobj = qobjs[idx]
-                    #  assure job get its id
-                    while True:
-                        job = run_on_backend(backend, qobj,
-                                             backend_options=backend_options,
-                                             noise_config=noise_config,
-                                             skip_qobj_validation=skip_qobj_validation)
-                        try:
-                            job_id = job.job_id()
-                            break
-                        except JobError as e:
-                            logger.warning("FAILURE: the {}-th chunk of circuits, "
-                                           "can not get job id. Resubmit the qobj to get job id. "
-                                           "Terra job error: {} ".format(idx, e))
-                        except Exception as e:
-                            logger.warning("FAILURE: the {}-th chunk of circuits, "
-                                           "can not get job id, Resubmit the qobj to get job id. "
-                                           "Unknown error: {} ".format(idx, e))
-                    jobs[idx] = job
-                    job_ids[idx] = job_id
-    else:
-        results = []
-        for job in jobs:
-            results.append(job.result(**qjob_config))
-
     result = _combine_result_objects(results) if len(results) != 0 else None
 
     return result
 
 
+def _submit_with_job_id(backend, qobj, idx, backend_options=None, noise_config=None, skip_qobj_validation=False):
+    """Submit the qobj of the idx-th chunk, resubmitting it until the job has an id.
+
+    Returns:
+        BaseJob: the submitted job
+        str: the id of the job
+    """
+    while True:
+        job = run_on_backend(backend, qobj, backend_options=backend_options, noise_config=noise_config,
+                             skip_qobj_validation=skip_qobj_validation)
+        try:
+            job_id = job.job_id()
+            return job, job_id
+        except JobError as e:
+            logger.warning("FAILURE: the {}-th chunk of circuits, can not get job id, "
+                           "Resubmit the qobj to get job id. "
+                           "Terra job error: {} ".format(idx, e))
+        except Exception as e:
+            logger.warning("FAILURE: the {}-th chunk of circuits, can not get job id, "
+                           "Resubmit the qobj to get job id. "
+                           "Error: {} ".format(idx, e))
+
+
+def _result_with_autorecover(backend, job, job_id, qobj, idx, qjob_config=None, backend_options=None,
+                             noise_config=None, skip_qobj_validation=False):
+    """Wait for the result of the idx-th chunk, recovering or resubmitting its job on failures.
+
+    Returns:
+        Result: the successful result of the chunk
+
+    Raises:
+        AquaError: Any error except for JobError raised by Qiskit Terra
+    """
+    qjob_config = qjob_config or {}
+    while True:
+        logger.info("Running {}-th chunk circuits, job id: {}".format(idx, job_id))
+        # try to get result if possible
+        try:
+            result = job.result(**qjob_config)
+            if result.success:
+                logger.info("COMPLETED the {}-th chunk of circuits, "
+                            "job id: {}".format(idx, job_id))
+                return result
+            else:
+                logger.warning("FAILURE: the {}-th chunk of circuits, "
+                               "job id: {}".format(idx, job_id))
+        except JobError as e:
+            # if terra raise any error, which means something wrong, re-run it
+            logger.warning("FAILURE: the {}-th chunk of circuits, job id: {} "
+                           "Terra job error: {} ".format(idx, job_id, e))
+        except Exception as e:
+            raise AquaError("FAILURE: the {}-th chunk of circuits, job id: {} "
+                            "Unknown error: {} ".format(idx, job_id, e)) from e
+
+        # something wrong here, querying the status to check how to handle it.
+        # keep qeurying it until getting the status.
+        while True:
+            try:
+                job_status = job.status()
+                break
+            except JobError as e:
+                logger.warning("FAILURE: job id: {}, "
+                               "status: 'FAIL_TO_GET_STATUS' "
+                               "Terra job error: {}".format(job_id, e))
+                time.sleep(5)
+            except Exception as e:
+                raise AquaError("FAILURE: job id: {}, "
+                                "status: 'FAIL_TO_GET_STATUS' "
+                                "Unknown error: ({})".format(job_id, e)) from e
+
+        logger.info("Job status: {}".format(job_status))
+
+        # handle the failure job based on job status
+        if job_status == JobStatus.DONE:
+            logger.info("Job ({}) is completed anyway, retrieve result "
+                        "from backend.".format(job_id))
+            job = backend.retrieve_job(job_id)
+        elif job_status == JobStatus.RUNNING or job_status == JobStatus.QUEUED:
+            logger.info("Job ({}) is {}, but encounter an exception, "
+                        "recover it from backend.".format(job_id, job_status))
+            job = backend.retrieve_job(job_id)
+        else:
+            logger.info("Fail to run Job ({}), resubmit it.".format(job_id))
+            #  assure job get its id
+            job, job_id = _submit_with_job_id(backend, qobj, idx, backend_options=backend_options,
+                                              noise_config=noise_config,
+                                              skip_qobj_validation=skip_qobj_validation)
+
+
 # skip_qobj_validation = True does what backend.run and aerjob.submit do, but without qobj validation.
 def run_on_backend(backend, qobj, backend_options=None, noise_config=None, skip_qobj_validation=False):
     if skip_qobj_validation:
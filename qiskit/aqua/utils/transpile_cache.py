@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+""" A persistent, content-addressed cache of transpiled circuits.
+
+Each transpiled circuit is stored in its own pickle file, named after the fingerprint of the
+uncompiled circuit (its registers and instructions, including the parameter values), the backend,
+the backend configuration (basis gates and coupling map) and the compile configuration. Unlike
+`CircuitCache`, which reuses the compiled qobjs of a single run, the transpile cache is meant to
+be shared across runs which transpile the very same circuits, e.g. the feature map circuits of a
+fixed dataset.
+
+The entries are tracked in a fixed-size index file, accessed as a numpy memory map, which records
+the fingerprint, the last access time and the size of every entry. When the cache is full, the
+least recently used entry is evicted. Entries are written to a temporary file first and then
+renamed, so that a concurrent reader never sees a partially written entry, and the index is only
+read and updated while holding a lock file, so that several processes can share the cache.
+
+The fingerprint only hashes canonical values, e.g. the edges of a coupling map or the passes of a
+pass manager, never the default `repr` of an object, which contains its memory address and would
+differ in every process.
+"""
+
+import contextlib
+import copy
+import hashlib
+import io
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+
+import numpy as np
+import sympy
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FILE = 'index.bin'
+_LOCK_FILE = 'index.lock'
+_INDEX_DTYPE = np.dtype([('key', 'u1', (32,)), ('last_used', '<f8'), ('size', '<i8')])
+
+# attributes which hold the state of a run rather than the configuration
+_VOLATILE_ATTRIBUTES = {'property_set', 'fenced_property_set', 'valid_passes'}
+_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def _canonical(value, visited=None):
+    """A representation of a configuration value which is the same in every process."""
+    if value is None or isinstance(value, (bool, int, str, bytes)):
+        return value
+    if isinstance(value, (float, np.floating)):
+        return float(value)
+    if isinstance(value, (complex, np.complexfloating)):
+        return complex(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, _canonical(value.tolist(), visited))
+
+    visited = set() if visited is None else visited
+    if id(value) in visited:
+        return ('cycle', type(value).__name__)
+    visited = visited | {id(value)}
+    if isinstance(value, dict):
+        return ('dict', sorted((repr(_canonical(k, visited)), repr(_canonical(v, visited)))
+                               for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, [_canonical(v, visited) for v in value])
+    if isinstance(value, (set, frozenset)):
+        return ('set', sorted(repr(_canonical(v, visited)) for v in value))
+
+    type_name = type(value).__module__ + '.' + type(value).__qualname__
+    if hasattr(value, 'get_edges'):
+        # coupling map
+        return (type_name, sorted(tuple(edge) for edge in value.get_edges()))
+    if hasattr(value, 'get_virtual_bits'):
+        # layout, virtual (register, index) to physical qubit
+        return (type_name, sorted(((reg.name, reg.size, idx), phys)
+                                  for (reg, idx), phys in value.get_virtual_bits().items()))
+    if hasattr(value, 'name') and hasattr(value, 'size') and not callable(value.size):
+        # register
+        return (type_name, value.name, value.size)
+    if hasattr(value, 'passes') and callable(value.passes):
+        # pass manager
+        return (type_name, _canonical(value.passes(), visited))
+    if callable(value) and hasattr(value, '__qualname__'):
+        return (type_name, getattr(value, '__module__', None), value.__qualname__)
+    if hasattr(value, '__dict__'):
+        return (type_name, _canonical({k: v for k, v in vars(value).items()
+                                       if not k.startswith('_') and k not in _VOLATILE_ATTRIBUTES}, visited))
+    return (type_name, _ADDRESS.sub('', repr(value)))
+
+
+class _CircuitPickler(pickle.Pickler):
+    """Pickles the sympy parameters of the gates as expressions, not as sympy internal state, which
+    does not load back with every version of sympy."""
+
+    def persistent_id(self, obj):
+        if isinstance(obj, sympy.Basic):
+            return 'sympy', sympy.srepr(obj)
+        return None
+
+
+class _CircuitUnpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        kind, expression = pid
+        if kind != 'sympy':
+            raise pickle.UnpicklingError('Unknown persistent id {}'.format(kind))
+        return sympy.sympify(expression)
+
+
+def circuit_fingerprint(circuit, backend_name, backend_config, compile_config):
+    """
+    Compute the fingerprint of a circuit transpiled with the given configuration.
+
+    Args:
+        circuit (QuantumCircuit): the uncompiled circuit
+        backend_name (str): the name of the target backend
+        backend_config (dict): configuration for backend, i.e. basis gates and coupling map
+        compile_config (dict): configuration for compilation
+
+    Returns:
+        bytes: the sha256 digest of the circuit and the configuration
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((backend_name,
+                        _canonical(backend_config),
+                        _canonical(compile_config),
+                        [(reg.name, reg.size) for reg in circuit.qregs],
+                        [(reg.name, reg.size) for reg in circuit.cregs])).encode())
+    for instruction, qargs, cargs in circuit.data:
+        params = getattr(instruction, 'params', None) or []
+        try:
+            params = np.asarray(params, dtype=complex).tobytes()
+        except (TypeError, ValueError):
+            params = repr(_canonical(list(params))).encode()
+        digest.update(repr((instruction.name,
+                            [(reg.name, idx) for reg, idx in qargs],
+                            [(reg.name, idx) for reg, idx in cargs])).encode())
+        digest.update(params)
+    return digest.digest()
+
+
+class TranspileCache:
+    """Persistent LRU cache of transpiled circuits, keyed by circuit fingerprint."""
+
+    def __init__(self, cache_dir, max_entries=4096):
+        """
+        Constructor.
+
+        Args:
+            cache_dir (str): the directory in which the cache is stored, created if missing
+            max_entries (int): the maximum number of transpiled circuits kept in the cache
+        """
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        # chunks of circuits may be transpiled concurrently, by several threads and processes
+        self._lock = threading.Lock()
+        with self._locked():
+            self._index = self._open_index()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the thread lock and the lock file of the index."""
+        with self._lock:
+            with open(os.path.join(self._cache_dir, _LOCK_FILE), 'a+b') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    index = getattr(self, '_index', None)
+                    if index is not None:
+                        index.flush()
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _open_index(self):
+        path = os.path.join(self._cache_dir, _INDEX_FILE)
+        if os.path.exists(path) and os.path.getsize(path) == self._max_entries * _INDEX_DTYPE.itemsize:
+            return np.memmap(path, dtype=_INDEX_DTYPE, mode='r+', shape=(self._max_entries,))
+        index = np.zeros(self._max_entries, dtype=_INDEX_DTYPE)
+        if os.path.exists(path):
+            # the capacity changed, keep the most recently used entries which still fit
+            old_index = np.fromfile(path, dtype=_INDEX_DTYPE)
+            old_index = old_index[old_index['last_used'] > 0]
+            old_index = old_index[np.argsort(-old_index['last_used'])]
+            for entry in old_index[self._max_entries:]:
+                self._remove_entry_file(entry['key'])
+            old_index = old_index[:self._max_entries]
+            index[:len(old_index)] = old_index
+        self._atomic_write(path, index.tobytes())
+        return np.memmap(path, dtype=_INDEX_DTYPE, mode='r+', shape=(self._max_entries,))
+
+    def _entry_path(self, key):
+        return os.path.join(self._cache_dir, bytes(key).hex() + '.pkl')
+
+    def _remove_entry_file(self, key):
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _atomic_write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _find(self, key):
+        matches = np.flatnonzero(np.all(self._index['key'] == np.frombuffer(key, dtype=np.uint8), axis=1) &
+                                 (self._index['last_used'] > 0))
+        return matches[0] if len(matches) > 0 else None
+
+    def get(self, key):
+        """
+        Look up a transpiled circuit.
+
+        Args:
+            key (bytes): the fingerprint of the circuit
+
+        Returns:
+            QuantumCircuit: the transpiled circuit, or None on a cache miss
+        """
+        with self._locked():
+            slot = self._find(key)
+            if slot is None:
+                return None
+            try:
+                with open(self._entry_path(key), 'rb') as entry_file:
+                    circuit = _CircuitUnpickler(entry_file).load()
+            except Exception as e:  # pylint: disable=broad-except
+                # e.g. an entry written by other versions of the libraries, which is a miss
+                logger.debug("Dropping unreadable transpile cache entry: {}".format(repr(e)))
+                self._index[slot] = 0
+                return None
+            self._index['last_used'][slot] = time.time()
+            return circuit
+
+    def put(self, key, circuit):
+        """
+        Store a transpiled circuit, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (bytes): the fingerprint of the uncompiled circuit
+            circuit (QuantumCircuit): the transpiled circuit
+        """
+        buffer = io.BytesIO()
+        _CircuitPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(circuit)
+        data = buffer.getvalue()
+        with self._locked():
+            slot = self._find(key)
+            if slot is None:
+                slot = int(np.argmin(self._index['last_used']))
+                if self._index['last_used'][slot] > 0:
+                    self._remove_entry_file(self._index['key'][slot])
+            self._atomic_write(self._entry_path(key), data)
+            self._index['key'][slot] = np.frombuffer(key, dtype=np.uint8)
+            self._index['size'][slot] = len(data)
+            self._index['last_used'][slot] = time.time()
+
+    def transpile(self, circuits, transpile_fn, backend_name, backend_config, compile_config):
+        """
+        Transpile circuits, reusing the cached transpiled circuits and transpiling only the misses.
+
+        Args:
+            circuits (list[QuantumCircuit]): the circuits to transpile
+            transpile_fn (callable): transpiles a list of circuits
+            backend_name (str): the name of the target backend
+            backend_config (dict): configuration for backend
+            compile_config (dict): configuration for compilation
+
+        Returns:
+            list[QuantumCircuit]: the transpiled circuits, in the order of `circuits`
+        """
+        keys = [circuit_fingerprint(circuit, backend_name, backend_config, compile_config) for circuit in circuits]
+        transpiled_circuits = [self.get(key) for key in keys]
+        misses = [i for i, transpiled in enumerate(transpiled_circuits) if transpiled is None]
+        logger.debug("Transpile cache: {} hits, {} misses.".format(len(circuits) - len(misses), len(misses)))
+        if len(misses) > 0:
+            new_circuits = transpile_fn([circuits[i] for i in misses])
+            if not isinstance(new_circuits, list):
+                new_circuits = [new_circuits]
+            for i, transpiled in zip(misses, new_circuits):
+                self.put(keys[i], transpiled)
+                transpiled_circuits[i] = transpiled
+        for i, (circuit, transpiled) in enumerate(zip(circuits, transpiled_circuits)):
+            if transpiled.name != circuit.name:
+                # the fingerprint ignores the name, but circuits are looked up by name in the results
+                transpiled_circuits[i] = copy.copy(transpiled)
+                transpiled_circuits[i].name = circuit.name
+        return transpiled_circuits
+
+    def clear(self):
+        """Remove all the entries of the cache."""
+        with self._locked():
+            for key in self._index['key'][self._index['last_used'] > 0]:
+                self._remove_entry_file(key)
+            self._index[:] = 0
+
+    @property
+    def cache_dir(self):
+        """Return the directory of the cache."""
+        return self._cache_dir
+
+    @property
+    def max_entries(self):
+        """Return the maximum number of entries."""
+        return self._max_entries
+
+    def __len__(self):
+        return int(np.count_nonzero(self._index['last_used'] > 0))
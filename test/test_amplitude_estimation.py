@@ -25,14 +25,76 @@ from parameterized import parameterized
 
 from qiskit import QuantumRegister, QuantumCircuit, BasicAer, execute
 
-from qiskit.aqua import QuantumInstance
+from qiskit.aqua import QuantumInstance, AquaError
 from qiskit.aqua.components.uncertainty_models import LogNormalDistribution, MultivariateNormalDistribution
 from qiskit.aqua.components.uncertainty_models import GaussianConditionalIndependenceModel as GCI
 from qiskit.aqua.components.uncertainty_problems import EuropeanCallExpectedValue, EuropeanCallDelta, FixedIncomeExpectedValue
 from qiskit.aqua.components.uncertainty_problems import UnivariatePiecewiseLinearObjective as PwlObjective
-from qiskit.aqua.components.uncertainty_problems import MultivariateProblem
+from qiskit.aqua.components.uncertainty_problems import MultivariateProblem, UncertaintyProblem
 from qiskit.aqua.circuits import WeightedSumOperator
-from qiskit.aqua.algorithms import AmplitudeEstimation
+from qiskit.aqua.algorithms import AmplitudeEstimation, MaximumLikelihoodAmplitudeEstimation
+
+
+class BernoulliAFactory(UncertaintyProblem):
+    """A single qubit measured in |1> with probability p, whose Q operator is a rotation by twice the angle."""
+
+    def __init__(self, probability, closed_form=True):
+        super().__init__(1)
+        self._theta = 2 * np.arcsin(np.sqrt(probability))
+        self._closed_form = closed_form
+
+    def build(self, qc, q, q_ancillas=None):
+        qc.ry(self._theta, q[0])
+
+    @property
+    def has_closed_form_q_power(self):
+        return self._closed_form
+
+    def build_q_power(self, qc, q, i_objective, power, q_ancillas=None):
+        qc.ry(2 * power * self._theta, q[0])
+
+
+class TestControlledPowers(QiskitAquaTestCase):
+
+    def test_closed_form_q_power(self):
+        probability = 0.3
+        results = []
+        for closed_form in [True, False]:
+            ae = AmplitudeEstimation(4, BernoulliAFactory(probability, closed_form=closed_form))
+            result = ae.run(quantum_instance=BasicAer.get_backend('statevector_simulator'))
+            results.append(result)
+        self.assertEqual(results[0]['estimation'], results[1]['estimation'])
+        np.testing.assert_array_almost_equal(results[0]['statevector'], results[1]['statevector'])
+        self.assertAlmostEqual(results[0]['estimation'], probability, places=1)
+
+    def test_controlled_power_by_reference(self):
+        uncertainty_model = LogNormalDistribution(2, mu=0.1, sigma=0.2, low=0, high=2)
+        european_call = EuropeanCallExpectedValue(uncertainty_model, strike_price=1, c_approx=0.5)
+        q_factory = AmplitudeEstimation(2, european_call).q_factory
+
+        q = QuantumRegister(european_call.num_target_qubits, name='q')
+        q_aux = QuantumRegister(q_factory.required_ancillas_controlled(), name='aux')
+        q_control = QuantumRegister(1, name='c')
+        qc_power = QuantumCircuit(q, q_aux)
+        european_call.build(qc_power, q, q_aux)
+        qc_controlled = qc_power.copy()
+        qc_controlled.add_register(q_control)
+        qc_controlled.x(q_control[0])
+        num_a_gates = len(qc_power.data)
+
+        # the controlled power is built from a single controlled body, repeated by reference
+        q_factory.build_power(qc_power, q, 4, q_aux)
+        q_factory.build_controlled_power(qc_controlled, q, q_control[0], 4, q_aux)
+        body = QuantumCircuit(q, q_aux, q_control)
+        q_factory.build_controlled(body, q, q_control[0], q_aux)
+        self.assertEqual(len(qc_controlled.data), num_a_gates + 1 + 4 * len(body.data))
+
+        backend = BasicAer.get_backend('statevector_simulator')
+        state_power = execute(qc_power, backend).result().get_statevector()
+        state_controlled = execute(qc_controlled, backend).result().get_statevector()
+        # the control qubit is the most significant one and in |1>
+        state_controlled = state_controlled[len(state_power):]
+        self.assertAlmostEqual(np.abs(np.vdot(state_power, state_controlled)), 1.0, places=6)
 
 
 class TestEuropeanCallOption(QiskitAquaTestCase):
@@ -143,6 +205,86 @@ class TestEuropeanCallOption(QiskitAquaTestCase):
         # compare to precomputed solution
         self.assertEqual(0.0, np.round(result['estimation'] - 0.5000, decimals=4))
 
+    @parameterized.expand([
+        'qasm_simulator',
+        'statevector_simulator'
+    ])
+    def test_run_batch(self, simulator):
+
+        uncertainty_model = LogNormalDistribution(2, mu=0.1, sigma=0.2, low=0, high=2)
+        european_call_delta = EuropeanCallDelta(uncertainty_model, strike_price=1)
+        num_eval_qubits = [2, 3, 4]
+
+        ae = AmplitudeEstimation(3, european_call_delta)
+        quantum_instance = QuantumInstance(BasicAer.get_backend(simulator), shots=1000, seed=2, seed_mapper=2)
+        results = ae.run_batch(num_eval_qubits, quantum_instance=quantum_instance)
+        self.assertEqual(len(results), len(num_eval_qubits))
+
+        for m, result in zip(num_eval_qubits, results):
+            with self.subTest(m=m):
+                self.assertAlmostEqual(sum(result['probabilities']), 1.0, places=4)
+                single = AmplitudeEstimation(m, european_call_delta).run(quantum_instance=quantum_instance)
+                if simulator == 'statevector_simulator':
+                    # the batch evaluates the ideal distribution, the single run simulates the full circuit
+                    np.testing.assert_array_almost_equal(result['values'], single['values'])
+                    np.testing.assert_array_almost_equal(result['probabilities'], single['probabilities'])
+                    self.assertAlmostEqual(result['estimation'], single['estimation'], places=4)
+                else:
+                    self.assertIn(result['estimation'], single['mapped_values'])
+
+    @parameterized.expand([
+        'qasm_simulator',
+        'statevector_simulator'
+    ])
+    def test_maximum_likelihood(self, simulator):
+
+        uncertainty_model = LogNormalDistribution(3, mu=0.1, sigma=0.2, low=0, high=2)
+        european_call = EuropeanCallExpectedValue(uncertainty_model, strike_price=1, c_approx=0.5)
+
+        # exact amplitude of the objective qubit
+        q = QuantumRegister(european_call.num_target_qubits, name='q')
+        q_a = QuantumRegister(european_call.required_ancillas(), name='q_a')
+        qc = QuantumCircuit(q, q_a)
+        european_call.build(qc, q, q_a)
+        probabilities = np.abs(execute(qc, BasicAer.get_backend('statevector_simulator')).result().get_statevector()) ** 2
+        i_objective = european_call.num_target_qubits - 1
+        exact = np.sum(probabilities.reshape(-1, 2, 2 ** i_objective)[:, 1, :])
+
+        mlae = MaximumLikelihoodAmplitudeEstimation(3, european_call, alpha=0.01)
+        self.assertEqual(mlae.evaluation_schedule, [0, 1, 2, 4])
+        quantum_instance = QuantumInstance(BasicAer.get_backend(simulator), shots=1000, seed=7, seed_mapper=7)
+        result = mlae.run(quantum_instance=quantum_instance)
+
+        if simulator == 'statevector_simulator':
+            self.assertAlmostEqual(result['value'], exact, places=6)
+
+            # an explicit evaluation schedule overrides the number of oracle circuits, which may be None
+            self.assertEqual(MaximumLikelihoodAmplitudeEstimation(a_factory=european_call).evaluation_schedule,
+                             [0, 1, 2, 4, 8, 16])
+            mlae = MaximumLikelihoodAmplitudeEstimation(None, european_call, evaluation_schedule=[0, 1, 3])
+            self.assertEqual(mlae.evaluation_schedule, [0, 1, 3])
+            self.assertAlmostEqual(mlae.run(quantum_instance=quantum_instance)['value'], exact, places=6)
+            with self.assertRaises(AquaError):
+                MaximumLikelihoodAmplitudeEstimation(None, european_call)
+
+            # the evaluation schedule can be configured
+            params = {
+                'algorithm': {'name': 'MaximumLikelihoodAmplitudeEstimation', 'num_oracle_circuits': None,
+                              'evaluation_schedule': [0, 1, 3], 'alpha': 0.05},
+                'uncertainty_problem': {'name': 'EuropeanCallExpectedValue', 'strike_price': 1, 'c_approx': 0.5},
+                'univariate_distribution': {'name': 'LogNormalDistribution', 'num_target_qubits': 3,
+                                            'mu': 0.1, 'sigma': 0.2, 'low': 0, 'high': 2}
+            }
+            mlae = MaximumLikelihoodAmplitudeEstimation.init_params(params, None)
+            self.assertEqual(mlae.evaluation_schedule, [0, 1, 3])
+            self.assertAlmostEqual(mlae.run(quantum_instance=quantum_instance)['value'], exact, places=6)
+        else:
+            for kind in ['fisher', 'likelihood_ratio']:
+                lower, upper = mlae.confidence_interval(kind=kind)
+                self.assertLessEqual(lower, exact)
+                self.assertGreaterEqual(upper, exact)
+        self.assertAlmostEqual(result['estimation'], european_call.value_to_estimation(result['value']))
+
 
 class TestFixedIncomeAssets(QiskitAquaTestCase):
 
@@ -6,7 +6,7 @@ from parameterized import parameterized
 import tempfile
 import pickle
 
-from qiskit import BasicAer
+from qiskit import BasicAer, QuantumRegister, QuantumCircuit
 from test.common import QiskitAquaTestCase
 from qiskit.aqua import Operator, QuantumInstance, QiskitAqua
 from qiskit.aqua.input import EnergyInput
@@ -14,7 +14,8 @@ from qiskit.aqua.components.variational_forms import RY, RYRZ
 from qiskit.aqua.components.optimizers import L_BFGS_B
 from qiskit.aqua.components.initial_states import Zero
 from qiskit.aqua.algorithms.adaptive import VQE
-from qiskit.aqua.utils import CircuitCache
+from qiskit.aqua.utils import CircuitCache, TranspileCache
+from qiskit.aqua.utils.transpile_cache import circuit_fingerprint
 from qiskit.qobj import Qobj
 
 
@@ -158,7 +159,8 @@ class TestCaching(QiskitAquaTestCase):
             self.assertIn('mappings', saved_cache)
             qobjs = [Qobj.from_dict(qob) for qob in saved_cache['qobjs']]
             self.assertTrue(isinstance(qobjs[0], Qobj))
-            self.assertGreaterEqual(len(saved_cache['mappings'][0][0]), 50)
+            self.assertIn('signatures', saved_cache)
+            self.assertGreaterEqual(len(saved_cache['mappings'][0]), 50)
 
             quantum_instance1 = QuantumInstance(backend,
                                                circuit_caching=True,
@@ -177,7 +179,92 @@ class TestCaching(QiskitAquaTestCase):
             self.assertEqual(quantum_instance0.circuit_cache.mappings, quantum_instance1.circuit_cache.mappings)
             self.assertLessEqual(quantum_instance1.circuit_cache.misses, 0)
 
+    def test_caching_traces_unrolled_parameters(self):
+        backend = BasicAer.get_backend('statevector_simulator')
+        quantum_instance = QuantumInstance(backend, circuit_caching=False)
+        quantum_instance_caching = QuantumInstance(backend,
+                                                   circuit_caching=True,
+                                                   skip_qobj_deepcopy=True,
+                                                   skip_qobj_validation=True)
+
+        def construct_circuit(params):
+            q = QuantumRegister(2, 'q')
+            qc = QuantumCircuit(q)
+            qc.ry(params[0], q[0])
+            qc.rx(params[1], q[1])
+            qc.crz(params[2], q[0], q[1])
+            qc.cu1(params[3], q[1], q[0])
+            return qc
+
+        for _ in range(3):
+            circuits = [construct_circuit(np.random.random(4)) for _ in range(2)]
+            result = quantum_instance.execute(circuits)
+            result_caching = quantum_instance_caching.execute(circuits)
+            for circuit in circuits:
+                np.testing.assert_array_almost_equal(result.get_statevector(circuit),
+                                                     result_caching.get_statevector(circuit))
+        self.assertEqual(quantum_instance_caching.circuit_cache.misses, 0)
+        self.assertEqual(len(quantum_instance_caching.circuit_cache.qobjs), 1)
+
+    def test_transpile_cache(self):
+        backend = BasicAer.get_backend('statevector_simulator')
+        var_form = RYRZ(num_qubits=3, depth=2)
+        circuits = [var_form.construct_circuit(np.random.random(var_form.num_parameters)) for _ in range(3)]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            quantum_instance = QuantumInstance(backend, circuit_caching=False,
+                                               transpile_cache_dir=cache_dir, transpile_cache_size=4)
+            result = quantum_instance.execute(circuits)
+            self.assertEqual(len(quantum_instance.transpile_cache), 3)
+
+            transpile_cache = TranspileCache(cache_dir, max_entries=4)
+            self.assertEqual(len(transpile_cache), 3)
+            transpiled = transpile_cache.transpile(circuits, lambda misses: self.fail("cache miss"),
+                                                   backend.name(), quantum_instance.backend_config,
+                                                   quantum_instance.compile_config)
+            self.assertEqual([circuit.name for circuit in transpiled], [circuit.name for circuit in circuits])
+
+            quantum_instance_cached = QuantumInstance(backend, circuit_caching=False,
+                                                      transpile_cache_dir=cache_dir, transpile_cache_size=4)
+            result_cached = quantum_instance_cached.execute(circuits[1:] + [circuits[0]])
+            for circuit in circuits:
+                np.testing.assert_array_almost_equal(result.get_statevector(circuit),
+                                                     result_cached.get_statevector(circuit))
+
+            new_circuits = [var_form.construct_circuit(np.random.random(var_form.num_parameters)) for _ in range(2)]
+            quantum_instance_cached.execute(new_circuits)
+            self.assertEqual(len(quantum_instance_cached.transpile_cache), 4)
+
+    def test_transpile_cache_fingerprint(self):
+        from qiskit.transpiler import CouplingMap, Layout
+        var_form = RYRZ(num_qubits=3, depth=2)
+        circuit = var_form.construct_circuit(np.random.random(var_form.num_parameters))
+        qr = circuit.qregs[0]
+
+        def config(edges, layout):
+            return {'coupling_map': CouplingMap(edges), 'initial_layout': Layout(layout),
+                    'basis_gates': ['u1', 'u2', 'u3', 'cx'], 'seed_transpiler': 7}
+
+        # equal configurations in other objects, e.g. in another process, give the same key
+        key = circuit_fingerprint(circuit, 'backend', {}, config([[0, 1], [1, 2]], {qr[0]: 0, qr[1]: 1, qr[2]: 2}))
+        self.assertEqual(key, circuit_fingerprint(circuit, 'backend', {},
+                                                  config([[1, 2], [0, 1]], {qr[2]: 2, qr[1]: 1, qr[0]: 0})))
+        self.assertNotEqual(key, circuit_fingerprint(circuit, 'backend', {},
+                                                     config([[0, 1], [0, 2]], {qr[0]: 0, qr[1]: 1, qr[2]: 2})))
+        self.assertNotEqual(key, circuit_fingerprint(circuit, 'backend', {},
+                                                     config([[0, 1], [1, 2]], {qr[0]: 1, qr[1]: 0, qr[2]: 2})))
 
+    def test_transpile_cache_unreadable_entry(self):
+        circuit = QuantumCircuit(QuantumRegister(1, 'q'))
+        circuit.h(circuit.qregs[0][0])
+        with tempfile.TemporaryDirectory() as cache_dir:
+            transpile_cache = TranspileCache(cache_dir, max_entries=2)
+            transpile_cache.put(b'k' * 32, circuit)
+            self.assertEqual(transpile_cache.get(b'k' * 32).name, circuit.name)
+            # an entry which can not be unpickled any more is a miss, and is dropped
+            with open(os.path.join(cache_dir, (b'k' * 32).hex() + '.pkl'), 'wb') as entry_file:
+                entry_file.write(pickle.dumps(circuit)[:-8])
+            self.assertIsNone(transpile_cache.get(b'k' * 32))
+            self.assertEqual(len(transpile_cache), 0)
 
 
 if __name__ == '__main__':
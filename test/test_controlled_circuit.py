@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+from qiskit import QuantumCircuit, QuantumRegister, BasicAer, execute
+
+from test.common import QiskitAquaTestCase
+from qiskit.aqua import AquaError
+from qiskit.aqua.utils.controlledcircuit import get_controlled_circuit
+
+
+class TestControlledCircuit(QiskitAquaTestCase):
+
+    def _random_circuit(self, q, num_gates):
+        qc = QuantumCircuit(q)
+        for _ in range(num_gates):
+            i, j, k = [int(v) for v in np.random.permutation(len(q))[:3]]
+            theta, phi, lam = np.random.uniform(-np.pi, np.pi, size=3)
+            gate = np.random.randint(10)
+            if gate == 0:
+                qc.h(q[i])
+            elif gate == 1:
+                qc.t(q[i])
+            elif gate == 2:
+                qc.x(q[i])
+            elif gate == 3:
+                qc.ry(theta, q[i])
+            elif gate == 4:
+                qc.rz(phi, q[i])
+            elif gate == 5:
+                qc.u2(phi, lam, q[i])
+            elif gate == 6:
+                qc.u3(theta, phi, lam, q[i])
+            elif gate == 7:
+                qc.cx(q[i], q[j])
+            elif gate == 8:
+                qc.cu3(theta, phi, lam, q[i], q[j])
+            else:
+                qc.ccx(q[i], q[j], q[k])
+        return qc
+
+    @parameterized.expand([
+        [True],
+        [False]
+    ])
+    def test_controlled_circuit(self, use_basis_gates):
+        np.random.seed(50)
+        backend = BasicAer.get_backend('unitary_simulator')
+        q = QuantumRegister(3, name='q')
+        c = QuantumRegister(1, name='c')
+        for _ in range(5):
+            qc = self._random_circuit(q, 20)
+            controlled_circuit = get_controlled_circuit(qc, c[0], use_basis_gates=use_basis_gates)
+            unitary = execute(qc, backend).result().get_unitary()
+            controlled_unitary = execute(controlled_circuit, backend).result().get_unitary()
+
+            # the control qubit is the most significant one
+            expected = np.eye(2 * len(unitary), dtype=complex)
+            expected[len(unitary):, len(unitary):] = unitary
+            np.testing.assert_array_almost_equal(controlled_unitary, expected)
+
+    def test_controlled_circuit_shares_gates(self):
+        q = QuantumRegister(2, name='q')
+        c = QuantumRegister(1, name='c')
+        qc = QuantumCircuit(q)
+        qc.ry(0.4, q[0])
+        qc.ry(0.4, q[1])
+        controlled_circuit = get_controlled_circuit(qc, c[0])
+        num_gates = len(controlled_circuit.data) // 2
+        for (inst_0, qargs_0, _), (inst_1, qargs_1, _) in zip(controlled_circuit.data[:num_gates],
+                                                              controlled_circuit.data[num_gates:]):
+            self.assertIs(inst_0, inst_1)
+            self.assertEqual([q_ if q_ != q[0] else q[1] for q_ in qargs_0], qargs_1)
+
+    def test_controlled_circuit_unsupported(self):
+        q = QuantumRegister(1, name='q')
+        c = QuantumRegister(1, name='c')
+        qc = QuantumCircuit(q)
+        qc.reset(q[0])
+        self.assertRaises(AquaError, get_controlled_circuit, qc, c[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
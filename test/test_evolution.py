@@ -18,11 +18,12 @@
 import unittest
 import copy
 import numpy as np
+from scipy.linalg import expm
 
 from qiskit import QuantumRegister, QuantumCircuit
 from qiskit import BasicAer
 from qiskit import execute as q_execute
-from qiskit.quantum_info import state_fidelity
+from qiskit.quantum_info import Pauli, state_fidelity
 
 from test.common import QiskitAquaTestCase
 from qiskit.aqua import Operator
@@ -126,5 +127,71 @@ class TestEvolution(QiskitAquaTestCase):
                 self.assertAlmostEqual(f_mc, 1)
 
 
+    def test_evolution_circuit_slices(self):
+        num_qubits = 3
+        temp = np.random.random((2 ** num_qubits, 2 ** num_qubits))
+        qubit_op = Operator(matrix=temp + temp.T)
+        qubit_op._check_representation('paulis')
+        state_in = Custom(num_qubits, state='random')
+        quantum_registers = QuantumRegister(num_qubits, name='q')
+
+        # the slice gates are reused with rescaled angles for every evolution time
+        num_time_slices = 2
+        for evo_time in [0.5, 1]:
+            state_out_matrix = qubit_op.evolve(
+                state_in=state_in.construct_circuit('vector'),
+                evo_time=evo_time,
+                evo_mode='matrix',
+                num_time_slices=num_time_slices
+            )
+            qc = QuantumCircuit(quantum_registers)
+            qc += state_in.construct_circuit('circuit', quantum_registers)
+            qc += Operator.construct_evolution_circuit(qubit_op.paulis, evo_time, num_time_slices,
+                                                       quantum_registers)
+            job = q_execute(qc, BasicAer.get_backend('statevector_simulator'))
+            state_out_circuit = np.asarray(job.result().get_statevector(qc, decimals=16))
+            self.assertAlmostEqual(state_fidelity(state_out_matrix, state_out_circuit), 1)
+
+        # the basis changes and cnots shared by consecutive paulis cancel out
+        qc = Operator.construct_evolution_circuit(qubit_op.paulis, 1, 1, quantum_registers)
+        num_gates = 0
+        for _, pauli in qubit_op.paulis:
+            support = np.logical_or(pauli.z, pauli.x)
+            if np.any(support):
+                num_gates += 2 * np.count_nonzero(pauli.x) + 2 * (np.count_nonzero(support) - 1) + 1
+        self.assertLess(len(qc.data), num_gates)
+
+        # reordering a slice of commuting paulis does not change the evolution
+        diagonal_op = Operator(paulis=[p for p in qubit_op.paulis if not np.any(p[1].x)])
+        qc = Operator.construct_evolution_circuit(diagonal_op.paulis, 1, 1, quantum_registers)
+        qc_reordered = Operator.construct_evolution_circuit(diagonal_op.paulis, 1, 1, quantum_registers,
+                                                            reorder_paulis=True)
+        backend = BasicAer.get_backend('unitary_simulator')
+        np.testing.assert_array_almost_equal(q_execute(qc, backend).result().get_unitary(qc),
+                                             q_execute(qc_reordered, backend).result().get_unitary(qc_reordered))
+
+    def test_evolution_matrix_free(self):
+        num_qubits = 8
+        paulis = [[np.random.random() - 0.5,
+                   Pauli(np.random.random(num_qubits) < 0.3, np.random.random(num_qubits) < 0.3)]
+                  for _ in range(20)]
+        qubit_op = Operator(paulis=paulis)
+        state_in = Custom(num_qubits, state='random').construct_circuit('vector')
+
+        state_out_exact = qubit_op.evolve(state_in=state_in, evo_time=1, evo_mode='matrix', num_time_slices=0)
+        self.assertAlmostEqual(np.linalg.norm(state_out_exact), 1)
+        # the exact evolution applies the paulis, without converting the operator to a matrix
+        self.assertIsNone(qubit_op.matrix)
+        matrix_op = Operator(paulis=paulis)
+        matrix_op.to_matrix()
+        np.testing.assert_array_almost_equal(state_out_exact, expm(-1.j * matrix_op.matrix.toarray()).dot(state_in))
+        for expansion_mode, num_time_slices in [('trotter', 200), ('suzuki', 20)]:
+            state_out = qubit_op.evolve(state_in=state_in, evo_time=1, evo_mode='matrix',
+                                        num_time_slices=num_time_slices, expansion_mode=expansion_mode,
+                                        expansion_order=2)
+            self.assertAlmostEqual(np.linalg.norm(state_out), 1)
+            self.assertGreater(state_fidelity(state_out_exact, state_out), 0.999)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -75,6 +75,45 @@ class TestExactEigensolver(QiskitAquaTestCase):
         self.assertEqual(len(result['eigvecs']), 4)
         np.testing.assert_array_almost_equal(result['energies'], [-1.85727503, -1.24458455, -0.88272215, -0.22491125])
 
+    def test_ee_matrix_free(self):
+        qubit_op = self.algo_input.qubit_op
+        algo = ExactEigensolver(qubit_op, k=2, matrix_free=True)
+        result = algo.run()
+        np.testing.assert_array_almost_equal(result['energies'], [-1.85727503, -1.24458455])
+        self.assertIsNone(qubit_op.matrix)
+
+        # warm start from the eigenvectors, and shift-invert around the third eigenvalue
+        algo = ExactEigensolver(qubit_op, k=2, matrix_free=True, initial_vectors=result['eigvecs'])
+        np.testing.assert_array_almost_equal(algo.run()['energies'], [-1.85727503, -1.24458455])
+        algo = ExactEigensolver(qubit_op, k=1, matrix_free=True, sigma=-0.9)
+        np.testing.assert_array_almost_equal(algo.run()['energies'], [-0.88272215])
+
+        # the matrix-free mode is opt-in
+        ExactEigensolver(qubit_op, k=2)
+        self.assertIsNotNone(qubit_op.matrix)
+
+    def test_ee_matrix_free_non_hermitian(self):
+        pauli_dict = {
+            'paulis': [{"coeff": {"imag": 0.0, "real": 0.39793742484318045}, "label": "ZII"},
+                       {"coeff": {"imag": 0.0, "real": -0.39793742484318045}, "label": "IZI"},
+                       {"coeff": {"imag": 0.2, "real": 0.0}, "label": "IIZ"},
+                       {"coeff": {"imag": 0.0, "real": 0.18093119978423156}, "label": "XXI"},
+                       {"coeff": {"imag": 0.3, "real": 0.1}, "label": "IXY"}
+                       ]
+        }
+        ref_eigvals = None
+        for matrix_free in [False, True]:
+            qubit_op = Operator.load_from_dict(pauli_dict)
+            eigvals = ExactEigensolver(qubit_op, k=2, matrix_free=matrix_free).run()['eigvals']
+            if ref_eigvals is None:
+                ref_eigvals = eigvals
+                matrix = qubit_op.matrix.toarray()
+                lowest = np.linalg.eigvals(matrix)
+                np.testing.assert_array_almost_equal(np.sort(lowest.real)[:2], np.sort(eigvals.real))
+            else:
+                self.assertIsNone(qubit_op.matrix)
+                np.testing.assert_array_almost_equal(np.sort_complex(eigvals), np.sort_complex(ref_eigvals))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,10 +17,13 @@
 
 import unittest
 
-from qiskit.quantum_info import pauli_group
+import numpy as np
+from parameterized import parameterized
+from qiskit.quantum_info import Pauli, pauli_group
 
 from test.common import QiskitAquaTestCase
 from qiskit.aqua import Operator
+from qiskit.aqua.utils import PauliGraph
 
 
 class TestGroupedPaulis(QiskitAquaTestCase):
@@ -57,6 +60,53 @@ class TestGroupedPaulis(QiskitAquaTestCase):
                 self.log.debug('{} {}'.format(x[0], x[1].to_label()))
             self.log.debug('---')
 
+    def _assert_valid_groups(self, grouped_paulis, paulis):
+        terms = []
+        for group in grouped_paulis:
+            basis = group[0][1]
+            for coeff, pauli in group[1:]:
+                support = pauli.z | pauli.x
+                np.testing.assert_array_equal(pauli.z[support], basis.z[support])
+                np.testing.assert_array_equal(pauli.x[support], basis.x[support])
+                terms.append((pauli.to_label(), coeff))
+        self.assertEqual(sorted(terms), sorted((pauli.to_label(), coeff) for coeff, pauli in paulis))
+
+    @parameterized.expand([
+        ['largest-degree'],
+        ['dsatur'],
+        ['independent-set'],
+        ['sorted-insertion']
+    ])
+    def test_coloring_modes(self, mode):
+        np.random.seed(0)
+        n = 70
+        paulis = [[np.random.randn(), Pauli(np.random.rand(n) < 0.1, np.random.rand(n) < 0.1)] for _ in range(100)]
+        grouped_paulis = PauliGraph(paulis, mode=mode).grouped_paulis
+        self._assert_valid_groups(grouped_paulis, paulis)
+
+        pg = [[1.0, x] for x in pauli_group(2, case='tensor')]
+        self.assertEqual(len(PauliGraph(pg, mode=mode).grouped_paulis), 9)
+
+    def test_incremental_grouping(self):
+        np.random.seed(0)
+        n = 6
+        paulis_1 = [[np.random.randn(), Pauli(np.random.rand(n) < 0.4, np.random.rand(n) < 0.4)] for _ in range(30)]
+        paulis_2 = [[np.random.randn(), Pauli(np.random.rand(n) < 0.4, np.random.rand(n) < 0.4)] for _ in range(30)]
+        paulis_2.append([2.0, paulis_1[0][1]])
+        for subtract in [False, True]:
+            op_1 = Operator(paulis=paulis_1)
+            op_1.to_grouped_paulis()
+            num_groups = len(op_1.grouped_paulis)
+            op_2 = Operator(paulis=paulis_2)
+            op_2.to_grouped_paulis()
+            result = op_1 - op_2 if subtract else op_1 + op_2
+            expected = Operator(paulis=paulis_1) - Operator(paulis=paulis_2) if subtract \
+                else Operator(paulis=paulis_1) + Operator(paulis=paulis_2)
+            self.assertIsNone(result.paulis)
+            self._assert_valid_groups(result.grouped_paulis, expected.paulis)
+            self.assertEqual(len(op_1.grouped_paulis), num_groups)
+            self.assertIsNotNone(op_2.grouped_paulis)
+
 
 if __name__ == '__main__':
     unittest.main()
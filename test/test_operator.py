@@ -16,17 +16,20 @@
 # =============================================================================
 
 import unittest
+from unittest.mock import patch
 import copy
 import itertools
 import os
 
-from qiskit import BasicAer
+from qiskit import BasicAer, QuantumCircuit, QuantumRegister, execute
 import numpy as np
 from qiskit.quantum_info import Pauli
 from qiskit.transpiler import PassManager
 
 from test.common import QiskitAquaTestCase
-from qiskit.aqua import Operator
+from qiskit.aqua import Operator, AquaError
+from qiskit.aqua.utils.commuting_paulis import CommutingSet
+from qiskit.aqua.utils.packed_paulis import PackedPaulis
 from qiskit.aqua.components.variational_forms import RYRZ
 
 
@@ -648,6 +651,42 @@ class TestOperator(QiskitAquaTestCase):
 
         os.remove('temp_op.json')
 
+    def test_load_from_binary_file(self):
+        num_qubits = 70
+        paulis = [Pauli(np.random.randint(2, size=num_qubits).astype(bool),
+                        np.random.randint(2, size=num_qubits).astype(bool)) for _ in range(50)]
+        for coeffs in [np.random.randn(50), np.random.randn(50) + 1j * np.random.randn(50)]:
+            op = Operator(paulis=[[coeff, pauli] for coeff, pauli in zip(coeffs, paulis)])
+            for compress in [False, True]:
+                for mmap in [False, True]:
+                    op.save_to_file('temp_op.bin', binary=True, compress=compress)
+                    # the loaded operator is modified in place without touching the file
+                    load_op = Operator.load_from_file('temp_op.bin', mmap=mmap)
+                    load_op += Operator(paulis=[[1.0, paulis[0]]])
+                    self.assertEqual(load_op.num_qubits, num_qubits)
+                    self.assertNotEqual(op, load_op)
+
+                    load_op = Operator.load_from_file('temp_op.bin', mmap=mmap)
+                    self.assertEqual(op, load_op)
+                    del load_op
+                    os.remove('temp_op.bin')
+
+            load_op = Operator.load_from_dict(op.save_to_dict(binary=True))
+            self.assertEqual(op, load_op)
+
+        # saving a memory-mapped operator back to the file it is mapped from
+        op.save_to_file('temp_op.bin', binary=True)
+        load_op = Operator.load_from_file('temp_op.bin', mmap=True)
+        load_op.save_to_file('temp_op.bin', binary=True)
+        self.assertEqual(Operator.load_from_file('temp_op.bin', mmap=True), op)
+        self.assertEqual(load_op, op)
+        load_op += Operator(paulis=[[1.0, paulis[0]]])
+        load_op.save_to_file('temp_op.bin', binary=True)
+        self.assertEqual(Operator.load_from_file('temp_op.bin', mmap=True), load_op)
+        self.assertNotEqual(op, load_op)
+        del load_op
+        os.remove('temp_op.bin')
+
     def test_group_paulis_1(self):
         """
             Test with color grouping approach
@@ -694,6 +733,245 @@ class TestOperator(QiskitAquaTestCase):
                     break
             self.assertTrue(passed, "non-existed paulis in grouped_paulis: {}".format(gp[1].to_label()))
 
+    def test_packed_paulis_arithmetic(self):
+        """
+            Test the vectorized addition and multiplication against term-by-term references
+        """
+        num_qubits = 5
+        labels = [''.join(label) for label in itertools.product('IXYZ', repeat=num_qubits)]
+        np.random.shuffle(labels)
+        paulis_a = [[np.random.randn(), Pauli.from_label(label)] for label in labels[:40]]
+        paulis_b = [[np.random.randn(), Pauli.from_label(label)] for label in labels[20:120]]
+        op_a = Operator(paulis=paulis_a)
+        op_b = Operator(paulis=paulis_b)
+
+        ref = {}
+        for coeff_a, pauli_a in paulis_a:
+            for coeff_b, pauli_b in paulis_b:
+                pauli, sign = Pauli.sgn_prod(pauli_a, pauli_b)
+                ref[pauli.to_label()] = ref.get(pauli.to_label(), 0.0) + coeff_a * coeff_b * sign
+        prod = op_a * op_b
+        self.assertEqual(len(prod.paulis), len(ref))
+        for coeff, pauli in prod.paulis:
+            self.assertAlmostEqual(coeff, ref[pauli.to_label()])
+
+        total = op_a - op_b
+        self.assertEqual(len(total.paulis), 120)
+        self.assertEqual(labels[:120], [pauli.to_label() for _, pauli in total.paulis])
+        for idx, (coeff, _) in enumerate(total.paulis):
+            expected = paulis_a[idx][0] if idx < 40 else 0.0
+            expected -= paulis_b[idx - 20][0] if idx >= 20 else 0.0
+            self.assertAlmostEqual(coeff, expected)
+
+    def test_eval_paulis_on_statevector(self):
+        """
+            Test the Paulis applied to a statevector against the matrix representation
+        """
+        num_qubits = 4
+        pauli_term = []
+        for pauli_label in itertools.product('IXYZ', repeat=num_qubits):
+            coeff = np.random.random(1)[0]
+            pauli_term.append([coeff, Pauli.from_label(''.join(pauli_label))])
+        op = Operator(paulis=pauli_term)
+        matrix_op = copy.deepcopy(op)
+        matrix_op.to_matrix()
+
+        quantum_state = np.random.randn(2 ** num_qubits) + 1j * np.random.randn(2 ** num_qubits)
+        quantum_state /= np.linalg.norm(quantum_state)
+        paulis_mode = op.eval('paulis', quantum_state, None)[0]
+        matrix_mode = matrix_op.eval('matrix', quantum_state, None)[0]
+        self.assertAlmostEqual(matrix_mode, paulis_mode, 6)
+        self.assertEqual(op.representations, ['paulis'])
+
+    @staticmethod
+    def _reference_expectation(paulis, counts):
+        # the mean and the variance of a set of simultaneously measured paulis, one bitstring at a time
+        num_shots = sum(counts.values())
+        signs = []
+        for key in counts:
+            bits = np.asarray(list(key.replace(' ', '')[::-1])) == '1'
+            signs.append([-1.0 if np.sum(bits & (pauli.z | pauli.x)) % 2 else 1.0 for _, pauli in paulis])
+        signs = np.asarray(signs)
+        weights = np.asarray(list(counts.values()), dtype=float)
+        avg = weights.dot(signs) / num_shots
+        cov = np.zeros((len(paulis), len(paulis)))
+        for k in range(len(paulis)):
+            for l in range(len(paulis)):
+                cov[k, l] = np.sum(weights * (signs[:, k] - avg[k]) * (signs[:, l] - avg[l])) / (num_shots - 1)
+        coeffs = np.asarray([coeff for coeff, _ in paulis])
+        return coeffs.dot(avg), coeffs.dot(cov).dot(coeffs)
+
+    def test_evaluate_with_counts(self):
+        """
+            Test the expectation values and the variances computed from the counts against a bitstring loop
+        """
+        random_state = np.random.RandomState(50)
+        labels = [''.join(random_state.choice(list('IXYZ'), 3)) for _ in range(12)]
+        op = Operator(paulis=[[random_state.randn(), Pauli.from_label(label)] for label in labels])
+        var_form = RYRZ(op.num_qubits, 1)
+        circuit = var_form.construct_circuit(random_state.randn(var_form.num_parameters))
+        backend = BasicAer.get_backend('qasm_simulator')
+
+        op.to_grouped_paulis()
+        for operator_mode in ['paulis', 'grouped_paulis']:
+            circuits = op.construct_evaluation_circuit(operator_mode, circuit, backend)
+            result = execute(circuits, backend, shots=1000).result()
+            if operator_mode == 'paulis':
+                measured_sets = [[pauli] for pauli in op.paulis]
+            else:
+                measured_sets = [tpb_set[1:] for tpb_set in op.grouped_paulis]
+            mean, variance = 0.0, 0.0
+            for measured_set, evaluation_circuit in zip(measured_sets, circuits):
+                set_mean, set_variance = self._reference_expectation(measured_set, result.get_counts(evaluation_circuit))
+                mean += set_mean
+                variance += set_variance
+            avg, std_dev = op.evaluate_with_result(operator_mode, circuits, backend, result)
+            self.assertAlmostEqual(avg, mean)
+            self.assertAlmostEqual(std_dev, np.sqrt(variance / sum(result.get_counts(circuits[0]).values())))
+
+        # the outcomes of more than 64 qubits span several words, the registers are separated by spaces
+        num_qubits = 70
+        counts = {}
+        for _ in range(20):
+            bits = ''.join(random_state.choice(['0', '1'], num_qubits))
+            counts[bits[:30] + ' ' + bits[30:]] = int(random_state.randint(1, 50))
+        pauli_1, pauli_2 = [Pauli.from_label(''.join(random_state.choice(list('IXYZ'), num_qubits))) for _ in range(2)]
+        avg_1 = Operator._measure_pauli_z(counts, pauli_1)
+        avg_2 = Operator._measure_pauli_z(counts, pauli_2)
+        self.assertAlmostEqual(avg_1, self._reference_expectation([[1.0, pauli_1]], counts)[0])
+        self.assertAlmostEqual(avg_2, self._reference_expectation([[1.0, pauli_2]], counts)[0])
+        _, variance = self._reference_expectation([[1.0, pauli_1], [1.0, pauli_2]], counts)
+        covariance = (variance - self._reference_expectation([[1.0, pauli_1]], counts)[1] -
+                      self._reference_expectation([[1.0, pauli_2]], counts)[1]) / 2
+        self.assertAlmostEqual(Operator._covariance(counts, pauli_1, pauli_2, avg_1, avg_2), covariance)
+
+    def test_diagonal_ising(self):
+        """
+            Test the diagonal engine of Z-only operators against the Pauli matrices
+        """
+        num_qubits = 5
+        pauli_term = []
+        for pauli_label in itertools.product('IZ', repeat=num_qubits):
+            coeff = np.random.randn()
+            pauli_term.append([coeff, Pauli.from_label(''.join(pauli_label))])
+        op = Operator(paulis=pauli_term)
+        ref_diagonal = sum(coeff * pauli.to_spmatrix().diagonal() for coeff, pauli in pauli_term)
+
+        diagonal_ising = op._get_diagonal_ising()
+        np.testing.assert_array_almost_equal(diagonal_ising.diagonal(chunk_size=5), ref_diagonal)
+        np.testing.assert_array_almost_equal(diagonal_ising.energies([[0, 1, 1, 0, 1], [1, 0, 0, 0, 0]]),
+                                             ref_diagonal[[0b10110, 0b00001]])
+        counts = {'10110': 30, '00001': 10}
+        avg, variance = diagonal_ising.evaluate_counts(counts)
+        energies = ref_diagonal[[0b10110, 0b00001]]
+        self.assertAlmostEqual(avg, (30 * energies[0] + 10 * energies[1]) / 40)
+        self.assertAlmostEqual(variance, (30 * (energies[0] - avg) ** 2 + 10 * (energies[1] - avg) ** 2) / 39)
+
+        # all the terms are measured by a single circuit
+        var_form = RYRZ(num_qubits, 1)
+        circuit = var_form.construct_circuit(np.array(np.random.randn(var_form.num_parameters)))
+        backend = BasicAer.get_backend('qasm_simulator')
+        self.assertEqual(len(op.construct_evaluation_circuit('paulis', circuit, backend)), 1)
+        reference = op.eval('paulis', circuit, BasicAer.get_backend('statevector_simulator'))[0]
+        paulis_mode = op.eval('paulis', circuit, backend, run_config={'shots': 10000})
+        self.assertLessEqual(abs(paulis_mode[0] - reference), 4 * paulis_mode[1] + 1e-6)
+
+        op.to_matrix()
+        self.assertEqual(op.matrix.ndim, 1)
+        np.testing.assert_array_almost_equal(op.matrix, ref_diagonal)
+
+    def test_packed_paulis_cache(self):
+        """
+            Test that the packed paulis and the diagonal engine are only built again when the paulis change
+        """
+        pauli_term = [[np.random.randn(), Pauli.from_label(''.join(pauli_label))]
+                      for pauli_label in itertools.product('IZ', repeat=4)]
+        op = Operator(paulis=pauli_term)
+        with patch.object(PackedPaulis, 'from_list', wraps=PackedPaulis.from_list) as from_list:
+            diagonal_ising = op._get_diagonal_ising()
+            packed_paulis = op._get_packed_paulis()
+            self.assertIs(op._get_diagonal_ising(), diagonal_ising)
+
+            # the list view materialized from the packed storage is not packed again
+            self.assertEqual(len(op.paulis), len(pauli_term))
+            self.assertIs(op._get_packed_paulis(), packed_paulis)
+            self.assertIs(op._get_diagonal_ising(), diagonal_ising)
+            self.assertEqual(from_list.call_count, 0)
+
+            # an in-place edit of the list view is seen by both
+            op.paulis[3][0] += 1.0
+            self.assertIsNot(op._get_packed_paulis(), packed_paulis)
+            self.assertIsNot(op._get_diagonal_ising(), diagonal_ising)
+            self.assertIs(op._get_packed_paulis(), op._get_packed_paulis())
+            self.assertIs(op._get_diagonal_ising(), op._get_diagonal_ising())
+            self.assertEqual(from_list.call_count, 1)
+        ref_diagonal = sum(coeff * pauli.to_spmatrix().diagonal() for coeff, pauli in op.paulis)
+        np.testing.assert_array_almost_equal(op._get_packed_paulis().coeffs, [coeff for coeff, _ in op.paulis])
+        np.testing.assert_array_almost_equal(op._get_diagonal_ising().diagonal(), ref_diagonal)
+
+    def test_commuting_paulis(self):
+        """
+            Test the measurement of commuting sets with Clifford diagonalization circuits
+        """
+        labels = ['IIII', 'ZIII', 'IZII', 'IIZI', 'IIIZ', 'ZZII', 'ZIZI', 'IZIZ',
+                  'XXYY', 'YYXX', 'XYYX', 'YXXY', 'XXXX', 'YYYY']
+        random_state = np.random.RandomState(50)
+        op = Operator(paulis=[[random_state.randn(), Pauli.from_label(label)] for label in labels])
+        var_form = RYRZ(op.num_qubits, 1)
+        circuit = var_form.construct_circuit(random_state.randn(var_form.num_parameters))
+        backend = BasicAer.get_backend('qasm_simulator')
+
+        # every Pauli of a set is a signed Z-type Pauli after the diagonalization circuit
+        unitary_backend = BasicAer.get_backend('unitary_simulator')
+        for commuting_set in op._get_commuting_sets():
+            diag_circuit = QuantumCircuit(QuantumRegister(op.num_qubits, name='q'))
+            diag_circuit.iden(diag_circuit.qregs[0])
+            commuting_set.build(diag_circuit, diag_circuit.qregs[0])
+            unitary = execute(diag_circuit, unitary_backend).result().get_unitary()
+            for idx, mask, sign in zip(commuting_set.indices, commuting_set.masks[:, 0], commuting_set.signs):
+                parities = np.array([bin(i & int(mask)).count('1') % 2 for i in range(2 ** op.num_qubits)])
+                np.testing.assert_array_almost_equal(
+                    unitary.dot(op.paulis[idx][1].to_matrix()).dot(unitary.conj().T),
+                    sign * np.diag(1 - 2 * parities))
+
+        # Paulis which anticommute have no common diagonalization circuit
+        with self.assertRaises(AquaError):
+            CommutingSet([0, 1], np.array([[True, False], [False, False]]), np.array([[False, False], [True, False]]))
+
+        num_circuits = len(op.construct_evaluation_circuit('commuting_paulis', circuit, backend))
+        grouped_op = copy.deepcopy(op)
+        grouped_op.to_grouped_paulis()
+        self.assertLess(num_circuits, len(grouped_op.construct_evaluation_circuit('grouped_paulis', circuit, backend)))
+
+        reference = op.eval('paulis', circuit, BasicAer.get_backend('statevector_simulator'))[0]
+        commuting_paulis_mode = op.eval('commuting_paulis', circuit, backend, run_config={'shots': 10000, 'seed': 50})
+        self.assertLessEqual(abs(commuting_paulis_mode[0] - reference), 4 * commuting_paulis_mode[1] + 1e-6)
+
+    def test_matrix_paulis_conversion(self):
+        """
+            Test the conversions between matrix, paulis and grouped paulis against the Pauli matrices
+        """
+        num_qubits = 3
+        dim = 2 ** num_qubits
+        matrix = np.random.randn(dim, dim) + 1j * np.random.randn(dim, dim)
+        op = Operator(matrix=matrix)
+        op.to_paulis()
+        labels = [''.join(label) for label in itertools.product('IXYZ', repeat=num_qubits)]
+        self.assertEqual([pauli.to_label() for _, pauli in op.paulis], labels)
+        for coeff, pauli in op.paulis:
+            self.assertAlmostEqual(coeff, np.trace(matrix @ pauli.to_matrix()) / dim)
+
+        op.to_matrix()
+        np.testing.assert_array_almost_equal(op._matrix.toarray(), matrix)
+
+        # the grouped paulis sum to the same matrix
+        pauli_term = [[np.random.randn(), Pauli.from_label(label)] for label in labels[::3]]
+        ref_matrix = sum(coeff * pauli.to_matrix() for coeff, pauli in pauli_term)
+        op = Operator(paulis=pauli_term)
+        op.to_grouped_paulis()
+        op.to_matrix()
+        np.testing.assert_array_almost_equal(op._matrix.toarray(), ref_matrix)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,14 +15,31 @@
 # limitations under the License.
 # =============================================================================
 
+import os
+import threading
 import unittest
+from unittest.mock import patch
 
-from scipy.optimize import rosen
+from scipy.optimize import rosen, rosen_der
 import numpy as np
 
 from test.common import QiskitAquaTestCase
-from qiskit.aqua.components.optimizers import (ADAM, CG, COBYLA, L_BFGS_B, NELDER_MEAD,
-                                               POWELL, SLSQP, SPSA, TNC)
+from qiskit.aqua import aqua_globals, PluggableType, get_pluggable_class
+from qiskit.aqua.components.optimizers import (Optimizer, ADAM, CG, COBYLA, L_BFGS_B, NELDER_MEAD,
+                                               P_BFGS, POWELL, SLSQP, SPSA, TNC, MultiStartOptimizer)
+from qiskit.aqua.components.optimizers.multi_start import EvaluationRecorder
+
+
+class _RecordedRosen:
+    """Rosenbrock function which reports its values to a callback, picklable for the pool workers."""
+
+    def __init__(self, callback):
+        self._callback = callback
+
+    def __call__(self, x):
+        value = rosen(x)
+        self._callback(value)
+        return value
 
 
 class TestOptimizers(QiskitAquaTestCase):
@@ -84,6 +101,146 @@ class TestOptimizers(QiskitAquaTestCase):
         res = self._optimize(optimizer)
         self.assertLessEqual(res[2], 10000)
 
+    def test_grouped_evaluations(self):
+        calls = []
+
+        def objective(x):
+            points = np.split(np.asarray(x), len(x) // 5)
+            calls.append(len(points))
+            values = [rosen(p) for p in points]
+            return values if len(values) > 1 else values[0]
+
+        x0 = np.asarray([1.3, 0.7, 0.8, 1.9, 1.2])
+        grad = Optimizer.gradient_num_diff(x0, objective, 1e-06, max_evals_grouped=3)
+        self.assertEqual(calls, [3, 3])
+        np.testing.assert_array_almost_equal(grad, rosen_der(x0), decimal=3)
+
+        calls.clear()
+        optimizer = NELDER_MEAD(maxfev=10000, tol=1e-06)
+        optimizer.set_max_evals_grouped(6)
+        res = optimizer.optimize(len(x0), objective, initial_point=x0)
+        np.testing.assert_array_almost_equal(res[0], [1.0] * len(x0), decimal=2)
+        # the initial simplex is evaluated as one group
+        self.assertEqual(calls[0], 6)
+
+    def test_gradient_param_shift(self):
+        calls = []
+
+        def objective(x):
+            points = np.split(np.asarray(x), len(x) // 4)
+            calls.append(len(points))
+            values = [np.sum(np.cos(p)) + np.prod(np.sin(p)) for p in points]
+            return values if len(values) > 1 else values[0]
+
+        x0 = np.asarray([0.1, 0.7, 1.3, 2.9])
+        grad = Optimizer.gradient_param_shift(x0, objective)
+        self.assertEqual(calls, [8])
+        ref_grad = -np.sin(x0) + np.array([np.cos(x0[k]) * np.prod(np.sin(np.delete(x0, k)))
+                                           for k in range(len(x0))])
+        np.testing.assert_array_almost_equal(grad, ref_grad)
+
+    def test_multi_start(self):
+        x0 = [1.3, 0.7, 0.8, 1.9, 1.2]
+        bounds = [(-2, 2)] * len(x0)
+        for optimizer in [COBYLA(maxiter=100000, tol=1e-06), SLSQP(maxiter=1000, tol=1e-06)]:
+            with self.subTest(optimizer=optimizer.__class__.__name__):
+                single = optimizer.optimize(len(x0), rosen, variable_bounds=bounds, initial_point=x0)
+                multi_start = MultiStartOptimizer(optimizer, num_starts=4, max_processes=2, seed=50)
+                try:
+                    res = multi_start.optimize(len(x0), rosen, variable_bounds=bounds, initial_point=x0)
+                    self.assertLessEqual(res[1], single[1] + 1e-8)
+                    self.assertGreaterEqual(res[2], single[2])
+                    np.testing.assert_array_almost_equal(res[0], [1.0] * len(x0), decimal=2)
+                finally:
+                    multi_start.close()
+
+        # the start points are seeded, and the first one is the initial point
+        points = MultiStartOptimizer(COBYLA(), num_starts=3, seed=50).start_points(len(x0), bounds, x0)
+        np.testing.assert_array_equal(points[0], x0)
+        np.testing.assert_array_equal(
+            points[1:], MultiStartOptimizer(COBYLA(), num_starts=3, seed=50).start_points(len(x0), bounds, x0)[1:])
+        self.assertTrue(np.all(np.abs(points) <= 2))
+
+        # the remaining starts are cancelled once a start is below the target value
+        multi_start = MultiStartOptimizer(L_BFGS_B(), num_starts=8, max_processes=1, target_value=1e-6)
+        res = multi_start.optimize(len(x0), rosen, variable_bounds=bounds, initial_point=x0)
+        single = L_BFGS_B().optimize(len(x0), rosen, variable_bounds=bounds, initial_point=x0)
+        self.assertEqual(res[2], single[2])
+
+    @patch.object(aqua_globals, '_num_processes', 2)
+    def test_multi_start_pool(self):
+        x0 = [1.3, 0.7, 0.8, 1.9, 1.2]
+        bounds = [(-2, 2)] * len(x0)
+        parent_values = []
+        worker_values = []
+        recorder = EvaluationRecorder(parent_values.append, worker_values.append)
+        multi_start = MultiStartOptimizer(L_BFGS_B(), num_starts=3, max_processes=2, seed=50)
+        try:
+            res = multi_start.optimize(len(x0), _RecordedRosen(recorder), variable_bounds=bounds, initial_point=x0)
+            np.testing.assert_array_almost_equal(res[0], [1.0] * len(x0), decimal=2)
+            # the starts run in the workers, and all their evaluations are sent back
+            self.assertEqual(parent_values, [])
+            self.assertEqual(len(worker_values), res[2])
+            self.assertAlmostEqual(min(worker_values), res[1])
+
+            # the pool is kept for the next optimizations, also after cancelling starts
+            pool = multi_start._pool
+            multi_start._target_value = 1e-3
+            res = multi_start.optimize(len(x0), _RecordedRosen(recorder), variable_bounds=bounds, initial_point=x0)
+            self.assertLess(res[1], 1e-3)
+            self.assertIs(multi_start._pool, pool)
+            res = multi_start.optimize(len(x0), rosen, variable_bounds=bounds, initial_point=x0)
+            self.assertLess(res[1], 1e-3)
+            self.assertIs(multi_start._pool, pool)
+        finally:
+            multi_start.close()
+        self.assertIsNone(multi_start._pool)
+
+    @patch.object(aqua_globals, '_num_processes', 3)
+    @patch('multiprocessing.cpu_count', return_value=3)
+    def test_p_bfgs_unpicklable_objective(self, _):
+        x0 = [1.3, 0.7, 0.8, 1.9, 1.2]
+        bounds = [(-2, 2)] * len(x0)
+        lock = threading.Lock()
+        parent_pids = []
+        worker_pids = []
+        recorder = EvaluationRecorder(parent_pids.append, worker_pids.append)
+
+        def objective(x):
+            # the lock can not be pickled, the workers are forked for the optimization
+            with lock:
+                recorder(os.getpid())
+            return rosen(x)
+
+        optimizer = P_BFGS(maxfun=10000)
+        res = optimizer.optimize(len(x0), objective, variable_bounds=bounds, initial_point=x0)
+        np.testing.assert_array_almost_equal(res[0], [1.0] * len(x0), decimal=2)
+        # the three starts run in the forked workers, and all their evaluations are sent back
+        self.assertEqual(parent_pids, [])
+        self.assertEqual(len(worker_pids), res[2])
+        self.assertNotIn(os.getpid(), worker_pids)
+        self.assertIsNone(optimizer._multi_start._pool)
+
+    def test_multi_start_init_params(self):
+        params = {'optimizer': {'name': 'MULTI_START',
+                                'optimizer': {'name': 'SLSQP', 'maxiter': 500},
+                                'num_starts': 3, 'max_processes': 1, 'seed': 50}}
+        optimizer = get_pluggable_class(PluggableType.OPTIMIZER, 'MULTI_START').init_params(params)
+        self.assertIsInstance(optimizer, MultiStartOptimizer)
+        self.assertIsInstance(optimizer.optimizer, SLSQP)
+        self.assertEqual(optimizer.optimizer._options['maxiter'], 500)
+        self.assertEqual(optimizer.num_starts, 3)
+        self.assertEqual(optimizer.get_support_level(), optimizer.optimizer.get_support_level())
+        self.assertTrue(optimizer.is_bounds_supported)
+        self.assertTrue(MultiStartOptimizer(COBYLA()).is_gradient_ignored)
+
+        x0 = [1.3, 0.7, 0.8, 1.9, 1.2]
+        res = optimizer.optimize(len(x0), rosen, variable_bounds=[(-2, 2)] * len(x0), initial_point=x0)
+        np.testing.assert_array_almost_equal(res[0], [1.0] * len(x0), decimal=2)
+
+        optimizer.set_max_evals_grouped(4)
+        self.assertEqual(optimizer.optimizer._max_evals_grouped, 4)
+
 
 if __name__ == '__main__':
     unittest.main()
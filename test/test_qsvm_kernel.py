@@ -15,15 +15,20 @@
 # limitations under the License.
 # =============================================================================
 
+import functools
 import os
+import tempfile
+from unittest.mock import patch
 
 import numpy as np
 from qiskit import BasicAer
+from qiskit.quantum_info import Pauli
 from test.common import QiskitAquaTestCase
 from qiskit.aqua import run_algorithm, QuantumInstance, aqua_globals
 from qiskit.aqua.input import SVMInput
-from qiskit.aqua.components.feature_maps import SecondOrderExpansion
+from qiskit.aqua.components.feature_maps import SecondOrderExpansion, self_product
 from qiskit.aqua.algorithms import QSVMKernel
+from qiskit.aqua.utils.circuit_cache import circuit_signature
 
 
 class TestQSVMKernel(QiskitAquaTestCase):
@@ -168,6 +173,175 @@ class TestQSVMKernel(QiskitAquaTestCase):
             except:
                 pass
 
+    def test_qsvm_kernel_statevector_kernel_matrix(self):
+
+        backend = BasicAer.get_backend('statevector_simulator')
+        num_qubits = 2
+        feature_map = SecondOrderExpansion(num_qubits=num_qubits, depth=2, entangler_map=[[0, 1]])
+        svm = QSVMKernel(feature_map, self.training_data, self.testing_data, None)
+        quantum_instance = QuantumInstance(backend, seed_mapper=self.random_seed)
+
+        x1_vec = np.concatenate((self.training_data['A'], self.training_data['B']))
+        x2_vec = np.concatenate((self.testing_data['A'], self.testing_data['B']))
+        kernel_matrix = svm.construct_kernel_matrix(x1_vec, x2_vec, quantum_instance)
+        self.assertEqual(kernel_matrix.shape, (4, 2))
+        for i, x1 in enumerate(x1_vec):
+            for j, x2 in enumerate(x2_vec):
+                circuit = svm.construct_circuit(x1, x2)
+                amplitude = quantum_instance.execute(circuit).get_statevector(circuit)[0]
+                self.assertAlmostEqual(kernel_matrix[i, j], np.abs(amplitude) ** 2)
+
+        kernel_matrix = svm.construct_kernel_matrix(x1_vec, quantum_instance=quantum_instance)
+        np.testing.assert_array_almost_equal(kernel_matrix, kernel_matrix.T)
+        np.testing.assert_array_almost_equal(np.diag(kernel_matrix), np.ones(4))
+
+    def test_qsvm_kernel_feature_map_batch(self):
+
+        backend = BasicAer.get_backend('statevector_simulator')
+        feature_map = SecondOrderExpansion(num_qubits=2, depth=2)
+        quantum_instance = QuantumInstance(backend, seed_mapper=self.random_seed)
+        x_vec = np.concatenate((self.training_data['A'], self.training_data['B']))
+        circuits = feature_map.construct_circuits(x_vec)
+        self.assertEqual(len(circuits), len(x_vec))
+        for x, circuit in zip(x_vec, circuits):
+            # reference: a layer of Hadamards then exp(-i phi(x) P) for every Pauli string, depth times
+            expected = np.zeros(2 ** feature_map.num_qubits, dtype=complex)
+            expected[0] = 1.0
+            hadamards = functools.reduce(np.kron, [np.array([[1, 1], [1, -1]]) / np.sqrt(2)] * feature_map.num_qubits)
+            for _ in range(2):
+                expected = hadamards.dot(expected)
+                for pauli in feature_map._pauli_strings:
+                    phi = self_product(x[np.where(np.asarray(list(pauli[::-1])) != 'I')[0]])
+                    pauli_matrix = Pauli.from_label(pauli).to_matrix()
+                    expected = np.cos(phi) * expected - 1j * np.sin(phi) * pauli_matrix.dot(expected)
+            statevector = quantum_instance.execute(circuit).get_statevector(circuit)
+            self.assertAlmostEqual(np.abs(np.vdot(expected, statevector)), 1.0)
+        self.assertEqual(feature_map.construct_circuits(np.zeros((0, 2))), [])
+
+        # the parameter vectors of the kernel circuits, without building them
+        svm = QSVMKernel(feature_map, self.training_data, self.testing_data, None)
+        parameters = np.hstack((feature_map.construct_parameters(x_vec),
+                                feature_map.construct_parameters(x_vec[::-1], inverse=True)))
+        for x1, x2, expected in zip(x_vec, x_vec[::-1], parameters):
+            _, values = circuit_signature(svm.construct_circuit(x1, x2, measurement=True))
+            np.testing.assert_array_almost_equal(values, expected)
+
+    def test_qsvm_kernel_binary_memmapped_kernel(self):
+
+        backend = BasicAer.get_backend('statevector_simulator')
+        num_qubits = 2
+        feature_map = SecondOrderExpansion(num_qubits=num_qubits, depth=2, entangler_map=[[0, 1]])
+        svm = QSVMKernel(feature_map, self.training_data, self.testing_data, None)
+        quantum_instance = QuantumInstance(backend, seed_mapper=self.random_seed)
+        result = svm.run(quantum_instance)
+
+        train_data, train_labels = svm.training_dataset
+        test_data = svm.test_dataset[0]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            kernel_file = os.path.join(tmp_dir, 'kernel_training.npy')
+            kernel_matrix = svm.construct_kernel_matrix(train_data, kernel_file=kernel_file)
+            self.assertIsInstance(kernel_matrix, np.memmap)
+            np.testing.assert_array_almost_equal(kernel_matrix, result['kernel_matrix_training'])
+
+            # a second run resumes from the completed tiles
+            resumed_kernel_matrix = svm.construct_kernel_matrix(train_data, kernel_file=kernel_file)
+            np.testing.assert_array_almost_equal(resumed_kernel_matrix, kernel_matrix)
+
+            svm.instance.train(train_data, train_labels, kernel_matrix=kernel_matrix)
+            np.testing.assert_array_almost_equal(svm.ret['svm']['alphas'], result['svm']['alphas'])
+
+            kernel_file = os.path.join(tmp_dir, 'kernel_testing.npy')
+            kernel_matrix = svm.construct_kernel_matrix(test_data, svm.ret['svm']['support_vectors'],
+                                                        kernel_file=kernel_file)
+            confidence = svm.instance.get_predicted_confidence(test_data, kernel_matrix=kernel_matrix)
+            np.testing.assert_array_almost_equal(confidence,
+                                                 svm.instance.get_predicted_confidence(test_data))
+
+    def test_qsvm_kernel_resume_interrupted_kernel(self):
+
+        backend = BasicAer.get_backend('statevector_simulator')
+        num_qubits = 2
+        feature_map = SecondOrderExpansion(num_qubits=num_qubits, depth=2, entangler_map=[[0, 1]])
+        svm = QSVMKernel(feature_map, self.training_data, self.testing_data, None)
+        quantum_instance = QuantumInstance(backend, seed_mapper=self.random_seed)
+        x_vec = np.concatenate((self.training_data['A'], self.training_data['B'],
+                                self.testing_data['A'], self.testing_data['B']))
+        ref_kernel_matrix = svm.construct_kernel_matrix(x_vec, quantum_instance=quantum_instance)
+
+        compute_tile = QSVMKernel._compute_state_overlap_tile
+        computed = []
+
+        def interrupted_tile(states1, states2_h, rows, cols, is_diagonal):
+            if len(computed) == 3:
+                raise KeyboardInterrupt()
+            computed.append((rows.start, cols.start))
+            return compute_tile(states1, states2_h, rows, cols, is_diagonal)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            kernel_file = os.path.join(tmp_dir, 'kernel.npy')
+            # 2x2 tiles, the 6 tiles on and above the diagonal are computed
+            with patch.object(QSVMKernel, 'BATCH_SIZE', 2):
+                with patch.object(QSVMKernel, '_compute_state_overlap_tile', side_effect=interrupted_tile):
+                    with self.assertRaises(KeyboardInterrupt):
+                        svm.construct_kernel_matrix(x_vec, kernel_file=kernel_file)
+                interrupted_kernel_matrix = np.array(np.load(kernel_file))
+                with patch.object(QSVMKernel, '_compute_state_overlap_tile',
+                                  side_effect=compute_tile) as resumed_tile:
+                    kernel_matrix = np.array(svm.construct_kernel_matrix(x_vec, kernel_file=kernel_file))
+
+        # the resumed run only computes the tiles which were not completed, and keeps the others
+        resumed = [(call[0][2].start, call[0][3].start) for call in resumed_tile.call_args_list]
+        self.assertEqual(len(resumed), 3)
+        self.assertFalse(set(resumed) & set(computed))
+        for row, col in computed:
+            np.testing.assert_array_equal(kernel_matrix[row:row + 2, col:col + 2],
+                                          interrupted_kernel_matrix[row:row + 2, col:col + 2])
+        np.testing.assert_array_almost_equal(kernel_matrix, ref_kernel_matrix)
+
+    def test_qsvm_kernel_resume_interrupted_kernel_qasm(self):
+
+        backend = BasicAer.get_backend('qasm_simulator')
+        num_qubits = 2
+        feature_map = SecondOrderExpansion(num_qubits=num_qubits, depth=2, entangler_map=[[0, 1]])
+        svm = QSVMKernel(feature_map, self.training_data, self.testing_data, None)
+        quantum_instance = QuantumInstance(backend, shots=1024, seed=self.random_seed,
+                                           seed_mapper=self.random_seed)
+        x_vec = np.concatenate((self.training_data['A'], self.training_data['B'],
+                                self.testing_data['A'], self.testing_data['B']))
+
+        compute_tile = svm._compute_kernel_tile
+        computed = []
+
+        def interrupted_tile(x1_vec, x2_vec, rows, cols, is_symmetric):
+            if len(computed) == 3:
+                raise KeyboardInterrupt()
+            computed.append((rows.start, cols.start))
+            return compute_tile(x1_vec, x2_vec, rows, cols, is_symmetric)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            kernel_file = os.path.join(tmp_dir, 'kernel.npy')
+            # tiles of 2x2 pairs executed as batches of at most 4 circuits, 6 tiles on and above the diagonal
+            with patch.object(QSVMKernel, 'BATCH_SIZE', 4):
+                ref_kernel_matrix = svm.construct_kernel_matrix(x_vec, quantum_instance=quantum_instance)
+                with patch.object(QSVMKernel, '_compute_kernel_tile', side_effect=interrupted_tile):
+                    with self.assertRaises(KeyboardInterrupt):
+                        svm.construct_kernel_matrix(x_vec, kernel_file=kernel_file)
+                self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'kernel.tiles.npy')))
+                self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'kernel.tiles.json')))
+                interrupted_kernel_matrix = np.array(np.load(kernel_file))
+                with patch.object(QSVMKernel, '_compute_kernel_tile',
+                                  side_effect=compute_tile) as resumed_tile:
+                    kernel_matrix = np.array(svm.construct_kernel_matrix(x_vec, kernel_file=kernel_file))
+
+        # the resumed run only executes the tiles which were not completed, and matches an uninterrupted run
+        resumed = [(call[0][2].start, call[0][3].start) for call in resumed_tile.call_args_list]
+        self.assertEqual(len(resumed), 3)
+        self.assertFalse(set(resumed) & set(computed))
+        for row, col in computed:
+            np.testing.assert_array_equal(kernel_matrix[row:row + 2, col:col + 2],
+                                          interrupted_kernel_matrix[row:row + 2, col:col + 2])
+        np.testing.assert_array_equal(kernel_matrix, ref_kernel_matrix)
+
     def test_qsvm_kernel_multiclass_one_against_all(self):
 
         backend = BasicAer.get_backend('qasm_simulator')
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+import threading
+import unittest
+from unittest.mock import patch
+
+from qiskit import BasicAer, ClassicalRegister, QuantumCircuit, QuantumRegister
+
+from test.common import QiskitAquaTestCase
+from qiskit.aqua.utils import run_circuits
+
+
+class _TrackedJob:
+    """A job which reports when its result has been collected."""
+
+    def __init__(self, job, on_result):
+        self._job = job
+        self._on_result = on_result
+
+    def __getattr__(self, name):
+        return getattr(self._job, name)
+
+    def result(self, **kwargs):
+        result = self._job.result(**kwargs)
+        self._on_result()
+        return result
+
+
+class TestRunCircuits(QiskitAquaTestCase):
+    """Pipelined execution of the chunks of circuits."""
+
+    def test_jobs_in_flight(self):
+        num_qubits = 3
+        circuits = []
+        for k in range(2 ** num_qubits):
+            qr = QuantumRegister(num_qubits, name='q')
+            cr = ClassicalRegister(num_qubits, name='c')
+            circuit = QuantumCircuit(qr, cr, name='basis_{}'.format(k))
+            for qubit in range(num_qubits):
+                if (k >> qubit) & 1:
+                    circuit.x(qr[qubit])
+            circuit.measure(qr, cr)
+            circuits.append(circuit)
+
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+        submit = run_circuits._submit_with_job_id
+
+        def on_result():
+            with lock:
+                in_flight.pop()
+
+        def tracked_submit(*args, **kwargs):
+            job, job_id = submit(*args, **kwargs)
+            with lock:
+                in_flight.append(job_id)
+                max_in_flight.append(len(in_flight))
+            return _TrackedJob(job, on_result), job_id
+
+        backend = BasicAer.get_backend('qasm_simulator')
+        for window in [1, 2, 3]:
+            with self.subTest(window=window):
+                del max_in_flight[:]
+                with patch.object(run_circuits, 'MAX_CIRCUITS_PER_JOB', '1'), \
+                        patch.object(run_circuits, 'MAX_JOBS_IN_FLIGHT', window), \
+                        patch.object(run_circuits, '_submit_with_job_id', side_effect=tracked_submit):
+                    result = run_circuits.compile_and_run_circuits(circuits, backend)
+
+                # one job per circuit, never more than the window in flight
+                self.assertEqual(len(max_in_flight), len(circuits))
+                self.assertLessEqual(max(max_in_flight), window)
+                self.assertEqual(in_flight, [])
+                # the results are in circuit order
+                self.assertEqual([experiment.header.name for experiment in result.results],
+                                 [circuit.name for circuit in circuits])
+                for k, circuit in enumerate(circuits):
+                    self.assertEqual(list(result.get_counts(circuit)), [format(k, '03b')])
+
+
+if __name__ == '__main__':
+    unittest.main()
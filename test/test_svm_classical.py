@@ -16,8 +16,13 @@
 # =============================================================================
 import numpy as np
 
+from sklearn.metrics.pairwise import rbf_kernel
+from sklearn.svm import SVC
+
 from qiskit.aqua import run_algorithm
 from qiskit.aqua.input import SVMInput
+from qiskit.aqua.algorithms import SVM_Classical
+from qiskit.aqua.algorithms.classical.svm._rbf_svc_estimator import _RBF_Kernel, _RBF_SVC_Estimator
 from test.common import QiskitAquaTestCase
 
 
@@ -107,6 +112,40 @@ class TestSVMClassical(QiskitAquaTestCase):
                          ['A', 'A', 'A', 'A', 'A', 'A', 'A', 'A', 'A', 'A',
                           'B', 'B', 'B', 'B', 'B', 'B', 'B', 'B', 'B', 'B'])
 
+    def test_classical_binary_blocks(self):
+        random = np.random.RandomState(5)
+        training_input = {'A': random.normal(0.5, 0.2, size=(20, 2)), 'B': random.normal(-0.5, 0.2, size=(20, 2))}
+        datapoints = random.normal(0, 0.6, size=(25, 2))
+
+        svm = SVM_Classical(training_input)
+        svm.train(*svm.instance.training_dataset)
+        support_vectors = svm.ret['svm']['support_vectors']
+        self.assertEqual(svm.ret['svm']['alphas'].shape, (len(support_vectors), 1))
+        self.assertEqual(svm.ret['svm']['yin'].shape, (len(support_vectors), 1))
+        weights = (svm.ret['svm']['yin'] * svm.ret['svm']['alphas']).ravel()
+        expected = rbf_kernel(datapoints, support_vectors).dot(weights) + svm.ret['svm']['bias']
+
+        # the decision function is streamed in blocks of data points
+        svm.instance.BATCH_SIZE = 4
+        confidence, kernel_matrix = svm.instance.get_predicted_confidence(datapoints, return_kernel_matrix=True)
+        np.testing.assert_array_almost_equal(confidence, expected)
+        np.testing.assert_array_almost_equal(kernel_matrix, rbf_kernel(datapoints, support_vectors))
+        np.testing.assert_array_equal(svm.predict(datapoints), (expected > 0).astype(int))
+        # the kernel matrices of more than a block of data points are kept
+        np.testing.assert_array_almost_equal(svm.ret['kernel_matrix_prediction'], kernel_matrix)
+        svm.test(datapoints, (expected > 0).astype(int))
+        np.testing.assert_array_almost_equal(svm.ret['kernel_matrix_testing'], kernel_matrix)
+        self.assertEqual(svm.ret['testing_accuracy'], 1.0)
+
+        # the estimators of a multiclass extension fit on blocks of the shared kernel matrix
+        kernel = _RBF_Kernel()
+        data, labels = svm.instance.training_dataset
+        kernel.fit(data)
+        estimator = _RBF_SVC_Estimator(kernel)
+        estimator.fit(data[::2], labels[::2])
+        np.testing.assert_array_almost_equal(estimator.decision_function(datapoints),
+                                             SVC(gamma='auto').fit(data[::2], labels[::2]).decision_function(datapoints))
+
     def test_classical_multiclass_one_against_all(self):
         training_input = {'A': np.asarray([[0.6560706, 0.17605998],
                                            [0.25776033, 0.47628296],
@@ -445,3 +484,38 @@ class TestSVMClassical(QiskitAquaTestCase):
                          ['A', 'A', 'A', 'A', 'A', 'A', 'A', 'A', 'A', 'A', 'B',
                           'B', 'B', 'B', 'B', 'B', 'B', 'B', 'B',
                           'B', 'C', 'C', 'C', 'C', 'C', 'C', 'C', 'C', 'C', 'C'])
+
+    def test_classical_multiclass_gamma(self):
+        random = np.random.RandomState(42)
+        centers = {'A': [-1., 0.], 'B': [1., 0.], 'C': [0., 1.]}
+        training_input = {k: random.normal(c, 0.6, size=(10, 2)) for k, c in centers.items()}
+        test_input = {k: random.normal(c, 0.6, size=(10, 2)) for k, c in centers.items()}
+        total_array = np.concatenate([test_input[k] for k in sorted(test_input)])
+        algo_input = SVMInput(training_input, test_input, total_array)
+
+        params = {
+            'problem': {'name': 'svm_classification'},
+            'algorithm': {
+                'name': 'SVM',
+                'gamma': 20.0
+            },
+            'multiclass_extension': {'name': 'OneAgainstRest'},
+        }
+        result = run_algorithm(params, algo_input)
+
+        # the estimators honour gamma, which used to be ignored in favour of 'auto'
+        data = np.concatenate([training_input[k] for k in sorted(training_input)])
+        labels = np.repeat(sorted(training_input), 10)
+        decisions = np.column_stack([SVC(kernel='rbf', gamma=20.0).fit(data, labels == k).decision_function(total_array)
+                                     for k in sorted(training_input)])
+        expected = [sorted(training_input)[i] for i in np.argmax(decisions, axis=1)]
+        self.assertEqual(list(result['predicted_classes']), expected)
+        self.assertAlmostEqual(result['testing_accuracy'], 2. / 3.)
+        self.assertEqual(list(result['predicted_classes']),
+                         ['A', 'A', 'C', 'C', 'A', 'A', 'A', 'A', 'A', 'A',
+                          'B', 'B', 'B', 'A', 'B', 'A', 'B', 'B', 'A', 'B',
+                          'C', 'A', 'C', 'A', 'C', 'A', 'A', 'C', 'A', 'C'])
+
+        del params['algorithm']['gamma']
+        result = run_algorithm(params, algo_input)
+        self.assertAlmostEqual(result['testing_accuracy'], 13. / 15.)
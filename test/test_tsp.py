@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 IBM.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+import itertools
+
+import numpy as np
+
+from test.common import QiskitAquaTestCase
+from qiskit.aqua.translators.ising import tsp
+
+
+class TestTSP(QiskitAquaTestCase):
+    """TSP Ising translator tests."""
+
+    def setUp(self):
+        super().setUp()
+        np.random.seed(100)
+
+    def test_tsp_qubitops(self):
+        num_nodes = 4
+        ins = tsp.random_tsp(num_nodes, seed=10)
+        qubit_op, offset = tsp.get_tsp_qubitops(ins)
+        diagonal_ising = qubit_op._get_diagonal_ising()
+
+        # feasible tours cost their length, the other assignments at least the penalty
+        for tour in itertools.permutations(range(num_nodes)):
+            x = np.zeros(num_nodes ** 2)
+            x[np.array(tour) * num_nodes + np.arange(num_nodes)] = 1
+            self.assertAlmostEqual(diagonal_ising.energies(x)[0] + offset, tsp.tsp_value(tour, ins.w), places=4)
+        infeasible = np.random.randint(0, 2, size=(20, num_nodes ** 2))
+        infeasible = infeasible[[not tsp.tsp_feasible(x) for x in infeasible]]
+        self.assertTrue(np.all(diagonal_ising.energies(infeasible) + offset >= 1e5))
+
+    def test_tsp_qubitops_large(self):
+        # too many qubits for a matrix, the energies of the diagonal are checked on sampled assignments
+        for num_nodes in [6, 9]:
+            ins = tsp.random_tsp(num_nodes, seed=num_nodes)
+            qubit_op, offset = tsp.get_tsp_qubitops(ins)
+            self.assertEqual(len(qubit_op.paulis), num_nodes ** 2 + 2 * num_nodes ** 2 * (num_nodes - 1))
+            diagonal_ising = qubit_op._get_diagonal_ising()
+            for _ in range(20):
+                tour = np.random.permutation(num_nodes)
+                x = np.zeros(num_nodes ** 2)
+                x[tour * num_nodes + np.arange(num_nodes)] = 1
+                self.assertAlmostEqual(diagonal_ising.energies(x)[0] + offset, tsp.tsp_value(tour, ins.w),
+                                       places=4)
+            infeasible = np.random.randint(0, 2, size=(20, num_nodes ** 2))
+            infeasible = infeasible[[not tsp.tsp_feasible(x) for x in infeasible]]
+            self.assertTrue(np.all(diagonal_ising.energies(infeasible) + offset >= 1e5))
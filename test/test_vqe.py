@@ -16,6 +16,7 @@
 # =============================================================================
 
 import unittest
+from unittest.mock import patch
 import os
 
 import numpy as np
@@ -26,7 +27,7 @@ from qiskit import BasicAer
 from qiskit.aqua import Operator, run_algorithm, QuantumInstance, aqua_globals
 from qiskit.aqua.input import EnergyInput
 from qiskit.aqua.components.variational_forms import RY
-from qiskit.aqua.components.optimizers import L_BFGS_B, COBYLA
+from qiskit.aqua.components.optimizers import Optimizer, L_BFGS_B, COBYLA, MultiStartOptimizer
 from qiskit.aqua.components.initial_states import Zero
 from qiskit.aqua.algorithms import VQE
 
@@ -125,6 +126,33 @@ class TestVQE(QiskitAquaTestCase):
         if quantum_instance.has_circuit_caching:
             self.assertLess(quantum_instance._circuit_cache.misses, 3)
 
+    def test_vqe_param_shift_gradient(self):
+        backend = BasicAer.get_backend('statevector_simulator')
+        var_form = RY(self.algo_input.qubit_op.num_qubits, 3)
+        with patch.object(Optimizer, 'gradient_param_shift', wraps=Optimizer.gradient_param_shift) as param_shift:
+            algo = VQE(self.algo_input.qubit_op, var_form, L_BFGS_B(), 'paulis', param_shift_gradient=True)
+            quantum_instance = QuantumInstance(backend)
+            result = algo.run(quantum_instance)
+        self.assertGreater(param_shift.call_count, 0)
+        self.assertAlmostEqual(result['energy'], -1.85727503, places=6)
+
+        # the gradient of the energy is exact, and its 2P shifted points are run in a single execution
+        x = np.random.uniform(-np.pi, np.pi, var_form.num_parameters)
+        ref_grad = [(algo._energy_evaluation(x + e) - algo._energy_evaluation(x - e)) / 2e-6
+                    for e in 1e-6 * np.eye(var_form.num_parameters)]
+        with patch.object(quantum_instance, 'execute', wraps=quantum_instance.execute) as execute:
+            grad = algo._gradient_evaluation(x)
+        self.assertEqual(execute.call_count, 1)
+        self.assertEqual(len(execute.call_args[0][0]), 2 * var_form.num_parameters)
+        np.testing.assert_array_almost_equal(grad, ref_grad, decimal=5)
+
+        # the optimizer computes its own gradient by default
+        with patch.object(Optimizer, 'gradient_param_shift', wraps=Optimizer.gradient_param_shift) as param_shift:
+            algo = VQE(self.algo_input.qubit_op, var_form, L_BFGS_B(), 'paulis')
+            result = algo.run(QuantumInstance(backend))
+        self.assertEqual(param_shift.call_count, 0)
+        self.assertAlmostEqual(result['energy'], -1.85727503, places=6)
+
     def test_vqe_callback(self):
 
         tmp_filename = 'vqe_callback_test.csv'
@@ -170,6 +198,29 @@ class TestVQE(QiskitAquaTestCase):
             if is_file_exist:
                 os.remove(self._get_resource_path(tmp_filename))
 
+    @patch.object(aqua_globals, '_num_processes', 2)
+    def test_vqe_multi_start_callback(self):
+        eval_counts = []
+        energies = []
+
+        def store_intermediate_result(eval_count, parameters, mean, std):
+            eval_counts.append(eval_count)
+            energies.append(mean)
+
+        backend = BasicAer.get_backend('statevector_simulator')
+        var_form = RY(self.algo_input.qubit_op.num_qubits, 3)
+        optimizer = MultiStartOptimizer(COBYLA(), num_starts=3, max_processes=2, seed=50)
+        algo = VQE(self.algo_input.qubit_op, var_form, optimizer, 'paulis', callback=store_intermediate_result)
+        try:
+            result = algo.run(QuantumInstance(backend, circuit_caching=False))
+        finally:
+            optimizer.close()
+        self.assertAlmostEqual(result['energy'], -1.85727503, places=5)
+        # the evaluations of the starts run in the pool are numbered in a single sequence
+        self.assertEqual(eval_counts, list(range(1, len(eval_counts) + 1)))
+        self.assertEqual(result['eval_count'], len(eval_counts))
+        self.assertAlmostEqual(min(energies), result['energy'], places=5)
+
 
 if __name__ == '__main__':
     unittest.main()